@@ -1,14 +1,13 @@
 # Config File For The Backend.
 
 
+# Note : Plaid And Google Clients Are Built On First Use ('get_plaid_config' / 'get_google_config'), Not At Import,
+#        So Cold Starts Don't Pay For The Plaid SDK And A Missing Credential Only Breaks The Routes That Need It.
+
 # Imports.
 import os
 import secrets
-import plaid
 from dotenv import load_dotenv
-from plaid.api import plaid_api
-from plaid.api_client import ApiClient
-from plaid.configuration import Configuration
 
 # Load .env Variables.
 load_dotenv()
@@ -86,6 +85,12 @@ PLAID_TRANSACTION_DAYS = int(os.getenv("PLAID_TRANSACTION_DAYS", "90"))  # Defau
 # Plaid Config Set Up.
 class PlaidConfig:
     def __init__(self):
+        # Plaid SDK Is Heavy To Import, So Only Load It When A Client Is Actually Built.
+        import plaid
+        from plaid.api import plaid_api
+        from plaid.api_client import ApiClient
+        from plaid.configuration import Configuration
+        
         # Set Client ID, Secret, env, Products, & Country Codes.
         self.client_id = os.getenv('PLAID_CLIENT_ID')
         self.secret = os.getenv('PLAID_SECRET')
@@ -138,6 +143,23 @@ class GoogleConfig:
         if not self.client_id or not self.client_secret:
             raise ValueError("GOOGLE_CLIENT_ID and GOOGLE_CLIENT_SECRET must be set in environment variables")
 
-# Create Global Instances.
-plaid_config = PlaidConfig()
-google_config = GoogleConfig() 
\ No newline at end of file
+# Global Instances (Created Lazily).
+plaid_config = None
+google_config = None
+
+# -------------------------------------------------------- Get Plaid Config.
+def get_plaid_config() -> PlaidConfig:
+    """Get Or Create The Plaid Config And API Client"""
+    global plaid_config
+    if plaid_config is None:
+        plaid_config = PlaidConfig()
+    return plaid_config
+
+# -------------------------------------------------------- Get Google Config.
+def get_google_config() -> GoogleConfig:
+    """Get Or Create The Google OAuth Config"""
+    global google_config
+    if google_config is None:
+        google_config = GoogleConfig()
+    return google_config
+ 
\ No newline at end of file
@@ -13,20 +13,40 @@
 #   - 'AccountBalanceHistory' - Account Balance History Model.
 #   - 'Tag' - Tag Model.
 #   - 'TransactionTag' - Transaction Tag Association Model.
+#   - 'MergedFingerprint' - Fingerprint Of A Transaction Merged Away By Reconciliation.
+#   - 'TagRule' - Auto-Tagging Rule Model.
 
 # Functions : 
 #   - 'get_database_url' - Get Database URL.
-#   - 'create_engine_safe' - Create Engine Safe.
+#   - 'get_engine_options' - Build Pool And Driver Options (DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT, DB_POOL_RECYCLE).
+#   - 'get_pool_metrics' - Get Current Pool Usage And Checkout Counters.
+#   - 'create_engine_safe' - Create Engine Safe (Primary, Or The Given URL).
 #   - 'get_engine' - Get Engine.
 #   - 'get_session' - Get Session.
+#   - 'ReadOnlySession' - Session That Refuses To Flush Changes (Used For Replica Reads).
+#   - 'get_async_database_url' - Map The Sync Database URL To Its Async Driver.
+#   - 'get_async_engine' - Get Async Engine.
+#   - 'get_async_session' - Get Async Session.
+#   - 'get_replica_database_url' - Get The Read Replica URL ('DATABASE_REPLICA_URL'), If Any.
+#   - 'get_replica_engine' - Get Read Replica Engine (Falls Back To The Primary).
+#   - 'get_replica_session' - Get Read-Only Session On The Read Replica.
+#   - 'get_async_replica_engine' - Get Async Read Replica Engine (Falls Back To The Primary).
+#   - 'get_async_replica_session' - Get Read-Only Async Session On The Read Replica.
+#   - 'dispose_async_engine' - Close Pooled Async Connections.
+#   - 'upgrade_schema' - Add Columns And Indexes Missing From An Existing Database.
 #   - 'create_tables' - Create Tables.
 
 # Imports.
 import os
+import time
 from datetime import datetime
-from sqlalchemy.orm import sessionmaker, relationship
+from typing import Optional
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.orm import Session, sessionmaker, relationship
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy import create_engine, Column, Integer, String, Float, Date, DateTime, Boolean, ForeignKey, Text
+from sqlalchemy import create_engine, event, text, inspect, Column, Integer, String, Float, Date, DateTime, Boolean, ForeignKey, Text, Index
 
 # Create Base Class For ORM Models.
 Base = declarative_base()
@@ -53,7 +73,8 @@ class User(Base):
     created_at = Column(DateTime)                           # When User Account Was Created.
     updated_at = Column(DateTime)                           # When User Account Was Last Updated.
     last_login = Column(DateTime)                           # When User Last Logged In.
-    
+    data_version = Column(Integer, default=0)               # Bumped On Every Transaction Write (Invalidates The Analytics Cache).
+
     # Relationships.
     accounts = relationship("Account", back_populates="user")           # One-To-Many Relationship With Accounts.
     transactions = relationship("Transaction", back_populates="user")   # One-To-Many Relationship With Transactions.
@@ -119,6 +140,7 @@ class Transaction(Base):
     # Source Tracking.
     source = Column(String, default="manual")               # "plaid", "csv", "manual". (How Transaction Was Imported)
     file = Column(String)                                   # Original File Name Or "plaid". (Tracks Import Source)
+    file_upload_id = Column(Integer, ForeignKey("file_uploads.id"), index=True)  # Upload This Row Came From. (CSV Only)
     
     # Additional Plaid Data.
     iso_currency_code = Column(String, default="USD")       # Currency Code. (Defaults To USD)
@@ -138,16 +160,23 @@ class Transaction(Base):
     
     # Duplicate Prevention.
     transaction_hash = Column(String, unique=True, index=True)  # Hash Of Key Transaction Fields. (Prevents Duplicate Imports)
+    fingerprint = Column(String)                            # Account + Date + Cents + Normalized Vendor. (Unique Per User, See 'fingerprint_utils')
     
     # Relationships.
     user = relationship("User", back_populates="transactions")  # Many-To-One Relationship With User.
     account = relationship("Account", back_populates="transactions")  # Many-To-One Relationship With Account.
     tags = relationship("TransactionTag", back_populates="transaction")  # Many-To-Many Relationship With Tags.
 
+    __table_args__ = (
+        Index("uq_transactions_user_fingerprint", "user_id", "fingerprint", unique=True),  # One Import Per Real Transaction.
+        Index("ix_transactions_user_date", "user_id", "date"),  # Per-User Date Scans. (Stays Selective Inside A Hash Partition)
+    )
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)  # Call Parent Class Constructor.
-        # Generate Transaction Hash For Duplicate Detection.
-        self.transaction_hash = self._generate_transaction_hash()
+        # Generate Transaction Hash For Duplicate Detection (Unless The Caller Already Has One).
+        if self.transaction_hash is None:
+            self.transaction_hash = self._generate_transaction_hash()
 
     def _generate_transaction_hash(self):
         """Generate a unique hash for the transaction based on its key attributes."""
@@ -159,7 +188,8 @@ class Transaction(Base):
             str(self.amount),            # Transaction Amount.
             str(self.vendor),            # Vendor Name.
             str(self.merchant_name),     # Merchant Name.
-            str(self.description)        # Transaction Description.
+            str(self.description),       # Transaction Description.
+            str(self.fingerprint)        # Fingerprint. (Tells Same-Day Repeats Of A Manual Entry Apart)
         ]
         hash_string = "|".join(key_fields)  # Join Fields With Pipe Separator.
         return hashlib.sha256(hash_string.encode()).hexdigest()  # Generate SHA-256 Hash.
@@ -260,10 +290,15 @@ class WeeklyCentiScore(Base):
     
     # Metadata.
     created_at = Column(DateTime, default=datetime.now())
+    is_reconstructed = Column(Boolean, nullable=True)   # Rebuilt From History By The Backfill (Live Scores Are Never Overwritten).
     
     # Relationships.
     user = relationship("User")
 
+    __table_args__ = (
+        Index("uq_weekly_centi_scores_user_date", "user_id", "score_date", unique=True),  # One Score Per User Per Week.
+    )
+
 # -------------------------------------------------------- Account Balance History Model
 class AccountBalanceHistory(Base):
     __tablename__ = "account_balance_history" # Physical Table Name In Database.
@@ -290,6 +325,10 @@ class AccountBalanceHistory(Base):
     # Relationships.
     user = relationship("User")
 
+    __table_args__ = (
+        Index("ix_account_balance_history_user_date", "user_id", "snapshot_date"),  # Per-User History Scans.
+    )
+
 # -------------------------------------------------------- Tag Model
 class Tag(Base):
     __tablename__ = "tags" # Physical Table Name In Database.
@@ -313,6 +352,7 @@ class TransactionTag(Base):
     
     id = Column(Integer, primary_key=True, index=True)                              # Transaction Tag ID.
     transaction_id = Column(Integer, ForeignKey("transactions.id"), nullable=False) # Transaction ID.
+    user_id = Column(Integer, ForeignKey("users.id"), index=True)                   # Owner Of The Transaction. (Partition Key On PostgreSQL)
     tag_id = Column(Integer, ForeignKey("tags.id"), nullable=False)                 # Tag ID.
     created_at = Column(DateTime, default=datetime.now())                           # When Transaction Tag Was Created.
     
@@ -320,6 +360,117 @@ class TransactionTag(Base):
     transaction = relationship("Transaction", back_populates="tags") # Many-To-One Relationship With Transaction.
     tag = relationship("Tag", back_populates="transaction_tags") # Many-To-One Relationship With Tag.
 
+    __table_args__ = (
+        Index("uq_transaction_tags_transaction_tag", "transaction_id", "tag_id", unique=True),  # Each Tag Linked Once Per Transaction.
+    )
+
+# -------------------------------------------------------- Tag Rule Model
+class TagRule(Base):
+    __tablename__ = "tag_rules" # Physical Table Name In Database.
+    
+    id = Column(Integer, primary_key=True, index=True)                              # Tag Rule ID.
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)   # User ID.
+    tag_id = Column(Integer, ForeignKey("tags.id"), nullable=False)                 # Tag Applied When The Rule Matches.
+    name = Column(String)                                                           # Optional Display Name.
+    vendor_contains = Column(String)                                                # Vendor Keyword(s), Comma-Separated, Any Matches.
+    merchant_contains = Column(String)                                              # Merchant Name Keyword(s), Comma-Separated.
+    category_primary = Column(String)                                               # Exact Primary Category.
+    min_amount = Column(Float)                                                      # Smallest Absolute Amount (Inclusive).
+    max_amount = Column(Float)                                                      # Largest Absolute Amount (Inclusive).
+    account_id = Column(String)                                                     # Only Transactions On This Account.
+    is_active = Column(Boolean, default=True)                                       # Whether The Rule Is Applied.
+    created_at = Column(DateTime)                                                   # When Rule Was Created.
+    updated_at = Column(DateTime)                                                   # When Rule Was Last Updated.
+    
+    # Relationships.
+    tag = relationship("Tag")
+
+# -------------------------------------------------------- Merged Fingerprint Model
+class MergedFingerprint(Base):
+    __tablename__ = "merged_fingerprints" # Physical Table Name In Database.
+    
+    id = Column(Integer, primary_key=True, index=True)                              # Merged Fingerprint ID.
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)               # User ID.
+    fingerprint = Column(String, nullable=False)                                    # Fingerprint Of The Removed Duplicate.
+    transaction_id = Column(Integer)                                                # Transaction It Was Merged Into.
+    created_at = Column(DateTime)                                                   # When It Was Merged.
+
+    __table_args__ = (
+        Index("uq_merged_fingerprints_user_fingerprint", "user_id", "fingerprint", unique=True),  # Re-Imports Stay Deduplicated.
+    )
+
+# -------------------------------------------------------- Recurring Series Model
+class RecurringSeries(Base):
+    __tablename__ = "recurring_series" # Physical Table Name In Database.
+
+    id = Column(Integer, primary_key=True, index=True)                              # Recurring Series ID.
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)               # User ID.
+    vendor_key = Column(String, nullable=False)                                     # Normalized Vendor (See 'vendor_key').
+    vendor = Column(String)                                                         # Display Name.
+    kind = Column(String)                                                           # "subscription", "bill" Or "income".
+    period = Column(String)                                                         # "weekly", "biweekly", "monthly", "quarterly", "annual".
+    interval_days = Column(Float)                                                   # Median Days Between Charges.
+    amount = Column(Float)                                                          # Median Amount (Negative For Charges).
+    amount_variation = Column(Float)                                                # Mean Deviation From The Median, As A Fraction Of It.
+    occurrences = Column(Integer)                                                   # Transactions In The Series.
+    confidence = Column(Float)                                                      # 0-1, Regularity x Amount Stability.
+    first_date = Column(Date)                                                       # First Charge.
+    last_date = Column(Date)                                                        # Latest Charge.
+    next_expected_date = Column(Date)                                               # Last Charge + Median Interval.
+    is_active = Column(Boolean, default=True)                                       # Whether The Next Charge Isn't Overdue.
+    updated_at = Column(DateTime)                                                   # When Series Was Last Detected.
+
+    __table_args__ = (
+        Index("ix_recurring_series_user_vendor", "user_id", "vendor_key"),  # Incremental Updates Replace One Vendor's Series.
+    )
+
+# -------------------------------------------------------- Budget Model
+class Budget(Base):
+    __tablename__ = "budgets" # Physical Table Name In Database.
+
+    id = Column(Integer, primary_key=True, index=True)                              # Budget ID.
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)   # User ID.
+    name = Column(String)                                                           # Optional Display Name.
+    category_primary = Column(String)                                               # Budgeted Category (Or Null For A Tag Budget).
+    tag_id = Column(Integer, ForeignKey("tags.id"))                                 # Budgeted Tag (Or Null For A Category Budget).
+    monthly_limit = Column(Float, nullable=False)                                   # Monthly Spending Limit In Dollars.
+    is_active = Column(Boolean, default=True)                                       # Whether Spend Is Counted And Alerts Raised.
+    created_at = Column(DateTime)                                                   # When Budget Was Created.
+    updated_at = Column(DateTime)                                                   # When Budget Was Last Updated.
+
+    # Relationships.
+    tag = relationship("Tag")
+
+# -------------------------------------------------------- Budget Spend Model
+class BudgetSpend(Base):
+    __tablename__ = "budget_spend" # Physical Table Name In Database.
+
+    id = Column(Integer, primary_key=True, index=True)                              # Budget Spend ID.
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)               # User ID.
+    budget_id = Column(Integer, ForeignKey("budgets.id"), nullable=False)           # Budget Counted.
+    period_start = Column(Date, nullable=False)                                     # First Day Of The Month Counted.
+    spent_cents = Column(Integer, default=0)                                        # Running Spend In Cents (Kept Up To Date At Write Time).
+    alert_level = Column(Integer, default=0)                                        # Highest Threshold (Percent) Already Alerted This Month.
+    updated_at = Column(DateTime)                                                   # When The Counter Last Moved.
+
+    __table_args__ = (
+        Index("uq_budget_spend_budget_period", "budget_id", "period_start", unique=True),  # One Counter Per Budget Per Month.
+    )
+
+# -------------------------------------------------------- Budget Alert Model
+class BudgetAlert(Base):
+    __tablename__ = "budget_alerts" # Physical Table Name In Database.
+
+    id = Column(Integer, primary_key=True, index=True)                              # Budget Alert ID.
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)   # User ID.
+    budget_id = Column(Integer, ForeignKey("budgets.id"), nullable=False)           # Budget Whose Threshold Was Crossed.
+    period_start = Column(Date)                                                     # Month Of The Crossing.
+    threshold = Column(Integer)                                                     # Threshold Crossed (Percent, e.g. 80 Or 100).
+    spent = Column(Float)                                                           # Spend When It Was Crossed.
+    monthly_limit = Column(Float)                                                   # Limit At The Time.
+    is_read = Column(Boolean, default=False)                                        # Whether The User Has Seen It.
+    created_at = Column(DateTime)                                                   # When The Crossing Happened.
+
 # -------------------------------------------------------- Database Setup.
 def get_database_url():
     """Get database URL from environment"""
@@ -329,17 +480,154 @@ def get_database_url():
     print(f"Using DATABASE_URL: {database_url[:20]}...")
     return database_url
 
+# -------------------------------------------------------- Engine Settings.
+
+# Pool Sizing (Override Per Deployment Via Environment).
+DEFAULT_POOL_SIZE = 5           # Connections Kept Open.
+DEFAULT_MAX_OVERFLOW = 10       # Extra Connections Allowed Under Burst Load.
+DEFAULT_POOL_TIMEOUT = 30       # Seconds To Wait For A Free Connection Before Erroring.
+DEFAULT_POOL_RECYCLE = 300      # Seconds Before A Connection Is Replaced.
+
+# SQLite Single-Node Performance Pragmas (Applied To Every New Connection).
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",          # Readers Don't Block The Writer (Or Each Other).
+    "synchronous": "NORMAL",        # Safe With WAL, Far Fewer fsyncs Than FULL.
+    "mmap_size": 268435456,         # 256 MB Memory-Mapped Reads.
+    "cache_size": -65536,           # 64 MB Page Cache (Negative = KiB).
+    "busy_timeout": 5000,           # Wait Up To 5s For A Lock Instead Of Failing With "database is locked".
+    "temp_store": "MEMORY"
+}
+
+# Pool Checkout Counters (Process-Wide).
+pool_stats = {
+    "checkouts": 0,
+    "checkins": 0,
+    "connections_created": 0,
+    "invalidations": 0,
+    "peak_checked_out": 0,
+    "total_checkout_seconds": 0.0,
+    "max_checkout_seconds": 0.0
+}
+
+# -------------------------------------------------------- Env Int Helper.
+def _env_int(name: str, default: int) -> int:
+    """Read An Integer Setting From The Environment, Falling Back To The Default."""
+    value = os.getenv(name)
+    if value is None or value.strip() == "":
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        print(f"Ignoring invalid {name}={value!r}, using {default}")
+        return default
+
+# -------------------------------------------------------- Get Engine Options.
+def get_engine_options(database_url: str, is_async: bool = False) -> dict:
+    """Build Pool And Driver Options For The Given Database URL"""
+    options = {
+        "pool_pre_ping": True,
+        "pool_recycle": _env_int("DB_POOL_RECYCLE", DEFAULT_POOL_RECYCLE)
+    }
+    
+    if database_url.startswith("sqlite"):
+        # In-Memory Databases Live In A Single Connection, So Keep SQLAlchemy's Default Pool.
+        if ":memory:" in database_url or database_url.rstrip("/") == "sqlite:":
+            options["connect_args"] = {"check_same_thread": False}
+            return options
+        
+        # File Databases Get A Real Queue Pool Shared Across Request Threads.
+        options.update(
+            poolclass=AsyncAdaptedQueuePool if is_async else QueuePool,
+            connect_args={"check_same_thread": False, "timeout": SQLITE_PRAGMAS["busy_timeout"] / 1000}
+        )
+    
+    options.update(
+        pool_size=_env_int("DB_POOL_SIZE", DEFAULT_POOL_SIZE),
+        max_overflow=_env_int("DB_MAX_OVERFLOW", DEFAULT_MAX_OVERFLOW),
+        pool_timeout=_env_int("DB_POOL_TIMEOUT", DEFAULT_POOL_TIMEOUT)
+    )
+    return options
+
+# -------------------------------------------------------- Apply SQLite Pragmas.
+def _apply_sqlite_pragmas(dbapi_connection, connection_record):
+    """Apply Performance Pragmas To A New SQLite Connection"""
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma, value in SQLITE_PRAGMAS.items():
+            cursor.execute(f"PRAGMA {pragma} = {value}")
+    finally:
+        cursor.close()
+
+# -------------------------------------------------------- Register Pool Metrics.
+def _register_pool_metrics(engine):
+    """Track Checkouts, Checkins And How Long Connections Are Held"""
+    
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        pool_stats["connections_created"] += 1
+    
+    @event.listens_for(engine, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        pool_stats["checkouts"] += 1
+        connection_record.info["checkout_time"] = time.perf_counter()
+        checked_out = engine.pool.checkedout() if hasattr(engine.pool, "checkedout") else 0
+        pool_stats["peak_checked_out"] = max(pool_stats["peak_checked_out"], checked_out)
+    
+    @event.listens_for(engine, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        pool_stats["checkins"] += 1
+        started = connection_record.info.pop("checkout_time", None)
+        if started is not None:
+            held = time.perf_counter() - started
+            pool_stats["total_checkout_seconds"] += held
+            pool_stats["max_checkout_seconds"] = max(pool_stats["max_checkout_seconds"], held)
+    
+    @event.listens_for(engine, "invalidate")
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        pool_stats["invalidations"] += 1
+
+# -------------------------------------------------------- Get Pool Metrics.
+def get_pool_metrics() -> dict:
+    """Get Current Pool Usage And Checkout Counters"""
+    pool = engine.pool if engine is not None else None
+    
+    metrics = dict(pool_stats)
+    metrics["average_checkout_ms"] = round(
+        metrics["total_checkout_seconds"] / metrics["checkins"] * 1000, 2
+    ) if metrics["checkins"] else 0.0
+    metrics["max_checkout_ms"] = round(metrics.pop("max_checkout_seconds") * 1000, 2)
+    metrics.pop("total_checkout_seconds")
+    
+    if isinstance(pool, QueuePool):
+        metrics.update(
+            pool_class=type(pool).__name__,
+            pool_size=pool.size(),
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            overflow=pool.overflow(),
+            status=pool.status()
+        )
+    elif pool is not None:
+        metrics.update(pool_class=type(pool).__name__, status=pool.status())
+    
+    # Replica Pool (Checkout Counters Above Are Shared With The Primary).
+    if replica_engine is not None and replica_engine is not engine:
+        metrics["replica_status"] = replica_engine.pool.status()
+    
+    return metrics
+
 # -------------------------------------------------------- Create Engine Safe.
-def create_engine_safe():
-    """Create database engine with error handling"""
+def create_engine_safe(database_url: str = None):
+    """Create database engine with error handling (Primary Unless A URL Is Given)"""
     try:
-        database_url = get_database_url()
+        database_url = database_url or get_database_url()
         print(f"Connecting to database: {database_url[:20]}...")  # Log partial URL for security
+        options = get_engine_options(database_url)
         
         # PostgreSQL configuration - try different drivers
         try:
             # First try with psycopg2
-            engine = create_engine(database_url, pool_pre_ping=True, pool_recycle=300)
+            engine = create_engine(database_url, **options)
             print("Using psycopg2 driver")
         except ImportError:
             # Fallback to asyncpg if psycopg2 is not available
@@ -347,18 +635,29 @@ def create_engine_safe():
                 import asyncpg
                 # Convert asyncpg URL to SQLAlchemy format
                 if database_url.startswith("postgresql://"):
-                    engine = create_engine(database_url, pool_pre_ping=True, pool_recycle=300)
+                    engine = create_engine(database_url, **options)
                     print("Using asyncpg driver")
                 else:
                     raise Exception("Unsupported database URL format")
             except ImportError:
                 raise Exception("Neither psycopg2 nor asyncpg are available")
         
+        # SQLite Pragmas Must Run On Every Pooled Connection, Not Just The First.
+        if engine.dialect.name == "sqlite":
+            event.listen(engine, "connect", _apply_sqlite_pragmas)
+        _register_pool_metrics(engine)
+        
+        # Per-Request Statement Count And DB Time, Plus The Opt-In Slow-Query Log.
+        from app.utils.metrics_utils import register_query_metrics
+        from app.utils.slow_query_utils import register_slow_query_log
+        register_query_metrics(engine)
+        register_slow_query_log(engine)
+        
         # Test the connection
         with engine.connect() as conn:
-            conn.execute("SELECT 1")
+            conn.execute(text("SELECT 1"))
         
-        print("Database connection successful")
+        print(f"Database connection successful (pool: {engine.pool.status()})")
         return engine
     except Exception as e:
         print(f"Database connection failed: {e}")
@@ -367,9 +666,73 @@ def create_engine_safe():
         # Return None so the app can still start without database
         return None
 
+# -------------------------------------------------------- Get Async Database URL.
+def get_async_database_url(database_url: str) -> str:
+    """Map The Sync Database URL To Its Async Driver (asyncpg / aiosqlite)"""
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    
+    if backend in ("postgresql", "postgres"):
+        # asyncpg Doesn't Understand libpq's 'sslmode', It Takes 'ssl' Instead.
+        query = dict(url.query)
+        sslmode = query.pop("sslmode", None)
+        if sslmode and sslmode != "disable":
+            query["ssl"] = sslmode
+        url = url.set(drivername="postgresql+asyncpg", query=query)
+    elif backend == "sqlite":
+        url = url.set(drivername="sqlite+aiosqlite")
+    else:
+        raise ValueError(f"No async driver configured for {backend}")
+    
+    return url.render_as_string(hide_password=False)
+
+# -------------------------------------------------------- Create Async Engine Safe.
+def create_async_engine_safe(database_url: str = None):
+    """Create async database engine with error handling (Primary Unless A URL Is Given)"""
+    try:
+        database_url = database_url or get_database_url()
+        async_engine = create_async_engine(
+            get_async_database_url(database_url),
+            **get_engine_options(database_url, is_async=True)
+        )
+        
+        # Same Pragmas And Pool Metrics As The Sync Engine (Events Live On The Sync Facade).
+        if async_engine.dialect.name == "sqlite":
+            event.listen(async_engine.sync_engine, "connect", _apply_sqlite_pragmas)
+        _register_pool_metrics(async_engine.sync_engine)
+        
+        from app.utils.metrics_utils import register_query_metrics
+        from app.utils.slow_query_utils import register_slow_query_log
+        register_query_metrics(async_engine.sync_engine)
+        register_slow_query_log(async_engine.sync_engine)
+        
+        print(f"Async database engine created ({async_engine.dialect.driver})")
+        return async_engine
+    except Exception as e:
+        print(f"Async database engine creation failed: {e}")
+        # Return None so sync routes keep working without the async path
+        return None
+
 # Initialize Engine Lazily.
 engine = None
 SessionLocal = None
+async_engine = None
+AsyncSessionLocal = None
+
+# Read Replica Engines (Fall Back To The Primary When 'DATABASE_REPLICA_URL' Is Unset).
+replica_engine = None
+ReplicaSessionLocal = None
+async_replica_engine = None
+AsyncReplicaSessionLocal = None
+
+# -------------------------------------------------------- Read-Only Session.
+class ReadOnlySession(Session):
+    """Session For Replica Reads; Flushing Any Change Raises, So Read Paths Can't Quietly Write."""
+
+@event.listens_for(ReadOnlySession, "before_flush")
+def _reject_replica_writes(session, flush_context, instances):
+    if session.new or session.deleted or any(session.is_modified(obj) for obj in session.dirty):
+        raise RuntimeError("Read replica sessions are read-only - use the primary session ('get_primary_db') to write")
 
 # -------------------------------------------------------- Get Engine.
 def get_engine():
@@ -391,6 +754,136 @@ def get_session():
             return None
     return SessionLocal()
 
+# -------------------------------------------------------- Get Async Engine.
+def get_async_engine():
+    """Get or create async database engine"""
+    global async_engine
+    if async_engine is None:
+        async_engine = create_async_engine_safe()
+    return async_engine
+
+# -------------------------------------------------------- Get Async Session.
+def get_async_session():
+    """Get async database session"""
+    global AsyncSessionLocal
+    if AsyncSessionLocal is None:
+        async_engine = get_async_engine()
+        if async_engine:
+            # 'expire_on_commit=False' So Loaded Objects Stay Readable Without Implicit (Sync) Refreshes.
+            AsyncSessionLocal = sessionmaker(
+                bind=async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+            )
+        else:
+            return None
+    return AsyncSessionLocal()
+
+# -------------------------------------------------------- Get Replica Database URL.
+def get_replica_database_url() -> Optional[str]:
+    """Get The Read Replica URL ('DATABASE_REPLICA_URL'), Or None To Read From The Primary."""
+    return os.getenv("DATABASE_REPLICA_URL") or None
+
+# -------------------------------------------------------- Get Replica Engine.
+def get_replica_engine():
+    """Get Or Create The Read Replica Engine (The Primary If No Replica Is Configured Or It's Unreachable)"""
+    global replica_engine
+    if replica_engine is None:
+        replica_url = get_replica_database_url()
+        replica_engine = (create_engine_safe(replica_url) if replica_url else None) or get_engine()
+    return replica_engine
+
+# -------------------------------------------------------- Get Replica Session.
+def get_replica_session():
+    """Get A Read-Only Session On The Read Replica"""
+    global ReplicaSessionLocal
+    if ReplicaSessionLocal is None:
+        engine = get_replica_engine()
+        if engine:
+            ReplicaSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine, class_=ReadOnlySession)
+        else:
+            return None
+    return ReplicaSessionLocal()
+
+# -------------------------------------------------------- Get Async Replica Engine.
+def get_async_replica_engine():
+    """Get Or Create The Async Read Replica Engine (The Primary If No Replica Is Configured Or It's Unreachable)"""
+    global async_replica_engine
+    if async_replica_engine is None:
+        replica_url = get_replica_database_url()
+        async_replica_engine = (create_async_engine_safe(replica_url) if replica_url else None) or get_async_engine()
+    return async_replica_engine
+
+# -------------------------------------------------------- Get Async Replica Session.
+def get_async_replica_session():
+    """Get A Read-Only Async Session On The Read Replica"""
+    global AsyncReplicaSessionLocal
+    if AsyncReplicaSessionLocal is None:
+        async_engine = get_async_replica_engine()
+        if async_engine:
+            AsyncReplicaSessionLocal = sessionmaker(
+                bind=async_engine, class_=AsyncSession, sync_session_class=ReadOnlySession,
+                autoflush=False, expire_on_commit=False
+            )
+        else:
+            return None
+    return AsyncReplicaSessionLocal()
+
+# -------------------------------------------------------- Dispose Async Engine.
+async def dispose_async_engine():
+    """Close Pooled Async Connections (aiosqlite Keeps A Thread Per Connection)"""
+    global async_engine, AsyncSessionLocal, async_replica_engine, AsyncReplicaSessionLocal
+    if async_replica_engine is not None and async_replica_engine is not async_engine:
+        await async_replica_engine.dispose()
+    async_replica_engine = None
+    AsyncReplicaSessionLocal = None
+    if async_engine is not None:
+        await async_engine.dispose()
+        async_engine = None
+        AsyncSessionLocal = None
+
+# -------------------------------------------------------- Upgrade Schema.
+def upgrade_schema(engine) -> list:
+    """Add Columns And Indexes Missing From An Existing Database (New Columns Must Be Nullable)."""
+
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+    changes = []
+
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+
+            # Columns ('create_all' Only Creates Whole Tables).
+            existing_columns = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing_columns:
+                    column_type = column.type.compile(dialect=engine.dialect)
+                    conn.execute(text(f'ALTER TABLE {table.name} ADD COLUMN "{column.name}" {column_type}'))
+                    changes.append(f"{table.name}.{column.name}")
+
+            # Indexes.
+            existing_indexes = {index["name"] for index in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name not in existing_indexes:
+                    if index.name == "uq_transaction_tags_transaction_tag":
+                        # Older Databases Could Link The Same Tag Twice; Keep The First Link.
+                        conn.execute(text(
+                            "DELETE FROM transaction_tags WHERE id NOT IN "
+                            "(SELECT MIN(id) FROM transaction_tags GROUP BY transaction_id, tag_id)"
+                        ))
+                    if index.name == "uq_weekly_centi_scores_user_date":
+                        # Overlapping Backfills Could Store The Same Week Twice; Keep The First Score.
+                        conn.execute(text(
+                            "DELETE FROM weekly_centi_scores WHERE id NOT IN "
+                            "(SELECT MIN(id) FROM weekly_centi_scores GROUP BY user_id, score_date)"
+                        ))
+                    index.create(bind=conn)
+                    changes.append(index.name)
+
+    if changes:
+        print(f"Upgraded schema: {', '.join(changes)}")
+    return changes
+
 # -------------------------------------------------------- Create Tables.
 def create_tables():
     """Create database tables if engine is available"""
@@ -399,6 +892,23 @@ def create_tables():
         try:
             Base.metadata.create_all(bind=engine)
             print("Database tables created successfully")
+            
+            # Bring Older Databases Up To The Current Models, Then Fill In Columns Added Since (Fingerprints, Upload Links, Tag Owners).
+            upgrade_schema(engine)
+            from app.utils.fingerprint_utils import backfill_fingerprints
+            backfill_fingerprints(engine)
+            from app.utils.file_utils import backfill_file_upload_ids
+            backfill_file_upload_ids(engine)
+            from app.utils.tag_utils import backfill_tag_link_user_ids
+            backfill_tag_link_user_ids(engine)
+
+            # Hash-Partition The Per-User Tables On PostgreSQL When 'DB_HASH_PARTITIONS' Is Set.
+            from app.utils.partition_utils import partition_tables
+            partition_tables(engine)
+            
+            # Set Up Full-Text Search Index Over Transactions.
+            from app.utils.search_utils import setup_search_index
+            setup_search_index(engine)
         except Exception as e:
             print(f"Failed to create database tables: {e}")
     else:
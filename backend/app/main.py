@@ -6,16 +6,22 @@
 #
 # Functions :
 #   - 'app' - FastAPI Instance.
+#   - 'metrics' - Prometheus Request Metrics.
 #   - 'startup_event' - Startup Event.
+#   - 'shutdown_event' - Shutdown Event.
 
 
 # Imports.
-from fastapi import FastAPI
+from fastapi import FastAPI, Header, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
+from typing import Optional
 import os
 
 # Local Imports.
-from app.routes import upload, transactions, files, plaid, accounts, centi_score
+from app.routes import upload, transactions, files, plaid, accounts, centi_score, tag_rules, analytics, budgets
+from app.utils.metrics_utils import MetricsMiddleware, render_metrics, check_metrics_token
+from app.utils.db_utils import ReadYourWritesMiddleware
 
 # Create Instance Of FastAPI Application.
 app = FastAPI(
@@ -69,6 +75,12 @@ app.add_middleware(
     max_age=86400,  # Cache Preflight For 24 Hours.
 )
 
+# After A Write, Keep That Browser's Reads On The Primary Briefly (GETs Otherwise Use The Read Replica).
+app.add_middleware(ReadYourWritesMiddleware)
+
+# Per-Request Query Count / Timing ('Server-Timing' Header + '/metrics'). Added Last So It Wraps Everything.
+app.add_middleware(MetricsMiddleware)
+
 # Add Specific CORS Handler For Auth Routes To Handle Railway Proxy Issues.
 @app.options("/auth/{path:path}")
 async def auth_cors_handler(path: str):
@@ -93,6 +105,9 @@ app.include_router(transactions.router)
 app.include_router(plaid.router)
 app.include_router(accounts.router)
 app.include_router(centi_score.router)
+app.include_router(tag_rules.router)
+app.include_router(analytics.router)
+app.include_router(budgets.router)
 
 # -------------------------------------------------------- Root Endpoint.
 @app.get("/")
@@ -107,6 +122,15 @@ async def root():
 async def health_check():
     return {"status": "healthy"}
 
+# -------------------------------------------------------- Metrics Endpoint.
+# Prometheus Scrape Target. Needs 'Authorization: Bearer <METRICS_TOKEN>' When
+# METRICS_TOKEN Is Set; Without One It's Only Open Outside Production.
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics(authorization: Optional[str] = Header(None)):
+    if not check_metrics_token(authorization):
+        raise HTTPException(status_code=401, detail="Invalid metrics token")
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
 # -------------------------------------------------------- Startup Event.
 # Start The Centi Score Scheduler Only When App Starts.
 @app.on_event("startup")
@@ -130,6 +154,11 @@ async def startup_event():
         from app.database import create_tables
         create_tables()
         
+        # Connect The Read Replica Up Front, So The First GET Doesn't Pay For It.
+        from app.database import get_replica_database_url, get_replica_engine
+        if get_replica_database_url():
+            get_replica_engine()
+        
         # Start Scheduler.
         from app.utils.scheduler import start_scheduler
         start_scheduler()
@@ -142,4 +171,9 @@ async def startup_event():
         traceback.print_exc()
         # Don't Fail The App If Startup Fails.
 
-
+# -------------------------------------------------------- Shutdown Event.
+# Release Async Pool Connections So Workers Exit Cleanly.
+@app.on_event("shutdown")
+async def shutdown_event():
+    from app.database import dispose_async_engine
+    await dispose_async_engine()
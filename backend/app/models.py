@@ -5,6 +5,8 @@
 # Models :
 #   - 'TransactionCreate' - Transaction Create Model For Requests.
 #   - 'TransactionOut' - Transaction Out Model For Responses.
+#   - 'ReconcileRequest' - Reconcile Request Model For Cross-Source Duplicate Matching.
+#   - 'BulkUpdateRequest' - Bulk Update Request Model For Recategorizing Many Transactions.
 #   - 'FileUploadOut' - File Upload Out Model For Responses.
 #   - 'UploadResponse' - Upload Response Model For Detailed Upload Results.
 #   - 'LinkTokenRequest' - Link Token Request Model.
@@ -27,11 +29,18 @@
 #   - 'TagCreate' - Tag Create Model.
 #   - 'TagOut' - Tag Out Model For Responses.
 #   - 'TransactionTagOut' - Transaction Tag Out Model For Responses.
+#   - 'BulkTagRequest' - Bulk Tag Request Model For Tagging Many Transactions.
+#   - 'TagRuleCreate' - Tag Rule Create Model (Also Used For Updates).
+#   - 'TagRuleOut' - Tag Rule Out Model For Responses.
 #   - 'AccountBalanceHistory' - Account Balance History Model.
 #   - 'AccountWithGrowth' - Account With Growth Model.
+#   - 'RecurringSeriesOut' - Recurring Series Out Model For Responses.
+#   - 'BudgetCreate' - Budget Create Model (Also Used For Updates).
+#   - 'BudgetOut' - Budget Out Model With This Month's Spend.
+#   - 'BudgetAlertOut' - Budget Alert Out Model For Responses.
 
 # Imports.
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
 from datetime import date, datetime
 from typing import Optional
 
@@ -84,6 +93,19 @@ class TransactionOut(BaseModel):
     class Config:
         from_attributes = True
 
+# Reconcile Request Model (Dry Run By Default - Nothing Is Merged Until 'dry_run' Is False).
+class ReconcileRequest(BaseModel):
+    dry_run: bool = True
+    window_days: int = Field(3, ge=0, le=14)
+    min_score: float = Field(0.6, ge=0, le=1)
+
+# Bulk Update Request Model (Only The Fields Sent Are Changed).
+class BulkUpdateRequest(BaseModel):
+    transaction_ids: list[int] = Field(..., min_length=1, max_length=5000)
+    category_primary: Optional[str] = None
+    category_detailed: Optional[str] = None
+    notes: Optional[str] = None
+
 # -------------------------------------------------------- File Upload Models.
 
 # FileUpload Out Model For Responses.
@@ -320,6 +342,42 @@ class TransactionTagOut(BaseModel):
     class Config:
         from_attributes = True
 
+class BulkTagRequest(BaseModel):
+    transaction_ids: list[int] = Field(..., min_length=1, max_length=5000)
+    add_tag_ids: list[int] = []
+    remove_tag_ids: list[int] = []
+
+# -------------------------------------------------------- Tag Rule Models.
+
+# Keyword Fields Are Comma-Separated; Every Condition That Is Set Must Match.
+class TagRuleCreate(BaseModel):
+    tag_id: int
+    name: Optional[str] = None
+    vendor_contains: Optional[str] = None
+    merchant_contains: Optional[str] = None
+    category_primary: Optional[str] = None
+    min_amount: Optional[float] = Field(None, ge=0)
+    max_amount: Optional[float] = Field(None, ge=0)
+    account_id: Optional[str] = None
+    is_active: bool = True
+
+class TagRuleOut(BaseModel):
+    id: int
+    tag_id: int
+    name: Optional[str] = None
+    vendor_contains: Optional[str] = None
+    merchant_contains: Optional[str] = None
+    category_primary: Optional[str] = None
+    min_amount: Optional[float] = None
+    max_amount: Optional[float] = None
+    account_id: Optional[str] = None
+    is_active: bool
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
 # -------------------------------------------------------- Account Balance History Models.
 
 class AccountBalanceHistory(BaseModel):
@@ -388,4 +446,62 @@ class AccountWithGrowth(BaseModel):
     days_since_last_transaction: Optional[int] = None
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+# -------------------------------------------------------- Recurring Series Models.
+
+class RecurringSeriesOut(BaseModel):
+    id: int
+    vendor_key: str
+    vendor: Optional[str] = None
+    kind: str
+    period: str
+    interval_days: float
+    amount: float
+    amount_variation: float
+    occurrences: int
+    confidence: float
+    first_date: date
+    last_date: date
+    next_expected_date: date
+    is_active: bool
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+# -------------------------------------------------------- Budget Models.
+
+class BudgetCreate(BaseModel):
+    name: Optional[str] = None
+    category_primary: Optional[str] = None
+    tag_id: Optional[int] = None
+    monthly_limit: float = Field(..., gt=0)
+    is_active: bool = True
+
+class BudgetOut(BaseModel):
+    id: int
+    name: Optional[str] = None
+    category_primary: Optional[str] = None
+    tag_id: Optional[int] = None
+    monthly_limit: float
+    is_active: bool
+    period_start: date
+    spent: float
+    remaining: float
+    percent_used: float
+    alert_level: int
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+class BudgetAlertOut(BaseModel):
+    id: int
+    budget_id: int
+    period_start: date
+    threshold: int
+    spent: float
+    monthly_limit: float
+    is_read: bool
+    created_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
@@ -33,7 +33,6 @@
 
 # Imports.
 import jwt
-import requests
 from typing import Optional
 from sqlalchemy.orm import Session
 from passlib.context import CryptContext
@@ -42,14 +41,14 @@ from fastapi import APIRouter, Depends, HTTPException, status, Response, Request
 
 # Local Imports.
 from app.database import User
-from app.config import google_config
+from app.config import get_google_config
 
 # Local Models.
 from app.models import PasswordReset
 from app.models import UserCreate, UserLogin, UserOut, AuthResponse, GoogleAuthCodeRequest
 
 # Local Utils.
-from app.utils.db_utils import get_db
+from app.utils.db_utils import get_db, get_primary_db
 from app.utils.auth_utils import get_current_user
 from app.utils.email_utils import create_verification_token, verify_verification_token, send_verification_email, send_welcome_email, send_password_reset_email, send_contact_form_email
 
@@ -476,7 +475,13 @@ def google_auth_code(
     ) -> AuthResponse:
     """Authenticate Or Register A User W/ Google OAuth Using Authorization Code."""
     
+    # Only This Route Makes Outbound HTTP Calls, So Load 'requests' Here Rather Than At Startup.
+    import requests
+    
     try:
+        # Get Google OAuth Credentials.
+        google_config = get_google_config()
+        
         # Exchange Authorization Code For Tokens.
         token_url = "https://oauth2.googleapis.com/token"
         token_data = {
@@ -609,7 +614,7 @@ def google_auth_code(
 @router.get("/verify-email")
 def verify_email(
         token: str,
-        db: Session = Depends(get_db)
+        db: Session = Depends(get_primary_db)   # A GET That Writes, So It Skips The Replica.
     ) -> dict:
     """Verify User Email With Token."""
     
@@ -0,0 +1,110 @@
+# Analytics Routes.
+#
+# Note : Flexible Period Comparisons For The Dashboard ("Last 45 Days vs The Prior 45", "Q3 vs Q2 Per Category").
+#        Answered From The Analytics Cache's Prefix Sums, So Adding Ranges Or Groups Adds No Queries.
+#        Also Serves Detected Recurring Series (Subscriptions, Bills, Income), Kept Current By Imports, And The
+#        Cash-Flow Forecast (Cached Alongside The Same Columns Until The User's Next Transaction Write).
+#
+# Router : Prefix w/ "/analytics" & Tag w/ "Analytics".
+#
+# API Endpoints :
+#   - 'compare_periods_route' - Compare Income, Spending And Net Across Date Ranges, Optionally Per Category Or Account.
+#   - 'get_recurring_series' - Get The User's Detected Recurring Series.
+#   - 'detect_recurring_series' - Re-Detect Recurring Series Across The User's Full History.
+#   - 'get_cash_flow_forecast' - Project End-Of-Month And N-Day Cash Flow Per Account.
+
+# Imports.
+from typing import List, Optional
+from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+# Local Imports.
+from app.database import User, Account, RecurringSeries
+
+# Local Models.
+from app.models import RecurringSeriesOut
+
+# Local Utils.
+from app.utils.db_utils import get_db
+from app.utils.auth_utils import get_current_user
+from app.utils.analytics_cache import get_prefix_sums
+from app.utils.compare_utils import MAX_COMPARE_RANGES, COMPARE_GROUPS, parse_period, trailing_periods, compare_periods
+from app.utils.recurring_utils import detect_recurring
+from app.utils.forecast_utils import FORECAST_MAX_DAYS, get_forecast
+
+# Create Router Instance.
+router = APIRouter(prefix="/analytics", tags=["Analytics"])
+
+# -------------------------------------------------------- Compare Periods.
+@router.get("/compare")
+def compare_periods_route(
+    ranges: List[str] = Query([], alias="range", description="YYYY-MM-DD:YYYY-MM-DD, YYYY-MM or YYYY-Qn (repeatable)"),
+    last_days: Optional[int] = Query(None, ge=1, le=3660, description="Compare trailing N-day windows instead"),
+    periods: int = Query(2, ge=1, le=MAX_COMPARE_RANGES, description="How many trailing windows"),
+    group_by: Optional[str] = Query(None, description="category or account"),
+    groups: List[str] = Query([], alias="group", description="Only these categories/accounts (repeatable)"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Compare Income, Spending And Net Across Date Ranges, Optionally Per Category Or Account."""
+
+    if group_by is not None and group_by not in COMPARE_GROUPS:
+        raise HTTPException(status_code=400, detail=f"group_by must be one of: {', '.join(COMPARE_GROUPS)}")
+    if ranges and last_days:
+        raise HTTPException(status_code=400, detail="Use either range or last_days, not both")
+    if len(ranges) > MAX_COMPARE_RANGES:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_COMPARE_RANGES} ranges per request")
+
+    # Explicit Ranges, Else Trailing Windows (The Last 30 Days vs The 30 Before By Default).
+    try:
+        date_ranges = [parse_period(spec) for spec in ranges] or trailing_periods(last_days or 30, periods)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    overall = get_prefix_sums(db, current_user)
+    grouped = get_prefix_sums(db, current_user, group_by) if group_by else None
+    return {"group_by": group_by, **compare_periods(overall, date_ranges, grouped, groups)}
+
+# -------------------------------------------------------- Get Recurring Series.
+@router.get("/recurring", response_model=list[RecurringSeriesOut])
+def get_recurring_series(
+    active_only: bool = False,
+    kind: Optional[str] = Query(None, description="subscription, bill or income"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Get The User's Detected Recurring Series, Soonest Next Charge First."""
+
+    query = db.query(RecurringSeries).filter(RecurringSeries.user_id == current_user.id)
+    if active_only:
+        query = query.filter(RecurringSeries.is_active == True)
+    if kind:
+        query = query.filter(RecurringSeries.kind == kind)
+    return query.order_by(RecurringSeries.next_expected_date, RecurringSeries.id).all()
+
+# -------------------------------------------------------- Detect Recurring Series.
+@router.post("/recurring/detect")
+def detect_recurring_series(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Re-Detect Recurring Series Across The User's Full History (Imports Keep Them Current Otherwise)."""
+
+    series_found = detect_recurring(db, current_user)
+    db.commit()
+    return {"message": f"Found {series_found} recurring series", "series_found": series_found}
+
+# -------------------------------------------------------- Get Cash Flow Forecast.
+@router.get("/forecast")
+def get_cash_flow_forecast(
+    horizon_days: int = Query(90, ge=1, le=FORECAST_MAX_DAYS, description="Days to project past today"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Project End-Of-Month And N-Day Cash Flow Per Account From Recurring Items And Seasonal Daily Averages."""
+
+    forecast = get_forecast(db, current_user)
+    account_names = dict(
+        db.query(Account.account_id, Account.name).filter(Account.user_id == current_user.id).all()
+    )
+    return forecast.summary(horizon_days, account_names)
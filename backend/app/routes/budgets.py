@@ -0,0 +1,213 @@
+# Budget Routes.
+#
+# Note : Monthly Spending Limits Per Category Or Tag. Spend Is Counted As Transactions Are Written (See
+#        'budget_utils'), So Every Read Here Is A Counter Lookup - Listing Budgets Never Re-Sums Transactions.
+#        Crossing 80% Or 100% Of A Limit Queues An Alert, Read Back Through '/budgets/alerts'.
+#
+# Router : Prefix w/ "/budgets" & Tag w/ "Budgets".
+#
+# API Endpoints :
+#   - 'get_budgets' - Get The User's Budgets With A Month's Spend (This Month By Default).
+#   - 'create_budget' - Create A Budget (Seeding Its Counters From History).
+#   - 'update_budget' - Update A Budget (Re-Seeding Its Counters).
+#   - 'delete_budget' - Delete A Budget With Its Counters And Alerts.
+#   - 'get_budget_history' - Get A Budget's Spend For Recent Months.
+#   - 'get_budget_alerts' - Get Queued Threshold Alerts, Newest First.
+#   - 'mark_budget_alerts_read' - Mark Alerts Read (Some Or All).
+
+# Imports.
+from datetime import date, datetime
+from typing import List, Optional
+from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+# Local Imports.
+from app.database import User, Tag, Budget, BudgetSpend, BudgetAlert
+
+# Local Models.
+from app.models import BudgetCreate, BudgetOut, BudgetAlertOut
+
+# Local Utils.
+from app.utils.db_utils import get_db
+from app.utils.auth_utils import get_current_user
+from app.utils.budget_utils import rebuild_budget_spend, delete_budgets, budget_status
+
+# Create Router Instance.
+router = APIRouter(prefix="/budgets", tags=["Budgets"])
+
+# -------------------------------------------------------- Parse Month.
+def _parse_month(month: Optional[str]) -> date:
+    """First Day Of A 'YYYY-MM' Month (This Month When None)."""
+
+    if not month:
+        today = date.today()
+        return date(today.year, today.month, 1)
+    try:
+        return datetime.strptime(month, "%Y-%m").date()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="month must look like YYYY-MM")
+
+# -------------------------------------------------------- Validate Budget.
+def _validate_budget(db: Session, user_id: int, budget_data: BudgetCreate):
+    """Check The Budget Targets Exactly One Category Or Tag, And That The Tag Belongs To The User."""
+
+    if bool(budget_data.category_primary) == (budget_data.tag_id is not None):
+        raise HTTPException(status_code=400, detail="A budget needs either category_primary or tag_id, not both")
+
+    if budget_data.tag_id is not None:
+        tag = db.query(Tag.id).filter(Tag.id == budget_data.tag_id, Tag.user_id == user_id).first()
+        if not tag:
+            raise HTTPException(status_code=404, detail="Tag not found")
+
+# -------------------------------------------------------- Get Budget.
+def _get_budget(db: Session, user_id: int, budget_id: int) -> Budget:
+    """Get One Of The User's Budgets, Or 404."""
+
+    budget = db.query(Budget).filter(Budget.id == budget_id, Budget.user_id == user_id).first()
+    if not budget:
+        raise HTTPException(status_code=404, detail="Budget not found")
+    return budget
+
+# -------------------------------------------------------- Get Budget Counter.
+def _get_counter(db: Session, budget_id: int, period_start: date) -> Optional[BudgetSpend]:
+    """One Budget's Counter For A Month (None If Nothing Was Spent)."""
+
+    return db.query(BudgetSpend).filter(
+        BudgetSpend.budget_id == budget_id,
+        BudgetSpend.period_start == period_start
+    ).first()
+
+# -------------------------------------------------------- Get Budgets.
+@router.get("", response_model=list[BudgetOut])
+def get_budgets(
+    month: Optional[str] = Query(None, description="YYYY-MM (defaults to this month)"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Get The User's Budgets With A Month's Spend (This Month By Default)."""
+
+    period_start = _parse_month(month)
+    budgets = db.query(Budget).filter(Budget.user_id == current_user.id).order_by(Budget.id).all()
+    if not budgets:
+        return []
+
+    # One Counter Per Budget For The Month (One Query).
+    counters = {
+        counter.budget_id: counter
+        for counter in db.query(BudgetSpend).filter(
+            BudgetSpend.user_id == current_user.id,
+            BudgetSpend.period_start == period_start
+        )
+    }
+    return [budget_status(budget, counters.get(budget.id), period_start) for budget in budgets]
+
+# -------------------------------------------------------- Create Budget.
+@router.post("", response_model=BudgetOut, status_code=201)
+def create_budget(
+    budget_data: BudgetCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Create A Budget, Seeding Its Monthly Counters From History."""
+
+    _validate_budget(db, current_user.id, budget_data)
+
+    now = datetime.now()
+    budget = Budget(user_id=current_user.id, created_at=now, updated_at=now, **budget_data.model_dump())
+    db.add(budget)
+    db.flush()
+    rebuild_budget_spend(db, budget)
+    db.commit()
+
+    period_start = _parse_month(None)
+    return budget_status(budget, _get_counter(db, budget.id, period_start), period_start)
+
+# -------------------------------------------------------- Update Budget.
+@router.put("/{budget_id}", response_model=BudgetOut)
+def update_budget(
+    budget_id: int,
+    budget_data: BudgetCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Update A Budget, Re-Seeding Its Counters (Its Category, Tag Or Limit May Have Changed)."""
+
+    budget = _get_budget(db, current_user.id, budget_id)
+    _validate_budget(db, current_user.id, budget_data)
+
+    for field, value in budget_data.model_dump().items():
+        setattr(budget, field, value)
+    budget.updated_at = datetime.now()
+    rebuild_budget_spend(db, budget)
+    db.commit()
+
+    period_start = _parse_month(None)
+    return budget_status(budget, _get_counter(db, budget.id, period_start), period_start)
+
+# -------------------------------------------------------- Delete Budget.
+@router.delete("/{budget_id}")
+def delete_budget(
+    budget_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Delete A Budget With Its Counters And Alerts."""
+
+    _get_budget(db, current_user.id, budget_id)
+    delete_budgets(db, current_user.id, [budget_id])
+    db.commit()
+    return {"message": f"Budget {budget_id} deleted successfully"}
+
+# -------------------------------------------------------- Get Budget History.
+@router.get("/{budget_id}/history")
+def get_budget_history(
+    budget_id: int,
+    months: int = Query(12, ge=1, le=120, description="How many recent months"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Get A Budget's Spend For Its Most Recent Counted Months, Newest First."""
+
+    budget = _get_budget(db, current_user.id, budget_id)
+    counters = db.query(BudgetSpend).filter(BudgetSpend.budget_id == budget_id).order_by(
+        BudgetSpend.period_start.desc()
+    ).limit(months).all()
+    return {
+        "budget_id": budget_id,
+        "monthly_limit": budget.monthly_limit,
+        "months": [
+            {key: status[key] for key in ("period_start", "spent", "remaining", "percent_used", "alert_level")}
+            for status in (budget_status(budget, counter, counter.period_start) for counter in counters)
+        ]
+    }
+
+# -------------------------------------------------------- Get Budget Alerts.
+@router.get("/alerts", response_model=list[BudgetAlertOut])
+def get_budget_alerts(
+    unread_only: bool = True,
+    limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Get Queued Threshold Alerts, Newest First."""
+
+    query = db.query(BudgetAlert).filter(BudgetAlert.user_id == current_user.id)
+    if unread_only:
+        query = query.filter(BudgetAlert.is_read == False)
+    return query.order_by(BudgetAlert.created_at.desc(), BudgetAlert.id.desc()).limit(limit).all()
+
+# -------------------------------------------------------- Mark Budget Alerts Read.
+@router.post("/alerts/read")
+def mark_budget_alerts_read(
+    alert_ids: Optional[List[int]] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Mark Alerts Read - These IDs, Or Every Unread Alert When None Are Given."""
+
+    query = db.query(BudgetAlert).filter(BudgetAlert.user_id == current_user.id, BudgetAlert.is_read == False)
+    if alert_ids:
+        query = query.filter(BudgetAlert.id.in_(set(alert_ids)))
+    marked = query.update({BudgetAlert.is_read: True}, synchronize_session=False)
+    db.commit()
+    return {"message": f"Marked {marked} alert{'s' if marked != 1 else ''} read", "marked_count": marked}
@@ -3,6 +3,7 @@
 # Router : Tag w/ "Centi Score".
 #
 # API Endpoints :
+#   - 'get_centi_score_overview' - Get Every Dashboard Centi Score Payload In One Round Trip.
 #   - 'get_centi_score_status' - Get Comprehensive Status Of User's Centi Score Data.
 #   - 'get_current_centi_score' - Get The Current/Latest Centi Score For The User.
 #   - 'get_centi_score_history' - Get The History Of Weekly Centi Scores For The User.
@@ -11,11 +12,13 @@
 #   - 'calculate_weekly_score' - Manually Calculate And Store A Weekly Centi Score For The Current Week.
 #   - 'get_score_trend' - Get Trend Analysis For The User's Centi Score.
 #   - 'calculate_all_users_weekly_scores' - Calculate Weekly Scores For All Users (Admin Function).
+#   - 'backfill_weekly_scores_route' - Reconstruct Past Weekly Scores From Transaction History.
 
 
 # Imports.
 from datetime import date
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import APIRouter, Depends, HTTPException
 
 # Local Imports.
@@ -25,8 +28,8 @@ from app.database import User
 from app.models import WeeklyCentiScore as WeeklyCentiScoreModel
 
 # Local Utils.
-from app.utils.db_utils import get_db
-from app.utils.auth_utils import get_current_user
+from app.utils.db_utils import get_db, get_async_db
+from app.utils.auth_utils import get_current_user, get_current_user_async
 from app.utils.centi_score_utils import (
     create_weekly_score,
     get_latest_weekly_score,
@@ -39,20 +42,157 @@ from app.utils.centi_score_utils import (
     get_score_growth_summary,
     check_user_centi_score_status
 )
+from app.utils.score_backfill_utils import backfill_weekly_scores
+from app.utils.score_analytics_utils import (
+    get_score_analytics,
+    get_recent_weekly_scores,
+    build_score_status,
+    build_growth_analysis,
+    build_score_summary
+)
 
 # Create Router Instance.
 router = APIRouter(tags=["Centi Score"])
 
+# -------------------------------------------------------- Format Current Score.
+def _format_current_score(db: Session, user_id: int, latest_score) -> dict:
+    """Format The Latest Weekly Score, Or Calculate One Live If None Exists Yet."""
+
+    if not latest_score:
+        # Calculate Current Score Without Saving.
+        financial_data = get_user_financial_data(db, user_id)
+        score_result = calculate_centi_score(
+            net_worth=financial_data["net_worth"],
+            total_assets=financial_data["total_assets"],
+            total_liabilities=financial_data["total_liabilities"],
+            monthly_cash_flow=financial_data["monthly_cash_flow"],
+            transaction_count=financial_data["transaction_count"],
+            forecast_cash_flow=financial_data.get("forecast_cash_flow")
+        )
+        
+        return {
+            "score": score_result["total_score"],
+            "breakdown": score_result["breakdown"],
+            "financial_data": financial_data,
+            "last_updated": None,
+            "is_weekly_score": False
+        }
+    
+    return {
+        "score": latest_score.total_score,
+        "breakdown": {
+            "net_worth": {"score": latest_score.net_worth_score, "max": 40, "value": latest_score.net_worth},
+            "assets": {"score": latest_score.assets_score, "max": 30, "value": latest_score.total_assets},
+            "liabilities": {"score": latest_score.liabilities_score, "max": 20, "value": latest_score.total_liabilities},
+            "cash_flow": {"score": latest_score.cash_flow_score, "max": 10, "value": latest_score.monthly_cash_flow}
+        },
+        "financial_data": {
+            "net_worth": latest_score.net_worth,
+            "total_assets": latest_score.total_assets,
+            "total_liabilities": latest_score.total_liabilities,
+            "monthly_cash_flow": latest_score.monthly_cash_flow,
+            "transaction_count": latest_score.transaction_count
+        },
+        "last_updated": latest_score.created_at,
+        "score_date": latest_score.score_date,
+        "is_weekly_score": True
+    }
+
+# -------------------------------------------------------- Format Score History.
+def _format_score_history(scores: list) -> dict:
+    """Format Weekly Score Rows (Newest First) For The History Response."""
+
+    score_history = [
+        {
+            "score_date": score.score_date,
+            "total_score": score.total_score,
+            "net_worth_score": score.net_worth_score,
+            "assets_score": score.assets_score,
+            "liabilities_score": score.liabilities_score,
+            "cash_flow_score": score.cash_flow_score,
+            "net_worth": score.net_worth,
+            "total_assets": score.total_assets,
+            "total_liabilities": score.total_liabilities,
+            "monthly_cash_flow": score.monthly_cash_flow,
+            "transaction_count": score.transaction_count,
+            "created_at": score.created_at
+        }
+        for score in scores
+    ]
+    
+    return {
+        "scores": score_history,
+        "trend": calculate_score_trend(scores),
+        "total_scores": len(score_history)
+    }
+
+# -------------------------------------------------------- Format Trend.
+def _format_trend(scores: list) -> dict:
+    """Format The Last Few Weekly Scores (Newest First) For The Trend Response."""
+
+    # If Less Than 2 Weeks Of Data, Return Insufficient Data.
+    if len(scores) < 2:
+        return {
+            "trend": "insufficient_data",
+            "message": "Need at least 2 weeks of data to calculate trend",
+            "weeks_tracked": len(scores)
+        }
+    
+    # Calculate Trend.
+    trend_data = calculate_score_trend(scores)
+    
+    return {
+        "trend": trend_data["trend"],
+        "change": trend_data["change"],
+        "change_percentage": trend_data["change_percentage"],
+        "weeks_tracked": trend_data["weeks_tracked"],
+        "latest_score": scores[0].total_score,
+        "previous_score": scores[1].total_score
+    }
+
+# -------------------------------------------------------- Build Overview.
+def _build_overview(db: Session, user_id: int, history_limit: int) -> dict:
+    """Build The Combined Dashboard Payload From One Analytics Query And One Recent-Rows Query."""
+
+    # One Aggregate Query For Stats & Streaks, One Bounded Query For Recent Rows.
+    analytics = get_score_analytics(db, user_id)
+    recent = get_recent_weekly_scores(db, user_id, max(history_limit, 12)) if analytics else []
+    
+    # Same Shapes As The Individual Endpoints.
+    return {
+        "current": _format_current_score(db, user_id, recent[0] if recent else None),
+        "status": build_score_status(analytics, recent),
+        "growth": build_growth_analysis(analytics, recent),
+        "summary": build_score_summary(analytics),
+        "trend": _format_trend(recent[:4]),
+        "history": _format_score_history(recent[:history_limit])
+    }
+
+# -------------------------------------------------------- Get Centi Score Overview.
+@router.get("/centi-score/overview")
+async def get_centi_score_overview(
+    history_limit: int = 12,
+    db: AsyncSession = Depends(get_async_db), 
+    current_user: User = Depends(get_current_user_async)
+):
+    """Get Every Dashboard Centi Score Payload In One Round Trip."""
+    try:
+        # Build Every Payload In One Pass Over The Session.
+        return await db.run_sync(_build_overview, current_user.id, history_limit)
+        
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error retrieving Centi Score overview: {str(e)}")
+
 # -------------------------------------------------------- Get Centi Score Status.
 @router.get("/centi-score/status")
-def get_centi_score_status(
-    db: Session = Depends(get_db), 
-    current_user: User = Depends(get_current_user)
+async def get_centi_score_status(
+    db: AsyncSession = Depends(get_async_db), 
+    current_user: User = Depends(get_current_user_async)
 ):
     """Get Comprehensive Status Of User's Centi Score Data."""
     try:
         # Get Status Data.
-        status_data = check_user_centi_score_status(db, current_user.id)
+        status_data = await db.run_sync(check_user_centi_score_status, current_user.id)
 
         # Return Status Data.
         return status_data
@@ -62,115 +202,49 @@ def get_centi_score_status(
 
 # -------------------------------------------------------- Get Current Centi Score.
 @router.get("/centi-score/current")
-def get_current_centi_score(
-    db: Session = Depends(get_db), 
-    current_user: User = Depends(get_current_user)
+async def get_current_centi_score(
+    db: AsyncSession = Depends(get_async_db), 
+    current_user: User = Depends(get_current_user_async)
 ):
     """Get The Current/Latest Centi Score For The User."""
     try:
         # Get The Latest Weekly Score.
-        latest_score = get_latest_weekly_score(db, current_user.id)
-        
-        if not latest_score:
-            # Calculate Current Score Without Saving.
-            financial_data = get_user_financial_data(db, current_user.id)
-            score_result = calculate_centi_score(
-                net_worth=financial_data["net_worth"],
-                total_assets=financial_data["total_assets"],
-                total_liabilities=financial_data["total_liabilities"],
-                monthly_cash_flow=financial_data["monthly_cash_flow"],
-                transaction_count=financial_data["transaction_count"]
-            )
-            
-            # Return Score Data.
-            return {
-                "score": score_result["total_score"],
-                "breakdown": score_result["breakdown"],
-                "financial_data": financial_data,
-                "last_updated": None,
-                "is_weekly_score": False
-            }
-        
-        # Convert To Response Model.
-        score_data = {
-            "score": latest_score.total_score,
-            "breakdown": {
-                "net_worth": {"score": latest_score.net_worth_score, "max": 40, "value": latest_score.net_worth},
-                "assets": {"score": latest_score.assets_score, "max": 30, "value": latest_score.total_assets},
-                "liabilities": {"score": latest_score.liabilities_score, "max": 20, "value": latest_score.total_liabilities},
-                "cash_flow": {"score": latest_score.cash_flow_score, "max": 10, "value": latest_score.monthly_cash_flow}
-            },
-            "financial_data": {
-                "net_worth": latest_score.net_worth,
-                "total_assets": latest_score.total_assets,
-                "total_liabilities": latest_score.total_liabilities,
-                "monthly_cash_flow": latest_score.monthly_cash_flow,
-                "transaction_count": latest_score.transaction_count
-            },
-            "last_updated": latest_score.created_at,
-            "score_date": latest_score.score_date,
-            "is_weekly_score": True
-        }
+        latest_score = await db.run_sync(get_latest_weekly_score, current_user.id)
         
-        # Return Score Data.
-        return score_data
+        # Return Score Data (Calculated Live If No Weekly Score Exists Yet).
+        return await db.run_sync(_format_current_score, current_user.id, latest_score)
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error retrieving Centi Score: {str(e)}")
 
 # -------------------------------------------------------- Get Centi Score History.
 @router.get("/centi-score/history")
-def get_centi_score_history(
+async def get_centi_score_history(
     limit: int = 12, 
-    db: Session = Depends(get_db), 
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db), 
+    current_user: User = Depends(get_current_user_async)
 ):
     """Get The History Of Weekly Centi Scores For The User."""
     try:
         # Get Weekly Scores.
-        scores = get_weekly_score_history(db, current_user.id, limit)
-        
-        # Calculate Trend.
-        trend_data = calculate_score_trend(scores)
-        
-        # Convert To Response Format.
-        score_history = []
-        for score in scores:
-            score_history.append({
-                "score_date": score.score_date,
-                "total_score": score.total_score,
-                "net_worth_score": score.net_worth_score,
-                "assets_score": score.assets_score,
-                "liabilities_score": score.liabilities_score,
-                "cash_flow_score": score.cash_flow_score,
-                "net_worth": score.net_worth,
-                "total_assets": score.total_assets,
-                "total_liabilities": score.total_liabilities,
-                "monthly_cash_flow": score.monthly_cash_flow,
-                "transaction_count": score.transaction_count,
-                "created_at": score.created_at
-            })
+        scores = await db.run_sync(get_weekly_score_history, current_user.id, limit)
         
         # Return Score History.
-        return {
-            "scores": score_history,
-            "trend": trend_data,
-            "total_scores": len(score_history)
-        }
+        return _format_score_history(scores)
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error retrieving score history: {str(e)}")
 
 # -------------------------------------------------------- Get Centi Score Growth.
 @router.get("/centi-score/growth")
-def get_centi_score_growth(
-    db: Session = Depends(get_db), 
-    current_user: User = Depends(get_current_user)
+async def get_centi_score_growth(
+    db: AsyncSession = Depends(get_async_db), 
+    current_user: User = Depends(get_current_user_async)
 ):
     """Get Detailed Growth Analysis For The User's Centi Score."""
     try:
         # Get Growth Data.
-        growth_data = get_detailed_growth_analysis(db, current_user.id)
+        growth_data = await db.run_sync(get_detailed_growth_analysis, current_user.id)
 
         # Return Growth Data.
         return growth_data
@@ -180,14 +254,14 @@ def get_centi_score_growth(
 
 # -------------------------------------------------------- Get Centi Score Summary.
 @router.get("/centi-score/summary")
-def get_centi_score_summary(
-    db: Session = Depends(get_db), 
-    current_user: User = Depends(get_current_user)
+async def get_centi_score_summary(
+    db: AsyncSession = Depends(get_async_db), 
+    current_user: User = Depends(get_current_user_async)
 ):
     """Get A Quick Summary Of The User's Centi Score Growth."""
     try:
         # Get Summary Data.
-        summary_data = get_score_growth_summary(db, current_user.id)
+        summary_data = await db.run_sync(get_score_growth_summary, current_user.id)
 
         # Return Summary Data.
         return summary_data
@@ -222,35 +296,17 @@ def calculate_weekly_score(
 
 # -------------------------------------------------------- Get Centi Score Trend.
 @router.get("/centi-score/trend")
-def get_score_trend(
-    db: Session = Depends(get_db), 
-    current_user: User = Depends(get_current_user)
+async def get_score_trend(
+    db: AsyncSession = Depends(get_async_db), 
+    current_user: User = Depends(get_current_user_async)
 ):
     """Get Trend Analysis For The User's Centi Score."""
     try:
         # Get Last 4 Weeks Of Scores.
-        scores = get_weekly_score_history(db, current_user.id, 4)
-        
-        # If Less Than 2 Weeks Of Data, Return Insufficient Data.
-        if len(scores) < 2:
-            return {
-                "trend": "insufficient_data",
-                "message": "Need at least 2 weeks of data to calculate trend",
-                "weeks_tracked": len(scores)
-            }
-        
-        # Calculate Trend.
-        trend_data = calculate_score_trend(scores)
+        scores = await db.run_sync(get_weekly_score_history, current_user.id, 4)
         
         # Return Trend Data.
-        return {
-            "trend": trend_data["trend"],
-            "change": trend_data["change"],
-            "change_percentage": trend_data["change_percentage"],
-            "weeks_tracked": trend_data["weeks_tracked"],
-            "latest_score": scores[0].total_score if scores else None,
-            "previous_score": scores[1].total_score if len(scores) > 1 else None
-        }
+        return _format_trend(scores)
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error calculating trend: {str(e)}")
@@ -303,4 +359,26 @@ def calculate_all_users_weekly_scores(
         }
         
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error calculating scores for all users: {str(e)}") 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Error calculating scores for all users: {str(e)}")
+
+# -------------------------------------------------------- Backfill Weekly Centi Scores.
+@router.post("/centi-score/backfill")
+def backfill_weekly_scores_route(
+    max_weeks: int = 52,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Reconstruct Past Weekly Scores From Transaction History."""
+    try:
+        # Fill In Any Missing Past Weeks.
+        inserted = backfill_weekly_scores(db, current_user.id, max_weeks)
+
+        # Return Backfill Results.
+        return {
+            "message": f"Backfilled {inserted} Weekly Centi Score{'s' if inserted != 1 else ''}",
+            "weeks_backfilled": inserted
+        }
+
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=f"Error backfilling weekly scores: {str(e)}")
@@ -8,7 +8,7 @@
 # API Endpoints :
 #   - 'get_files' - Get All Files For The Current User.
 #   - 'get_file_transactions' - Get All Transactions From A Specific File.
-#   - 'delete_file' - Delete A Specific File.
+#   - 'delete_file' - Delete A Specific File, Its Transactions And Their Tags.
 #   - 'rename_file' - Rename A Specific File.
 
 # Imports.
@@ -18,8 +18,10 @@ from fastapi import APIRouter, Depends, HTTPException, Body
 # Local Imports.
 from app.utils.db_utils import get_db
 from app.utils.auth_utils import get_current_user
+from app.utils.file_utils import delete_file_cascade
+from app.utils.transaction_list_utils import build_transaction_list
 from app.models import FileUploadOut, TransactionOut
-from app.database import FileUpload, Transaction, User
+from app.database import FileUpload, User
 
 # Create Router Instance.
 router = APIRouter(prefix="/files", tags=["Files"])
@@ -51,14 +53,8 @@ def get_file_transactions(
     if not file:
         raise HTTPException(status_code=404, detail="File not found") 
     
-    # Get All Transactions From File For This User.
-    transactions = db.query(Transaction).filter(
-        Transaction.file == file.filename,
-        Transaction.user_id == current_user.id
-    ).all()
-    
-    # Return Transactions.
-    return transactions
+    # Get All Transactions From File For This User (Indexed By Upload, With Tags And Account Details).
+    return build_transaction_list(db, current_user.id, file.id)
 
 # ----------------------------------------------------------------------- Delete File.
 @router.delete("/{file_id}")
@@ -77,20 +73,14 @@ def delete_file(
     if not file:
         raise HTTPException(status_code=404, detail="File not found")
     
-    # Delete All Transactions From File For This User.
-    db.query(Transaction).filter(
-        Transaction.file == file.filename,
-        Transaction.user_id == current_user.id
-    ).delete()
-    
-    # Delete File.
-    db.delete(file)
+    # Delete The File, Its Transactions And Their Tags, And Take Them Out Of Account Balances.
+    result = delete_file_cascade(db, current_user.id, file)
     
     # Commit To Database.
     db.commit()
     
     # Return Success Message.
-    return {"message": f"File {file_id} and its transactions deleted successfully"}
+    return {"message": f"File {file_id} and its transactions deleted successfully", **result}
 
 # ----------------------------------------------------------------------- Rename File By File Id.
 @router.patch("/{file_id}")
@@ -15,20 +15,13 @@
 import asyncio
 from sqlalchemy.orm import Session
 from datetime import datetime, timedelta
-from fastapi import APIRouter, HTTPException, Depends
-
-# Plaid Imports.
-import plaid
-from plaid.model.products import Products
-from plaid.model.country_code import CountryCode
-from plaid.model.accounts_get_request import AccountsGetRequest
-from plaid.model.transactions_get_request import TransactionsGetRequest
-from plaid.model.link_token_create_request import LinkTokenCreateRequest
-from plaid.model.link_token_create_request_user import LinkTokenCreateRequestUser
-from plaid.model.item_public_token_exchange_request import ItemPublicTokenExchangeRequest
+from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks
+from fastapi.concurrency import run_in_threadpool
+
+# Note : Plaid SDK Models Are Imported Inside Each Route, So The SDK Only Loads Once A Plaid Route Is Hit.
 
 # Local Imports.
-from app.config import plaid_config, PLAID_TRANSACTION_DAYS
+from app.config import get_plaid_config, PLAID_TRANSACTION_DAYS
 from app.database import Transaction, Account, Institution, User
 
 # Local Models.
@@ -37,10 +30,26 @@ from app.models import LinkTokenRequest, PublicTokenExchangeRequest, LinkTokenRe
 # Local Utils.
 from app.utils.db_utils import get_db
 from app.utils.auth_utils import get_current_user
+from app.utils.score_backfill_utils import backfill_weekly_scores_job
+from app.utils.fingerprint_utils import LOOKUP_CHUNK_SIZE, split_new_rows
+from app.utils.tag_rule_utils import apply_rules_to_rows
+from app.utils.analytics_cache import bump_data_version
+from app.utils.budget_utils import record_rows_spend
+from app.utils.recurring_utils import recurring_series_job
 
 # Create Router Instance.
 router = APIRouter(prefix="/plaid", tags=["Plaid"])
 
+# ----------------------------------------------------------------------- Get Plaid Config Or 503.
+def _require_plaid_config():
+    """Get The Plaid Config, Or Raise 503 If Plaid Credentials Aren't Set."""
+    
+    try:
+        return get_plaid_config()
+    except ValueError as e:
+        print(f"❌ Plaid is not configured: {str(e)}")
+        raise HTTPException(status_code=503, detail="Plaid is not configured")
+
 # ----------------------------------------------------------------------- Creates Plaid Link Token.
 @router.post("/create_link_token", response_model=LinkTokenResponse)
 async def create_link_token(
@@ -50,6 +59,13 @@ async def create_link_token(
 ):
     """Creates Plaid Link Token."""
     
+    from plaid.model.products import Products
+    from plaid.model.country_code import CountryCode
+    from plaid.model.link_token_create_request import LinkTokenCreateRequest
+    from plaid.model.link_token_create_request_user import LinkTokenCreateRequestUser
+    
+    plaid_config = _require_plaid_config()
+    
     try:
         print(f"🔗 Creating Plaid link token for user {current_user.id} in {plaid_config.env} environment")
         
@@ -96,6 +112,13 @@ async def exchange_public_token(
 ):
     """Exchange Frontend Token For Access Token."""
     
+    from plaid.model.country_code import CountryCode
+    from plaid.model.item_get_request import ItemGetRequest
+    from plaid.model.institutions_get_by_id_request import InstitutionsGetByIdRequest
+    from plaid.model.item_public_token_exchange_request import ItemPublicTokenExchangeRequest
+    
+    plaid_config = _require_plaid_config()
+    
     try:
         print(f"🔄 Exchanging public token for user {current_user.id} in {plaid_config.env} environment")
 
@@ -123,7 +146,7 @@ async def exchange_public_token(
                 try:
                     # Get Institution Info From The Item.
                     item_response = plaid_config.client.item_get(
-                        plaid.model.item_get_request.ItemGetRequest(
+                        ItemGetRequest(
                             access_token=response['access_token']
                         )
                     )
@@ -133,7 +156,7 @@ async def exchange_public_token(
                     
                     # Get Institution Details.
                     institution_response = plaid_config.client.institutions_get_by_id(
-                        plaid.model.institutions_get_by_id_request.InstitutionsGetByIdRequest(
+                        InstitutionsGetByIdRequest(
                             institution_id=institution_id,
                             country_codes=[CountryCode('US')]
                         )
@@ -185,15 +208,201 @@ async def exchange_public_token(
         print(f"❌ Error exchanging token: {str(e)}")
         raise HTTPException(status_code=400, detail=f"Error exchanging token: {str(e)}")
 
+# ----------------------------------------------------------------------- Store Plaid Accounts And Transactions.
+def _store_plaid_data(db: Session, user_id: int, response, background_tasks: BackgroundTasks):
+    """Store Accounts And New Transactions From A Plaid Transactions Response."""
+    try:
+        # Get Account Data.
+        accounts_data = response.get('accounts', [])
+
+        # Set Stored Accounts To 0 (Pre-Processed Accounts).
+        stored_accounts = 0
+
+        # Get Item ID From Response For Linking Accounts To Institutions.
+        item_id = response.get('item', {}).get('item_id') if response.get('item') else None
+
+        # Per Account,
+        for account in accounts_data:
+
+            # Grab Account ID.
+            account_id = getattr(account, 'account_id', None)
+            if not account_id:
+                continue
+
+            # Check If Account Already Exists For This User.
+            existing_account = db.query(Account).filter(
+                Account.account_id == account_id,
+                Account.user_id == user_id
+            ).first()
+
+            # Get Balances From Account.
+            balances = getattr(account, 'balances', None)
+
+            # Convert Plaid Enum Objects To String Values.
+            account_type = getattr(account, 'type', None)
+            account_subtype = getattr(account, 'subtype', None)
+
+            # Convert Enum Objects To String Values.
+            type_str = str(account_type.value) if hasattr(account_type, 'value') else str(account_type) if account_type else None
+            subtype_str = str(account_subtype.value) if hasattr(account_subtype, 'value') else str(account_subtype) if account_subtype else None
+
+            # Create New Account, Add To Database, Then Increment Stored Accounts.
+            if not existing_account:
+                new_account = Account(
+                    user_id=user_id,
+                    account_id=account_id,
+                    item_id=item_id,
+                    name=getattr(account, 'name', None),
+                    official_name=getattr(account, 'official_name', None),
+                    type=type_str,
+                    subtype=subtype_str,
+                    mask=getattr(account, 'mask', None),
+                    current_balance=getattr(balances, 'current', None) if balances else None,
+                    available_balance=getattr(balances, 'available', None) if balances else None,
+                    limit=getattr(balances, 'limit', None) if balances else None,
+                    currency=getattr(balances, 'iso_currency_code', 'USD') if balances else 'USD',
+                    is_active=True,
+                    created_at=datetime.now(),
+                    updated_at=datetime.now()
+                )
+                db.add(new_account)
+                stored_accounts += 1
+            else:
+                # Update Existing Account Balances And Item ID If Missing.
+                if balances:
+                    existing_account.current_balance = getattr(balances, 'current', existing_account.current_balance)
+                    existing_account.available_balance = getattr(balances, 'available', existing_account.available_balance)
+                    existing_account.updated_at = datetime.now()
+
+                # Update Item ID If It's Missing.
+                if not existing_account.item_id and item_id:
+                    existing_account.item_id = item_id
+                    existing_account.updated_at = datetime.now()
+
+        # Commit Account Changes To Database.
+        db.commit()
+
+        print(f"✅ Processed {stored_accounts} new accounts")
+
+        # Create Balance Snapshots For Growth Tracking.
+        from app.utils.account_utils import create_account_balance_snapshot
+        create_account_balance_snapshot(db, user_id)
+
+        # Process Transactions.
+        transactions = response['transactions']
+
+        # Build Rows For Every Transaction With An ID.
+        rows = []
+        for tx in transactions:
+
+            # Get Transaction Attributes Safely.
+            transaction_id = getattr(tx, 'transaction_id', None)
+            account_id = getattr(tx, 'account_id', None)
+            merchant_name = getattr(tx, 'merchant_name', None)
+            name = getattr(tx, 'name', 'Unknown')
+            amount = getattr(tx, 'amount', 0)
+            date = getattr(tx, 'date', None)
+            category = getattr(tx, 'category', None)
+            transaction_type = getattr(tx, 'transaction_type', None)
+
+            # Convert Transaction Type Enum To String If Needed.
+            transaction_type_str = str(transaction_type.value) if hasattr(transaction_type, 'value') else str(transaction_type) if transaction_type else None
+
+            # Skip If No Transaction ID.
+            if not transaction_id:
+                continue
+
+            # Extract Location Data.
+            location = getattr(tx, 'location', None)
+            location_address = getattr(location, 'address', None) if location else None
+            location_city = getattr(location, 'city', None) if location else None
+            location_state = getattr(location, 'region', None) if location else None
+            location_country = getattr(location, 'country', None) if location else None
+
+            # Extract Payment Metadata.
+            payment_meta = getattr(tx, 'payment_meta', None)
+            payment_reference = getattr(payment_meta, 'reference_number', None) if payment_meta else None
+            payment_method = getattr(payment_meta, 'payment_method', None) if payment_meta else None
+
+            rows.append({
+                'user_id': user_id,
+                'transaction_id': transaction_id,
+                'account_id': account_id,
+                'date': date,
+                'amount': -amount,  # Convert Plaid Convention (Negative = Expense).
+                'vendor': merchant_name or name,
+                'merchant_name': merchant_name,
+                'description': name,
+                'category_primary': category[0] if category and len(category) > 0 else 'other',
+                'category_detailed': ', '.join(category) if category else None,
+                'transaction_type': transaction_type_str,
+                'source': 'plaid',
+                'file': 'plaid',
+                'iso_currency_code': getattr(tx, 'iso_currency_code', 'USD'),
+                'location_address': location_address,
+                'location_city': location_city,
+                'location_state': location_state,
+                'location_country': location_country,
+                'payment_reference': payment_reference,
+                'payment_method': payment_method,
+                'created_at': datetime.now(),
+                'updated_at': datetime.now()
+            })
+
+        # Transactions Already Stored For This User, By Plaid ID (One Query Per Chunk).
+        known_ids = set()
+        transaction_ids = [row['transaction_id'] for row in rows]
+        for start in range(0, len(transaction_ids), LOOKUP_CHUNK_SIZE):
+            known_ids.update(found[0] for found in db.query(Transaction.transaction_id).filter(
+                Transaction.transaction_id.in_(transaction_ids[start:start + LOOKUP_CHUNK_SIZE]),
+                Transaction.user_id == user_id
+            ))
+
+        # Fingerprints Catch The Same Purchase Imported Another Way (CSV, Manual, Or A Re-Issued Plaid ID).
+        new_rows, _ = split_new_rows(db, user_id, rows)
+        new_rows = [row for row in new_rows if row['transaction_id'] not in known_ids]
+
+        # Add New Transactions To Database (Fingerprints Are Unique Per User, So They Double As The Row Hash).
+        for row in new_rows:
+            row['transaction_hash'] = f"{user_id}:{row['fingerprint']}"
+        db.bulk_insert_mappings(Transaction, new_rows, render_nulls=True)
+        stored_count = len(new_rows)
+
+        # Auto-Tag The Batch With The User's Rules, And Count It Against The User's Budgets.
+        apply_rules_to_rows(db, user_id, new_rows)
+        record_rows_spend(db, user_id, new_rows)
+        if stored_count:
+            bump_data_version(db, user_id)
+
+        # Commit Transaction Changes To Database, Then Refresh Recurring Series For The Batch's Vendors And
+        # Backfill Past Weekly Centi Scores (Reconstructed Weeks From The Batch's Earliest Date On Are Recomputed).
+        db.commit()
+        if stored_count:
+            background_tasks.add_task(recurring_series_job, user_id, sorted({row['vendor'] or "" for row in new_rows}))
+            background_tasks.add_task(backfill_weekly_scores_job, user_id, min((row['date'] for row in new_rows if row['date']), default=None))
+
+        print(f"✅ Successfully stored {stored_count} new transactions")
+        
+        return accounts_data, transactions, stored_accounts, stored_count
+        
+    finally:
+        # Close Database Connection.
+        db.close()
+
 # ----------------------------------------------------------------------- Fetches Transactions From Access Token.
 @router.post("/fetch_transactions/{access_token}")
 async def fetch_transactions(
     access_token: str, 
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """Fetch Transactions From Access Token."""
     
+    from plaid.model.transactions_get_request import TransactionsGetRequest
+    
+    plaid_config = _require_plaid_config()
+    
     print(f"📊 Fetching transactions for user {current_user.id} in {plaid_config.env} environment")
     
     # Set Var For Max Retries Per Connection.
@@ -220,201 +429,34 @@ async def fetch_transactions(
                 end_date=end_date
             )
             
-            # Attempt To Fetch Transactions.
-            response = plaid_config.client.transactions_get(request)
+            # Attempt To Fetch Transactions (Blocking Plaid Call Runs In The Threadpool).
+            response = await run_in_threadpool(plaid_config.client.transactions_get, request)
             
             print(f"✅ Successfully fetched {len(response.get('transactions', []))} transactions")
             
-            # Process And Store Accounts First.
-            try:
-                # Get Account Data.
-                accounts_data = response.get('accounts', [])
-
-                # Set Stored Accounts To 0 (Pre-Processed Accounts).
-                stored_accounts = 0
-
-                # Get Item ID From Response For Linking Accounts To Institutions.
-                item_id = response.get('item', {}).get('item_id') if response.get('item') else None
-
-                # Per Account,
-                for account in accounts_data:
-
-                    # Grab Account ID.
-                    account_id = getattr(account, 'account_id', None)
-                    if not account_id:
-                        continue
-                        
-                    # Check If Account Already Exists For This User.
-                    existing_account = db.query(Account).filter(
-                        Account.account_id == account_id,
-                        Account.user_id == current_user.id
-                    ).first()
-                    
-                    # Get Balances From Account.
-                    balances = getattr(account, 'balances', None)
-                    
-                    # Convert Plaid Enum Objects To String Values.
-                    account_type = getattr(account, 'type', None)
-                    account_subtype = getattr(account, 'subtype', None)
-                    
-                    # Convert Enum Objects To String Values.
-                    type_str = str(account_type.value) if hasattr(account_type, 'value') else str(account_type) if account_type else None
-                    subtype_str = str(account_subtype.value) if hasattr(account_subtype, 'value') else str(account_subtype) if account_subtype else None
-                    
-                    # Create New Account, Add To Database, Then Increment Stored Accounts.
-                    if not existing_account:
-                        new_account = Account(
-                            user_id=current_user.id,
-                            account_id=account_id,
-                            item_id=item_id,
-                            name=getattr(account, 'name', None),
-                            official_name=getattr(account, 'official_name', None),
-                            type=type_str,
-                            subtype=subtype_str,
-                            mask=getattr(account, 'mask', None),
-                            current_balance=getattr(balances, 'current', None) if balances else None,
-                            available_balance=getattr(balances, 'available', None) if balances else None,
-                            limit=getattr(balances, 'limit', None) if balances else None,
-                            currency=getattr(balances, 'iso_currency_code', 'USD') if balances else 'USD',
-                            is_active=True,
-                            created_at=datetime.now(),
-                            updated_at=datetime.now()
-                        )
-                        db.add(new_account)
-                        stored_accounts += 1
-                    else:
-                        # Update Existing Account Balances And Item ID If Missing.
-                        if balances:
-                            existing_account.current_balance = getattr(balances, 'current', existing_account.current_balance)
-                            existing_account.available_balance = getattr(balances, 'available', existing_account.available_balance)
-                            existing_account.updated_at = datetime.now()
-                        
-                        # Update Item ID If It's Missing.
-                        if not existing_account.item_id and item_id:
-                            existing_account.item_id = item_id
-                            existing_account.updated_at = datetime.now()
-                
-                # Commit Account Changes To Database.
-                db.commit()
-                
-                print(f"✅ Processed {stored_accounts} new accounts")
-                
-                # Create Balance Snapshots For Growth Tracking.
-                from app.utils.account_utils import create_account_balance_snapshot
-                create_account_balance_snapshot(db, current_user.id)
-                
-                # Process Transactions.
-                transactions = response['transactions']
-                
-                # Set Stored Count To 0 (Pre-Processed Transactions).
-                stored_count = 0
-                
-                # Per Transaction,
-                for i, tx in enumerate(transactions):
-                    
-                    # Get Transaction Attributes Safely.
-                    transaction_id = getattr(tx, 'transaction_id', None)
-                    account_id = getattr(tx, 'account_id', None)
-                    merchant_name = getattr(tx, 'merchant_name', None)
-                    name = getattr(tx, 'name', 'Unknown')
-                    amount = getattr(tx, 'amount', 0)
-                    date = getattr(tx, 'date', None)
-                    category = getattr(tx, 'category', None)
-                    transaction_type = getattr(tx, 'transaction_type', None)
-                    
-                    # Convert Transaction Type Enum To String If Needed.
-                    transaction_type_str = str(transaction_type.value) if hasattr(transaction_type, 'value') else str(transaction_type) if transaction_type else None
-                    
-                    # Skip If No Transaction ID.
-                    if not transaction_id:
-                        continue
-                    
-                    # Check If Transaction Already Exists For This User.
-                    existing = db.query(Transaction).filter(
-                        Transaction.transaction_id == transaction_id,
-                        Transaction.user_id == current_user.id
-                    ).first()
-                    
-                    # If Transaction Doesn't Exist,
-                    if not existing:
-                        
-                        # Extract Location Data.
-                        location = getattr(tx, 'location', None)
-                        location_address = getattr(location, 'address', None) if location else None
-                        location_city = getattr(location, 'city', None) if location else None
-                        location_state = getattr(location, 'region', None) if location else None
-                        location_country = getattr(location, 'country', None) if location else None
-                        
-                        # Extract Payment Metadata.
-                        payment_meta = getattr(tx, 'payment_meta', None)
-                        payment_reference = getattr(payment_meta, 'reference_number', None) if payment_meta else None
-                        payment_method = getattr(payment_meta, 'payment_method', None) if payment_meta else None
-                        
-                        # Create New Transaction With Enhanced Data.
-                        new_transaction = Transaction(
-                            user_id=current_user.id,
-                            transaction_id=transaction_id,
-                            account_id=account_id,
-                            date=date,
-                            amount=-amount,  # Convert Plaid Convention (Negative = Expense).
-                            vendor=merchant_name or name,
-                            merchant_name=merchant_name,
-                            description=name,
-                            category_primary=category[0] if category and len(category) > 0 else 'other',
-                            category_detailed=', '.join(category) if category else None,
-                            transaction_type=transaction_type_str,
-                            source='plaid',
-                            file='plaid',
-                            iso_currency_code=getattr(tx, 'iso_currency_code', 'USD'),
-                            location_address=location_address,
-                            location_city=location_city,
-                            location_state=location_state,
-                            location_country=location_country,
-                            payment_reference=payment_reference,
-                            payment_method=payment_method,
-                            created_at=datetime.now(),
-                            updated_at=datetime.now()
-                        )
-                        
-                        try:
-                            # Add Transaction To Database.
-                            db.add(new_transaction)
-                            # Increment Stored Count.
-                            stored_count += 1
-                        except Exception as e:
-                            if "UNIQUE constraint failed" in str(e):
-                                # Transaction hash already exists, Move On.
-                                continue
-                            else:
-                                raise e
-                
-                # Commit Transaction Changes To Database.
-                db.commit()
-                
-                print(f"✅ Successfully stored {stored_count} new transactions")
-                
-                # Return Success Response.
-                return {
-                    "message": f"Successfully fetched and stored {stored_count} new transactions and {stored_accounts} new accounts",
-                    "total_fetched": len(transactions),
-                    "new_transactions": stored_count,
-                    "new_accounts": stored_accounts,
-                    "attempts": attempt + 1,
-                    "date_range": {
-                        "start_date": start_date.isoformat(),
-                        "end_date": end_date.isoformat(),
-                        "days_requested": (end_date - start_date).days
-                    },
-                    "data_quality": {
-                        "accounts_with_balances": len([acc for acc in accounts_data if getattr(acc, 'balances', None)]),
-                        "total_accounts": len(accounts_data),
-                        "transactions_with_dates": len([tx for tx in transactions if getattr(tx, 'date', None)])
-                    }
+            # Store Accounts And Transactions (Blocking DB Work Runs In The Threadpool).
+            accounts_data, transactions, stored_accounts, stored_count = await run_in_threadpool(
+                _store_plaid_data, db, current_user.id, response, background_tasks
+            )
+            
+            # Return Success Response.
+            return {
+                "message": f"Successfully fetched and stored {stored_count} new transactions and {stored_accounts} new accounts",
+                "total_fetched": len(transactions),
+                "new_transactions": stored_count,
+                "new_accounts": stored_accounts,
+                "attempts": attempt + 1,
+                "date_range": {
+                    "start_date": start_date.isoformat(),
+                    "end_date": end_date.isoformat(),
+                    "days_requested": (end_date - start_date).days
+                },
+                "data_quality": {
+                    "accounts_with_balances": len([acc for acc in accounts_data if getattr(acc, 'balances', None)]),
+                    "total_accounts": len(accounts_data),
+                    "transactions_with_dates": len([tx for tx in transactions if getattr(tx, 'date', None)])
                 }
-                
-            finally:
-                # Close Database Connection.
-                db.close()
+            }
                 
         except Exception as e:
             # Convert Error To String.
@@ -460,6 +502,14 @@ async def fetch_transactions(
 @router.get("/status")
 async def check_plaid_status():
     """Check Plaid Configuration And Production Readiness."""
+    
+    from plaid.model.products import Products
+    from plaid.model.country_code import CountryCode
+    from plaid.model.link_token_create_request import LinkTokenCreateRequest
+    from plaid.model.link_token_create_request_user import LinkTokenCreateRequestUser
+    
+    plaid_config = _require_plaid_config()
+    
     try:
         # Check If We Can Create A Link Token (Basic Connectivity Test).
         test_request = LinkTokenCreateRequest(
@@ -502,6 +552,10 @@ async def get_accounts(
 ):
     """Fetches Accounts From Access Token."""
     
+    from plaid.model.accounts_get_request import AccountsGetRequest
+    
+    plaid_config = _require_plaid_config()
+    
     try:
         # Create Account Request Using Token.
         request = AccountsGetRequest(access_token=access_token)
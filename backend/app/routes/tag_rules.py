@@ -0,0 +1,142 @@
+# Tag Rule Routes.
+#
+# Note : Rules Tag Transactions Automatically As They're Imported (CSV, Plaid, Manual). New Or Edited Rules Only Affect
+#        Later Imports Until 'apply' Re-Runs Them Over The User's History.
+#
+# Router : Prefix w/ "/tag-rules" & Tag w/ "Tag Rules".
+#
+# API Endpoints :
+#   - 'get_tag_rules' - Get All Tag Rules For The Current User.
+#   - 'create_tag_rule' - Create A New Tag Rule.
+#   - 'update_tag_rule' - Update An Existing Tag Rule.
+#   - 'delete_tag_rule' - Delete A Tag Rule (Tags It Already Applied Stay).
+#   - 'initialize_default_tag_rules' - Create Rules That Apply The Default Tags.
+#   - 'apply_tag_rules' - Re-Apply Rules Across The User's Full History In The Background.
+
+# Imports.
+from datetime import datetime
+from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+
+# Local Imports.
+from app.database import User, Tag, TagRule
+
+# Local Models.
+from app.models import TagRuleCreate, TagRuleOut
+
+# Local Utils.
+from app.utils.db_utils import get_db
+from app.utils.auth_utils import get_current_user
+from app.utils.tag_rule_utils import create_default_tag_rules, apply_rules_job
+
+# Create Router Instance.
+router = APIRouter(prefix="/tag-rules", tags=["Tag Rules"])
+
+# -------------------------------------------------------- Validate Tag Rule.
+def _validate_rule(db: Session, user_id: int, rule_data: TagRuleCreate):
+    """Check The Rule's Tag Belongs To The User And That It Has At Least One Condition."""
+
+    tag = db.query(Tag.id).filter(Tag.id == rule_data.tag_id, Tag.user_id == user_id).first()
+    if not tag:
+        raise HTTPException(status_code=404, detail="Tag not found")
+
+    conditions = rule_data.model_dump(exclude={"tag_id", "name", "is_active"})
+    if all(value in (None, "") for value in conditions.values()):
+        raise HTTPException(status_code=400, detail="A rule needs at least one condition")
+
+    if rule_data.min_amount is not None and rule_data.max_amount is not None and rule_data.min_amount > rule_data.max_amount:
+        raise HTTPException(status_code=400, detail="min_amount must not exceed max_amount")
+
+# -------------------------------------------------------- Get Tag Rules.
+@router.get("", response_model=list[TagRuleOut])
+def get_tag_rules(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Get All Tag Rules For The Current User."""
+    return db.query(TagRule).filter(TagRule.user_id == current_user.id).order_by(TagRule.id).all()
+
+# -------------------------------------------------------- Create Tag Rule.
+@router.post("", response_model=TagRuleOut, status_code=201)
+def create_tag_rule(
+    rule_data: TagRuleCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Create A New Tag Rule."""
+
+    _validate_rule(db, current_user.id, rule_data)
+
+    now = datetime.now()
+    rule = TagRule(user_id=current_user.id, created_at=now, updated_at=now, **rule_data.model_dump())
+    db.add(rule)
+    db.commit()
+    db.refresh(rule)
+    return rule
+
+# -------------------------------------------------------- Update Tag Rule.
+@router.put("/{rule_id}", response_model=TagRuleOut)
+def update_tag_rule(
+    rule_id: int,
+    rule_data: TagRuleCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Update An Existing Tag Rule."""
+
+    rule = db.query(TagRule).filter(TagRule.id == rule_id, TagRule.user_id == current_user.id).first()
+    if not rule:
+        raise HTTPException(status_code=404, detail="Tag rule not found")
+
+    _validate_rule(db, current_user.id, rule_data)
+
+    for field, value in rule_data.model_dump().items():
+        setattr(rule, field, value)
+    rule.updated_at = datetime.now()
+    db.commit()
+    db.refresh(rule)
+    return rule
+
+# -------------------------------------------------------- Delete Tag Rule.
+@router.delete("/{rule_id}")
+def delete_tag_rule(
+    rule_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Delete A Tag Rule (Tags It Already Applied Stay)."""
+
+    deleted = db.query(TagRule).filter(TagRule.id == rule_id, TagRule.user_id == current_user.id).delete()
+    if not deleted:
+        raise HTTPException(status_code=404, detail="Tag rule not found")
+    db.commit()
+    return {"message": f"Tag rule {rule_id} deleted successfully"}
+
+# -------------------------------------------------------- Initialize Default Tag Rules.
+@router.post("/initialize")
+def initialize_default_tag_rules(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Create Rules That Apply The Default Tags."""
+
+    try:
+        created_rules = create_default_tag_rules(db, current_user.id)
+        return {
+            "message": f"Created {len(created_rules)} default tag rules",
+            "rules_created": len(created_rules)
+        }
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=f"Error initializing default tag rules: {str(e)}")
+
+# -------------------------------------------------------- Apply Tag Rules.
+@router.post("/apply", status_code=202)
+def apply_tag_rules(
+    background_tasks: BackgroundTasks,
+    current_user: User = Depends(get_current_user)
+):
+    """Re-Apply Rules Across The User's Full History In The Background."""
+
+    background_tasks.add_task(apply_rules_job, current_user.id)
+    return {"message": "Applying tag rules to all transactions"}
@@ -8,14 +8,19 @@
 # API Endpoints :
 #   - 'get_transactions' - Get All Transactions For The Current User.
 #   - 'get_detailed_transactions' - Get All Transactions With Account Info For The Current User.
+#   - 'search_transactions_route' - Search Transactions By Vendor, Merchant, Description And Notes.
+#   - 'export_transactions' - Stream The User's Transactions As CSV, NDJSON Or Parquet.
 #   - 'get_accounts' - Get All Accounts For The Current User.
 #   - 'get_enhanced_accounts' - Get Accounts With Enhanced Data Including Growth, Financial Impact, And Health Indicators.
 #   - 'get_account_analysis' - Get Comprehensive Analysis Of The User's Account Portfolio.
 #   - 'create_snapshot' - Create A Balance Snapshot For All User Accounts.
 #   - 'clear_database' - Clear The Database.
+#   - 'clear_database_status' - Get The Progress Of A Background Clear.
 #   - 'create_transaction' - Create A New Transaction.
 #   - 'recalculate_account_balances' - Recalculate The Balances For All Accounts.
 #   - 'bulk_delete_transactions' - Bulk Delete Transactions.
+#   - 'bulk_update_transactions' - Recategorize (Or Annotate) Many Transactions At Once.
+#   - 'reconcile_transactions' - Find (And Optionally Merge) Plaid Transactions Also Imported From CSV Or By Hand.
 #   - 'delete_transaction' - Delete A Specific Transaction.
 #   - 'debug_account_balance' - Debug Account Balance.
 #   - 'fix_account_balance' - Fix Account Balance.
@@ -23,140 +28,107 @@
 #   - 'get_stats' - Get Statistics For The Current User.
 #   - 'update_transaction_details' - Update Transaction Details.
 #   - 'debug_cash_flow' - Debug Cash Flow.
+#   - 'debug_pool_metrics' - Debug Database Connection Pool Usage (Admin Only).
+#   - 'debug_slow_queries' - Get Recorded Slow Queries With Their Plans (Admin Only).
+#   - 'dump_slow_queries_route' - Append Recorded Slow Queries To The Slow-Query Log File (Admin Only).
+#   - 'clear_slow_queries_route' - Clear Recorded Slow Queries (Admin Only).
 #   - 'get_tags' - Get All Tags For The Current User.
 #   - 'create_tag' - Create A New Tag For The Current User.
 #   - 'update_tag' - Update An Existing Tag.
 #   - 'delete_tag' - Delete A Tag And Remove All Associations.
 #   - 'add_tag_to_transaction' - Add A Tag To A Transaction.
 #   - 'remove_tag_from_transaction' - Remove A Tag From A Transaction.
+#   - 'bulk_tag_transactions' - Add And Remove Tags On Many Transactions At Once.
 #   - 'get_transaction_tags' - Get All Tags For A Specific Transaction.
 #   - 'get_tag_transaction_count' - Get The Number Of Transactions Associated With A Tag.
 #   - 'initialize_default_tags' - Initialize Default Tags For The Current User.
 
 # Imports.
-from sqlalchemy import func, text
+from sqlalchemy import func
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, timedelta, date
-from fastapi import APIRouter, Depends, HTTPException
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Query
+from fastapi.responses import StreamingResponse, ORJSONResponse, JSONResponse
 
 # Local Imports.
-from app.database import Transaction, FileUpload, Account, Institution, User, MonthlySnapshot, AccountBalanceHistory, Tag, TransactionTag
+from app.database import get_pool_metrics, get_session
+from app.database import Transaction, Account, User, MonthlySnapshot, AccountBalanceHistory, Tag, TransactionTag, TagRule, Budget
 
 # Local Utils.
-from app.utils.auth_utils import get_current_user
-from app.utils.tag_utils import create_default_tags
-from app.utils.db_utils import get_db, check_db_connection
+from app.utils.auth_utils import get_current_user, get_current_user_async
+from app.utils.tag_utils import create_default_tags, find_missing_ids, add_tags_to_transactions, remove_tags_from_transactions
+from app.utils.search_utils import search_transactions
+from app.utils.fingerprint_utils import next_free_fingerprint
+from app.utils.tag_rule_utils import apply_rules_to_transaction
+from app.utils.reconcile_utils import find_duplicate_pairs, merge_duplicate_pairs
+from app.utils.analytics_cache import get_user_columns, bump_data_version
+from app.utils.budget_utils import record_rows_spend, record_transactions_spend, record_recategorize_spend, record_tag_links_spend, delete_budgets
+from app.utils.transaction_list_utils import TRANSACTION_FIELDS, build_transaction_list, build_detailed_transaction_list
+from app.utils.export_utils import EXPORT_FORMATS, get_parquet_module, stream_transactions_export
+from app.utils.db_utils import get_db, get_async_db, check_db_connection
+from app.utils.slow_query_utils import get_slow_queries, dump_slow_queries, clear_slow_queries
+from app.utils.purge_utils import purge_user_data, start_purge_job, run_purge_job, get_purge_job
 from app.utils.type_label_map import NEGATIVE_TYPES, POSITIVE_TYPES
-from app.utils.snapshot_utils import (create_monthly_snapshot, get_previous_month_snapshot, get_growth_context)
+from app.utils.snapshot_utils import (monthly_snapshot_job, get_previous_month_snapshot, get_growth_context)
 from app.utils.account_utils import (
     create_account_balance_snapshot, 
+    account_balance_snapshot_job,
     calculate_account_financial_impact,
-    get_account_growth_data,
-    calculate_account_health_indicators,
+    get_accounts_growth_data,
+    get_account_transaction_stats,
+    build_account_health_indicators,
     get_account_percentage_contributions,
     analyze_account_portfolio
 )
 
 # Local Models.
-from app.models import TransactionOut, TransactionCreate, AccountWithGrowth, TagCreate, TagOut
+from app.models import TransactionOut, TransactionCreate, ReconcileRequest, BulkUpdateRequest, BulkTagRequest, AccountWithGrowth, TagCreate, TagOut
 
 # Create Router Instance.
 router = APIRouter(tags=["Transactions"])
 
 # -------------------------------------------------------- Get All Transactions.
 @router.get("/transactions", response_model=list[TransactionOut])
-def get_transactions(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+async def get_transactions(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
 ):
     """Get All Transactions For The Current User."""
     
-    # Check Database Connection.
-    db = check_db_connection(db)
+    # Build Rows From Tuples (One Query Each For Transactions, Institutions And Tags).
+    result = await db.run_sync(build_transaction_list, current_user.id)
     
-    # Query For All Transactions With Account And Institution Details For This User.
-    transactions = db.query(Transaction).filter(
-        Transaction.user_id == current_user.id
-    ).join(
-        Account, Transaction.account_id == Account.account_id, isouter=True
-    ).join(
-        Institution, Account.item_id == Institution.item_id, isouter=True
-    ).all()
-    
-    # Create Result List With Enhanced Details.
-    result = []
-    for tx in transactions:
-        # Get Account Details.
-        account_details = None
-        if tx.account:
-            account_details = {
-                "id": tx.account.id,
-                "account_id": tx.account.account_id,
-                "name": tx.account.name,
-                "official_name": tx.account.official_name,
-                "type": tx.account.type,
-                "subtype": tx.account.subtype,
-                "mask": tx.account.mask,
-                "current_balance": tx.account.current_balance,
-                "available_balance": tx.account.available_balance,
-                "limit": tx.account.limit,
-                "currency": tx.account.currency,
-                "is_active": tx.account.is_active
-            }
-        elif tx.account_id is None:
-            # Handle Cash Transactions.
-            account_details = {
-                "id": None,
-                "account_id": None,
-                "name": "Cash",
-                "official_name": "Cash Transaction",
-                "type": "cash",
-                "subtype": "cash",
-                "mask": None,
-                "current_balance": None,
-                "available_balance": None,
-                "limit": None,
-                "currency": "USD",
-                "is_active": True
-            }
-        
-        # Get Institution Details.
-        institution_details = None
-        if tx.account and tx.account.item_id:
-            # Query For Institution Using Item ID (Must Belong To Current User).
-            institution = db.query(Institution).filter(
-                Institution.item_id == tx.account.item_id,
-                Institution.user_id == current_user.id
-            ).first()
-            
-            # If Institution Found, Return Institution Details.
-            if institution:
-                institution_details = {
-                    "id": institution.id,
-                    "institution_id": institution.institution_id,
-                    "name": institution.name,
-                    "item_id": institution.item_id,
-                    "is_connected": institution.is_connected,
-                    "last_sync": institution.last_sync
-                }
-        
-        # Get Tags For This Transaction.
-        transaction_tags = db.query(Tag).join(TransactionTag).filter(
-            TransactionTag.transaction_id == tx.id,
-            Tag.user_id == current_user.id
-        ).all()
-        
-        tags_list = []
-        for tag in transaction_tags:
-            tags_list.append({
-                "id": tag.id,
-                "name": tag.name,
-                "emoji": tag.emoji,
-                "color": tag.color
-            })
-        
-        # Create Transaction Dict With Enhanced Fields.
-        tx_dict = {
+    # Trusted DB Output - Encode Directly With orjson Instead Of Re-Validating Every Row.
+    return ORJSONResponse(result)
+
+# ----------------------------------------------------------------------- Search Transactions.
+@router.get("/transactions/search")
+def search_transactions_route(
+    q: str,
+    limit: int = 50,
+    offset: int = 0,
+    fuzzy: bool = True,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Search Transactions By Vendor, Merchant, Description And Notes."""
+    
+    # Validate Query And Pagination.
+    if not q.strip():
+        raise HTTPException(status_code=400, detail="Search query cannot be empty")
+    if limit < 1 or limit > 200:
+        raise HTTPException(status_code=400, detail="Limit must be between 1 and 200")
+    if offset < 0:
+        raise HTTPException(status_code=400, detail="Offset cannot be negative")
+    
+    # Get Ranked Page Of Matches.
+    results = search_transactions(db, current_user.id, q, limit, offset, fuzzy)
+    
+    # Format Matches (Best Match First).
+    transactions = [
+        {
             "id": tx.id,
             "transaction_id": tx.transaction_id,
             "account_id": tx.account_id,
@@ -167,30 +139,77 @@ def get_transactions(
             "description": tx.description,
             "category_primary": tx.category_primary,
             "category_detailed": tx.category_detailed,
-            "transaction_type": tx.transaction_type,
             "source": tx.source,
-            "file": tx.file,
-            "iso_currency_code": tx.iso_currency_code,
-            "location_address": tx.location_address,
-            "location_city": tx.location_city,
-            "location_state": tx.location_state,
-            "location_country": tx.location_country,
-            "payment_reference": tx.payment_reference,
-            "payment_method": tx.payment_method,
-            "created_at": tx.created_at,
-            "updated_at": tx.updated_at,
-            "notes": tx.notes,
-            "is_duplicate": tx.is_duplicate if hasattr(tx, 'is_duplicate') else False,
-            "duplicate_count": tx.duplicate_count if hasattr(tx, 'duplicate_count') else 0,
-            "last_updated": tx.last_updated if hasattr(tx, 'last_updated') else None,
-            "account_details": account_details,
-            "institution_details": institution_details,
-            "tags": tags_list
+            "notes": tx.notes
         }
-        
-        result.append(tx_dict)
+        for tx in results["transactions"]
+    ]
     
-    return result
+    return {
+        "query": q,
+        "transactions": transactions,
+        "total": results["total"],
+        "limit": limit,
+        "offset": offset,
+        "has_more": offset + len(transactions) < results["total"]
+    }
+
+# ----------------------------------------------------------------------- Export Transactions.
+@router.get("/transactions/export")
+def export_transactions(
+    format: str = "csv",
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    account_id: Optional[str] = None,
+    category: Optional[str] = None,
+    source: Optional[str] = None,
+    min_amount: Optional[float] = Query(None, ge=0, description="Smallest amount, by size"),
+    max_amount: Optional[float] = Query(None, ge=0, description="Largest amount, by size"),
+    direction: Optional[str] = Query(None, description="income or expense"),
+    categories: Optional[List[str]] = Query(None, description="Any of these categories (case-insensitive)"),
+    tag_ids: Optional[List[int]] = Query(None, description="Any of these tags"),
+    current_user: User = Depends(get_current_user)
+):
+    """Stream The User's Transactions As CSV, NDJSON Or Parquet (Same Filters As The Transactions Table)."""
+    
+    # Validate Format Before Any Bytes Are Sent.
+    export_format = format.lower()
+    if export_format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unsupported export format. Use one of: {', '.join(EXPORT_FORMATS)}")
+    if export_format == "parquet" and get_parquet_module() is None:
+        raise HTTPException(status_code=400, detail="Parquet export is not available on this server (pyarrow is not installed)")
+    if start_date and end_date and start_date > end_date:
+        raise HTTPException(status_code=400, detail="start_date must be on or before end_date")
+    if direction not in (None, "income", "expense"):
+        raise HTTPException(status_code=400, detail="direction must be income or expense")
+    
+    # Build Download Headers.
+    media_type, extension = EXPORT_FORMATS[export_format]
+    filename = f"transactions_{date.today().strftime('%Y%m%d')}.{extension}"
+    filters = {
+        "start_date": start_date,
+        "end_date": end_date,
+        "account_id": account_id,
+        "category": category,
+        "source": source,
+        "min_amount": min_amount,
+        "max_amount": max_amount,
+        "direction": direction,
+        "categories": categories,
+        "tag_ids": tag_ids
+    }
+    
+    # The Stream Gets Its Own Session For Its Whole Length - Checked Here, So A Missing Database Is A 503, Not An Empty File.
+    db = get_session()
+    if db is None:
+        raise HTTPException(status_code=503, detail="Database connection is not available. Please try again later.")
+
+    # Stream Rows In Batches.
+    return StreamingResponse(
+        stream_transactions_export(db, current_user.id, export_format, filters),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
 
 # ----------------------------------------------------------------------- Get Transactions with Account Info.
 @router.get("/transactions/detailed")
@@ -198,56 +217,11 @@ def get_detailed_transactions(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    # Query For All Transactions For This User, And Join With Account Info.
-    transactions = db.query(Transaction).filter(
-        Transaction.user_id == current_user.id
-    ).join(Account, Transaction.account_id == Account.account_id, isouter=True).all()
-    
-    # Create Result List.
-    result = []
-    for tx in transactions:
-        # Handle Account Details For Cash Transactions.
-        account_info = None
-        if tx.account:
-            account_info = {
-                "name": tx.account.name,
-                "type": tx.account.type,
-                "subtype": tx.account.subtype,
-                "mask": tx.account.mask
-            }
-        elif tx.account_id is None:
-            # Handle cash transactions
-            account_info = {
-                "name": "Cash",
-                "type": "cash",
-                "subtype": "cash",
-                "mask": None
-            }
-        
-        tx_dict = {
-            "id": tx.id,
-            "transaction_id": tx.transaction_id,
-            "date": tx.date,
-            "amount": tx.amount,
-            "vendor": tx.vendor,
-            "merchant_name": tx.merchant_name,
-            "description": tx.description,
-            "category_primary": tx.category_primary,
-            "category_detailed": tx.category_detailed,
-            "transaction_type": tx.transaction_type,
-            "source": tx.source,
-            "file": tx.file,
-            "location_city": tx.location_city,
-            "location_state": tx.location_state,
-            "created_at": tx.created_at,
-            "account": account_info
-        }
-
-        # Add Transaction To Result List.
-        result.append(tx_dict)
+    # Query Transactions Joined With Account Info As Tuples.
+    result = build_detailed_transaction_list(db, current_user.id)
     
     # Return Result List.
-    return result
+    return ORJSONResponse(result)
 
 # ----------------------------------------------------------------------- Get All Accounts.
 @router.get("/accounts")
@@ -264,14 +238,14 @@ def get_accounts(
         Account.is_active == True
     ).all()
     
+    # Transaction Count And Total Per Account (Cash Under None) In One Query.
+    transaction_stats = get_account_transaction_stats(db, current_user.id)
+    
     # Create Result List.
     result = []
     for account in accounts:
         # Count Transactions For This Account (Must Belong To Current User).
-        tx_count = db.query(Transaction).filter(
-            Transaction.account_id == account.account_id,
-            Transaction.user_id == current_user.id
-        ).count()
+        tx_count = transaction_stats.get(account.account_id, (0, None, 0))[0]
         
         # Create Account Dictionary.
         account_dict = {
@@ -292,18 +266,10 @@ def get_accounts(
         # Add Account To Result List.
         result.append(account_dict)
     
-    # Add Cash Account If User Has Cash Transactions.
-    cash_balance = db.query(func.sum(Transaction.amount)).filter(
-        Transaction.account_id.is_(None),  # Cash Transactions Have Account ID = None.
-        Transaction.user_id == current_user.id
-    ).scalar() or 0
+    # Add Cash Account If User Has Cash Transactions (Cash Transactions Have Account ID = None).
+    cash_tx_count, _, cash_balance = transaction_stats.get(None, (0, None, 0))
     
     if cash_balance != 0:  # Only Add Cash Account If There Are Cash Transactions.
-        cash_tx_count = db.query(Transaction).filter(
-            Transaction.account_id.is_(None),
-            Transaction.user_id == current_user.id
-        ).count()
-        
         cash_account = {
             "id": None,
             "account_id": None,
@@ -326,26 +292,41 @@ def get_accounts(
 
 # ----------------------------------------------------------------------- Get Enhanced Accounts with Growth Data.
 @router.get("/accounts/enhanced", response_model=list[AccountWithGrowth])
-def get_enhanced_accounts(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+async def get_enhanced_accounts(
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
 ):
     """Get Accounts With Enhanced Data Including Growth, Financial Impact, And Health Indicators."""
     
+    # Today's Balance Snapshot Is Written On The Primary After The Response (Reads May Come From A Replica).
+    background_tasks.add_task(account_balance_snapshot_job, current_user.id)
+    
+    # Reuse The Sync Query Code On The Async Connection (Event Loop Stays Free While Waiting On The DB).
+    return await db.run_sync(_get_enhanced_accounts, current_user)
+
+def _get_enhanced_accounts(db: Session, current_user: User):
+    """Build Enhanced Account Data For The Current User."""
+    
     # Check Database Connection.
     db = check_db_connection(db)
     
-    # Create Balance Snapshot For Today.
-    create_account_balance_snapshot(db, current_user.id)
-    
     # Get All Accounts.
     accounts = db.query(Account).filter(
         Account.user_id == current_user.id,
         Account.is_active == True
     ).all()
     
-    # Calculate Financial Impact For Percentages.
+    # Calculate Financial Impact For Percentages (Once, Shared By Every Account).
     financial_impact = calculate_account_financial_impact(db, current_user.id)
+    cash_balance = financial_impact["cash_balance"]
+    
+    # Transaction Counts / Last Dates Per Account And Growth For Every Account, Each In One Query.
+    transaction_stats = get_account_transaction_stats(db, current_user.id)
+    current_balances = {account.account_id: account.current_balance for account in accounts}
+    if cash_balance != 0:
+        current_balances[None] = cash_balance
+    growth = get_accounts_growth_data(db, current_user.id, current_balances, (30, 90, 365))
     
     # Create Result List.
     result = []
@@ -353,18 +334,15 @@ def get_enhanced_accounts(
     # Per Account,
     for account in accounts:
         # Get Transaction Count.
-        tx_count = db.query(Transaction).filter(
-            Transaction.account_id == account.account_id,
-            Transaction.user_id == current_user.id
-        ).count()
+        tx_count, last_transaction_date, _ = transaction_stats.get(account.account_id, (0, None, 0))
         
         # Get Growth Data.
-        growth_30d = get_account_growth_data(db, current_user.id, account.account_id, 30)
-        growth_90d = get_account_growth_data(db, current_user.id, account.account_id, 90)
-        growth_1y = get_account_growth_data(db, current_user.id, account.account_id, 365)
+        growth_30d = growth[account.account_id][30]
+        growth_90d = growth[account.account_id][90]
+        growth_1y = growth[account.account_id][365]
         
         # Get Health Indicators.
-        health_indicators = calculate_account_health_indicators(db, current_user.id, account)
+        health_indicators = build_account_health_indicators(account, last_transaction_date)
         
         # Calculate Financial Impact.
         balance = account.current_balance or 0
@@ -382,7 +360,7 @@ def get_enhanced_accounts(
             net_worth_contribution = balance
         
         # Get Percentage Contributions.
-        percentages = get_account_percentage_contributions(db, current_user.id, balance, account.type)
+        percentages = get_account_percentage_contributions(db, current_user.id, balance, account.type, financial_impact)
         
         account_dict = {
             "id": account.id,
@@ -422,24 +400,16 @@ def get_enhanced_accounts(
         result.append(account_dict)
     
     # Add Cash Account If User Has Cash Transactions.
-    cash_balance = db.query(func.sum(Transaction.amount)).filter(
-        Transaction.account_id.is_(None),
-        Transaction.user_id == current_user.id
-    ).scalar() or 0
-    
     if cash_balance != 0:
-        cash_tx_count = db.query(Transaction).filter(
-            Transaction.account_id.is_(None),
-            Transaction.user_id == current_user.id
-        ).count()
+        cash_tx_count = transaction_stats.get(None, (0, None, 0))[0]
         
         # Get Cash Growth Data.
-        cash_growth_30d = get_account_growth_data(db, current_user.id, None, 30)
-        cash_growth_90d = get_account_growth_data(db, current_user.id, None, 90)
-        cash_growth_1y = get_account_growth_data(db, current_user.id, None, 365)
+        cash_growth_30d = growth[None][30]
+        cash_growth_90d = growth[None][90]
+        cash_growth_1y = growth[None][365]
         
         # Get Cash Percentages.
-        cash_percentages = get_account_percentage_contributions(db, current_user.id, cash_balance, "cash")
+        cash_percentages = get_account_percentage_contributions(db, current_user.id, cash_balance, "cash", financial_impact)
         
         cash_account = {
             "id": None,
@@ -483,13 +453,14 @@ def get_enhanced_accounts(
 # ----------------------------------------------------------------------- Get Account Portfolio Analysis.
 @router.get("/accounts/analysis")
 def get_account_analysis(
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get Comprehensive Analysis Of The User's Account Portfolio."""
     
-    # Create Balance Snapshot.
-    create_account_balance_snapshot(db, current_user.id)
+    # Snapshot Balances On The Primary After The Response (Reads May Come From A Replica).
+    background_tasks.add_task(account_balance_snapshot_job, current_user.id)
     
     # Get Portfolio Analysis.
     portfolio_analysis = analyze_account_portfolio(db, current_user.id)
@@ -521,62 +492,36 @@ def create_snapshot(
 # ----------------------------------------------------------------------- Clears Entire Database For Current User.
 @router.delete("/clear")
 def clear_database(
+    background_tasks: BackgroundTasks,
+    background: bool = False,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Clear The Database For The Current User."""
+    """Clear The Database For The Current User (Chunked; Pass 'background=true' To Run It As A Job)."""
+    
+    # Background : Register A Job And Return Straight Away ('/clear/status' Reports Progress).
+    if background:
+        job = start_purge_job(current_user.id)
+        if job["started"]:
+            background_tasks.add_task(run_purge_job, job["job_id"])
+        return JSONResponse(status_code=202, content={
+            "message": "Clearing your data in the background" if job["started"] else "Your data is already being cleared",
+            **job
+        })
     
     try:
-        # Disable Foreign Key Checks Temporarily.
-        if "sqlite" in str(db.bind.url):
-            db.execute(text("PRAGMA foreign_keys = OFF"))
-        else:
-            db.execute(text("SET FOREIGN_KEY_CHECKS = 0"))
-        
-        # Clear All Tables For Current User (In Order Of Dependencies).
-        db.query(Transaction).filter(Transaction.user_id == current_user.id).delete()
-        db.query(FileUpload).filter(FileUpload.user_id == current_user.id).delete()
-        db.query(Account).filter(Account.user_id == current_user.id).delete()
-        db.query(Institution).filter(Institution.user_id == current_user.id).delete()
-        
-        # Re-enable Foreign Key Checks.
-        if "sqlite" in str(db.bind.url):
-            db.execute(text("PRAGMA foreign_keys = ON"))
-        else:
-            db.execute(text("SET FOREIGN_KEY_CHECKS = 1"))
+        # Chunked Deletes In Dependency Order, Committing As It Goes.
+        deleted = purge_user_data(db, current_user.id)
         
-        # Commit Changes.
-        db.commit()
-        
-        # Verify Tables Are Empty For Current User.
-        transaction_count = db.query(Transaction).filter(Transaction.user_id == current_user.id).count()
-        file_count = db.query(FileUpload).filter(FileUpload.user_id == current_user.id).count()
-        account_count = db.query(Account).filter(Account.user_id == current_user.id).count()
-        institution_count = db.query(Institution).filter(Institution.user_id == current_user.id).count()
-        
-        # Return Success Msg With Verification.
+        # Return Success Msg With Rows Removed Per Table.
         return {
             "message": "Your data has been cleared successfully",
-            "tables_cleared": ["transactions", "file_uploads", "accounts", "institutions"],
-            "verification": {
-                "transactions": transaction_count,
-                "file_uploads": file_count,
-                "accounts": account_count,
-                "institutions": institution_count
-            }
+            "tables_cleared": list(deleted),
+            "deleted": deleted
         }
     except Exception as e:
-        # Any Issues, Rollback To Last Commit.
+        # Any Issues, Rollback The Current Chunk (Earlier Chunks Stay Deleted; Clearing Again Finishes The Job).
         db.rollback()
-        
-        # Re-enable Foreign Key Checks In Case Of Error.
-        try:
-            if "sqlite" in str(db.bind.url):
-                db.execute(text("PRAGMA foreign_keys = ON"))
-            else:
-                db.execute(text("SET FOREIGN_KEY_CHECKS = 1"))
-        except:
-            pass
 
         # Return HTTP Error.
         raise HTTPException(
@@ -584,6 +529,18 @@ def clear_database(
             detail=f"Error clearing database: {str(e)}"
         )
 
+# ----------------------------------------------------------------------- Clear Database Status.
+@router.get("/clear/status")
+def clear_database_status(
+    current_user: User = Depends(get_current_user)
+):
+    """Get The Progress Of The Current User's Latest Background Clear."""
+    
+    job = get_purge_job(current_user.id)
+    if not job:
+        raise HTTPException(status_code=404, detail="No clear job found")
+    return job
+
 # ----------------------------------------------------------------------- Manually Add Transaction.
 @router.post("/transactions/", response_model=TransactionOut, status_code=201)
 def create_transaction(
@@ -667,17 +624,26 @@ def create_transaction(
         # Cash Transaction - No Account ID.
         new_tx_data['account_id'] = None
 
+    # Fingerprint (Manual Entries Are Always Kept, So A Same-Day Repeat Takes The Next Occurrence; Later Imports Of
+    # The Same Statement Then Skip Rows That Were Entered By Hand).
+    new_tx_data['fingerprint'] = next_free_fingerprint(
+        db, current_user.id, new_tx_data['account_id'], new_tx_data['date'], new_tx_data['amount'], new_tx_data['vendor']
+    )
+
     # Create New Transaction.
     new_tx = Transaction(**new_tx_data)
     
-    # Add, Commit, And Refresh Database.
+    # Add, Commit, And Refresh Database (A New Data Version Refreshes Cached Analytics, Budgets Count The Row).
     db.add(new_tx)
+    bump_data_version(db, current_user.id)
+    record_rows_spend(db, current_user.id, [new_tx_data])
     db.commit()
     db.refresh(new_tx)
 
     # Handle Tags If Provided.
     tag_ids = tx_data.get("tag_ids", [])
     if tag_ids:
+        linked_tag_ids = []
         for tag_id in tag_ids:
             # Verify Tag Belongs To Current User.
             tag = db.query(Tag).filter(
@@ -686,22 +652,38 @@ def create_transaction(
             ).first()
             
             if tag:
-                # Create Transaction-Tag Relationship.
-                transaction_tag = TransactionTag(
-                    transaction_id=new_tx.id,
-                    tag_id=tag_id
-                )
-                db.add(transaction_tag)
+                linked_tag_ids.append(tag_id)
+
+        # Create Transaction-Tag Relationships (Counted By Tag Budgets First, In One Go).
+        record_tag_links_spend(db, current_user.id, [(new_tx.id, tag_id) for tag_id in linked_tag_ids], 1)
+        for tag_id in linked_tag_ids:
+            transaction_tag = TransactionTag(
+                transaction_id=new_tx.id,
+                tag_id=tag_id,
+                user_id=current_user.id
+            )
+            db.add(transaction_tag)
         
         db.commit()
 
+    # Auto-Tag With The User's Rules (Tags Added Above Are Skipped).
+    if apply_rules_to_transaction(db, new_tx):
+        db.commit()
+
     # Recalculate Account Balance If Not Cash Transaction.
     if selected_account:
         updated_accounts = recalculate_account_balances(db, current_user.id, [selected_account.account_id])
         print(f"Updated balance for account {selected_account.account_id} after transaction creation")
 
-    # Return New Transaction.
-    return new_tx
+    # Return New Transaction (Tags As Dicts, Like '/transactions' - Manual And Rule Tags May Both Be Attached).
+    response = {field: getattr(new_tx, field) for field in TRANSACTION_FIELDS}
+    response["tags"] = [
+        {"id": tag_id, "name": name, "emoji": emoji, "color": color}
+        for tag_id, name, emoji, color in db.query(Tag.id, Tag.name, Tag.emoji, Tag.color).join(
+            TransactionTag, TransactionTag.tag_id == Tag.id
+        ).filter(TransactionTag.transaction_id == new_tx.id).order_by(TransactionTag.id)
+    ]
+    return response
 
 # ----------------------------------------------------------------------- Helper function to recalculate account balances.
 def recalculate_account_balances(db: Session, user_id: int, affected_account_ids: list = None):
@@ -769,7 +751,10 @@ def bulk_delete_transactions(
     
     deleted_count = len(transactions)
     
-    # Delete All Found Transactions.
+    # Take Them Out Of Their Budgets' Counters, Drop Their Tag Links (One Statement), Then Delete All Found Transactions.
+    found_ids = [transaction.id for transaction in transactions]
+    record_transactions_spend(db, current_user.id, [Transaction.id.in_(found_ids)], -1)
+    db.query(TransactionTag).filter(TransactionTag.transaction_id.in_(found_ids)).delete(synchronize_session=False)
     for transaction in transactions:
         db.delete(transaction)
     
@@ -779,6 +764,7 @@ def bulk_delete_transactions(
         print(f"Updated balances for {len(updated_accounts)} accounts after bulk delete")
     
     # Commit To Database.
+    bump_data_version(db, current_user.id)
     db.commit()
     
     # Return Success Message.
@@ -788,6 +774,76 @@ def bulk_delete_transactions(
         "updated_accounts": len(affected_account_ids) if affected_account_ids else 0
     }
 
+# ----------------------------------------------------------------------- Bulk Update Transactions.
+@router.post("/transactions/bulk-update")
+def bulk_update_transactions(
+    request: BulkUpdateRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Recategorize (Or Annotate) Many Transactions At Once."""
+
+    # Only Fields Present In The Request Are Changed.
+    updates = request.model_dump(exclude_unset=True, exclude={"transaction_ids"})
+    if not updates:
+        raise HTTPException(status_code=400, detail="No fields to update")
+
+    # Every Transaction Must Belong To The Current User, Or Nothing Changes.
+    missing = find_missing_ids(db, Transaction, current_user.id, request.transaction_ids)
+    if missing:
+        raise HTTPException(status_code=404, detail=f"{len(missing)} transaction(s) not found")
+
+    # One UPDATE For All Of Them (Recategorizing Moves Them Between Category Budgets).
+    recategorized = "category_primary" in updates
+    if recategorized:
+        record_recategorize_spend(db, current_user.id, [Transaction.id.in_(set(request.transaction_ids))], updates["category_primary"])
+    updates["updated_at"] = datetime.now()
+    updated_count = db.query(Transaction).filter(
+        Transaction.id.in_(set(request.transaction_ids)),
+        Transaction.user_id == current_user.id
+    ).update(updates, synchronize_session=False)
+    if recategorized:
+        bump_data_version(db, current_user.id)   # Category Totals Are Cached.
+    db.commit()
+
+    return {
+        "message": f"Updated {updated_count} transaction{'s' if updated_count != 1 else ''}",
+        "updated_count": updated_count
+    }
+
+# ----------------------------------------------------------------------- Reconcile Cross-Source Duplicates.
+@router.post("/transactions/reconcile")
+def reconcile_transactions(
+    request: ReconcileRequest = ReconcileRequest(),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Find (And Optionally Merge) Plaid Transactions Also Imported From CSV Or By Hand."""
+
+    pairs, scanned = find_duplicate_pairs(db, current_user.id, request.window_days, request.min_score)
+
+    merged_count = 0
+    if pairs and not request.dry_run:
+        try:
+            merged_count = merge_duplicate_pairs(db, current_user.id, pairs)
+
+            # Balances Are Sums Of Transactions, So Every Touched Account Needs Recalculating.
+            affected_account_ids = list({pair["account_id"] for pair in pairs})
+            recalculate_account_balances(db, current_user.id, affected_account_ids)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            raise HTTPException(status_code=500, detail=f"Error merging duplicates: {str(e)}")
+
+    # Return The Matches (Capped - The Counts Cover Everything).
+    return {
+        "dry_run": request.dry_run,
+        "scanned": scanned,
+        "duplicates_found": len(pairs),
+        "merged_count": merged_count,
+        "pairs": pairs[:500]
+    }
+
 # ----------------------------------------------------------------------- Delete Individual Transaction.
 @router.delete("/transactions/{transaction_id}")
 def delete_transaction(
@@ -809,7 +865,9 @@ def delete_transaction(
     # Store Account ID For Balance Recalculation.
     affected_account_id = transaction.account_id
     
-    # Delete Transaction.
+    # Take It Out Of Its Budgets' Counters, Drop Its Tag Links, Then Delete Transaction.
+    record_transactions_spend(db, current_user.id, [Transaction.id == transaction_id], -1)
+    db.query(TransactionTag).filter(TransactionTag.transaction_id == transaction_id).delete(synchronize_session=False)
     db.delete(transaction)
     
     # Recalculate Balance For Affected Account (If Not Cash Transaction).
@@ -818,6 +876,7 @@ def delete_transaction(
         print(f"Updated balance for account {affected_account_id} after transaction delete")
 
     # Commit To Database.
+    bump_data_version(db, current_user.id)
     db.commit()
     
     # Return Success Message.
@@ -966,12 +1025,19 @@ def recalculate_all_account_balances(
 
 # ----------------------------------------------------------------------- Get Stats.
 @router.get("/stats")
-def get_stats(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+async def get_stats(
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
 ):
     """Get Statistics For The Current User."""
     
+    # Reuse The Sync Query Code On The Async Connection (Event Loop Stays Free While Waiting On The DB).
+    return await db.run_sync(_get_stats, current_user, background_tasks)
+
+def _get_stats(db: Session, current_user: User, background_tasks: BackgroundTasks):
+    """Build Overview Statistics For The Current User."""
+    
     # Check Database Connection.
     db = check_db_connection(db)
     
@@ -999,110 +1065,31 @@ def get_stats(
     prev_year_start = datetime(now.year - 1, 1, 1).date()
     prev_year_end = datetime(now.year - 1, 12, 31).date()
 
-    # Get All Transactions For Current User.
-    transactions = db.query(Transaction).filter(Transaction.user_id == current_user.id).all()
-    
-    # Total Income (All Time).
-    total_income = db.query(func.sum(Transaction.amount)).filter(
-        Transaction.amount > 0,
-        Transaction.user_id == current_user.id
-    ).scalar() or 0
-    
-    # Monthly Income (Current Month).
-    monthly_income = db.query(func.sum(Transaction.amount)).filter(
-        Transaction.amount > 0,
-        Transaction.date >= start_of_month,
-        Transaction.user_id == current_user.id
-    ).scalar() or 0
-    
-    # Previous Month Income.
-    prev_monthly_income = db.query(func.sum(Transaction.amount)).filter(
-        Transaction.amount > 0,
-        Transaction.date >= prev_month_start,
-        Transaction.date <= prev_month_end,
-        Transaction.user_id == current_user.id
-    ).scalar() or 0
-    
-    # Weekly Income (Current Week).
-    weekly_income = db.query(func.sum(Transaction.amount)).filter(
-        Transaction.amount > 0,
-        Transaction.date >= start_of_week,
-        Transaction.user_id == current_user.id
-    ).scalar() or 0
-    
-    # Previous Week Income.
-    prev_weekly_income = db.query(func.sum(Transaction.amount)).filter(
-        Transaction.amount > 0,
-        Transaction.date >= prev_week_start,
-        Transaction.date <= prev_week_end,
-        Transaction.user_id == current_user.id
-    ).scalar() or 0
-    
-    # Year-to-Date Income.
-    ytd_income = db.query(func.sum(Transaction.amount)).filter(
-        Transaction.amount > 0,
-        Transaction.date >= start_of_year,
-        Transaction.user_id == current_user.id
-    ).scalar() or 0
-    
-    # Previous Year Income.
-    prev_ytd_income = db.query(func.sum(Transaction.amount)).filter(
-        Transaction.amount > 0,
-        Transaction.date >= prev_year_start,
-        Transaction.date <= prev_year_end,
-        Transaction.user_id == current_user.id
-    ).scalar() or 0
-    
-    # Total Spending (All Time).
-    total_spending = db.query(func.sum(Transaction.amount)).filter(
-        Transaction.amount < 0,
-        Transaction.user_id == current_user.id
-    ).scalar() or 0
-    
-    # Monthly Spending (Current Month).
-    monthly_spending = db.query(func.sum(Transaction.amount)).filter(
-        Transaction.amount < 0,
-        Transaction.date >= start_of_month,
-        Transaction.user_id == current_user.id
-    ).scalar() or 0
-    
-    # Previous Month Spending.
-    prev_monthly_spending = db.query(func.sum(Transaction.amount)).filter(
-        Transaction.amount < 0,
-        Transaction.date >= prev_month_start,
-        Transaction.date <= prev_month_end,
-        Transaction.user_id == current_user.id
-    ).scalar() or 0
-    
-    # Weekly Spending (Current Week).
-    weekly_spending = db.query(func.sum(Transaction.amount)).filter(
-        Transaction.amount < 0,
-        Transaction.date >= start_of_week,
-        Transaction.user_id == current_user.id
-    ).scalar() or 0
-    
-    # Previous Week Spending.
-    prev_weekly_spending = db.query(func.sum(Transaction.amount)).filter(
-        Transaction.amount < 0,
-        Transaction.date >= prev_week_start,
-        Transaction.date <= prev_week_end,
-        Transaction.user_id == current_user.id
-    ).scalar() or 0
-    
-    # Year-to-Date Spending.
-    ytd_spending = db.query(func.sum(Transaction.amount)).filter(
-        Transaction.amount < 0,
-        Transaction.date >= start_of_year,
-        Transaction.user_id == current_user.id
-    ).scalar() or 0
-    
-    # Previous Year Spending.
-    prev_ytd_spending = db.query(func.sum(Transaction.amount)).filter(
-        Transaction.amount < 0,
-        Transaction.date >= prev_year_start,
-        Transaction.date <= prev_year_end,
-        Transaction.user_id == current_user.id
-    ).scalar() or 0
+    # The User's Transactions As Columns (Cached Across Requests Until Their Data Changes).
+    columns = get_user_columns(db, current_user)
+    
+    # Income And Spending Per Period (Exact Cents, One Vectorized Sum Each).
+    periods = {
+        "total": columns.window(),
+        "monthly": columns.window(start_of_month),
+        "prev_monthly": columns.window(prev_month_start, prev_month_end),
+        "weekly": columns.window(start_of_week),
+        "prev_weekly": columns.window(prev_week_start, prev_week_end),
+        "ytd": columns.window(start_of_year),
+        "prev_ytd": columns.window(prev_year_start, prev_year_end)
+    }
+    income, spending = {}, {}
+    for period, rows in periods.items():
+        income_cents, spending_cents = columns.totals(rows)
+        income[period], spending[period] = income_cents / 100, spending_cents / 100
+    
+    total_income, total_spending = income["total"], spending["total"]
+    monthly_income, monthly_spending = income["monthly"], spending["monthly"]
+    prev_monthly_income, prev_monthly_spending = income["prev_monthly"], spending["prev_monthly"]
+    weekly_income, weekly_spending = income["weekly"], spending["weekly"]
+    prev_weekly_income, prev_weekly_spending = income["prev_weekly"], spending["prev_weekly"]
+    ytd_income, ytd_spending = income["ytd"], spending["ytd"]
+    prev_ytd_income, prev_ytd_spending = income["prev_ytd"], spending["prev_ytd"]
     
     # Calculate Cash Flow.
     monthly_cash_flow = monthly_income + monthly_spending
@@ -1174,50 +1161,23 @@ def get_stats(
     print(f"  Date ranges - Previous: {prev_month_start} to {prev_month_end}")
     
     # Get Income By Category.
-    income_by_category = db.query(
-        Transaction.category_primary,
-        func.sum(Transaction.amount).label('total')
-    ).filter(
-        Transaction.amount > 0,
-        Transaction.user_id == current_user.id
-    ).group_by(
-        Transaction.category_primary
-    ).all()
+    income_by_category = [
+        (category, cents / 100) for category, cents in columns.group_totals("category", sign=1).items()
+    ]
     
     # Get Spending By Category (Top 5).
-    spending_by_category = db.query(
-        Transaction.category_primary,
-        func.sum(Transaction.amount).label('total')
-    ).filter(
-        Transaction.amount < 0,
-        Transaction.user_id == current_user.id
-    ).group_by(
-        Transaction.category_primary
-    ).order_by(
-        func.sum(Transaction.amount).asc()
-    ).limit(5).all()
-    
-    # Get Average Transaction Amounts.
-    avg_income = db.query(func.avg(Transaction.amount)).filter(
-        Transaction.amount > 0,
-        Transaction.user_id == current_user.id
-    ).scalar() or 0
-    
-    avg_spending = db.query(func.avg(Transaction.amount)).filter(
-        Transaction.amount < 0,
-        Transaction.user_id == current_user.id
-    ).scalar() or 0
+    spending_by_category = [
+        (category, cents / 100)
+        for category, cents in sorted(columns.group_totals("category", sign=-1).items(), key=lambda item: item[1])[:5]
+    ]
     
     # Get Transaction Frequency.
-    transaction_count = db.query(Transaction).filter(Transaction.user_id == current_user.id).count()
-    income_count = db.query(Transaction).filter(
-        Transaction.amount > 0,
-        Transaction.user_id == current_user.id
-    ).count()
-    spending_count = db.query(Transaction).filter(
-        Transaction.amount < 0,
-        Transaction.user_id == current_user.id
-    ).count()
+    transaction_count = len(columns)
+    income_count, spending_count = columns.counts()
+    
+    # Get Average Transaction Amounts.
+    avg_income = total_income / income_count if income_count else 0
+    avg_spending = total_spending / spending_count if spending_count else 0
     
     # Get Account Statistics For Current User.
     accounts = db.query(Account).filter(Account.user_id == current_user.id).all()
@@ -1239,10 +1199,7 @@ def get_stats(
             total_assets += balance
     
     # Calculate Cash Balance From Cash Transactions.
-    cash_balance = db.query(func.sum(Transaction.amount)).filter(
-        Transaction.account_id.is_(None),  # Cash Transactions Have Account Id = None.
-        Transaction.user_id == current_user.id
-    ).scalar() or 0
+    cash_balance = columns.group_totals("account").get(None, 0) / 100   # Cash Transactions Have Account Id = None.
     
     # Include Cash Balance In Total Assets And Net Worth.
     total_assets_with_cash = total_assets + cash_balance
@@ -1281,31 +1238,27 @@ def get_stats(
     }
     
     # Get Source Statistics For Current User.
+    source_counts, source_totals = columns.group_counts("source"), columns.group_totals("source")
     source_stats = {}
     for source in ['plaid', 'csv', 'manual']:
-        source_transactions = db.query(Transaction).filter(
-            Transaction.source == source,
-            Transaction.user_id == current_user.id
-        ).all()
         source_stats[source] = {
-            'count': len(source_transactions),
-            'total': sum(t.amount for t in source_transactions)
+            'count': source_counts.get(source, 0),
+            'total': source_totals.get(source, 0) / 100
         }
     
-    # Create Or Update Monthly Snapshot For Current Month.
+    # This Month's Snapshot : Compare Against It Now, Save It On The Primary After The Response.
     current_month_start = datetime(now.year, now.month, 1).date()
-    current_snapshot = create_monthly_snapshot(
-        db=db,
-        user_id=current_user.id,
-        snapshot_date=current_month_start,
-        net_worth=net_worth,
-        total_assets=total_assets_with_cash,
-        total_liabilities=total_liabilities,
-        monthly_cash_flow=monthly_cash_flow,
-        monthly_income=monthly_income,
-        monthly_spending=monthly_spending,
-        transaction_count=transaction_count
-    )
+    snapshot_values = {
+        "net_worth": net_worth,
+        "total_assets": total_assets_with_cash,
+        "total_liabilities": total_liabilities,
+        "monthly_cash_flow": monthly_cash_flow,
+        "monthly_income": monthly_income,
+        "monthly_spending": monthly_spending,
+        "transaction_count": transaction_count
+    }
+    current_snapshot = MonthlySnapshot(user_id=current_user.id, snapshot_date=current_month_start, **snapshot_values)
+    background_tasks.add_task(monthly_snapshot_job, current_user.id, current_month_start, snapshot_values)
     
     # Get Previous Month's Snapshot For Comparison.
     previous_snapshot = get_previous_month_snapshot(db, current_user.id, now.date())
@@ -1385,35 +1338,23 @@ def update_transaction_details(
     """Update Existing Transactions With Account/Institution Details."""
     
     try:
-        # Get All Transactions That Don't Have Account Details Populated For Current User.
-        transactions = db.query(Transaction).filter(Transaction.user_id == current_user.id).all()
-        
-        updated_count = 0
+        # Count The User's Transactions.
+        total_transactions = db.query(func.count(Transaction.id)).filter(
+            Transaction.user_id == current_user.id
+        ).scalar()
         
-        for tx in transactions:
-            # Get Account Details (Must Belong To Current User).
-            account = db.query(Account).filter(
-                Account.account_id == tx.account_id,
-                Account.user_id == current_user.id
-            ).first()
-            
-            if account:
-                # Get Institution Details (Must Belong To Current User).
-                institution = None
-                if account.item_id:
-                    institution = db.query(Institution).filter(
-                        Institution.item_id == account.item_id,
-                        Institution.user_id == current_user.id
-                    ).first()
-                
-                # Update Transaction With Account And Institution Details.
-                # Note: Since These Are Computed Fields In The Response, We Don't Need To Store Them In The Database.
-                # They Will Be Populated When The Transaction Is Fetched.
-                updated_count += 1
+        # Count Those Linked To One Of The User's Accounts (One Join Instead Of A Lookup Per Transaction).
+        # Note: Account/Institution Details Are Computed Fields In The Response, So Nothing Is Stored Here.
+        # They Will Be Populated When The Transaction Is Fetched.
+        updated_count = db.query(func.count(Transaction.id)).join(
+            Account, (Account.account_id == Transaction.account_id) & (Account.user_id == current_user.id)
+        ).filter(
+            Transaction.user_id == current_user.id
+        ).scalar()
         
         return {
             "message": f"Found {updated_count} transactions with linked accounts",
-            "total_transactions": len(transactions),
+            "total_transactions": total_transactions,
             "linked_transactions": updated_count
         }
         
@@ -1509,6 +1450,64 @@ def debug_cash_flow(
         }
     }
 
+# ----------------------------------------------------------------------- Debug Pool Metrics.
+@router.get("/debug/pool")
+def debug_pool_metrics(
+    current_user: User = Depends(get_current_user)
+):
+    """Debug Endpoint To Check Database Connection Pool Usage (Admin Only)."""
+    
+    # Pool Stats Are Process-Wide, So Only Admins Can See Them.
+    if current_user.email != "admin@example.com":  # Replace With Your Admin Check.
+        raise HTTPException(status_code=403, detail="Admin access required")
+    
+    return get_pool_metrics()
+
+# ----------------------------------------------------------------------- Debug Slow Queries.
+@router.get("/debug/slow-queries")
+def debug_slow_queries(
+    limit: int = 50,
+    current_user: User = Depends(get_current_user)
+):
+    """Get Recorded Slow Queries With Their Plans, Newest First (Admin Only, Needs SLOW_QUERY_MS)."""
+    
+    # Statements Come From Every User's Requests, So Only Admins Can See Them.
+    if current_user.email != "admin@example.com":  # Replace With Your Admin Check.
+        raise HTTPException(status_code=403, detail="Admin access required")
+    
+    if limit < 1 or limit > 500:
+        raise HTTPException(status_code=400, detail="Limit must be between 1 and 500")
+    
+    return get_slow_queries(limit)
+
+# ----------------------------------------------------------------------- Dump Slow Queries.
+@router.post("/debug/slow-queries/dump")
+def dump_slow_queries_route(
+    current_user: User = Depends(get_current_user)
+):
+    """Append Recorded Slow Queries To The Slow-Query Log File (Admin Only)."""
+    
+    if current_user.email != "admin@example.com":  # Replace With Your Admin Check.
+        raise HTTPException(status_code=403, detail="Admin access required")
+    
+    # Path Comes From SLOW_QUERY_LOG, Never From The Request.
+    try:
+        return dump_slow_queries()
+    except OSError as e:
+        raise HTTPException(status_code=500, detail=f"Could not write slow query log: {str(e)}")
+
+# ----------------------------------------------------------------------- Clear Slow Queries.
+@router.delete("/debug/slow-queries")
+def clear_slow_queries_route(
+    current_user: User = Depends(get_current_user)
+):
+    """Clear Recorded Slow Queries (Admin Only)."""
+    
+    if current_user.email != "admin@example.com":  # Replace With Your Admin Check.
+        raise HTTPException(status_code=403, detail="Admin access required")
+    
+    return {"cleared": clear_slow_queries()}
+
 # ----------------------------------------------------------------------- Get All Tags For User.
 @router.get("/tags", response_model=list[TagOut])
 def get_tags(
@@ -1627,8 +1626,10 @@ def delete_tag(
         TransactionTag.tag_id == tag_id
     ).count()
     
-    # Delete All Transaction Associations First.
+    # Delete All Transaction Associations, Rules And Budgets First.
     db.query(TransactionTag).filter(TransactionTag.tag_id == tag_id).delete()
+    db.query(TagRule).filter(TagRule.tag_id == tag_id).delete()
+    delete_budgets(db, current_user.id, [budget_id for (budget_id,) in db.query(Budget.id).filter(Budget.tag_id == tag_id)])
     
     # Delete The Tag.
     db.delete(tag)
@@ -1679,10 +1680,12 @@ def add_tag_to_transaction(
             detail="Tag is already associated with this transaction"
         )
     
-    # Create Association.
+    # Create Association (Counted By Tag Budgets First).
+    record_tag_links_spend(db, current_user.id, [(transaction_id, tag_id)], 1)
     transaction_tag = TransactionTag(
         transaction_id=transaction_id,
-        tag_id=tag_id
+        tag_id=tag_id,
+        user_id=current_user.id
     )
     
     # Add Association To Database & Commit.
@@ -1723,13 +1726,46 @@ def remove_tag_from_transaction(
             detail="Tag is not associated with this transaction"
         )
     
-    # Delete Association.
+    # Delete Association (Uncounted By Tag Budgets First).
+    record_tag_links_spend(db, current_user.id, [(transaction_id, tag_id)], -1)
     db.delete(association)
     db.commit()
     
     # Return Success Message.
     return {"message": "Tag removed from transaction"}
 
+# ----------------------------------------------------------------------- Bulk Tag Transactions
+@router.post("/transactions/bulk-tag")
+def bulk_tag_transactions(
+    request: BulkTagRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Add And Remove Tags On Many Transactions At Once."""
+
+    if not request.add_tag_ids and not request.remove_tag_ids:
+        raise HTTPException(status_code=400, detail="No tags to add or remove")
+
+    # Verify Transactions And Tags Belong To Current User (One Query Each).
+    missing_transactions = find_missing_ids(db, Transaction, current_user.id, request.transaction_ids)
+    if missing_transactions:
+        raise HTTPException(status_code=404, detail=f"{len(missing_transactions)} transaction(s) not found")
+
+    missing_tags = find_missing_ids(db, Tag, current_user.id, request.add_tag_ids + request.remove_tag_ids)
+    if missing_tags:
+        raise HTTPException(status_code=404, detail=f"{len(missing_tags)} tag(s) not found")
+
+    # Set-Based Insert And Delete, One Commit.
+    added_count = add_tags_to_transactions(db, current_user.id, request.transaction_ids, request.add_tag_ids)
+    removed_count = remove_tags_from_transactions(db, current_user.id, request.transaction_ids, request.remove_tag_ids)
+    db.commit()
+
+    return {
+        "message": f"Added {added_count} and removed {removed_count} tag link{'s' if added_count + removed_count != 1 else ''}",
+        "added_count": added_count,
+        "removed_count": removed_count
+    }
+
 # ----------------------------------------------------------------------- Get Transaction Tags
 @router.get("/transactions/{transaction_id}/tags")
 def get_transaction_tags(
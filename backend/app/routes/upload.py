@@ -15,7 +15,8 @@ from io import StringIO
 from datetime import datetime
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
-from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, Form
+from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, Form, BackgroundTasks
+from fastapi.concurrency import run_in_threadpool
 
 # Local Imports.
 from app.database import FileUpload, Account, Transaction, User
@@ -24,6 +25,12 @@ from app.routes.transactions import recalculate_account_balances
 # Local Utils.
 from app.utils.db_utils import get_db
 from app.utils.auth_utils import get_current_user
+from app.utils.score_backfill_utils import backfill_weekly_scores_job
+from app.utils.fingerprint_utils import split_new_rows
+from app.utils.tag_rule_utils import apply_rules_to_rows
+from app.utils.analytics_cache import bump_data_version
+from app.utils.budget_utils import record_rows_spend
+from app.utils.recurring_utils import recurring_series_job
 
 # Local Models.
 from app.models import UploadResponse
@@ -31,25 +38,11 @@ from app.models import UploadResponse
 # Create Router Instance.
 router = APIRouter(tags=["Upload"])
 
-# -------------------------------------------------------- Upload CSV File.
-@router.post("/upload", response_model=UploadResponse)
-async def upload_csv(
-    file: UploadFile = File(...), 
-    account_data: str = Form(None),  # JSON string with account info
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
-):
-    """Upload A CSV File And Process Transactions."""
+# -------------------------------------------------------- Import CSV Content.
+def _import_csv(db: Session, user_id: int, filename: str, content: bytes, account_data: str, start_time: float,
+                background_tasks: BackgroundTasks) -> UploadResponse:
+    """Parse CSV Content And Store New Transactions (Blocking, Runs In The Threadpool)."""
 
-    # Track Processing Time.
-    start_time = time.time()
-    
-    # Check If File Is CSV.
-    if not file.filename.endswith('.csv'):
-        raise HTTPException(status_code=400, detail="Only CSV Files Are Allowed.")
-    
-    # Read File Content.
-    content = await file.read()
     content_str = content.decode('utf-8')
     
     # Create Content Hash For Duplicate Detection.
@@ -58,7 +51,7 @@ async def upload_csv(
     # Check If File Already Exists For This User.
     existing_file = db.query(FileUpload).filter_by(
         content_hash=content_hash,
-        user_id=current_user.id
+        user_id=user_id
     ).first()
     if existing_file:
         raise HTTPException(status_code=400, detail="This file has already been uploaded")
@@ -72,9 +65,9 @@ async def upload_csv(
     
     # Create FileUpload Item.
     uploaded_file = FileUpload(
-        user_id=current_user.id,
-        filename=file.filename,
-        original_filename=file.filename,
+        user_id=user_id,
+        filename=filename,
+        original_filename=filename,
         file_type="csv",
         upload_date=datetime.now(),
         transaction_count=0,
@@ -102,7 +95,7 @@ async def upload_csv(
             elif account_info.get('is_new'):
                 # Create New Manual Account.
                 selected_account = Account(
-                    user_id=current_user.id,
+                    user_id=user_id,
                     account_id=account_info['account_id'],
                     name=account_info['name'],
                     official_name=account_info['name'],
@@ -121,7 +114,7 @@ async def upload_csv(
                 # Use Existing Account (Must Belong To Current User).
                 selected_account = db.query(Account).filter_by(
                     account_id=account_info['account_id'],
-                    user_id=current_user.id
+                    user_id=user_id
                 ).first()
                 
                 if not selected_account:
@@ -129,11 +122,11 @@ async def upload_csv(
         except json.JSONDecodeError:
             raise HTTPException(status_code=400, detail="Invalid account data format")
     
-    # Process Transactions.
-    transactions_added = 0
+    # Parse Rows.
     transactions_skipped = 0
     errors = []
-    total_amount = 0
+    parsed_rows = []
+    created_at = datetime.now()
     
     for index, row in enumerate(rows):
         try:
@@ -162,70 +155,43 @@ async def upload_csv(
             description = str(row.get('Description', row.get('description', '')))
             category = str(row.get('Category', row.get('category', row.get('Type', 'other'))))
             
-            # Check If Transaction Already Exists Using Multiple Fields For This User.
-            existing_transaction = db.query(Transaction).filter(
-                Transaction.date == date,
-                Transaction.amount == amount,
-                Transaction.vendor == vendor,
-                Transaction.description == description,
-                Transaction.category_primary == category,
-                Transaction.source == 'csv',
-                Transaction.user_id == current_user.id
-            ).first()
-            
-            # If Transaction Already Exists, Skip It.
-            if existing_transaction:
-                transactions_skipped += 1
-                continue
-            
-            # Generate Unique Transaction Hash.
-            timestamp = datetime.now().timestamp()
-            hash_string = f"{date}|{amount}|{vendor}|{description}|{category}|{timestamp}|{index}"
-            transaction_hash = hashlib.sha256(hash_string.encode()).hexdigest()
-            
-            # Create Transaction With Account Info.
-            transaction_data = {
-                'user_id': current_user.id,
-                'transaction_id': f"csv_{timestamp}_{index}",
+            # Create Transaction With Account Info (Cash Transactions Have No Account ID).
+            parsed_rows.append({
+                'user_id': user_id,
+                'transaction_id': f"csv_{created_at.timestamp()}_{index}",
+                'account_id': selected_account.account_id if selected_account else None,
                 'date': date,
                 'amount': amount,
                 'vendor': vendor,
                 'description': description,
                 'category_primary': category,
                 'source': 'csv',
-                'file': file.filename,
-                'created_at': datetime.now(),
-                'updated_at': datetime.now(),
-                'transaction_hash': transaction_hash,
+                'file': filename,
+                'file_upload_id': uploaded_file.id,
+                'created_at': created_at,
+                'updated_at': created_at,
                 'iso_currency_code': 'USD'
-            }
-            
-            # Add Account Info If Not Cash Transaction.
-            if selected_account:
-                transaction_data['account_id'] = selected_account.account_id
-            else:
-                # Cash transaction - no account_id
-                transaction_data['account_id'] = None
-            
-            transaction = Transaction(**transaction_data)
-            
-            try:
-                db.add(transaction)
-                db.flush()  # Flush To Check For Immediate Errors.
-                transactions_added += 1
-                total_amount += amount
-            except IntegrityError:
-                db.rollback()
-                transactions_skipped += 1
-                continue
+            })
             
         except Exception as e:
             errors.append(f"Row {index + 1}: {str(e)}")
     
+    # Drop Rows Already Imported (Same File, Overlapping Statement, Or Entered By Hand) - One Lookup Per Batch.
+    new_rows, transactions_skipped = split_new_rows(db, user_id, parsed_rows)
+    for row in new_rows:
+        row['transaction_hash'] = f"{user_id}:{row['fingerprint']}"  # Fingerprints Are Unique Per User.
+    db.bulk_insert_mappings(Transaction, new_rows, render_nulls=True)
+    transactions_added = len(new_rows)
+    
+    # Auto-Tag The Batch With The User's Rules, And Count It Against The User's Budgets.
+    apply_rules_to_rows(db, user_id, new_rows)
+    record_rows_spend(db, user_id, new_rows)
+    total_amount = sum(row['amount'] for row in new_rows)
+    
     # Update Account Balance If Account Exists And Not Cash.
     if selected_account:
         # Use Proper Balance Calculation Based On All Transactions For This Account.
-        updated_accounts = recalculate_account_balances(db, current_user.id, [selected_account.account_id])
+        updated_accounts = recalculate_account_balances(db, user_id, [selected_account.account_id])
         print(f"Recalculated balance for account {selected_account.account_id} after CSV upload")
     
     # Update FileUpload With Enhanced Results.
@@ -238,13 +204,25 @@ async def upload_csv(
     if errors:
         uploaded_file.error_message = "; ".join(errors[:5])  # Store First 5 Errors.
     
-    # Commit Changes To Database.
+    # Commit Changes To Database (A New Data Version Refreshes Cached Analytics).
+    if transactions_added:
+        bump_data_version(db, user_id)
     try:
         db.commit()
+    except IntegrityError:
+        # Another Import Stored Some Of These Rows Between Our Lookup And Commit.
+        db.rollback()
+        raise HTTPException(status_code=409, detail="These transactions were just imported by another upload, please try again")
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Error saving transactions: {str(e)}")
     
+    # Refresh Recurring Series For The Batch's Vendors Once The Rows Are Committed, Then Backfill Past Weekly
+    # Centi Scores (Reconstructed Weeks From The Batch's Earliest Date On Are Recomputed).
+    if transactions_added:
+        background_tasks.add_task(recurring_series_job, user_id, sorted({row['vendor'] or "" for row in new_rows}))
+        background_tasks.add_task(backfill_weekly_scores_job, user_id, min(row['date'] for row in new_rows))
+    
     # Calculate Processing Duration.
     processing_duration_ms = int((time.time() - start_time) * 1000)
     
@@ -272,4 +250,32 @@ async def upload_csv(
         account_balance=total_amount if selected_account else 0,
         upload_timestamp=upload_timestamp,
         processing_duration_ms=processing_duration_ms
-    )
\ No newline at end of file
+    )
+
+# -------------------------------------------------------- Upload CSV File.
+@router.post("/upload", response_model=UploadResponse)
+async def upload_csv(
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...), 
+    account_data: str = Form(None),  # JSON string with account info
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Upload A CSV File And Process Transactions."""
+
+    # Track Processing Time.
+    start_time = time.time()
+    
+    # Check If File Is CSV.
+    if not file.filename.endswith('.csv'):
+        raise HTTPException(status_code=400, detail="Only CSV Files Are Allowed.")
+    
+    # Read File Content.
+    content = await file.read()
+    
+    # Parse And Store Off The Event Loop (The Sync Session Blocks).
+    result = await run_in_threadpool(
+        _import_csv, db, current_user.id, file.filename, content, account_data, start_time, background_tasks
+    )
+    
+    return result
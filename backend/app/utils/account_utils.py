@@ -2,9 +2,13 @@
 #
 # Functions :
 #   - 'create_account_balance_snapshot' - Create Balance Snapshots For All User Accounts.
+#   - 'account_balance_snapshot_job' - Take Today's Balance Snapshots In Their Own Session (For Background Tasks).
 #   - 'calculate_account_financial_impact' - Calculate Total Assets, Liabilities, And Net Worth With Proper Categorization.
 #   - 'get_account_growth_data' - Get Account Balance Growth Over Specified Period.
+#   - 'get_accounts_growth_data' - Get Balance Growth For Many Accounts And Periods From One Query.
+#   - 'get_account_transaction_stats' - Get Transaction Count, Last Date And Total Per Account In One Query.
 #   - 'calculate_account_health_indicators' - Calculate Account Health Indicators Like Utilization Rate.
+#   - 'build_account_health_indicators' - Build Health Indicators From An Already-Known Last Transaction Date.
 #   - 'get_account_percentage_contributions' - Calculate What Percentage Of Total Assets/Liabilities This Account Represents.
 #   - 'analyze_account_portfolio' - Analyze The User's Account Portfolio For Insights.
 
@@ -12,10 +16,10 @@
 from sqlalchemy import func
 from sqlalchemy.orm import Session
 from datetime import date, timedelta
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 # Local Imports.
-from ..database import Account, AccountBalanceHistory, Transaction
+from ..database import get_session, Account, AccountBalanceHistory, Transaction
 
 # -------------------------------------------------------- Account Balance Tracking.
 def create_account_balance_snapshot(
@@ -36,14 +40,18 @@ def create_account_balance_snapshot(
     
     snapshots = []
     
+    # Load This Date's Existing Snapshots Once (Keyed By Account ID, None For Cash) Instead Of One Lookup Per Account.
+    existing_by_account = {}
+    for existing in db.query(AccountBalanceHistory).filter(
+        AccountBalanceHistory.user_id == user_id,
+        AccountBalanceHistory.snapshot_date == snapshot_date
+    ).order_by(AccountBalanceHistory.id):
+        existing_by_account.setdefault(existing.account_id, existing)
+    
     # Create Snapshots For Each Account.
     for account in accounts:
         # Check If Snapshot Already Exists For This Date.
-        existing = db.query(AccountBalanceHistory).filter(
-            AccountBalanceHistory.user_id == user_id,
-            AccountBalanceHistory.account_id == account.account_id,
-            AccountBalanceHistory.snapshot_date == snapshot_date
-        ).first()
+        existing = existing_by_account.get(account.account_id)
         
         if existing:
             # Update Existing Snapshot.
@@ -55,18 +63,18 @@ def create_account_balance_snapshot(
             existing.account_subtype = account.subtype
             existing.currency = account.currency
         else:
-            # Create New Snapshot.
+            # Create New Snapshot (Column Defaults Filled In Up Front, So Every Row Shares One INSERT Shape).
             snapshot = AccountBalanceHistory(
                 user_id=user_id,
                 account_id=account.account_id,
                 snapshot_date=snapshot_date,
-                current_balance=account.current_balance,
-                available_balance=account.available_balance,
-                limit=account.limit,
+                current_balance=account.current_balance if account.current_balance is not None else 0.0,
+                available_balance=account.available_balance if account.available_balance is not None else 0.0,
+                limit=account.limit if account.limit is not None else 0.0,
                 account_name=account.name,
                 account_type=account.type,
                 account_subtype=account.subtype,
-                currency=account.currency
+                currency=account.currency or "USD"
             )
             snapshots.append(snapshot)
     
@@ -78,11 +86,7 @@ def create_account_balance_snapshot(
     
     if cash_balance != 0:
         # Check If Cash Snapshot Already Exists.
-        existing_cash = db.query(AccountBalanceHistory).filter(
-            AccountBalanceHistory.user_id == user_id,
-            AccountBalanceHistory.account_id.is_(None),
-            AccountBalanceHistory.snapshot_date == snapshot_date
-        ).first()
+        existing_cash = existing_by_account.get(None)
         
         if existing_cash:
             existing_cash.current_balance = cash_balance
@@ -102,13 +106,31 @@ def create_account_balance_snapshot(
             )
             snapshots.append(cash_snapshot)
     
-    # Add Snapshots To Database.
+    # Add Snapshots To Database (One Batched INSERT).
     if snapshots:
-        db.add_all(snapshots)
+        db.bulk_save_objects(snapshots)
         db.commit()
     
     return snapshots
 
+# -------------------------------------------------------- Account Balance Snapshot Job.
+def account_balance_snapshot_job(user_id: int):
+    """Take Today's Balance Snapshots In Their Own Session (For Background Tasks, So GET Routes Stay Read-Only)."""
+
+    # Request Sessions Are Closed (And May Be Replica Sessions) By Now, So Open A Fresh One On The Primary.
+    db = get_session()
+    if db is None:
+        print("Skipping balance snapshot - no database connection")
+        return
+
+    try:
+        create_account_balance_snapshot(db, user_id)
+    except Exception as e:
+        db.rollback()
+        print(f"Error creating balance snapshot for user {user_id}: {str(e)}")
+    finally:
+        db.close()
+
 # -------------------------------------------------------- Enhanced Financial Calculations.
 def calculate_account_financial_impact(
     db: Session, 
@@ -216,12 +238,78 @@ def get_account_growth_data(
         "historical_balance": historical_balance
     }
 
-def calculate_account_health_indicators(
+def get_accounts_growth_data(
     db: Session, 
     user_id: int, 
-    account: Account
+    current_balances: Dict[Optional[str], Optional[float]], 
+    periods: Tuple[int, ...] = (30, 90, 365)
+) -> Dict[Optional[str], Dict[int, Dict[str, Optional[float]]]]:
+    """Get Balance Growth For Many Accounts And Periods From One Query (Same Results As 'get_account_growth_data')."""
+    
+    end_date = date.today()
+    start_date = end_date - timedelta(days=max(periods))
+    
+    # Latest Snapshot Per Account Within The Longest Window. Every Window Ends Today, So That Snapshot Is Also
+    # The Latest One For Each Shorter Window - As Long As It Falls Inside It.
+    latest = {}
+    for account_id, snapshot_date, balance in db.query(
+        AccountBalanceHistory.account_id, AccountBalanceHistory.snapshot_date, AccountBalanceHistory.current_balance
+    ).filter(
+        AccountBalanceHistory.user_id == user_id,
+        AccountBalanceHistory.snapshot_date >= start_date,
+        AccountBalanceHistory.snapshot_date <= end_date
+    ).order_by(AccountBalanceHistory.snapshot_date.desc()):
+        latest.setdefault(account_id, (snapshot_date, balance))
+    
+    result = {}
+    for account_id, current_balance in current_balances.items():
+        snapshot = latest.get(account_id)
+        result[account_id] = {}
+        for days in periods:
+            if snapshot is None or snapshot[0] < end_date - timedelta(days=days) or current_balance is None:
+                result[account_id][days] = {
+                    "balance_change": None,
+                    "growth_percentage": None,
+                    "current_balance": current_balance,
+                    "historical_balance": None
+                }
+                continue
+            
+            historical_balance = snapshot[1]
+            balance_change = current_balance - historical_balance
+            if historical_balance != 0:
+                growth_percentage = (balance_change / abs(historical_balance)) * 100
+            else:
+                growth_percentage = 0 if current_balance == 0 else 100
+            
+            result[account_id][days] = {
+                "balance_change": balance_change,
+                "growth_percentage": growth_percentage,
+                "current_balance": current_balance,
+                "historical_balance": historical_balance
+            }
+    
+    return result
+
+def get_account_transaction_stats(
+    db: Session, 
+    user_id: int
+) -> Dict[Optional[str], Tuple[int, Optional[date], float]]:
+    """Get Transaction Count, Last Date And Total Per Account ID (None For Cash) In One Query."""
+    
+    rows = db.query(
+        Transaction.account_id, func.count(Transaction.id), func.max(Transaction.date), func.sum(Transaction.amount)
+    ).filter(
+        Transaction.user_id == user_id
+    ).group_by(Transaction.account_id).all()
+    
+    return {account_id: (count, last_date, total or 0) for account_id, count, last_date, total in rows}
+
+def build_account_health_indicators(
+    account: Account, 
+    last_transaction_date: Optional[date]
 ) -> Dict[str, Optional[float]]:
-    """Calculate Account Health Indicators Like Utilization Rate."""
+    """Build Health Indicators From An Already-Known Last Transaction Date."""
     
     indicators = {}
     
@@ -232,27 +320,39 @@ def calculate_account_health_indicators(
         indicators['utilization_rate'] = utilization_rate
     
     # Calculate Days Since Last Transaction.
+    if last_transaction_date:
+        days_since = (date.today() - last_transaction_date).days
+        indicators['days_since_last_transaction'] = days_since
+    
+    return indicators
+
+def calculate_account_health_indicators(
+    db: Session, 
+    user_id: int, 
+    account: Account
+) -> Dict[str, Optional[float]]:
+    """Calculate Account Health Indicators Like Utilization Rate."""
+    
+    # Get Last Transaction Date.
     last_transaction = db.query(Transaction.date).filter(
         Transaction.account_id == account.account_id,
         Transaction.user_id == user_id
     ).order_by(Transaction.date.desc()).first()
     
-    if last_transaction:
-        days_since = (date.today() - last_transaction[0]).days
-        indicators['days_since_last_transaction'] = days_since
-    
-    return indicators
+    return build_account_health_indicators(account, last_transaction[0] if last_transaction else None)
 
 def get_account_percentage_contributions(
     db: Session, 
     user_id: int, 
     account_balance: float, 
-    account_type: str
+    account_type: str,
+    financial_impact: Optional[Dict[str, float]] = None
 ) -> Dict[str, float]:
     """Calculate What Percentage Of Total Assets/Liabilities This Account Represents."""
     
-    # Calculate Financial Impact.
-    financial_impact = calculate_account_financial_impact(db, user_id)
+    # Calculate Financial Impact (Callers Looping Over Accounts Pass It In Once).
+    if financial_impact is None:
+        financial_impact = calculate_account_financial_impact(db, user_id)
     
     percentages = {}
     
@@ -0,0 +1,284 @@
+# Analytics Cache.
+#
+# Note : Holds Each Active User's Transactions As Compact NumPy Columns - int64 Cents (Exact, No Float Drift),
+#        int32 Day Numbers (Sorted, So Any Date Window Is A Slice Found By Binary Search) And Small-Int Codes For
+#        Category, Account, Source And Vendor - So Stats, Category Breakdowns, Period Comparisons And Recurring
+#        Detection Are Vectorized Passes Instead Of SQL Round Trips. About 20-22 Bytes Per Transaction.
+#        Columns Load On First Use (One Query) And Are Tagged With The User's 'data_version'; Every Write To A
+#        User's Transactions Bumps That Version ('bump_data_version'), So Any Worker Holding Older Columns Reloads
+#        On Its Next Read - The Version Rides Along On The Already-Loaded User Row, So Checking Costs Nothing.
+#        Least-Recently-Used Users Are Evicted Once The Cache Passes 'ANALYTICS_CACHE_MB'.
+#        Prefix Sums ('PrefixSums') Are Built On Top Of The Columns The First Time A Comparison Asks For Them - Per
+#        User, Overall Or Per Category/Account - So Any Date Range Is Two Binary Searches And A Subtraction. They
+#        Live And Die With The Columns (Same Data Version, Same Memory Budget).
+#        Smaller Derived Results (The Cash-Flow Forecast) Ride Along In 'UserColumns.derived' The Same Way.
+#        numpy Is Imported On First Load, So App Startup Doesn't Pay For It.
+#
+# Functions :
+#   - 'PrefixSums' - Cumulative Income/Spending Over A User's Rows, Overall Or Per Group.
+#   - 'UserColumns' - One User's Transactions As Columns, With Windowed Sums And Group-Bys.
+#   - 'load_user_columns' - Load A User's Transactions Into Columns (One Query).
+#   - 'get_user_columns' - Get A User's Columns, Loading Them On A Miss Or When Their Data Version Moved.
+#   - 'get_prefix_sums' - Get A User's Prefix Sums (Overall Or Per Group), Building Them On First Use.
+#   - 'bump_data_version' - Mark A User's Transactions Changed (Invalidates Their Columns In Every Worker).
+#   - 'invalidate_user' - Drop A User's Columns From This Worker's Cache.
+#   - 'get_cache_stats' - Entries, Memory And Hit/Miss/Eviction Counters.
+
+# Imports.
+import os
+import threading
+from collections import OrderedDict
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+# Local Imports.
+from app.database import User, Transaction
+
+# Settings.
+ANALYTICS_CACHE_MB = float(os.getenv("ANALYTICS_CACHE_MB", "256"))   # Memory Budget Per Worker.
+
+# Cache State (Per Worker) : User ID -> Columns, Least Recently Used First.
+_cache: "OrderedDict[int, UserColumns]" = OrderedDict()
+_cache_bytes = 0
+_counters = {"hits": 0, "misses": 0, "reloads": 0, "evictions": 0}
+_lock = threading.Lock()
+
+# -------------------------------------------------------- Prefix Sums.
+class PrefixSums:
+    """Cumulative Income/Spending Over A User's Rows, Grouped (Day-Sorted Within Each Group)."""
+
+    def __init__(self, days, income, spending, offsets, labels: List):
+        self.days = days              # Row Days, Ascending Within Each Group.
+        self.income = income          # int64 Running Income In Cents (Leading 0, So Length Is Rows + 1).
+        self.spending = spending      # int64 Running Spending In Cents (Negative).
+        self.offsets = offsets        # Group 'g' Owns Rows offsets[g]:offsets[g + 1].
+        self.labels = labels
+        self.nbytes = days.nbytes + income.nbytes + spending.nbytes + offsets.nbytes
+
+    def range_totals(self, code: int, starts, ends):
+        """(Income, Spending, Count) Arrays For One Group Over Many [start, end] Day Ranges."""
+
+        import numpy as np
+        first, last = int(self.offsets[code]), int(self.offsets[code + 1])
+        days = self.days[first:last]
+        low = first + np.searchsorted(days, starts, side="left")
+        high = np.maximum(low, first + np.searchsorted(days, ends, side="right"))
+        return self.income[high] - self.income[low], self.spending[high] - self.spending[low], high - low
+
+# -------------------------------------------------------- User Columns.
+class UserColumns:
+    """One User's Transactions As Columns (Sorted By Day), With Windowed Sums And Group-Bys."""
+
+    def __init__(self, user_id: int, version: int, cents, days, category, account, source, vendor,
+                 categories: List, accounts: List, sources: List, vendors: List):
+        self.user_id = user_id
+        self.version = version
+        self.cents = cents            # int64 Amount In Cents.
+        self.days = days              # int32 'date.toordinal()' (0 = No Date), Ascending.
+        self.category = category      # Codes Into 'categories'.
+        self.account = account        # Codes Into 'accounts' (None = Cash).
+        self.source = source          # Codes Into 'sources'.
+        self.vendor = vendor          # Codes Into 'vendors' (Raw Spellings).
+        self.categories = categories
+        self.accounts = accounts
+        self.sources = sources
+        self.vendors = vendors
+        self.nbytes = sum(column.nbytes for column in (cents, days, category, account, source, vendor))
+        self.prefix: Dict[Optional[str], PrefixSums] = {}
+        self.derived: Dict = {}       # Small Results Computed From The Columns (Forecasts), Dropped With Them.
+
+    def __len__(self) -> int:
+        return len(self.cents)
+
+    def labels(self, by: str) -> List:
+        """Labels Behind The Codes Of 'category', 'account', 'source' Or 'vendor'."""
+        return {"category": self.categories, "account": self.accounts, "source": self.sources, "vendor": self.vendors}[by]
+
+    def window(self, start: Optional[date] = None, end: Optional[date] = None) -> slice:
+        """Rows Dated Within [start, end] (Either Side Open When None), As A Slice."""
+
+        import numpy as np
+        low = 0 if start is None else int(np.searchsorted(self.days, start.toordinal(), side="left"))
+        high = len(self.days) if end is None else int(np.searchsorted(self.days, end.toordinal(), side="right"))
+        return slice(low, max(low, high))
+
+    def totals(self, rows: slice = slice(None)) -> Tuple[int, int]:
+        """(Income, Spending) In Cents Over A Slice (Spending Is Negative)."""
+
+        cents = self.cents[rows]
+        return int(cents[cents > 0].sum()), int(cents[cents < 0].sum())
+
+    def counts(self, rows: slice = slice(None)) -> Tuple[int, int]:
+        """(Income, Spending) Row Counts Over A Slice."""
+
+        cents = self.cents[rows]
+        return int((cents > 0).sum()), int((cents < 0).sum())
+
+    def group_totals(self, by: str, sign: int = 0, rows: slice = slice(None)) -> Dict:
+        """Cents Per Label Of 'category', 'account', 'source' Or 'vendor', Optionally Only Income (1) Or Spending (-1)."""
+
+        import numpy as np
+        labels = self.labels(by)
+        codes, cents = getattr(self, by)[rows], self.cents[rows]
+        if sign:
+            keep = cents > 0 if sign > 0 else cents < 0
+            codes, cents = codes[keep], cents[keep]
+        present = np.bincount(codes, minlength=len(labels)) > 0
+        sums = np.bincount(codes, weights=cents, minlength=len(labels))
+        return {labels[code]: int(round(sums[code])) for code in np.flatnonzero(present)}
+
+    def group_counts(self, by: str, rows: slice = slice(None)) -> Dict:
+        """Row Count Per Label Of 'category', 'account', 'source' Or 'vendor'."""
+
+        import numpy as np
+        labels = self.labels(by)
+        counts = np.bincount(getattr(self, by)[rows], minlength=len(labels))
+        return {labels[code]: int(counts[code]) for code in np.flatnonzero(counts)}
+
+    def build_prefix_sums(self, by: Optional[str] = None) -> PrefixSums:
+        """Cumulative Sums Over All Rows (by=None) Or Per 'category'/'account'."""
+
+        import numpy as np
+        if by is None:
+            order, labels = np.arange(len(self.cents)), [None]
+            offsets = np.array([0, len(self.cents)], dtype=np.int64)
+        else:
+            # Stable Sort By Group Keeps Rows Day-Ordered Within Each Group.
+            codes = getattr(self, by)
+            labels = self.labels(by)
+            order = np.argsort(codes, kind="stable")
+            offsets = np.searchsorted(codes[order], np.arange(len(labels) + 1)).astype(np.int64)
+
+        cents = self.cents[order]
+        income = np.concatenate(([0], np.cumsum(np.where(cents > 0, cents, 0)))).astype(np.int64)
+        spending = np.concatenate(([0], np.cumsum(np.where(cents < 0, cents, 0)))).astype(np.int64)
+        return PrefixSums(self.days[order], income, spending, offsets, labels)
+
+# -------------------------------------------------------- Encode.
+def _encode(values: list) -> Tuple[list, list]:
+    """Map Values To Small Integer Codes. Returns (Codes, Labels)."""
+
+    index = {}
+    codes = [index.setdefault(value, len(index)) for value in values]
+    return codes, list(index)
+
+# -------------------------------------------------------- Load User Columns.
+def load_user_columns(db: Session, user_id: int, version: int) -> UserColumns:
+    """Load A User's Transactions Into Columns (One Query)."""
+
+    # Imported Here So App Startup Doesn't Pay For numpy.
+    import numpy as np
+
+    rows = db.query(
+        Transaction.amount, Transaction.date, Transaction.category_primary, Transaction.account_id, Transaction.source,
+        Transaction.vendor
+    ).filter(Transaction.user_id == user_id).all()
+
+    count = len(rows)
+    cents = np.rint(np.fromiter((row[0] or 0.0 for row in rows), dtype=np.float64, count=count) * 100).astype(np.int64)
+    days = np.fromiter((row[1].toordinal() if row[1] else 0 for row in rows), dtype=np.int32, count=count)
+
+    columns = []
+    for position in (2, 3, 4, 5):
+        codes, labels = _encode([row[position] for row in rows])
+        dtype = np.int16 if len(labels) < 2 ** 15 else np.int32
+        columns.append((np.fromiter(codes, dtype=dtype, count=count), labels))
+
+    # Sort By Day Once, So Date Windows Are Slices.
+    order = np.argsort(days, kind="stable")
+    (category, categories), (account, accounts), (source, sources), (vendor, vendors) = columns
+    return UserColumns(
+        user_id, version, cents[order], days[order], category[order], account[order], source[order], vendor[order],
+        categories, accounts, sources, vendors
+    )
+
+# -------------------------------------------------------- Evict.
+def _evict():
+    """Evict Least Recently Used Users Past The Budget, Always Keeping The Newest. Call With '_lock' Held."""
+
+    global _cache_bytes
+    budget = ANALYTICS_CACHE_MB * 1024 * 1024
+    while _cache_bytes > budget and len(_cache) > 1:
+        _, evicted = _cache.popitem(last=False)
+        _cache_bytes -= evicted.nbytes
+        _counters["evictions"] += 1
+
+# -------------------------------------------------------- Get User Columns.
+def get_user_columns(db: Session, user: User) -> UserColumns:
+    """Get A User's Columns, Loading Them On A Miss Or When Their Data Version Moved."""
+
+    global _cache_bytes
+    version = user.data_version or 0
+    with _lock:
+        cached = _cache.get(user.id)
+        if cached is not None and cached.version == version:
+            _cache.move_to_end(user.id)
+            _counters["hits"] += 1
+            return cached
+        _counters["reloads" if cached is not None else "misses"] += 1
+
+    # Load Outside The Lock (Other Users' Reads Keep Hitting The Cache Meanwhile).
+    columns = load_user_columns(db, user.id, version)
+
+    with _lock:
+        previous = _cache.pop(user.id, None)
+        if previous is not None:
+            _cache_bytes -= previous.nbytes
+        _cache[user.id] = columns
+        _cache_bytes += columns.nbytes
+        _evict()
+    return columns
+
+# -------------------------------------------------------- Get Prefix Sums.
+def get_prefix_sums(db: Session, user: User, by: Optional[str] = None) -> PrefixSums:
+    """Get A User's Prefix Sums (Overall Or Per 'category'/'account'), Building Them On First Use."""
+
+    global _cache_bytes
+    columns = get_user_columns(db, user)
+    prefix = columns.prefix.get(by)
+    if prefix is None:
+        prefix = columns.build_prefix_sums(by)
+        with _lock:
+            if by not in columns.prefix:
+                columns.prefix[by] = prefix
+                columns.nbytes += prefix.nbytes
+
+                # Count It Against The Budget Only While The Columns Are Still Cached.
+                if _cache.get(user.id) is columns:
+                    _cache_bytes += prefix.nbytes
+                    _evict()
+            prefix = columns.prefix[by]
+    return prefix
+
+# -------------------------------------------------------- Bump Data Version.
+def bump_data_version(db: Session, user_id: int):
+    """Mark A User's Transactions Changed (Invalidates Their Columns In Every Worker). Caller Commits."""
+
+    db.query(User).filter(User.id == user_id).update(
+        {User.data_version: func.coalesce(User.data_version, 0) + 1}, synchronize_session=False
+    )
+    invalidate_user(user_id)
+
+# -------------------------------------------------------- Invalidate User.
+def invalidate_user(user_id: int):
+    """Drop A User's Columns From This Worker's Cache."""
+
+    global _cache_bytes
+    with _lock:
+        dropped = _cache.pop(user_id, None)
+        if dropped is not None:
+            _cache_bytes -= dropped.nbytes
+
+# -------------------------------------------------------- Get Cache Stats.
+def get_cache_stats() -> dict:
+    """Entries, Memory And Hit/Miss/Eviction Counters (This Worker)."""
+
+    with _lock:
+        return {
+            "entries": len(_cache),
+            "bytes": _cache_bytes,
+            "budget_bytes": int(ANALYTICS_CACHE_MB * 1024 * 1024),
+            **_counters
+        }
@@ -3,16 +3,19 @@
 # Functions :
 #   - 'verify_token' - Verify And Decode A JWT Token.
 #   - 'get_current_user' - Get The Current Authenticated User From JWT Token In Cookies.
+#   - 'get_current_user_async' - Same As 'get_current_user', Using The Async Session.
 
 # Imports.
 import jwt
 from typing import Optional
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, Depends, status, Request
 
 # Local Imports.
 from ..database import User
-from ..utils.db_utils import get_db
+from ..utils.db_utils import get_db, get_async_db
 
 # JWT Settings — signing secret & algorithm resolved from env in app.config.
 from ..config import SECRET_KEY, ALGORITHM
@@ -26,12 +29,9 @@ def verify_token(token: str) -> Optional[dict]:
     except jwt.PyJWTError:
         return None
 
-# -------------------------------------------------------- Get Current User.
-def get_current_user(
-    request: Request,
-    db: Session = Depends(get_db)
-) -> User:
-    """Get The Current Authenticated User From JWT Token In Cookies."""
+# -------------------------------------------------------- Get Token User ID.
+def _get_token_user_id(request: Request) -> int:
+    """Get The User ID From The JWT In The 'access_token' Cookie."""
     
     # Extract Token From Cookies.
     token = request.cookies.get("access_token")
@@ -60,8 +60,40 @@ def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    return int(user_id)
+
+# -------------------------------------------------------- Get Current User.
+def get_current_user(
+    request: Request,
+    db: Session = Depends(get_db)
+) -> User:
+    """Get The Current Authenticated User From JWT Token In Cookies."""
+    
+    # Get User ID From The Access Token Cookie.
+    user_id = _get_token_user_id(request)
+    
     # Get User From Database.
-    user = db.query(User).filter(User.id == int(user_id)).first()
+    user = db.query(User).filter(User.id == user_id).first()
+    return _check_user(user)
+
+# -------------------------------------------------------- Get Current User Async.
+async def get_current_user_async(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db)
+) -> User:
+    """Same As 'get_current_user', Using The Async Session."""
+    
+    # Get User ID From The Access Token Cookie.
+    user_id = _get_token_user_id(request)
+    
+    # Get User From Database.
+    result = await db.execute(select(User).where(User.id == user_id))
+    return _check_user(result.scalars().first())
+
+# -------------------------------------------------------- Check User.
+def _check_user(user: Optional[User]) -> User:
+    """Reject Missing Or Deactivated Users."""
+    
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
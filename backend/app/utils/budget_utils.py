@@ -0,0 +1,321 @@
+# Budget Utils.
+#
+# Note : Budgets Cap Monthly Spending In A Category Or On A Tag. Each Budget Keeps One Running Counter Per Month
+#        ('budget_spend', Cents Of Outflow) That Every Write Path Moves By Exactly What It Changed - Imports And
+#        Manual Entries Add Their Rows, Deletes (Single, Bulk, File Cascades, Duplicate Merges) Subtract Theirs,
+#        Recategorizing Moves Rows Between Category Budgets And Tag Links Added Or Removed Move Them On Tag Budgets.
+#        So Reading A Budget's Status Is One Counter Lookup, Never A Re-Sum Of The Month's Transactions.
+#        Threshold Crossings ('BUDGET_ALERT_THRESHOLDS') Are Spotted As The Counter Moves And Queued As
+#        'budget_alerts' Rows In The Same Transaction - Only For The Current Month, So Importing Old Statements
+#        Doesn't Raise Stale Alerts. Dropping Back Under A Threshold Re-Arms It.
+#        A User's Budgets Are Loaded Once Per Session ('Session.info'), So Users Without Budgets Pay One Small Query
+#        Per Write And Nothing Else. Only A New Or Edited Budget Scans History, Once, To Seed Its Counters.
+#
+# Functions :
+#   - 'load_budgets' - Get A User's Active Budgets (Once Per Session).
+#   - 'record_rows_spend' - Count Freshly Inserted Row Dicts Against Category Budgets.
+#   - 'record_transactions_spend' - Count Stored Transactions In (+1) Or Out (-1) Of Budgets.
+#   - 'record_recategorize_spend' - Move Stored Transactions Between Category Budgets Ahead Of A Recategorize.
+#   - 'record_tag_links_spend' - Count Tag Links About To Be Added (+1) Or Removed (-1) Against Tag Budgets.
+#   - 'rebuild_budget_spend' - Seed A Budget's Monthly Counters From History (On Create Or Edit).
+#   - 'delete_budgets' - Delete Budgets With Their Counters And Alerts.
+#   - 'budget_status' - Format A Budget With Its Counter For A Month.
+
+# Imports.
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional
+from sqlalchemy import and_
+from sqlalchemy.orm import Session
+
+# Local Imports.
+from app.database import Budget, BudgetSpend, BudgetAlert, Transaction, TransactionTag
+
+# Settings.
+BUDGET_ALERT_THRESHOLDS = (80, 100)     # Percent Of The Monthly Limit That Raise An Alert.
+LOOKUP_CHUNK_SIZE = 500                 # IDs Per IN Query.
+
+# -------------------------------------------------------- Month Start.
+def _month_start(day) -> date:
+    """First Day Of The Month Containing 'day' (A Date Or Datetime)."""
+    return date(day.year, day.month, 1)
+
+# -------------------------------------------------------- Load Budgets.
+def load_budgets(db: Session, user_id: int) -> List[Budget]:
+    """Get A User's Active Budgets, Loaded Once Per Session (Budget Edits Reset It)."""
+
+    cache = db.info.setdefault("budgets", {})
+    if user_id not in cache:
+        cache[user_id] = db.query(Budget).filter(Budget.user_id == user_id, Budget.is_active == True).all()
+    return cache[user_id]
+
+# -------------------------------------------------------- Forget Budgets.
+def _forget_budgets(db: Session, user_id: int):
+    """Drop This Session's Copy Of A User's Budgets."""
+    db.info.get("budgets", {}).pop(user_id, None)
+
+# -------------------------------------------------------- Check Thresholds.
+def _check_thresholds(budget: Budget, period: date, spent_cents: int, alert_level: int, now: datetime, alerts: list) -> int:
+    """A Counter's New Alert Level, Queuing An Alert In 'alerts' If It Just Crossed A Threshold This Month."""
+
+    # Dropping Back Under A Threshold Lowers The Level, Which Re-Arms It.
+    percent = spent_cents / 100 / budget.monthly_limit * 100 if budget.monthly_limit else 0
+    level = max([threshold for threshold in BUDGET_ALERT_THRESHOLDS if percent >= threshold], default=0)
+    if level > (alert_level or 0) and period == _month_start(now):
+        alerts.append({
+            "user_id": budget.user_id,
+            "budget_id": budget.id,
+            "period_start": period,
+            "threshold": level,
+            "spent": round(spent_cents / 100, 2),
+            "monthly_limit": budget.monthly_limit,
+            "is_read": False,
+            "created_at": now
+        })
+    return level
+
+# -------------------------------------------------------- Apply Deltas.
+def _apply_deltas(db: Session, budgets: List[Budget], deltas: Dict[tuple, int]):
+    """Move Counters By (Budget ID, Month) -> Cents, Creating Missing Ones And Queuing Threshold Alerts."""
+
+    deltas = {key: cents for key, cents in deltas.items() if cents}
+    if not deltas:
+        return
+
+    # Lock The Counters Being Moved (One Query), So Concurrent Writers Add Up Instead Of Overwriting.
+    budget_ids = {budget_id for budget_id, _ in deltas}
+    periods = {period for _, period in deltas}
+    counters = {
+        (budget_id, period): (counter_id, spent_cents, alert_level)
+        for counter_id, budget_id, period, spent_cents, alert_level in db.query(
+            BudgetSpend.id, BudgetSpend.budget_id, BudgetSpend.period_start, BudgetSpend.spent_cents, BudgetSpend.alert_level
+        ).filter(
+            BudgetSpend.budget_id.in_(budget_ids),
+            BudgetSpend.period_start.in_(periods)
+        ).with_for_update()
+    }
+
+    now = datetime.now()
+    by_id = {budget.id: budget for budget in budgets}
+    created, updated, alerts = [], [], []
+    for (budget_id, period), cents in deltas.items():
+        counter_id, spent_cents, alert_level = counters.get((budget_id, period), (None, 0, 0))
+        spent_cents = (spent_cents or 0) + cents
+        level = _check_thresholds(by_id[budget_id], period, spent_cents, alert_level, now, alerts)
+        values = {"spent_cents": spent_cents, "alert_level": level, "updated_at": now}
+        if counter_id is None:
+            created.append({"user_id": by_id[budget_id].user_id, "budget_id": budget_id, "period_start": period, **values})
+        else:
+            updated.append({"id": counter_id, **values})
+
+    # One Batched Statement Each, However Many Months Were Touched.
+    if created:
+        db.bulk_insert_mappings(BudgetSpend, created)
+    if updated:
+        db.bulk_update_mappings(BudgetSpend, updated)
+    if alerts:
+        db.bulk_insert_mappings(BudgetAlert, alerts)
+
+# -------------------------------------------------------- Add Deltas.
+def _add(deltas: Dict[tuple, int], budget_id: int, day, amount: float, sign: int):
+    """Add One Row's Outflow (Cents) To A Budget's Month. Inflows And Undated Rows Don't Count."""
+
+    if day is not None and amount is not None and amount < 0:
+        key = (budget_id, _month_start(day))
+        deltas[key] = deltas.get(key, 0) - sign * int(round(amount * 100))
+
+# -------------------------------------------------------- Record Rows Spend.
+def record_rows_spend(db: Session, user_id: int, rows: Iterable[dict], sign: int = 1):
+    """Count Freshly Inserted Row Dicts ('date', 'amount', 'category_primary') Against Category Budgets. Caller Commits."""
+
+    # Tag Budgets Are Counted As The Rows' Links Are Inserted ('record_tag_links_spend').
+    category_budgets = {}
+    for budget in load_budgets(db, user_id):
+        if budget.category_primary:
+            category_budgets.setdefault(budget.category_primary, []).append(budget.id)
+    if not category_budgets:
+        return
+
+    deltas = {}
+    for row in rows:
+        for budget_id in category_budgets.get(row.get("category_primary"), ()):
+            _add(deltas, budget_id, row.get("date"), row.get("amount"), sign)
+    _apply_deltas(db, load_budgets(db, user_id), deltas)
+
+# -------------------------------------------------------- Record Transactions Spend.
+def record_transactions_spend(db: Session, user_id: int, criteria: list, sign: int):
+    """Count Stored Transactions Matching 'criteria' In (+1) Or Out (-1) Of Budgets. Caller Commits."""
+
+    # Called With -1 Before A Delete. Tag Budgets Move Through The Rows' Links (A Deleted Row Takes Them With It).
+    budgets = load_budgets(db, user_id)
+    category_budgets, tag_budgets = {}, {}
+    for budget in budgets:
+        if budget.category_primary:
+            category_budgets.setdefault(budget.category_primary, []).append(budget.id)
+        elif budget.tag_id:
+            tag_budgets.setdefault(budget.tag_id, []).append(budget.id)
+    if not category_budgets and not tag_budgets:
+        return
+
+    # Outflows Only, Each With Its Links To Budgeted Tags (One Query - A Row Repeats Per Link).
+    query = db.query(Transaction.id, Transaction.date, Transaction.amount, Transaction.category_primary)
+    if tag_budgets:
+        query = query.add_columns(TransactionTag.tag_id).outerjoin(TransactionTag, and_(
+            TransactionTag.transaction_id == Transaction.id,
+            TransactionTag.tag_id.in_(list(tag_budgets))
+        ))
+    deltas, seen = {}, set()
+    for row in query.filter(Transaction.user_id == user_id, Transaction.amount < 0, *criteria):
+        transaction_id, day, amount, category = row[:4]
+        if transaction_id not in seen:
+            seen.add(transaction_id)
+            for budget_id in category_budgets.get(category, ()):
+                _add(deltas, budget_id, day, amount, sign)
+        if tag_budgets and row[4] is not None:
+            for budget_id in tag_budgets[row[4]]:
+                _add(deltas, budget_id, day, amount, sign)
+    _apply_deltas(db, budgets, deltas)
+
+# -------------------------------------------------------- Record Recategorize Spend.
+def record_recategorize_spend(db: Session, user_id: int, criteria: list, category: Optional[str]):
+    """Move Stored Transactions Matching 'criteria' From Their Category's Budgets To 'category's. Caller Commits."""
+
+    # Called Before The UPDATE. Tag Links Don't Change, So Tag Budgets Don't Either.
+    budgets = load_budgets(db, user_id)
+    category_budgets = {}
+    for budget in budgets:
+        if budget.category_primary:
+            category_budgets.setdefault(budget.category_primary, []).append(budget.id)
+    if not category_budgets:
+        return
+
+    deltas = {}
+    for day, amount, previous in db.query(Transaction.date, Transaction.amount, Transaction.category_primary).filter(
+        Transaction.user_id == user_id, Transaction.amount < 0, *criteria
+    ):
+        if previous == category:
+            continue
+        for budget_id in category_budgets.get(previous, ()):
+            _add(deltas, budget_id, day, amount, -1)
+        for budget_id in category_budgets.get(category, ()):
+            _add(deltas, budget_id, day, amount, 1)
+    _apply_deltas(db, budgets, deltas)
+
+# -------------------------------------------------------- Record Tag Links Spend.
+def record_tag_links_spend(db: Session, user_id: int, links: Iterable, sign: int):
+    """Count (Transaction ID, Tag ID) Links About To Be Added (+1) Or Removed (-1) Against Tag Budgets. Caller Commits."""
+
+    # Called Before The Write : Links That Already Exist (When Adding) Or Don't (When Removing) Are Skipped.
+    budgets = load_budgets(db, user_id)
+    tag_budgets = {}
+    for budget in budgets:
+        if budget.tag_id and not budget.category_primary:
+            tag_budgets.setdefault(budget.tag_id, []).append(budget.id)
+    links = {(transaction_id, tag_id) for transaction_id, tag_id in links if tag_id in tag_budgets}
+    if not links:
+        return
+
+    # The Outflows These Links Point At, With Which Budgeted Tags They Carry Now (One Query Per Chunk).
+    ids = list({transaction_id for transaction_id, _ in links})
+    existing, rows = set(), {}
+    for start in range(0, len(ids), LOOKUP_CHUNK_SIZE):
+        for transaction_id, day, amount, tag_id in db.query(
+            Transaction.id, Transaction.date, Transaction.amount, TransactionTag.tag_id
+        ).outerjoin(TransactionTag, and_(
+            TransactionTag.transaction_id == Transaction.id,
+            TransactionTag.tag_id.in_(list(tag_budgets))
+        )).filter(
+            Transaction.id.in_(ids[start:start + LOOKUP_CHUNK_SIZE]),
+            Transaction.user_id == user_id,
+            Transaction.amount < 0
+        ):
+            rows[transaction_id] = (transaction_id, day, amount)
+            if tag_id is not None:
+                existing.add((transaction_id, tag_id))
+
+    deltas = {}
+    for transaction_id, tag_id in links:
+        if ((transaction_id, tag_id) in existing) == (sign > 0) or transaction_id not in rows:
+            continue
+        _, day, amount = rows[transaction_id]
+        for budget_id in tag_budgets[tag_id]:
+            _add(deltas, budget_id, day, amount, sign)
+    _apply_deltas(db, budgets, deltas)
+
+# -------------------------------------------------------- Rebuild Budget Spend.
+def rebuild_budget_spend(db: Session, budget: Budget):
+    """Seed A Budget's Monthly Counters From History (One Scan, On Create Or Edit). Caller Commits."""
+
+    # Keep This Month's Alert Level, So Editing A Budget Doesn't Re-Raise An Alert Already Sent.
+    previous = db.query(BudgetSpend).filter(
+        BudgetSpend.budget_id == budget.id, BudgetSpend.period_start == _month_start(datetime.now())
+    ).first()
+    current_level = previous.alert_level if previous else 0
+    db.query(BudgetSpend).filter(BudgetSpend.budget_id == budget.id).delete(synchronize_session=False)
+    _forget_budgets(db, budget.user_id)
+    if not budget.is_active:
+        return
+
+    # Outflows In The Category, Or On The Tag.
+    query = db.query(Transaction.date, Transaction.amount).filter(
+        Transaction.user_id == budget.user_id, Transaction.amount < 0
+    )
+    if budget.category_primary:
+        query = query.filter(Transaction.category_primary == budget.category_primary)
+    else:
+        query = query.join(TransactionTag, TransactionTag.transaction_id == Transaction.id).filter(
+            TransactionTag.tag_id == budget.tag_id
+        )
+    deltas = {}
+    for day, amount in query:
+        _add(deltas, budget.id, day, amount, 1)
+
+    # New Counters, Checked Against The Thresholds (Only This Month's Can Alert), Inserted As One Batch.
+    now = datetime.now()
+    counters, alerts = [], []
+    for (_, period), cents in deltas.items():
+        level = current_level if period == _month_start(now) else 0
+        counters.append({
+            "user_id": budget.user_id,
+            "budget_id": budget.id,
+            "period_start": period,
+            "spent_cents": cents,
+            "alert_level": _check_thresholds(budget, period, cents, level, now, alerts),
+            "updated_at": now
+        })
+    if counters:
+        db.bulk_insert_mappings(BudgetSpend, counters)
+    if alerts:
+        db.bulk_insert_mappings(BudgetAlert, alerts)
+
+# -------------------------------------------------------- Delete Budgets.
+def delete_budgets(db: Session, user_id: int, budget_ids: List[int]) -> int:
+    """Delete Budgets With Their Counters And Alerts. Returns Budgets Deleted. Caller Commits."""
+
+    if not budget_ids:
+        return 0
+    db.query(BudgetSpend).filter(BudgetSpend.budget_id.in_(budget_ids)).delete(synchronize_session=False)
+    db.query(BudgetAlert).filter(BudgetAlert.budget_id.in_(budget_ids)).delete(synchronize_session=False)
+    deleted = db.query(Budget).filter(Budget.id.in_(budget_ids), Budget.user_id == user_id).delete(synchronize_session=False)
+    _forget_budgets(db, user_id)
+    return deleted
+
+# -------------------------------------------------------- Budget Status.
+def budget_status(budget: Budget, counter: Optional[BudgetSpend], period_start: date) -> dict:
+    """Format A Budget With Its Counter For A Month (No Counter Means Nothing Spent)."""
+
+    spent = round((counter.spent_cents if counter else 0) / 100, 2)
+    return {
+        "id": budget.id,
+        "name": budget.name,
+        "category_primary": budget.category_primary,
+        "tag_id": budget.tag_id,
+        "monthly_limit": budget.monthly_limit,
+        "is_active": budget.is_active,
+        "period_start": period_start,
+        "spent": spent,
+        "remaining": round(budget.monthly_limit - spent, 2),
+        "percent_used": round(spent / budget.monthly_limit * 100, 1) if budget.monthly_limit else 0.0,
+        "alert_level": counter.alert_level if counter else 0,
+        "created_at": budget.created_at,
+        "updated_at": budget.updated_at
+    }
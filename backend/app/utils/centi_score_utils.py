@@ -1,7 +1,12 @@
 # Centi Score Utils.
 #
+# Note : The Cash Flow Component Uses The Month's To-Date Net By Default, Which Swings Early In The Month. With
+#        'CENTI_SCORE_USE_FORECAST' On, It Uses The Projected Full-Month Net From 'forecast_utils' Instead
+#        (Month-To-Date Plus Projected Recurring Items And Seasonal Baseline); 'monthly_cash_flow' Is Still Reported.
+#
 # Functions :
 #   - 'calculate_centi_score' - Calculate Centi Score Based On Financial Metrics.
+#   - 'calculate_centi_scores_batch' - Vectorized Centi Score For Many Sets Of Financial Metrics At Once.
 #   - 'get_user_financial_data' - Get Current Financial Data For A User To Calculate Their Score.
 #   - 'create_weekly_score' - Create A Weekly Centi Score For A User.
 #   - 'get_weekly_score' - Get A Specific Weekly Score For A User.
@@ -14,15 +19,27 @@
 #   - 'check_user_centi_score_status' - Check If A User Has Centi Score Data And Provide A Comprehensive Status.
 
 # Imports.
+import os
 import math
 from sqlalchemy import func
 from sqlalchemy.orm import Session
-from typing import Dict, Optional, List
+from typing import Any, Dict, Optional, List
 from datetime import datetime, date, timedelta
 
 # Local Imports.
-from ..database import WeeklyCentiScore, Transaction, Account
+from ..database import WeeklyCentiScore, Transaction, Account, User
 from .account_utils import calculate_account_financial_impact
+from .forecast_utils import forecast_month_cash_flow
+from .score_analytics_utils import (
+    get_score_analytics,
+    get_recent_weekly_scores,
+    build_score_status,
+    build_growth_analysis,
+    build_score_summary
+)
+
+# Settings.
+CENTI_SCORE_USE_FORECAST = os.getenv("CENTI_SCORE_USE_FORECAST", "false").lower() == "true"
 
 # -------------------------------------------------------- Calculate Centi Score.
 def calculate_centi_score(
@@ -30,7 +47,8 @@ def calculate_centi_score(
     total_assets: float,
     total_liabilities: float,
     monthly_cash_flow: float,
-    transaction_count: int
+    transaction_count: int,
+    forecast_cash_flow: Optional[float] = None
 ) -> Dict:
     """Calculate Centi Score Based On Financial Metrics. Returns Both Total Score And Breakdown Of Components."""
     
@@ -58,13 +76,14 @@ def calculate_centi_score(
         liability_ratio = min(1, total_liabilities / 50000)  # Cap At $50k.
         liabilities_score = max(0, int(20 * (1 - liability_ratio)))
     
-    # Cash Flow Contribution (Up To 10 Points).
-    if monthly_cash_flow > 0:
+    # Cash Flow Contribution (Up To 10 Points), From The Projected Full Month When A Forecast Is Given.
+    cash_flow = monthly_cash_flow if forecast_cash_flow is None else forecast_cash_flow
+    if cash_flow > 0:
         # Positive Cash Flow Gets Points.
-        cash_flow_score = min(10, int((monthly_cash_flow / 5000) * 10))
+        cash_flow_score = min(10, int((cash_flow / 5000) * 10))
     else:
         # Negative cash flow gets penalty
-        cash_flow_score = max(-5, int((monthly_cash_flow / 2000) * 5))
+        cash_flow_score = max(-5, int((cash_flow / 2000) * 5))
     
     # Calculate Total Score.
     total_score = max(0, min(100, net_worth_score + assets_score + liabilities_score + cash_flow_score))
@@ -79,13 +98,72 @@ def calculate_centi_score(
             "net_worth": {"score": net_worth_score, "max": 40, "value": net_worth},
             "assets": {"score": assets_score, "max": 30, "value": total_assets},
             "liabilities": {"score": liabilities_score, "max": 20, "value": total_liabilities},
-            "cash_flow": {"score": cash_flow_score, "max": 10, "value": monthly_cash_flow}
+            "cash_flow": {
+                "score": cash_flow_score, "max": 10, "value": cash_flow,
+                "basis": "month_to_date" if forecast_cash_flow is None else "forecast"
+            }
         }
     }
 
+# -------------------------------------------------------- Calculate Centi Scores Batch.
+def calculate_centi_scores_batch(
+    net_worth,
+    total_assets,
+    total_liabilities,
+    monthly_cash_flow
+) -> Dict[str, Any]:
+    """Vectorized Centi Score For Many Sets Of Financial Metrics At Once. Mirrors 'calculate_centi_score' Exactly."""
+
+    # Only Batch Scoring Needs numpy, So Keep It Out Of App Startup.
+    import numpy as np
+
+    # Coerce Inputs To Float Arrays.
+    net_worth = np.asarray(net_worth, dtype=np.float64)
+    total_assets = np.asarray(total_assets, dtype=np.float64)
+    total_liabilities = np.asarray(total_liabilities, dtype=np.float64)
+    monthly_cash_flow = np.asarray(monthly_cash_flow, dtype=np.float64)
+
+    # Net Worth & Assets Contributions (Logarithmic, Only For Positive Values). 'np.trunc' Matches 'int()'.
+    net_worth_score = np.where(
+        net_worth > 0,
+        np.minimum(40, np.trunc(np.log10(np.maximum(net_worth, 0) + 1) / 5 * 40)),
+        0
+    )
+    assets_score = np.where(
+        total_assets > 0,
+        np.minimum(30, np.trunc(np.log10(np.maximum(total_assets, 0) + 1) / 5 * 30)),
+        0
+    )
+
+    # Liabilities Contribution (Full Points For No Liabilities, Penalty Capped At $50k).
+    liability_ratio = np.minimum(1, total_liabilities / 50000)
+    liabilities_score = np.where(
+        total_liabilities == 0,
+        20,
+        np.maximum(0, np.trunc(20 * (1 - liability_ratio)))
+    )
+
+    # Cash Flow Contribution (Points For Positive, Penalty For Negative).
+    cash_flow_score = np.where(
+        monthly_cash_flow > 0,
+        np.minimum(10, np.trunc(monthly_cash_flow / 5000 * 10)),
+        np.maximum(-5, np.trunc(monthly_cash_flow / 2000 * 5))
+    )
+
+    # Calculate Total Score.
+    total_score = np.clip(net_worth_score + assets_score + liabilities_score + cash_flow_score, 0, 100)
+
+    return {
+        "total_score": total_score.astype(np.int64),
+        "net_worth_score": net_worth_score.astype(np.int64),
+        "assets_score": assets_score.astype(np.int64),
+        "liabilities_score": liabilities_score.astype(np.int64),
+        "cash_flow_score": cash_flow_score.astype(np.int64)
+    }
+
 # -------------------------------------------------------- Get User Financial Data.
-def get_user_financial_data(db: Session, user_id: int) -> Dict:
-    """Get Current Financial Data For A User To Calculate Their Score."""
+def get_user_financial_data(db: Session, user_id: int, use_forecast: Optional[bool] = None) -> Dict:
+    """Get Current Financial Data For A User To Calculate Their Score (Plus The Forecast Cash Flow If Enabled)."""
 
     # Get Current Date And Calculate Time Periods.
     now = datetime.now()
@@ -117,7 +195,7 @@ def get_user_financial_data(db: Session, user_id: int) -> Dict:
         Transaction.user_id == user_id
     ).count()
     
-    return {
+    financial_data = {
         "net_worth": net_worth,
         "total_assets": total_assets,
         "total_liabilities": total_liabilities,
@@ -125,6 +203,14 @@ def get_user_financial_data(db: Session, user_id: int) -> Dict:
         "transaction_count": transaction_count
     }
 
+    # Projected Full-Month Net (Smoother Than To-Date Early In The Month).
+    if CENTI_SCORE_USE_FORECAST if use_forecast is None else use_forecast:
+        user = db.query(User).filter(User.id == user_id).first()
+        if user is not None:
+            financial_data["forecast_cash_flow"] = forecast_month_cash_flow(db, user)
+    
+    return financial_data
+
 # -------------------------------------------------------- Create Weekly Score.
 def create_weekly_score(db: Session, user_id: int, score_date: date) -> WeeklyCentiScore:
     """Create A Weekly Centi Score For A User."""
@@ -138,7 +224,8 @@ def create_weekly_score(db: Session, user_id: int, score_date: date) -> WeeklyCe
         total_assets=financial_data["total_assets"],
         total_liabilities=financial_data["total_liabilities"],
         monthly_cash_flow=financial_data["monthly_cash_flow"],
-        transaction_count=financial_data["transaction_count"]
+        transaction_count=financial_data["transaction_count"],
+        forecast_cash_flow=financial_data.get("forecast_cash_flow")
     )
     
     # Check If Score Already Exists For This Week.
@@ -159,6 +246,7 @@ def create_weekly_score(db: Session, user_id: int, score_date: date) -> WeeklyCe
         existing_score.total_liabilities = financial_data["total_liabilities"]
         existing_score.monthly_cash_flow = financial_data["monthly_cash_flow"]
         existing_score.transaction_count = financial_data["transaction_count"]
+        existing_score.is_reconstructed = False
         db.commit()
         return existing_score
     else:
@@ -175,7 +263,8 @@ def create_weekly_score(db: Session, user_id: int, score_date: date) -> WeeklyCe
             total_assets=financial_data["total_assets"],
             total_liabilities=financial_data["total_liabilities"],
             monthly_cash_flow=financial_data["monthly_cash_flow"],
-            transaction_count=financial_data["transaction_count"]
+            transaction_count=financial_data["transaction_count"],
+            is_reconstructed=False
         )
         db.add(weekly_score)
         db.commit()
@@ -253,249 +342,22 @@ def calculate_score_trend(scores: List[WeeklyCentiScore]) -> Dict:
 def get_detailed_growth_analysis(db: Session, user_id: int) -> Dict:
     """Get Detailed Growth Analysis Including Monthly Comparisons And Streaks."""
 
-    # Get All Scores For The User.
-    all_scores = db.query(WeeklyCentiScore).filter(
-        WeeklyCentiScore.user_id == user_id
-    ).order_by(WeeklyCentiScore.score_date.desc()).all()
-    
-    if len(all_scores) < 2:
-        return {
-            "has_growth_data": False,
-            "message": "Need at least 2 weeks of data to show growth analysis"
-        }
-    
-    # Calculate Basic Trend.
-    trend_data = calculate_score_trend(all_scores)
-    
-    # Calculate Monthly Comparison.
-    current_month = datetime.now().month
-    current_year = datetime.now().year
-    
-    # Get Current And Previous Month Scores.
-    current_month_scores = [s for s in all_scores if s.score_date.month == current_month and s.score_date.year == current_year]
-    previous_month_scores = [s for s in all_scores if s.score_date.month == (current_month - 1 if current_month > 1 else 12) and s.score_date.year == (current_year if current_month > 1 else current_year - 1)]
-    
-    monthly_comparison = None
-    if current_month_scores and previous_month_scores:
-        current_month_avg = sum(s.total_score for s in current_month_scores) / len(current_month_scores)
-        previous_month_avg = sum(s.total_score for s in previous_month_scores) / len(previous_month_scores)
-        monthly_change = current_month_avg - previous_month_avg
-        monthly_comparison = {
-            "current_month_avg": round(current_month_avg, 1),
-            "previous_month_avg": round(previous_month_avg, 1),
-            "change": round(monthly_change, 1),
-            "change_percentage": round((monthly_change / previous_month_avg * 100) if previous_month_avg > 0 else 0, 1)
-        }
-    
-    # Calculate Growth Streak.
-    growth_streak = 0
-    decline_streak = 0
-    current_streak = 0
-    streak_type = "stable"
-    
-    for i in range(len(all_scores) - 1):
-        # Get Current And Next Score.
-        current_score = all_scores[i].total_score
-        next_score = all_scores[i + 1].total_score
-        
-        # Check If Current Score Is Greater Than Next Score.
-        if current_score > next_score:
-            if streak_type == "improving":
-                growth_streak = max(growth_streak, current_streak)
-                current_streak = 1
-                streak_type = "improving"
-            else:
-                current_streak += 1
-                streak_type = "improving"
-        elif current_score < next_score:
-            if streak_type == "declining":
-                decline_streak = max(decline_streak, current_streak)
-                current_streak = 1
-                streak_type = "declining"
-            else:
-                current_streak += 1
-                streak_type = "declining"
-        else:
-            # Reset Streak On Stable Scores.
-            if streak_type == "improving":
-                growth_streak = max(growth_streak, current_streak)
-            elif streak_type == "declining":
-                decline_streak = max(decline_streak, current_streak)
-            current_streak = 0
-            streak_type = "stable"
-    
-    # Update Final Streaks.
-    if streak_type == "improving":
-        growth_streak = max(growth_streak, current_streak)
-    elif streak_type == "declining":
-        decline_streak = max(decline_streak, current_streak)
-    
-    # Calculate Best & Worst Scores.
-    best_score = max(s.total_score for s in all_scores)
-    worst_score = min(s.total_score for s in all_scores)
-    best_score_date = next(s.score_date for s in all_scores if s.total_score == best_score)
-    worst_score_date = next(s.score_date for s in all_scores if s.total_score == worst_score)
-    
-    # Calculate Average Score.
-    avg_score = sum(s.total_score for s in all_scores) / len(all_scores)
-    
-    return {
-        "has_growth_data": True,
-        "current_score": all_scores[0].total_score if all_scores else 0,
-        "previous_score": all_scores[1].total_score if len(all_scores) > 1 else 0,
-        "trend": trend_data,
-        "monthly_comparison": monthly_comparison,
-        "streaks": {
-            "current_growth_streak": growth_streak,
-            "current_decline_streak": decline_streak,
-            "longest_growth_streak": growth_streak,
-            "longest_decline_streak": decline_streak
-        },
-        "stats": {
-            "total_scores": len(all_scores),
-            "best_score": best_score,
-            "best_score_date": best_score_date,
-            "worst_score": worst_score,
-            "worst_score_date": worst_score_date,
-            "average_score": round(avg_score, 1),
-            "score_range": best_score - worst_score
-        },
-        "recent_scores": [
-            {
-                "date": score.score_date,
-                "score": score.total_score,
-                "net_worth": score.net_worth,
-                "assets": score.total_assets,
-                "liabilities": score.total_liabilities,
-                "cash_flow": score.monthly_cash_flow
-            }
-            for score in all_scores[:8]  # Last 8 weeks
-        ]
-    }
+    # Stats & Streaks Come From One Aggregate Query, Plus The Last 8 Rows For The Chart.
+    analytics = get_score_analytics(db, user_id)
+    recent = get_recent_weekly_scores(db, user_id, 8) if analytics else []
+    return build_growth_analysis(analytics, recent)
 
 # -------------------------------------------------------- Get Score Growth Summary.
 def get_score_growth_summary(db: Session, user_id: int) -> Dict:
     """Get A Quick Summary Of Score Growth For Display In UI."""
 
-    latest_score = get_latest_weekly_score(db, user_id)
-    if not latest_score:
-        return {
-            "has_data": False,
-            "message": "No Centi Score data available"
-        }
-    
-    # Get The Previous Score.
-    previous_score = db.query(WeeklyCentiScore).filter(
-        WeeklyCentiScore.user_id == user_id,
-        WeeklyCentiScore.score_date < latest_score.score_date
-    ).order_by(WeeklyCentiScore.score_date.desc()).first()
-    
-    if not previous_score:
-        return {
-            "has_data": True,
-            "current_score": latest_score.total_score,
-            "is_first_score": True,
-            "message": "This is your first Centi Score! Keep adding financial data to see your growth."
-        }
-    
-    # Calculate Change And Change Percentage.
-    change = latest_score.total_score - previous_score.total_score
-    change_percentage = ((change / previous_score.total_score) * 100) if previous_score.total_score > 0 else 0
-    
-    # Determine Growth Message.
-    if change > 0:
-        if change >= 5:
-            growth_message = f"Great progress! Your score increased by {change} points."
-        elif change >= 2:
-            growth_message = f"Nice improvement! Your score went up by {change} points."
-        else:
-            growth_message = f"Small gain of {change} points."
-    elif change < 0:
-        if change <= -5:
-            growth_message = f"Score dropped by {abs(change)} points - Time to review your finances."
-        elif change <= -2:
-            growth_message = f"Score decreased by {abs(change)} points"
-        else:
-            growth_message = f"Small decrease of {abs(change)} points"
-    else:
-        growth_message = "Your score stayed the same"
-    
-    return {
-        "has_data": True,
-        "current_score": latest_score.total_score,
-        "previous_score": previous_score.total_score,
-        "change": change,
-        "change_percentage": round(change_percentage, 1),
-        "growth_message": growth_message,
-        "last_updated": latest_score.created_at,
-        "score_date": latest_score.score_date
-    }
+    return build_score_summary(get_score_analytics(db, user_id))
 
 # -------------------------------------------------------- Check User Centi Score Status.
 def check_user_centi_score_status(db: Session, user_id: int) -> Dict:
     """Check If A User Has Centi Score Data And Provide A Comprehensive Status."""
 
-    # Get All Scores For The User.
-    all_scores = db.query(WeeklyCentiScore).filter(
-        WeeklyCentiScore.user_id == user_id
-    ).order_by(WeeklyCentiScore.score_date.desc()).all()
-    
-    if not all_scores:
-        return {
-            "has_centi_scores": False,
-            "total_scores": 0,
-            "message": "No Centi Score data found. Add financial data and calculate your first score!",
-            "can_calculate": True
-        }
-    
-    # Get Latest Score.
-    latest_score = all_scores[0]
-    total_scores = len(all_scores)
-    
-    # Calculate Basic Stats.
-    best_score = max(s.total_score for s in all_scores)
-    worst_score = min(s.total_score for s in all_scores)
-    avg_score = sum(s.total_score for s in all_scores) / total_scores
-    
-    # Determine Score Trend.
-    if total_scores >= 2:
-        trend = "improving" if latest_score.total_score > all_scores[1].total_score else "declining" if latest_score.total_score < all_scores[1].total_score else "stable"
-        change = latest_score.total_score - all_scores[1].total_score
-    else:
-        trend = "new"
-        change = 0
-    
-    # Calculate Weeks Tracked.
-    if total_scores > 0:
-        first_score_date = all_scores[-1].score_date
-        last_score_date = all_scores[0].score_date
-        weeks_tracked = (last_score_date - first_score_date).days // 7 + 1
-    else:
-        weeks_tracked = 0
-    
-    return {
-        "has_centi_scores": True,
-        "total_scores": total_scores,
-        "weeks_tracked": weeks_tracked,
-        "latest_score": latest_score.total_score,
-        "latest_score_date": latest_score.score_date,
-        "best_score": best_score,
-        "worst_score": worst_score,
-        "average_score": round(avg_score, 1),
-        "trend": trend,
-        "change": change,
-        "last_updated": latest_score.created_at,
-        "message": f"You have {total_scores} Centi Score{'s' if total_scores > 1 else ''} tracked over {weeks_tracked} week{'s' if weeks_tracked > 1 else ''}",
-        "can_calculate": True,
-        "score_history": [
-            {
-                "date": score.score_date,
-                "score": score.total_score,
-                "net_worth": score.net_worth,
-                "assets": score.total_assets,
-                "liabilities": score.total_liabilities,
-                "cash_flow": score.monthly_cash_flow
-            }
-            for score in all_scores[:12]  # Last 12 scores
-        ]
-    } 
\ No newline at end of file
+    # Stats Come From One Aggregate Query, Plus The Last 12 Rows For The History Chart.
+    analytics = get_score_analytics(db, user_id)
+    recent = get_recent_weekly_scores(db, user_id, 12) if analytics else []
+    return build_score_status(analytics, recent)
@@ -0,0 +1,103 @@
+# Compare Utils.
+#
+# Note : Answers "These Date Ranges x These Categories/Accounts" From The Analytics Cache's Prefix Sums, So Each
+#        Range Costs Two Binary Searches Per Group However Long It Is - No Scans And No SQL Beyond The Cache Load.
+#        Ranges Are Written As 'YYYY-MM-DD:YYYY-MM-DD', A Month ('2024-07') Or A Quarter ('2024-Q3');
+#        'trailing_periods' Builds "Last N Days vs The N Before" Style Ranges.
+#
+# Functions :
+#   - 'parse_period' - Parse One Range Spec Into (Start, End) Dates.
+#   - 'trailing_periods' - Consecutive N-Day Ranges Ending Today (Most Recent First).
+#   - 'compare_periods' - Income, Spending, Net And Count Per Range, Overall And Per Group.
+
+# Imports.
+import re
+import calendar
+from datetime import date, timedelta
+from typing import List, Optional, Tuple
+
+# Local Imports.
+from app.utils.analytics_cache import PrefixSums
+
+# Most Ranges One Request May Compare.
+MAX_COMPARE_RANGES = 24
+
+# Dimensions Comparisons Can Be Grouped By.
+COMPARE_GROUPS = ("category", "account")
+
+_MONTH = re.compile(r"^(\d{4})-(\d{2})$")
+_QUARTER = re.compile(r"^(\d{4})-[Qq]([1-4])$")
+
+# -------------------------------------------------------- Parse Period.
+def parse_period(spec: str) -> Tuple[date, date]:
+    """Parse 'YYYY-MM-DD:YYYY-MM-DD', 'YYYY-MM' Or 'YYYY-Qn' Into (Start, End). Raises ValueError."""
+
+    spec = spec.strip()
+    month, quarter = _MONTH.match(spec), _QUARTER.match(spec)
+    if month:
+        year, number = int(month.group(1)), int(month.group(2))
+        return date(year, number, 1), date(year, number, calendar.monthrange(year, number)[1])
+    if quarter:
+        year, first_month = int(quarter.group(1)), (int(quarter.group(2)) - 1) * 3 + 1
+        last_month = first_month + 2
+        return date(year, first_month, 1), date(year, last_month, calendar.monthrange(year, last_month)[1])
+
+    start, separator, end = spec.partition(":")
+    if not separator:
+        raise ValueError(f"Invalid range {spec!r}: use YYYY-MM-DD:YYYY-MM-DD, YYYY-MM or YYYY-Qn")
+    start, end = date.fromisoformat(start), date.fromisoformat(end)
+    if end < start:
+        raise ValueError(f"Invalid range {spec!r}: end is before start")
+    return start, end
+
+# -------------------------------------------------------- Trailing Periods.
+def trailing_periods(days: int, count: int, today: Optional[date] = None) -> List[Tuple[date, date]]:
+    """Consecutive 'days'-Long Ranges Ending Today, Most Recent First."""
+
+    end = today or date.today()
+    periods = []
+    for _ in range(count):
+        start = end - timedelta(days=days - 1)
+        periods.append((start, end))
+        end = start - timedelta(days=1)
+    return periods
+
+# -------------------------------------------------------- Compare Periods.
+def compare_periods(
+    overall: PrefixSums,
+    periods: List[Tuple[date, date]],
+    grouped: Optional[PrefixSums] = None,
+    groups: Optional[List[str]] = None
+) -> dict:
+    """Income, Spending, Net And Count Per Range, Overall And (With 'grouped') Per Group."""
+
+    import numpy as np
+    starts = np.array([start.toordinal() for start, _ in periods], dtype=np.int64)
+    ends = np.array([end.toordinal() for _, end in periods], dtype=np.int64)
+
+    def values(prefix: PrefixSums, code: int) -> list:
+        income, spending, count = prefix.range_totals(code, starts, ends)
+        return [
+            {
+                "income": int(income[i]) / 100,
+                "spending": int(spending[i]) / 100,
+                "net": int(income[i] + spending[i]) / 100,
+                "count": int(count[i])
+            }
+            for i in range(len(periods))
+        ]
+
+    result = {
+        "ranges": [{"start": start.isoformat(), "end": end.isoformat()} for start, end in periods],
+        "totals": values(overall, 0)
+    }
+
+    if grouped is not None:
+        wanted = set(groups) if groups else None
+        result["groups"] = [
+            {"group": label, "values": values(grouped, code)}
+            for code, label in enumerate(grouped.labels)
+            if wanted is None or label in wanted
+        ]
+
+    return result
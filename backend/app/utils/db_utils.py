@@ -1,28 +1,86 @@
 # DB Utils.
 #
+# Note : GET Requests Read From The Replica ('DATABASE_REPLICA_URL'; The Primary When Unset) So Dashboard Reads Don't
+#        Compete With Imports And The Scheduler's Batch Writes. Replica Sessions Are Read-Only, So A GET Route That
+#        Needs To Write Depends On 'get_primary_db' Instead. After A Successful Write Request The Response Sets A
+#        Short-Lived Cookie That Pins That Browser's Reads To The Primary ('REPLICA_STICKY_SECONDS'), So Users See
+#        Their Own Writes Even While The Replica Lags.
+#
 # Functions :
-#   - 'get_db' - Get Database Session.
+#   - 'reads_from_replica' - Whether A Request's Reads Can Go To The Replica.
+#   - 'get_db' - Get Database Session (Replica For Reads, Primary For Writes).
+#   - 'get_primary_db' - Get Database Session On The Primary (GET Routes That Write).
+#   - 'get_async_db' - Get Async Database Session (Replica For Reads, Primary For Writes).
 #   - 'check_db_connection' - Check Database Connection.
+#   - 'ReadYourWritesMiddleware' - Pin A Browser's Reads To The Primary For A While After It Writes.
 
 # Imports.
-from app.database import get_session
-from fastapi import HTTPException, status
+import os
+import time
+from app.database import get_session, get_async_session, get_replica_session, get_async_replica_session
+from fastapi import HTTPException, Request, status
+
+# Replica Settings.
+REPLICA_STICKY_SECONDS = int(os.getenv("REPLICA_STICKY_SECONDS", "10"))   # Reads Stay On The Primary This Long After A Write.
+STICKY_COOKIE = "read_primary_until"                                      # Holds The Unix Time The Pin Ends.
+READ_METHODS = ("GET", "HEAD")
+
+# -------------------------------------------------------- Reads From Replica.
+def reads_from_replica(request: Request) -> bool:
+    """Whether A Request's Reads Can Go To The Replica (Read Method, And No Recent Write From This Browser)."""
+
+    if request.method not in READ_METHODS:
+        return False
+    pinned_until = request.cookies.get(STICKY_COOKIE)
+    try:
+        return pinned_until is None or float(pinned_until) <= time.time()
+    except ValueError:
+        return True
 
 # -------------------------------------------------------- Get Database Session.
-def get_db():
-    db = get_session()   # Get database session (may be None if connection failed)
+def get_db(request: Request):
+    db = get_replica_session() if reads_from_replica(request) else get_session()   # Get database session (may be None if connection failed)
     if db is None:
         # If no database connection, raise an error instead of yielding None
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail="Database connection is not available. Please try again later."
         )
-    
+
     try:
         yield db          # Provide The Session To The Route That Depends On it.
     finally:
         db.close()        # Ensure Session Is Properly Closed After Request Finishes.
 
+# -------------------------------------------------------- Get Primary Database Session.
+def get_primary_db():
+    db = get_session()   # Always The Primary, Whatever The Method.
+    if db is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Database connection is not available. Please try again later."
+        )
+
+    try:
+        yield db
+    finally:
+        db.close()
+
+# -------------------------------------------------------- Get Async Database Session.
+async def get_async_db(request: Request):
+    # Get async database session (may be None if the async driver is unavailable)
+    db = get_async_replica_session() if reads_from_replica(request) else get_async_session()
+    if db is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Database connection is not available. Please try again later."
+        )
+
+    try:
+        yield db          # Provide The Session To The Route That Depends On it.
+    finally:
+        await db.close()  # Return The Connection To The Pool Without Blocking The Event Loop.
+
 # -------------------------------------------------------- Check Database Connection.
 def check_db_connection(db):
     """Check if database connection is available and raise appropriate error if not"""
@@ -31,4 +89,27 @@ def check_db_connection(db):
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail="Database connection is not available. Please try again later."
         )
-    return db
\ No newline at end of file
+    return db
+
+# -------------------------------------------------------- Read Your Writes Middleware.
+class ReadYourWritesMiddleware:
+    """ASGI Middleware That Pins A Browser's Reads To The Primary For A While After A Successful Write."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] in READ_METHODS + ("OPTIONS",) or REPLICA_STICKY_SECONDS <= 0:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                cookie = (
+                    f"{STICKY_COOKIE}={time.time() + REPLICA_STICKY_SECONDS:.0f}; Max-Age={REPLICA_STICKY_SECONDS}; "
+                    "Path=/; HttpOnly; Secure; SameSite=none"
+                )
+                message["headers"] = list(message.get("headers", [])) + [(b"set-cookie", cookie.encode("latin-1"))]
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,262 @@
+# Export Utils.
+#
+# Note : Streams A User's Transactions Out As CSV, NDJSON Or Parquet Without Loading Them All Into Memory.
+#        Rows Come From A Server-Side Cursor ('yield_per') As Plain Tuples And Are Encoded One Batch At A Time,
+#        So Memory Stays Flat Regardless Of Export Size And The First Bytes Go Out As Soon As The First Batch Is Read.
+#        Parquet Needs 'pyarrow', Which Is Optional And Only Imported When A Parquet Export Is Requested.
+#
+# Functions :
+#   - 'apply_transaction_filters' - Apply The Transaction Table's Filters (Dates, Account, Category, Source, Amount,
+#     Direction, Types, Tags) To A Query.
+#   - 'get_parquet_module' - Get The 'pyarrow' Modules If Installed, Otherwise None.
+#   - 'stream_transactions_export' - Stream A User's Transactions In The Requested Format.
+
+# Imports.
+import io
+import csv
+import json
+from datetime import date, datetime
+from sqlalchemy import case, func
+from sqlalchemy.orm import Session
+from typing import Iterator, List, Optional
+
+# Local Imports.
+from ..database import Transaction, TransactionTag, Account
+
+# Supported Formats -> (Media Type, File Extension).
+EXPORT_FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "parquet": ("application/vnd.apache.parquet", "parquet")
+}
+
+# Rows Fetched Per Round Trip And Encoded Per Chunk.
+EXPORT_BATCH_SIZE = 1000
+
+# Exported Columns, In Output Order.
+EXPORT_COLUMNS = [
+    ("id", Transaction.id),
+    ("transaction_id", Transaction.transaction_id),
+    ("date", Transaction.date),
+    ("amount", Transaction.amount),
+    ("vendor", Transaction.vendor),
+    ("merchant_name", Transaction.merchant_name),
+    ("description", Transaction.description),
+    ("category_primary", Transaction.category_primary),
+    ("category_detailed", Transaction.category_detailed),
+    ("transaction_type", Transaction.transaction_type),
+    ("account_id", Transaction.account_id),
+    ("account_name", case((Transaction.account_id.is_(None), "Cash"), else_=Account.name)),  # Matches '/transactions'.
+    ("source", Transaction.source),
+    ("file", Transaction.file),
+    ("iso_currency_code", Transaction.iso_currency_code),
+    ("payment_method", Transaction.payment_method),
+    ("notes", Transaction.notes),
+    ("created_at", Transaction.created_at),
+    ("updated_at", Transaction.updated_at)
+]
+EXPORT_FIELDS = [name for name, _ in EXPORT_COLUMNS]
+
+# -------------------------------------------------------- Apply Transaction Filters.
+def apply_transaction_filters(
+    query,
+    user_id: int,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    account_id: Optional[str] = None,
+    category: Optional[str] = None,
+    source: Optional[str] = None,
+    min_amount: Optional[float] = None,
+    max_amount: Optional[float] = None,
+    direction: Optional[str] = None,
+    categories: Optional[List[str]] = None,
+    tag_ids: Optional[List[int]] = None
+):
+    """Apply The Transaction Table's Filters (Dates, Account, Category, Source, Amount, Direction, Types, Tags) To A Query."""
+
+    query = query.filter(Transaction.user_id == user_id)
+
+    if start_date:
+        query = query.filter(Transaction.date >= start_date)
+    if end_date:
+        query = query.filter(Transaction.date <= end_date)
+    if account_id:
+        # "cash" Selects Transactions Without An Account.
+        if account_id == "cash":
+            query = query.filter(Transaction.account_id.is_(None))
+        else:
+            query = query.filter(Transaction.account_id == account_id)
+    if category:
+        query = query.filter(Transaction.category_primary == category)
+    if source:
+        query = query.filter(Transaction.source == source)
+
+    # Same Semantics As The Transactions Table : Amounts Compare By Size, Types Ignore Case, Any Listed Tag Matches.
+    if min_amount:
+        query = query.filter(func.abs(Transaction.amount) >= min_amount)
+    if max_amount:
+        query = query.filter(func.abs(Transaction.amount) <= max_amount)
+    if direction == "income":
+        query = query.filter(Transaction.amount > 0)
+    elif direction == "expense":
+        query = query.filter(Transaction.amount < 0)
+    if categories:
+        query = query.filter(func.lower(Transaction.category_primary).in_([category.lower() for category in categories]))
+    if tag_ids:
+        query = query.filter(Transaction.id.in_(
+            query.session.query(TransactionTag.transaction_id).filter(TransactionTag.tag_id.in_(tag_ids))
+        ))
+
+    return query
+
+# -------------------------------------------------------- Get Parquet Module.
+def get_parquet_module():
+    """Get The 'pyarrow' Modules If Installed, Otherwise None."""
+
+    try:
+        import pyarrow
+        import pyarrow.parquet
+        return pyarrow
+    except ImportError:
+        return None
+
+# -------------------------------------------------------- Iterate Export Rows.
+def _iter_batches(db: Session, user_id: int, filters: dict) -> Iterator[list]:
+    """Yield Lists Of Row Tuples From A Server-Side Cursor."""
+
+    query = db.query(*[column for _, column in EXPORT_COLUMNS]).outerjoin(
+        Account, Transaction.account_id == Account.account_id
+    )
+    query = apply_transaction_filters(query, user_id, **filters)
+    query = query.order_by(Transaction.date, Transaction.id).yield_per(EXPORT_BATCH_SIZE)
+
+    batch = []
+    for row in query:
+        batch.append(row)
+        if len(batch) >= EXPORT_BATCH_SIZE:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+# -------------------------------------------------------- JSON Value Helper.
+def _json_default(value):
+    """Serialize Dates As ISO Strings."""
+
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return str(value)
+
+# -------------------------------------------------------- CSV Encoder.
+def _encode_csv(batches: Iterator[list]) -> Iterator[bytes]:
+    """Encode Row Batches As CSV, Header First."""
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    writer.writerow(EXPORT_FIELDS)
+    yield buffer.getvalue().encode("utf-8")
+
+    for batch in batches:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(batch)
+        yield buffer.getvalue().encode("utf-8")
+
+# -------------------------------------------------------- NDJSON Encoder.
+def _encode_ndjson(batches: Iterator[list]) -> Iterator[bytes]:
+    """Encode Row Batches As Newline-Delimited JSON."""
+
+    for batch in batches:
+        lines = [json.dumps(dict(zip(EXPORT_FIELDS, row)), default=_json_default) for row in batch]
+        yield ("\n".join(lines) + "\n").encode("utf-8")
+
+# -------------------------------------------------------- Parquet Sink.
+class _ParquetSink:
+    """Write-Only File Object That Hands Written Bytes Back Out Instead Of Keeping Them."""
+
+    def __init__(self):
+        self.chunks = []
+        self.position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self.chunks.append(data)
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        # Parquet Footers Store Absolute Offsets, So Report The Total Written, Not The Buffered Size.
+        return self.position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
+
+# -------------------------------------------------------- Parquet Encoder.
+def _encode_parquet(batches: Iterator[list], pa) -> Iterator[bytes]:
+    """Encode Row Batches As Parquet, One Row Group Per Batch."""
+
+    strings = pa.string()
+    schema = pa.schema([
+        ("id", pa.int64()),
+        ("transaction_id", strings),
+        ("date", pa.date32()),
+        ("amount", pa.float64()),
+        ("vendor", strings),
+        ("merchant_name", strings),
+        ("description", strings),
+        ("category_primary", strings),
+        ("category_detailed", strings),
+        ("transaction_type", strings),
+        ("account_id", strings),
+        ("account_name", strings),
+        ("source", strings),
+        ("file", strings),
+        ("iso_currency_code", strings),
+        ("payment_method", strings),
+        ("notes", strings),
+        ("created_at", pa.timestamp("us")),
+        ("updated_at", pa.timestamp("us"))
+    ])
+
+    sink = _ParquetSink()
+    writer = pa.parquet.ParquetWriter(sink, schema, compression="snappy")
+    try:
+        for batch in batches:
+            columns = list(zip(*batch))
+            table = pa.Table.from_arrays(
+                [pa.array(values, type=field.type) for values, field in zip(columns, schema)],
+                schema=schema
+            )
+            writer.write_table(table)
+            yield sink.drain()
+    finally:
+        writer.close()
+
+    # Footer Is Written On Close.
+    yield sink.drain()
+
+# -------------------------------------------------------- Stream Transactions Export.
+def stream_transactions_export(db: Session, user_id: int, export_format: str, filters: dict) -> Iterator[bytes]:
+    """Stream A User's Transactions In The Requested Format, Closing 'db' When Done."""
+
+    # Request Sessions Can Close Before A Long Stream Finishes, So The Stream Owns A Session Of Its Own.
+    try:
+        batches = _iter_batches(db, user_id, filters)
+        if export_format == "csv":
+            yield from _encode_csv(batches)
+        elif export_format == "ndjson":
+            yield from _encode_ndjson(batches)
+        elif export_format == "parquet":
+            yield from _encode_parquet(batches, get_parquet_module())
+    finally:
+        db.close()
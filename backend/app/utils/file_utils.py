@@ -0,0 +1,89 @@
+# File Utils.
+#
+# Note : Transactions Point At The Upload They Came From Through 'file_upload_id' (Indexed), Instead Of Matching On
+#        The 'file' Name Column - Which Had No Index, Collided When Two Uploads Shared A Name, And Broke On Rename.
+#        Deleting A File Is A Set-Based Cascade : Tag Links And Transactions Go In One Statement Each, And Account
+#        Balances Drop By The Deleted Rows' Per-Account Totals Instead Of Being Re-Summed From Scratch.
+#
+# Functions :
+#   - 'delete_file_cascade' - Delete A File, Its Transactions And Their Tag Links, Adjusting Balances.
+#   - 'backfill_file_upload_ids' - Link CSV Transactions Stored Before 'file_upload_id' Existed To Their Upload.
+
+# Imports.
+from datetime import datetime
+from typing import Dict
+from sqlalchemy import func, text
+from sqlalchemy.orm import Session
+
+# Local Imports.
+from app.database import FileUpload, Transaction, TransactionTag, Account
+from app.utils.analytics_cache import bump_data_version
+from app.utils.budget_utils import record_transactions_spend
+
+# -------------------------------------------------------- Delete File Cascade.
+def delete_file_cascade(db: Session, user_id: int, file: FileUpload) -> Dict:
+    """Delete A File, Its Transactions And Their Tag Links, Adjusting Balances. Caller Commits."""
+
+    in_file = (Transaction.file_upload_id == file.id, Transaction.user_id == user_id)
+
+    # Per-Account Totals Of What's About To Go (Cash Rows Have No Account).
+    account_totals = dict(db.query(Transaction.account_id, func.sum(Transaction.amount)).filter(
+        *in_file, Transaction.account_id.isnot(None)
+    ).group_by(Transaction.account_id).all())
+
+    # Take The Rows Out Of Their Budgets' Counters.
+    record_transactions_spend(db, user_id, [Transaction.file_upload_id == file.id], -1)
+
+    # Tag Links, Then Transactions - One Statement Each.
+    db.query(TransactionTag).filter(
+        TransactionTag.transaction_id.in_(db.query(Transaction.id).filter(*in_file))
+    ).delete(synchronize_session=False)
+    deleted_count = db.query(Transaction).filter(*in_file).delete(synchronize_session=False)
+
+    # Balances Are Sums Of Transactions, So Subtract The Deleted Totals.
+    now = datetime.now()
+    for account_id, total in account_totals.items():
+        db.query(Account).filter(
+            Account.user_id == user_id,
+            Account.account_id == account_id
+        ).update({
+            Account.current_balance: func.coalesce(Account.current_balance, 0) - total,
+            Account.available_balance: func.coalesce(Account.available_balance, 0) - total,
+            Account.updated_at: now
+        }, synchronize_session=False)
+
+    if deleted_count:
+        bump_data_version(db, user_id)
+
+    db.delete(file)
+    return {"transactions_deleted": deleted_count, "accounts_updated": len(account_totals)}
+
+# -------------------------------------------------------- Backfill File Upload IDs.
+def backfill_file_upload_ids(engine) -> int:
+    """Link CSV Transactions Stored Before 'file_upload_id' Existed To Their Upload (One Statement). Returns Rows Linked."""
+
+    # Same-Named Uploads Are Told Apart By Time : The Latest Upload Started Before The Row Was Created Wins.
+    statement = text("""
+        UPDATE transactions
+        SET file_upload_id = COALESCE(
+            (SELECT f.id FROM file_uploads f
+             WHERE f.user_id = transactions.user_id AND f.filename = transactions.file
+               AND f.upload_date <= transactions.created_at
+             ORDER BY f.upload_date DESC, f.id DESC LIMIT 1),
+            (SELECT MIN(f.id) FROM file_uploads f
+             WHERE f.user_id = transactions.user_id AND f.filename = transactions.file)
+        )
+        WHERE file_upload_id IS NULL AND source = 'csv' AND file IS NOT NULL
+          AND EXISTS (SELECT 1 FROM file_uploads f WHERE f.user_id = transactions.user_id AND f.filename = transactions.file)
+    """)
+
+    try:
+        with engine.begin() as conn:
+            linked = conn.execute(statement).rowcount or 0
+    except Exception as e:
+        print(f"File upload backfill failed: {e}")
+        return 0
+
+    if linked:
+        print(f"Linked {linked} existing transactions to their file uploads")
+    return linked
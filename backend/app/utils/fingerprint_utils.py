@@ -0,0 +1,161 @@
+# Fingerprint Utils.
+#
+# Note : A Fingerprint Identifies A Real-World Transaction Regardless Of How It Was Imported : User, Account (Cash If
+#        None), Date, Amount In Cents And Normalized Vendor. Identical Purchases On The Same Day (Two Coffees) Get An
+#        Occurrence Suffix ('-2', '-3', ...) In Import Order, So Re-Importing A Statement - Or Importing The Next
+#        Month's Statement That Overlaps It - Maps Each Row Onto The Same Fingerprint And Is Skipped, While Genuine
+#        Repeats Inside One File Are Kept. Fingerprints Are Unique Per User ('uq_transactions_user_fingerprint'),
+#        And Duplicates Are Found With One Indexed IN-Lookup Per Batch Instead Of A Query Per Row. Fingerprints Of
+#        Rows Merged Away By Reconciliation Are Kept In 'merged_fingerprints', So Re-Importing Them Is Skipped Too.
+#
+# Functions :
+#   - 'vendor_key' - Normalized, Lowercased Vendor Used In Fingerprints (Cached).
+#   - 'fingerprint_base' - Fingerprint Of A Transaction's Identifying Fields (Without Occurrence Suffix).
+#   - 'fingerprint_rows' - Fingerprint A Batch Of Rows, Numbering Repeats In Order.
+#   - 'find_existing_fingerprints' - Which Of These Fingerprints The User Already Has (One Query Per Chunk).
+#   - 'split_new_rows' - Fingerprint A Batch And Drop Rows The User Already Has.
+#   - 'next_free_fingerprint' - Fingerprint For A Row That Must Always Be Stored (Manual Entries).
+#   - 'backfill_fingerprints' - Fingerprint Rows Stored Before Fingerprints Existed.
+
+# Imports.
+import hashlib
+from datetime import date
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+
+# Local Imports.
+from app.database import Transaction, MergedFingerprint
+from app.utils.vendor_utils import normalize_vendor
+
+# Fingerprints Per IN-Lookup (Well Under SQLite's Bound-Parameter Limit).
+LOOKUP_CHUNK_SIZE = 500
+
+# -------------------------------------------------------- Vendor Key.
+@lru_cache(maxsize=32768)   # Big Enough For A Large History's Distinct Spellings (Recurring Detection).
+def vendor_key(vendor: str) -> str:
+    """Normalized, Lowercased Vendor (Cached - Statements Repeat The Same Merchants)."""
+    return normalize_vendor(vendor).lower()
+
+# -------------------------------------------------------- Fingerprint Base.
+def fingerprint_base(user_id: int, account_id: Optional[str], transaction_date: date, amount: float, vendor: Optional[str]) -> str:
+    """Fingerprint Of A Transaction's Identifying Fields (Without Occurrence Suffix)."""
+
+    cents = int(round((amount or 0) * 100))
+    normalized = vendor_key(vendor or "")
+    key = f"{user_id}|{account_id or 'cash'}|{transaction_date.isoformat() if transaction_date else ''}|{cents}|{normalized}"
+    return hashlib.sha256(key.encode()).hexdigest()[:32]
+
+# -------------------------------------------------------- Fingerprint Rows.
+def fingerprint_rows(user_id: int, rows: Iterable[dict]) -> List[str]:
+    """Fingerprint A Batch Of Rows ('account_id', 'date', 'amount', 'vendor'), Numbering Repeats In Order."""
+
+    seen: Dict[str, int] = {}
+    fingerprints = []
+    for row in rows:
+        base = fingerprint_base(user_id, row.get("account_id"), row.get("date"), row.get("amount"), row.get("vendor"))
+        occurrence = seen.get(base, 0) + 1
+        seen[base] = occurrence
+        fingerprints.append(base if occurrence == 1 else f"{base}-{occurrence}")
+    return fingerprints
+
+# -------------------------------------------------------- Find Existing Fingerprints.
+def find_existing_fingerprints(db: Session, user_id: int, fingerprints: Iterable[str]) -> Set[str]:
+    """Which Of These Fingerprints The User Already Has, Stored Or Merged Away (One Indexed Query Per Chunk)."""
+
+    fingerprints = list(dict.fromkeys(fingerprints))
+    existing = set()
+    for start in range(0, len(fingerprints), LOOKUP_CHUNK_SIZE):
+        chunk = fingerprints[start:start + LOOKUP_CHUNK_SIZE]
+        stored = db.query(Transaction.fingerprint).filter(
+            Transaction.user_id == user_id,
+            Transaction.fingerprint.in_(chunk)
+        )
+        merged = db.query(MergedFingerprint.fingerprint).filter(
+            MergedFingerprint.user_id == user_id,
+            MergedFingerprint.fingerprint.in_(chunk)
+        )
+        existing.update(row[0] for row in stored.union_all(merged))
+    return existing
+
+# -------------------------------------------------------- Split New Rows.
+def split_new_rows(db: Session, user_id: int, rows: List[dict]) -> Tuple[List[dict], int]:
+    """Fingerprint A Batch And Drop Rows The User Already Has. Returns (New Rows With 'fingerprint' Set, Skipped Count)."""
+
+    fingerprints = fingerprint_rows(user_id, rows)
+    existing = find_existing_fingerprints(db, user_id, fingerprints)
+
+    new_rows = []
+    for row, fingerprint in zip(rows, fingerprints):
+        if fingerprint not in existing:
+            row["fingerprint"] = fingerprint
+            new_rows.append(row)
+    return new_rows, len(rows) - len(new_rows)
+
+# -------------------------------------------------------- Next Free Fingerprint.
+def next_free_fingerprint(db: Session, user_id: int, account_id: Optional[str], transaction_date: date, amount: float, vendor: Optional[str]) -> str:
+    """Fingerprint For A Row That Must Always Be Stored (Manual Entries) - The Next Unused Occurrence."""
+
+    base = fingerprint_base(user_id, account_id, transaction_date, amount, vendor)
+    taken = {row[0] for row in db.query(Transaction.fingerprint).filter(
+        Transaction.user_id == user_id,
+        or_(Transaction.fingerprint == base, Transaction.fingerprint.like(f"{base}-%"))
+    )}
+
+    occurrence = 1
+    while (base if occurrence == 1 else f"{base}-{occurrence}") in taken:
+        occurrence += 1
+    return base if occurrence == 1 else f"{base}-{occurrence}"
+
+# -------------------------------------------------------- Backfill Fingerprints.
+def backfill_fingerprints(engine, batch_size: int = 5000) -> int:
+    """Fingerprint Rows Stored Before Fingerprints Existed (Or Inserted Without One). Returns Rows Updated."""
+
+    from sqlalchemy.orm import sessionmaker
+
+    db = sessionmaker(bind=engine)()
+    updated = 0
+    try:
+        user_ids = [row[0] for row in db.query(Transaction.user_id).filter(
+            Transaction.fingerprint.is_(None)
+        ).distinct()]
+
+        for user_id in user_ids:
+            # Existing Fingerprints Keep Their Occurrence Numbers; Unfingerprinted Rows Take The Next Free Ones.
+            taken = {row[0] for row in db.query(Transaction.fingerprint).filter(
+                Transaction.user_id == user_id,
+                Transaction.fingerprint.isnot(None)
+            )}
+            rows = db.query(
+                Transaction.id, Transaction.account_id, Transaction.date, Transaction.amount, Transaction.vendor
+            ).filter(
+                Transaction.user_id == user_id,
+                Transaction.fingerprint.is_(None)
+            ).order_by(Transaction.id).all()
+
+            occurrences: Dict[str, int] = {}
+            mappings = []
+            for transaction_id, account_id, transaction_date, amount, vendor in rows:
+                base = fingerprint_base(user_id, account_id, transaction_date, amount, vendor)
+                occurrence = occurrences.get(base, 0) + 1
+                while (base if occurrence == 1 else f"{base}-{occurrence}") in taken:
+                    occurrence += 1
+                occurrences[base] = occurrence
+                fingerprint = base if occurrence == 1 else f"{base}-{occurrence}"
+                taken.add(fingerprint)
+                mappings.append({"id": transaction_id, "fingerprint": fingerprint})
+
+            for start in range(0, len(mappings), batch_size):
+                db.bulk_update_mappings(Transaction, mappings[start:start + batch_size])
+            db.commit()
+            updated += len(mappings)
+    except Exception as e:
+        db.rollback()
+        print(f"Fingerprint backfill failed: {e}")
+    finally:
+        db.close()
+
+    if updated:
+        print(f"Fingerprinted {updated} existing transactions")
+    return updated
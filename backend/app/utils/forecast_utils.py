@@ -0,0 +1,232 @@
+# Forecast Utils.
+#
+# Note : Projects Cash Flow Per Account To The End Of The Month And Over The Next 'FORECAST_MAX_DAYS' Days.
+#        A Projection Is Two Parts :
+#          - Recurring Items, Detected Inline Over The Cached Columns By 'detect_series_rows' With Rows Coded By
+#            (Vendor Key, Account) - Each Active Series Is Laid Out From Its Next Expected Date, Weekly Ones By Their
+#            Interval And Monthly/Quarterly/Annual Ones On Their Usual Day Of The Month (Rent Stays On The 1st).
+#          - A Seasonal Daily Baseline From Everything Else - Per Account, The Average Non-Recurring Net Per Day
+#            Of That Calendar Month Over The History, Blended With The Trailing 'RECENT_DAYS' Average So A Changed
+#            Lifestyle Shows Up Before A Year Has Passed (Months The History Doesn't Cover Use The Recent Rate).
+#        Both Are Batched Array Operations - 'np.bincount' For The Averages, 'np.add.at' To Lay Recurring Items
+#        Onto An (Accounts x Days) Grid - So One Pass Serves Every Account And Every Horizon Up To The Maximum.
+#        The Result Is Cached On The User's Analytics Columns ('UserColumns.derived'), So It Lives Until The
+#        User's Next Transaction Write Bumps Their 'data_version' (Or The Day Rolls Over).
+#        'forecast_month_cash_flow' Is The Smoother Input For 'calculate_centi_score' : Month-To-Date Net Plus
+#        The Projected Rest Of The Month, Instead Of The To-Date Net Alone That Swings Early In The Month.
+#
+# Functions :
+#   - 'CashFlowForecast' - One User's Projected Daily Net Per Account, With Summaries For Any Horizon.
+#   - 'build_forecast' - Build A Forecast From A User's Cached Columns.
+#   - 'get_forecast' - Get A User's Forecast, Building It On First Use After Each Write (Or Each New Day).
+#   - 'forecast_month_cash_flow' - Projected Full-Month Net (Dollars) For The Centi Score.
+
+# Imports.
+import calendar
+from datetime import date, timedelta
+from typing import Dict, List, Optional
+from sqlalchemy.orm import Session
+
+# Local Imports.
+from app.database import User
+from app.utils.vendor_utils import normalize_vendor
+from app.utils.analytics_cache import UserColumns, get_user_columns
+from app.utils.recurring_utils import detect_series_rows, vendor_key_codes
+
+# Forecast Settings.
+FORECAST_MAX_DAYS = 365         # Longest Horizon Served (Every Shorter One Is A Slice Of The Same Grid).
+RECENT_DAYS = 90                # Trailing Window For The Recent Daily Rate.
+SEASONAL_WEIGHT = 0.5           # Share Of The Baseline From The Calendar-Month Average (The Rest Is Recent).
+MAX_UPCOMING_ITEMS = 50         # Recurring Occurrences Listed In A Summary.
+CALENDAR_MONTHS = {"monthly": 1, "quarterly": 3, "annual": 12}   # Periods Scheduled By Calendar Month.
+
+# Day Ordinal Of 1970-01-01, For Converting Ordinals To numpy Dates.
+_EPOCH = date(1970, 1, 1).toordinal()
+
+# -------------------------------------------------------- Cash Flow Forecast.
+class CashFlowForecast:
+    """One User's Projected Daily Net Per Account (Cents), With Summaries For Any Horizon."""
+
+    def __init__(self, today: date, accounts: List, month_to_date, baseline, recurring, upcoming: List[dict]):
+        self.today = today
+        self.accounts = accounts          # Account IDs (None = Cash), One Per Grid Row.
+        self.month_to_date = month_to_date  # int64 Actual Net Per Account, 1st Of The Month Through Today.
+        self.baseline = baseline          # float (Accounts x Days) Projected Non-Recurring Net, Starting Tomorrow.
+        self.recurring = recurring        # float (Accounts x Days) Projected Recurring Net, Starting Tomorrow.
+        self.upcoming = upcoming          # Recurring Occurrences In Date Order.
+
+    def days_left_in_month(self) -> int:
+        """Days After Today Through The End Of This Month."""
+        return calendar.monthrange(self.today.year, self.today.month)[1] - self.today.day
+
+    def summary(self, horizon_days: int, account_names: Optional[Dict] = None) -> dict:
+        """Per-Account And Total Projections (Dollars) For The Rest Of The Month And The Next 'horizon_days'."""
+
+        horizon_days = max(1, min(horizon_days, FORECAST_MAX_DAYS))
+        month_days = self.days_left_in_month()
+        rest_of_month = self.baseline[:, :month_days].sum(axis=1) + self.recurring[:, :month_days].sum(axis=1)
+        horizon_baseline = self.baseline[:, :horizon_days].sum(axis=1)
+        horizon_recurring = self.recurring[:, :horizon_days].sum(axis=1)
+        end_of_month = self.month_to_date + rest_of_month
+
+        def dollars(cents) -> float:
+            return round(float(cents) / 100, 2)
+
+        accounts = [
+            {
+                "account_id": account_id,
+                "account_name": (account_names or {}).get(account_id, "Cash" if account_id is None else None),
+                "month_to_date": dollars(self.month_to_date[index]),
+                "rest_of_month": dollars(rest_of_month[index]),
+                "end_of_month": dollars(end_of_month[index]),
+                "horizon_net": dollars(horizon_baseline[index] + horizon_recurring[index]),
+                "horizon_recurring": dollars(horizon_recurring[index]),
+                "horizon_baseline": dollars(horizon_baseline[index])
+            }
+            for index, account_id in enumerate(self.accounts)
+        ]
+        end_day = self.today + timedelta(days=horizon_days)
+        return {
+            "as_of": self.today,
+            "horizon_days": horizon_days,
+            "totals": {
+                "month_to_date": dollars(self.month_to_date.sum()),
+                "rest_of_month": dollars(rest_of_month.sum()),
+                "end_of_month": dollars(end_of_month.sum()),
+                "horizon_net": dollars(horizon_baseline.sum() + horizon_recurring.sum()),
+                "horizon_recurring": dollars(horizon_recurring.sum()),
+                "horizon_baseline": dollars(horizon_baseline.sum())
+            },
+            "accounts": accounts,
+            "upcoming": [item for item in self.upcoming if item["date"] <= end_day][:MAX_UPCOMING_ITEMS]
+        }
+
+# -------------------------------------------------------- Months Of Days.
+def _months(days):
+    """Calendar Month (0-11) Of Each Day Ordinal."""
+
+    import numpy as np
+    return (np.asarray(days, dtype=np.int64) - _EPOCH).astype("datetime64[D]").astype("datetime64[M]").astype(np.int64) % 12
+
+# -------------------------------------------------------- Occurrence Days.
+def _occurrence_days(active: List[dict], today_day: int):
+    """Candidate Future Day Ordinals Per Series (Series x Steps). Callers Mask Out Days Outside The Horizon."""
+
+    import numpy as np
+    intervals = np.maximum(np.array([int(found["interval_days"]) for found in active], dtype=np.int64), 1)
+    steps = np.arange(int(FORECAST_MAX_DAYS // intervals.min()) + 2)
+
+    # Fixed-Interval Series Step From Their Next Expected Date.
+    next_days = np.array([found["next_expected_date"].toordinal() for found in active], dtype=np.int64)
+    days = next_days[:, None] + steps[None, :] * intervals[:, None]
+
+    # Calendar Series (Monthly, Quarterly, Annual) Keep Their Day Of Month, Clamped To Shorter Months.
+    months = np.array([CALENDAR_MONTHS.get(found["period"], 0) for found in active], dtype=np.int64)
+    calendar_rows = np.flatnonzero(months)
+    if len(calendar_rows):
+        last_dates = [active[row]["last_date"] for row in calendar_rows]
+        last_month = np.array([(last.year - 1970) * 12 + last.month - 1 for last in last_dates], dtype=np.int64)
+        anchor = np.array([last.day for last in last_dates], dtype=np.int64)
+        month = last_month[:, None] + (steps[None, :] + 1) * months[calendar_rows, None]
+        month_start = month.astype("datetime64[M]").astype("datetime64[D]").astype(np.int64)
+        month_length = (month + 1).astype("datetime64[M]").astype("datetime64[D]").astype(np.int64) - month_start
+        days[calendar_rows] = _EPOCH + month_start + np.minimum(anchor[:, None], month_length) - 1
+
+    # An Overdue First Charge Is Expected Tomorrow.
+    days[:, 0] = np.where(days[:, 0] <= today_day, today_day + 1, days[:, 0])
+    return days
+
+# -------------------------------------------------------- Build Forecast.
+def build_forecast(columns: UserColumns, today: Optional[date] = None) -> CashFlowForecast:
+    """Build A Forecast From A User's Cached Columns (Recurring Items Plus Seasonal Daily Baseline)."""
+
+    import numpy as np
+    today = today or date.today()
+    today_day = today.toordinal()
+    account_count = max(len(columns.accounts), 1)
+    accounts = list(columns.accounts) or [None]
+
+    # Dated Rows Up To Today.
+    dated = columns.window(date.fromordinal(1), today)
+    days = columns.days[dated].astype(np.int64)
+    cents = columns.cents[dated]
+    account = columns.account[dated].astype(np.int64)
+
+    # Month-To-Date Actuals.
+    month_rows = days >= today.replace(day=1).toordinal()
+    month_to_date = np.bincount(account[month_rows], weights=cents[month_rows], minlength=account_count)
+    month_to_date = np.rint(month_to_date).astype(np.int64)
+
+    # Recurring Items : Detect Over (Vendor Key, Account) Codes So Each Account Keeps Its Own Series.
+    vendor_codes, _, spellings = vendor_key_codes(columns)
+    vendor_codes = vendor_codes[dated]
+    series, member = detect_series_rows(days, cents, vendor_codes * account_count + account, today_day)
+
+    # Seasonal Baseline : Non-Recurring Net Per (Account, Calendar Month), Over The Days Of That Month Covered.
+    grid_days = np.arange(today_day + 1, today_day + 1 + FORECAST_MAX_DAYS)
+    baseline = np.zeros((account_count, FORECAST_MAX_DAYS))
+    other = ~member
+    if len(days):
+        covered = np.bincount(_months(np.arange(int(days.min()), today_day + 1)), minlength=12)
+        flat = account[other] * 12 + _months(days[other])
+        month_net = np.bincount(flat, weights=cents[other], minlength=account_count * 12).reshape(account_count, 12)
+        seasonal = month_net / np.maximum(covered, 1)
+
+        # Recent Rate Over The Trailing Window (Or The Whole History If Shorter).
+        recent_start = max(today_day - RECENT_DAYS + 1, int(days.min()))
+        recent_rows = other & (days >= recent_start)
+        recent = np.bincount(account[recent_rows], weights=cents[recent_rows], minlength=account_count)
+        recent = recent / (today_day - recent_start + 1)
+
+        # Blend Per Grid Day (Uncovered Months Fall Back To The Recent Rate).
+        grid_months = _months(grid_days)
+        blended = np.where(covered > 0, SEASONAL_WEIGHT * seasonal + (1 - SEASONAL_WEIGHT) * recent[:, None], recent[:, None])
+        baseline = blended[:, grid_months]
+
+    # Lay Active Series Onto The Grid (Overdue Ones Land Tomorrow).
+    recurring = np.zeros((account_count, FORECAST_MAX_DAYS))
+    upcoming = []
+    active = [found for found in series if found["is_active"]]
+    if active:
+        occurrence_days = _occurrence_days(active, today_day)
+        owner, step = np.nonzero((occurrence_days > today_day) & (occurrence_days <= today_day + FORECAST_MAX_DAYS))
+        occurrence_days = occurrence_days[owner, step]
+        codes = np.array([found["code"] for found in active], dtype=np.int64)
+        amounts = np.array([round(found["amount"] * 100) for found in active], dtype=np.float64)
+        occurrence_accounts = codes[owner] % account_count
+        np.add.at(recurring, (occurrence_accounts, occurrence_days - today_day - 1), amounts[owner])
+
+        # Upcoming List (Date Order), Named Like The Recurring Series.
+        vendors = [normalize_vendor(spellings[found["code"] // account_count]) for found in active]
+        for index in np.argsort(occurrence_days, kind="stable")[:MAX_UPCOMING_ITEMS * 4]:
+            series_index = int(owner[index])
+            upcoming.append({
+                "date": date.fromordinal(int(occurrence_days[index])),
+                "vendor": vendors[series_index],
+                "kind": active[series_index]["kind"],
+                "account_id": accounts[int(occurrence_accounts[index])],
+                "amount": active[series_index]["amount"]
+            })
+
+    return CashFlowForecast(today, accounts, month_to_date, baseline, recurring, upcoming)
+
+# -------------------------------------------------------- Get Forecast.
+def get_forecast(db: Session, user: User, today: Optional[date] = None) -> CashFlowForecast:
+    """Get A User's Forecast, Building It On First Use After Each Transaction Write (Or Each New Day)."""
+
+    today = today or date.today()
+    columns = get_user_columns(db, user)
+    key = ("forecast", today.toordinal())
+    forecast = columns.derived.get(key)
+    if forecast is None:
+        forecast = build_forecast(columns, today)
+
+        # Keep Only Today's Forecast.
+        columns.derived = {**{k: v for k, v in columns.derived.items() if k[0] != "forecast"}, key: forecast}
+    return forecast
+
+# -------------------------------------------------------- Forecast Month Cash Flow.
+def forecast_month_cash_flow(db: Session, user: User) -> float:
+    """Projected Full-Month Net In Dollars (Month-To-Date Plus The Projected Rest Of The Month)."""
+
+    return get_forecast(db, user).summary(1)["totals"]["end_of_month"]
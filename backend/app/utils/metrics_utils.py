@@ -0,0 +1,206 @@
+# Metrics Utils.
+#
+# Note : Per-Request Telemetry Without Any New Dependency. SQLAlchemy 'before/after_cursor_execute' Listeners Add
+#        Each Statement's Count And Duration To The Current Request's Stats (Held In A ContextVar, So Sync Routes
+#        In The Threadpool And 'AsyncSession.run_sync' Greenlets Still Report Into The Right Request). The ASGI
+#        Middleware Then :
+#          - Adds A 'Server-Timing' Header ('db' And 'app' Durations, Statement Count) To Every Response.
+#          - Records Prometheus Histograms Per Method + Route Template (Not Raw Path, So IDs Don't Explode Labels).
+#          - Logs Requests Over 'METRICS_QUERY_THRESHOLD' Statements (Default 50, 0 Disables) To Catch N+1s.
+#          - Checks Each Request Against Its Route's Query Budget ('query_budget_utils').
+#        '/metrics' Renders The Histograms In Prometheus Text Format. Set 'METRICS_TOKEN' To Require A Bearer Token
+#        (Production Without A Token Keeps '/metrics' Closed).
+#
+# Functions :
+#   - 'register_query_metrics' - Attach Statement Count/Time Listeners To An Engine.
+#   - 'get_request_stats' - Get The Current Request's Stats (None Outside A Request).
+#   - 'get_request_route' - Get The Current Request's Method And Route Template.
+#   - 'MetricsMiddleware' - ASGI Middleware That Records Request Metrics And Sets 'Server-Timing'.
+#   - 'render_metrics' - Render All Request Histograms In Prometheus Text Format.
+#   - 'check_metrics_token' - Check A '/metrics' Request Against 'METRICS_TOKEN'.
+
+# Imports.
+import os
+import hmac
+import time
+import threading
+from contextvars import ContextVar
+from typing import Dict, Optional, Tuple
+
+# Local Imports.
+from .query_budget_utils import check_route_budget
+
+# Log Any Request That Runs More Statements Than This (0 Disables).
+QUERY_THRESHOLD = int(os.getenv("METRICS_QUERY_THRESHOLD", "50"))
+
+# Histogram Buckets.
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+# Histogram Name -> (Help Text, Buckets).
+HISTOGRAMS = {
+    "http_request_duration_seconds": ("Total request time by route.", DURATION_BUCKETS),
+    "http_request_db_duration_seconds": ("Time spent in database statements per request by route.", DURATION_BUCKETS),
+    "http_request_db_queries": ("Database statements executed per request by route.", QUERY_BUCKETS)
+}
+
+# -------------------------------------------------------- Request Stats.
+class RequestStats:
+    """Statement Count And Database Time For One Request."""
+
+    __slots__ = ("queries", "db_seconds", "scope")
+
+    def __init__(self, scope: Optional[dict] = None):
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.scope = scope
+
+# Current Request's Stats (Copied Into Threadpool Workers And Greenlets, So They Mutate The Same Object).
+_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+# -------------------------------------------------------- Get Request Stats.
+def get_request_stats() -> Optional[RequestStats]:
+    """Get The Current Request's Stats (None Outside A Request)."""
+    return _request_stats.get()
+
+# -------------------------------------------------------- Get Request Route.
+def get_request_route() -> Optional[str]:
+    """Get The Current Request's Method And Route Template (e.g. 'GET /transactions/{transaction_id}/tags')."""
+
+    stats = _request_stats.get()
+    if stats is None or stats.scope is None:
+        return None
+    route = getattr(stats.scope.get("route"), "path", None) or stats.scope.get("path")
+    return f"{stats.scope.get('method')} {route}"
+
+# -------------------------------------------------------- Register Query Metrics.
+def register_query_metrics(engine):
+    """Attach Statement Count/Time Listeners To An Engine (Pass 'sync_engine' For Async Engines)."""
+
+    from sqlalchemy import event
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        # Start Time Lives On The Execution Context, So A Failed Statement Leaves Nothing Behind.
+        if context is not None:
+            context._metrics_started = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        stats = _request_stats.get()
+        if stats is not None:
+            stats.queries += 1
+            started = getattr(context, "_metrics_started", None)
+            if started is not None:
+                stats.db_seconds += time.perf_counter() - started
+
+# -------------------------------------------------------- Histogram.
+class _Histogram:
+    """Cumulative Prometheus Histogram Keyed By Label Values."""
+
+    def __init__(self, buckets: tuple):
+        self.buckets = buckets
+        self.series: Dict[Tuple[str, str], list] = {}
+
+    def observe(self, labels: Tuple[str, str], value: float):
+        # Per Series : [Bucket Counts..., +Inf Count, Sum].
+        series = self.series.get(labels)
+        if series is None:
+            series = self.series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                series[i] += 1
+        series[-2] += 1
+        series[-1] += value
+
+_histograms = {name: _Histogram(buckets) for name, (_, buckets) in HISTOGRAMS.items()}
+_lock = threading.Lock()
+
+# -------------------------------------------------------- Record Request.
+def _record_request(method: str, route: str, status_code: int, seconds: float, stats: RequestStats):
+    """Add One Finished Request To The Histograms And Flag Query-Heavy Requests."""
+
+    labels = (method, route)
+    with _lock:
+        _histograms["http_request_duration_seconds"].observe(labels, seconds)
+        _histograms["http_request_db_duration_seconds"].observe(labels, stats.db_seconds)
+        _histograms["http_request_db_queries"].observe(labels, stats.queries)
+
+    if QUERY_THRESHOLD and stats.queries > QUERY_THRESHOLD:
+        print(
+            f"⚠️ {method} {route} ran {stats.queries} queries (threshold {QUERY_THRESHOLD}) - "
+            f"{stats.db_seconds * 1000:.1f}ms in DB, {seconds * 1000:.1f}ms total, status {status_code}"
+        )
+
+# -------------------------------------------------------- Render Metrics.
+def render_metrics() -> str:
+    """Render All Request Histograms In Prometheus Text Format."""
+
+    def label_set(method, route, le=None):
+        route = route.replace("\\", "\\\\").replace('"', '\\"')
+        bound = "" if le is None else f',le="{le}"'
+        return f'{{method="{method}",route="{route}"{bound}}}'
+
+    lines = []
+    with _lock:
+        for name, (help_text, _) in HISTOGRAMS.items():
+            histogram = _histograms[name]
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} histogram")
+            for (method, route), series in sorted(histogram.series.items()):
+                for bound, count in zip(histogram.buckets, series):
+                    lines.append(f"{name}_bucket{label_set(method, route, bound)} {count}")
+                lines.append(f"{name}_bucket{label_set(method, route, '+Inf')} {series[-2]}")
+                lines.append(f"{name}_sum{label_set(method, route)} {series[-1]}")
+                lines.append(f"{name}_count{label_set(method, route)} {series[-2]}")
+    return "\n".join(lines) + "\n"
+
+# -------------------------------------------------------- Check Metrics Token.
+def check_metrics_token(authorization: Optional[str]) -> bool:
+    """Check A '/metrics' Request Against 'METRICS_TOKEN' (Without A Token, Only Open Outside Production)."""
+
+    token = os.getenv("METRICS_TOKEN")
+    if not token:
+        return os.getenv("ENVIRONMENT", "development").lower() != "production"
+    return hmac.compare_digest(authorization or "", f"Bearer {token}")
+
+# -------------------------------------------------------- Metrics Middleware.
+class MetricsMiddleware:
+    """ASGI Middleware That Records Request Metrics And Sets 'Server-Timing'."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats(scope)
+        token = _request_stats.set(stats)
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                # Timing Up To The First Byte (Streaming Bodies Keep Running After This).
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                server_timing = (
+                    f'db;dur={stats.db_seconds * 1000:.1f};desc="{stats.queries} queries", '
+                    f"app;dur={elapsed_ms:.1f}"
+                )
+                message["headers"] = list(message.get("headers", [])) + [(b"server-timing", server_timing.encode("latin-1"))]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+            route = getattr(scope.get("route"), "path", None)
+            if route is not None:
+                check_route_budget(scope["method"], route, stats.queries)
+        finally:
+            _request_stats.reset(token)
+            # Route Template Is Set On The Scope By The Router; Unmatched Paths Share One Label.
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            _record_request(scope["method"], route, status_code, time.perf_counter() - started, stats)
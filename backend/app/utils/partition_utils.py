@@ -0,0 +1,146 @@
+# Partition Utils.
+#
+# Note : Optional PostgreSQL Hash Partitioning Of The Per-User Tables That Grow Without Bound - 'transactions',
+#        'transaction_tags' And 'account_balance_history' - On 'user_id'. Every Hot Query Is Scoped By 'user_id',
+#        So The Planner Prunes To One Partition And Each User's Reads Touch An Index A Fraction Of The Full Size;
+#        Vacuum And Reindex Work Per Partition Too. Set 'DB_HASH_PARTITIONS' (e.g. 16) To Turn It On; 0 (The
+#        Default) Keeps Plain Tables, And SQLite Is Never Partitioned.
+#        Migration Is In Place And Runs At Startup : Each Table Is Rebuilt As A Partitioned Copy Inside One
+#        Transaction (Copy Rows, Move The ID Sequence Over, Drop The Old Table, Rename), So It Either Finishes Or
+#        Leaves The Old Table Untouched. The Old Table Is Share-Locked While Copying - Reads Keep Working, Writes
+#        Wait - So Run The First Start With Partitioning On In A Quiet Window. Needs PostgreSQL 12+.
+#        PostgreSQL Requires Unique Keys To Include The Partition Key, So On Partitioned Tables The Primary Key
+#        Is (id, user_id), Model Unique Indexes Get 'user_id' Prepended, And Foreign Keys Into 'transactions'
+#        Become (transaction_id, user_id) - Which Is Why Tag Links Carry Their Owner's 'user_id'.
+#        Indexes Are Created On The Parent, So PostgreSQL Builds And Maintains Them Per Partition.
+#
+# Functions :
+#   - 'get_partition_count' - Hash Partitions Requested Through 'DB_HASH_PARTITIONS' (0 = Off).
+#   - 'is_partitioned' - Whether A Table Is Already Partitioned.
+#   - 'partition_ddl' - Statements That Rebuild One Table As A Hash-Partitioned Copy.
+#   - 'partition_tables' - Convert The Per-User Tables To Hash Partitions (No-Op On SQLite Or When Off).
+
+# Imports.
+import os
+from typing import List
+from sqlalchemy import text
+
+# Local Imports.
+from app.database import Base
+
+# Tables Partitioned On 'user_id', In Conversion Order ('transactions' First, So Tag Links Can Reference It).
+PARTITIONED_TABLES = ["transactions", "transaction_tags", "account_balance_history"]
+
+# Partition Key.
+PARTITION_KEY = "user_id"
+
+# -------------------------------------------------------- Get Partition Count.
+def get_partition_count() -> int:
+    """Hash Partitions Requested Through 'DB_HASH_PARTITIONS' (0 = Off)."""
+
+    value = os.getenv("DB_HASH_PARTITIONS", "0")
+    try:
+        return max(0, int(value))
+    except ValueError:
+        print(f"Ignoring invalid DB_HASH_PARTITIONS={value!r}")
+        return 0
+
+# -------------------------------------------------------- Is Partitioned.
+def is_partitioned(conn, table: str) -> bool:
+    """Whether A Table Is Already Partitioned."""
+
+    return conn.execute(
+        text("SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:table)"), {"table": table}
+    ).first() is not None
+
+# -------------------------------------------------------- Partition DDL.
+def partition_ddl(table, partitions: int, partitioned_parents: set, sequence: str = None) -> List[str]:
+    """Statements That Rebuild One Table As A Hash-Partitioned Copy (Run In One Transaction)."""
+
+    name = table.name
+    staging = f"{name}_partitioned"
+    statements = [
+        f"LOCK TABLE {name} IN SHARE MODE",
+        f"CREATE TABLE {staging} (LIKE {name} INCLUDING DEFAULTS) PARTITION BY HASH ({PARTITION_KEY})"
+    ]
+    statements += [
+        f"CREATE TABLE {name}_p{remainder} PARTITION OF {staging} "
+        f"FOR VALUES WITH (MODULUS {partitions}, REMAINDER {remainder})"
+        for remainder in range(partitions)
+    ]
+    statements.append(f"INSERT INTO {staging} SELECT * FROM {name}")
+
+    # The Old Table Owns The ID Sequence; Hand It Over So Dropping The Old Table Keeps It.
+    if sequence:
+        statements.append(f"ALTER SEQUENCE {sequence} OWNED BY {staging}.id")
+
+    # Swap (CASCADE Drops Foreign Keys Pointing At The Old Table; They're Re-Added With The Partition Key).
+    statements += [
+        f"DROP TABLE {name} CASCADE",
+        f"ALTER TABLE {staging} RENAME TO {name}",
+        f"ALTER TABLE {name} ADD PRIMARY KEY (id, {PARTITION_KEY})"
+    ]
+
+    # Model Indexes, With The Partition Key Leading Any Unique One That Lacks It.
+    for index in sorted(table.indexes, key=lambda index: index.name):
+        columns = [column.name for column in index.columns]
+        if index.unique and PARTITION_KEY not in columns:
+            columns.insert(0, PARTITION_KEY)
+        unique = "UNIQUE " if index.unique else ""
+        statements.append(f"CREATE {unique}INDEX {index.name} ON {name} ({', '.join(columns)})")
+
+    # Foreign Keys, Carrying The Partition Key Into Partitioned Parents.
+    for foreign_key in sorted(table.foreign_key_constraints, key=lambda foreign_key: foreign_key.column_keys):
+        columns = [element.parent.name for element in foreign_key.elements]
+        referred = [element.column.name for element in foreign_key.elements]
+        parent = foreign_key.referred_table.name
+        if parent in partitioned_parents:
+            columns.append(PARTITION_KEY)
+            referred.append(PARTITION_KEY)
+        statements.append(
+            f"ALTER TABLE {name} ADD CONSTRAINT {name}_{'_'.join(columns)}_fkey "
+            f"FOREIGN KEY ({', '.join(columns)}) REFERENCES {parent} ({', '.join(referred)})"
+        )
+
+    return statements
+
+# -------------------------------------------------------- Partition Tables.
+def partition_tables(engine, partitions: int = None) -> list:
+    """Convert The Per-User Tables To Hash Partitions (No-Op On SQLite Or When Off). Returns Tables Converted."""
+
+    partitions = get_partition_count() if partitions is None else partitions
+    if partitions < 2 or engine.dialect.name != "postgresql":
+        return []
+
+    converted = []
+    partitioned_parents = set()
+    for name in PARTITIONED_TABLES:
+        table = Base.metadata.tables[name]
+        try:
+            with engine.begin() as conn:
+                if is_partitioned(conn, name):
+                    partitioned_parents.add(name)
+                    current = conn.execute(
+                        text("SELECT COUNT(*) FROM pg_inherits WHERE inhparent = to_regclass(:table)"), {"table": name}
+                    ).scalar()
+                    if current != partitions:
+                        print(f"{name} already has {current} partitions; repartitioning to {partitions} is not automatic")
+                    continue
+
+                # Rows Without An Owner Have No Partition To Go To.
+                orphaned = conn.execute(text(f"SELECT COUNT(*) FROM {name} WHERE {PARTITION_KEY} IS NULL")).scalar()
+                if orphaned:
+                    print(f"Skipping partitioning of {name}: {orphaned} rows have no {PARTITION_KEY}")
+                    continue
+
+                sequence = conn.execute(text("SELECT pg_get_serial_sequence(:table, 'id')"), {"table": name}).scalar()
+                for statement in partition_ddl(table, partitions, partitioned_parents, sequence):
+                    conn.execute(text(statement))
+            partitioned_parents.add(name)
+            converted.append(name)
+        except Exception as e:
+            print(f"Partitioning {name} failed: {e}")
+
+    if converted:
+        print(f"Hash-partitioned {', '.join(converted)} on {PARTITION_KEY} ({partitions} partitions)")
+    return converted
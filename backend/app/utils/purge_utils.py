@@ -0,0 +1,171 @@
+# Purge Utils.
+#
+# Note : Wipes A User's Financial Data Without One Giant Transaction. Each Table Is Emptied In Bounded Chunks
+#        ('PURGE_CHUNK_SIZE' Rows) - Select A Chunk Of IDs, Delete By Primary Key, Commit - So Locks Are Held Only
+#        For One Small Statement At A Time And Other Requests Keep Flowing. Tables Go In Dependency Order (Tag Links
+#        Before Transactions, Transactions Before Files And Accounts), So Foreign Keys Never Need Switching Off, And
+#        A Purge That Stops Part-Way Leaves No Orphans - Running It Again Finishes The Job.
+#        The User's Tags, Tag Rules And Budgets Are Settings, Not Imported Data, So They're Kept (Budget Counters
+#        And Alerts Go With The Transactions They Counted).
+#        Purges Can Run Inline Or As A Background Job; Jobs Report Per-Table Progress Until They Finish.
+#
+# Functions :
+#   - 'purge_user_data' - Delete All Of A User's Financial Data In Chunks, In Dependency Order.
+#   - 'start_purge_job' - Register A Background Purge For A User (Or Return The One Already Running).
+#   - 'run_purge_job' - Run A Registered Purge In Its Own Session (For Background Tasks).
+#   - 'get_purge_job' - Get The Progress Of A User's Latest Purge.
+
+# Imports.
+import os
+import time
+import uuid
+import threading
+from datetime import datetime
+from typing import Callable, Dict, Optional
+from sqlalchemy.orm import Session
+
+# Local Imports.
+from app.database import (
+    get_session, Transaction, TransactionTag, MergedFingerprint, AccountBalanceHistory, MonthlySnapshot,
+    WeeklyCentiScore, FileUpload, Account, Institution, RecurringSeries, BudgetSpend, BudgetAlert
+)
+from app.utils.analytics_cache import bump_data_version
+
+# Settings.
+PURGE_CHUNK_SIZE = int(os.getenv("PURGE_CHUNK_SIZE", "1000"))
+PURGE_PAUSE_MS = float(os.getenv("PURGE_PAUSE_MS", "0"))   # Optional Breather Between Chunks.
+
+# Tables In Delete Order : (Table Name, Model). Tag Links Are Found Through Their Transactions.
+PURGE_ORDER = [
+    ("transaction_tags", TransactionTag),
+    ("merged_fingerprints", MergedFingerprint),
+    ("transactions", Transaction),
+    ("recurring_series", RecurringSeries),
+    ("budget_spend", BudgetSpend),
+    ("budget_alerts", BudgetAlert),
+    ("account_balance_history", AccountBalanceHistory),
+    ("monthly_snapshots", MonthlySnapshot),
+    ("weekly_centi_scores", WeeklyCentiScore),
+    ("file_uploads", FileUpload),
+    ("accounts", Account),
+    ("institutions", Institution)
+]
+
+# Purge Jobs By ID, And Each User's Latest Job.
+_jobs: Dict[str, dict] = {}
+_latest_job: Dict[int, str] = {}
+_lock = threading.Lock()
+
+# -------------------------------------------------------- Chunk IDs.
+def _chunk_ids(db: Session, model, user_id: int, chunk_size: int) -> list:
+    """Next Chunk Of A User's Row IDs In One Table."""
+
+    if model is TransactionTag:
+        query = db.query(TransactionTag.id).join(
+            Transaction, TransactionTag.transaction_id == Transaction.id
+        ).filter(Transaction.user_id == user_id)
+    else:
+        query = db.query(model.id).filter(model.user_id == user_id)
+    return [row[0] for row in query.limit(chunk_size)]
+
+# -------------------------------------------------------- Purge User Data.
+def purge_user_data(
+    db: Session,
+    user_id: int,
+    chunk_size: int = PURGE_CHUNK_SIZE,
+    on_progress: Optional[Callable[[str, int], None]] = None
+) -> Dict[str, int]:
+    """Delete All Of A User's Financial Data In Chunks, In Dependency Order. Returns Rows Deleted Per Table."""
+
+    deleted = {}
+    for table, model in PURGE_ORDER:
+        deleted[table] = 0
+        while True:
+            ids = _chunk_ids(db, model, user_id, chunk_size)
+            if not ids:
+                break
+            deleted[table] += db.query(model).filter(model.id.in_(ids)).delete(synchronize_session=False)
+            db.commit()
+
+            if on_progress:
+                on_progress(table, deleted[table])
+            if PURGE_PAUSE_MS > 0:
+                time.sleep(PURGE_PAUSE_MS / 1000)
+            if len(ids) < chunk_size:
+                break
+
+    # Drop Cached Analytics Built From The Deleted Rows.
+    if deleted.get("transactions"):
+        bump_data_version(db, user_id)
+        db.commit()
+    return deleted
+
+# -------------------------------------------------------- Start Purge Job.
+def start_purge_job(user_id: int) -> dict:
+    """Register A Background Purge For A User (Or Return The One Already Running)."""
+
+    with _lock:
+        current = _jobs.get(_latest_job.get(user_id))
+        if current and current["status"] in ("queued", "running"):
+            return {**current, "deleted": dict(current["deleted"]), "started": False}
+
+        job = {
+            "job_id": uuid.uuid4().hex,
+            "user_id": user_id,
+            "status": "queued",
+            "current_table": None,
+            "deleted": {table: 0 for table, _ in PURGE_ORDER},
+            "queued_at": datetime.now().isoformat(timespec="seconds"),
+            "finished_at": None,
+            "error": None
+        }
+        # Keep Only Each User's Latest Job.
+        _jobs.pop(_latest_job.get(user_id), None)
+        _jobs[job["job_id"]] = job
+        _latest_job[user_id] = job["job_id"]
+        return {**job, "deleted": dict(job["deleted"]), "started": True}
+
+# -------------------------------------------------------- Run Purge Job.
+def run_purge_job(job_id: str):
+    """Run A Registered Purge In Its Own Session (For Background Tasks)."""
+
+    with _lock:
+        job = _jobs.get(job_id)
+        if job is None:
+            return
+        job["status"] = "running"
+
+    def on_progress(table: str, count: int):
+        with _lock:
+            job["current_table"] = table
+            job["deleted"][table] = count
+
+    # Request Sessions Are Closed By The Time Background Tasks Run, So Open A Fresh One.
+    db = get_session()
+    try:
+        if db is None:
+            raise RuntimeError("no database connection")
+        purge_user_data(db, job["user_id"], on_progress=on_progress)
+        status, error = "completed", None
+    except Exception as e:
+        if db is not None:
+            db.rollback()
+        status, error = "failed", str(e)
+        print(f"Error purging data for user {job['user_id']}: {error}")
+    finally:
+        if db is not None:
+            db.close()
+
+    with _lock:
+        job["status"] = status
+        job["error"] = error
+        job["current_table"] = None
+        job["finished_at"] = datetime.now().isoformat(timespec="seconds")
+
+# -------------------------------------------------------- Get Purge Job.
+def get_purge_job(user_id: int) -> Optional[dict]:
+    """Get The Progress Of A User's Latest Purge (None If They Haven't Started One)."""
+
+    with _lock:
+        job = _jobs.get(_latest_job.get(user_id))
+        return {**job, "deleted": dict(job["deleted"])} if job else None
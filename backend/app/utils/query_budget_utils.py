@@ -0,0 +1,233 @@
+# Query Budget Utils.
+#
+# Note : Guards Against N+1 Regressions. Every Route Gets A Maximum Number Of SQL Statements Per Request In
+#        'ROUTE_QUERY_BUDGETS' (Keyed By Method + Route Template, The Same Labels '/metrics' Uses). The Budgets Are
+#        Independent Of How Much Data A User Has - A Route Whose Statement Count Grows With Rows Is A Bug, Not A
+#        Budget. Routes That Still Do Per-Row Work On Purpose (Bulk Writes, Plaid Syncs, Admin Jobs) Are Listed
+#        With 'None' So They Stay Visible Until They're Fixed.
+#        'MetricsMiddleware' Checks Each Request Against Its Budget : Over-Budget Requests Are Logged, And With
+#        'QUERY_BUDGET_STRICT=true' (CI, 'benchmarks.check_query_budgets') They Raise 'QueryBudgetExceeded'.
+#        'query_budget' Is The Same Check For Any Block Of Code, For Use In Scripts And Tests.
+#
+# Functions :
+#   - 'QueryBudgetExceeded' - Raised When A Block Or Request Runs More Statements Than Its Budget.
+#   - 'count_queries' - Context Manager That Counts Statements Sent By The App's Engines.
+#   - 'query_budget' - Context Manager That Fails When A Block Runs More Than N Statements.
+#   - 'get_route_budget' - Get The Budget For A Method + Route Template.
+#   - 'check_route_budget' - Check A Finished Request Against Its Route Budget.
+#   - 'find_unbudgeted_routes' - List App Routes Missing From 'ROUTE_QUERY_BUDGETS'.
+
+# Imports.
+import os
+from contextlib import contextmanager
+from typing import List, Optional
+
+# Raise Instead Of Logging When A Request Goes Over Budget.
+QUERY_BUDGET_STRICT = os.getenv("QUERY_BUDGET_STRICT", "false").lower() == "true"
+
+# Method + Route Template -> Max Statements Per Request ('None' = Known Per-Row Route, Not Enforced Yet).
+# Counts Include Auth (One Statement To Load The Current User).
+ROUTE_QUERY_BUDGETS = {
+    # App.
+    "GET /": 0,
+    "GET /health": 0,
+    "GET /metrics": 0,
+    "OPTIONS /auth/{path:path}": 0,
+    "OPTIONS /files/{path:path}": 0,
+    "OPTIONS /files/": 0,
+
+    # Files.
+    "GET /files": 2,
+    "GET /files/": 2,
+    "GET /files/{file_id}/transactions": 5,
+    "PATCH /files/{file_id}": 5,
+    "DELETE /files/{file_id}": 12,              # One Balance Update Per Account In The File (Real Uploads Target One).
+    "POST /upload": None,                       # One Fingerprint Lookup Per 500 Rows.
+
+    # Transactions.
+    "GET /transactions": 4,
+    "GET /transactions/search": 5,
+    "GET /transactions/export": 2,
+    "GET /transactions/detailed": 2,
+    "POST /transactions/": 22,                  # Up To Ten Move Budget Counters (The Row, Then Its Tag Links).
+    "DELETE /transactions/bulk": None,          # Per-Transaction Deletes And Per-Account Balance Sums.
+    "POST /transactions/bulk-update": 10,       # Recategorizing Moves Budget Counters (Up To Six).
+    "POST /transactions/reconcile": None,       # Merges In Chunks Of 500, Plus Per-Account Balance Sums.
+    "DELETE /transactions/{transaction_id}": 13,
+    "POST /transactions/update-details": 3,
+    "DELETE /clear": None,                      # Chunked Purge, Two Statements Per 1,000 Rows.
+    "GET /clear/status": 1,
+
+    # Accounts.
+    "GET /accounts": 3,
+    "GET /accounts/enhanced": 11,
+    "GET /accounts/analysis": 9,
+    "POST /accounts/snapshot": 4,
+    "POST /accounts/{account_id}/fix-balance": 6,
+    "POST /accounts/recalculate-balances": None,    # One Balance Sum Per Account.
+    "GET /stats": 7,                            # Aggregates Come From The Analytics Cache (One Load On A Miss).
+    "GET /analytics/compare": 2,                # Prefix Sums Over The Analytics Cache (One Load On A Miss).
+    "GET /analytics/recurring": 2,
+    "POST /analytics/recurring/detect": 4,
+    "GET /analytics/forecast": 3,
+
+    # Budgets.
+    "GET /budgets": 3,
+    "POST /budgets": 10,                        # Seeds Counters From History In One Scan.
+    "PUT /budgets/{budget_id}": 11,
+    "DELETE /budgets/{budget_id}": 5,
+    "GET /budgets/{budget_id}/history": 3,
+    "GET /budgets/alerts": 2,
+    "POST /budgets/alerts/read": 2,
+
+    # Debug.
+    "GET /debug/account/{account_id}": 4,
+    "GET /debug/cash-flow": 8,
+    "GET /debug/pool": 1,
+    "GET /debug/slow-queries": 1,
+    "POST /debug/slow-queries/dump": 1,
+    "DELETE /debug/slow-queries": 1,
+
+    # Tags.
+    "GET /tags": 2,
+    "POST /tags": 4,
+    "PUT /tags/{tag_id}": 5,
+    "DELETE /tags/{tag_id}": 11,                # Deletes The Tag's Budgets Too.
+    "POST /tags/initialize": 2,
+    "GET /tags/{tag_id}/transaction-count": 3,
+    "POST /transactions/{transaction_id}/tags/{tag_id}": 12,
+    "DELETE /transactions/{transaction_id}/tags/{tag_id}": 8,
+    "GET /transactions/{transaction_id}/tags": 3,
+    "POST /transactions/bulk-tag": 15,
+
+    # Tag Rules.
+    "GET /tag-rules": 2,
+    "POST /tag-rules": 4,
+    "PUT /tag-rules/{rule_id}": 5,
+    "DELETE /tag-rules/{rule_id}": 2,
+    "POST /tag-rules/initialize": 6,
+    "POST /tag-rules/apply": None,              # Background Job, One Batch Per 5,000 Transactions.
+
+    # Plaid.
+    "POST /plaid/create_link_token": 1,
+    "POST /plaid/exchange_public_token": None,      # Per-Account And Per-Transaction Upserts.
+    "POST /plaid/fetch_transactions/{access_token}": None,
+    "GET /plaid/status": 1,
+    "GET /plaid/accounts/{access_token}": 1,
+
+    # Auth.
+    "POST /auth/register": 4,
+    "POST /auth/login": 3,
+    "POST /auth/refresh": 2,
+    "POST /auth/logout": 0,
+    "POST /auth/google-code": 4,
+    "GET /auth/verify-email": 3,
+    "POST /auth/resend-verification": 3,
+    "POST /auth/forgot-password": 3,
+    "GET /auth/verify-reset-token": 1,
+    "POST /auth/reset-password": 3,
+    "GET /auth/me": 1,
+    "POST /auth/contact": 1,
+
+    # Centi Score.
+    "GET /centi-score/overview": 7,
+    "GET /centi-score/status": 2,
+    "GET /centi-score/current": 7,
+    "GET /centi-score/history": 2,
+    "GET /centi-score/growth": 2,
+    "GET /centi-score/summary": 2,
+    "POST /centi-score/calculate": 9,
+    "GET /centi-score/trend": 2,
+    "POST /centi-score/calculate-all-users": None,  # Scores Every User.
+    "POST /centi-score/backfill": None              # One Score Per Missing Week.
+}
+
+# -------------------------------------------------------- Query Budget Exceeded.
+class QueryBudgetExceeded(AssertionError):
+    """Raised When A Block Or Request Runs More Statements Than Its Budget."""
+
+# -------------------------------------------------------- Query Counter.
+class _QueryCounter:
+    """Statements Seen While A 'count_queries' Block Is Open."""
+
+    def __init__(self):
+        self.count = 0
+        self.statements: List[str] = []
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+        self.statements.append(statement)
+
+# -------------------------------------------------------- Count Queries.
+@contextmanager
+def count_queries(engine=None):
+    """Count Statements Sent By The App's Engines (Or Just 'engine') While The Block Runs."""
+
+    from sqlalchemy import event
+    from app.database import get_engine, get_async_engine
+
+    if engine is not None:
+        engines = [engine]
+    else:
+        engines = [get_engine()]
+        async_engine = get_async_engine()
+        if async_engine is not None:
+            engines.append(async_engine.sync_engine)
+
+    counter = _QueryCounter()
+    for target in engines:
+        event.listen(target, "before_cursor_execute", counter._on_execute)
+    try:
+        yield counter
+    finally:
+        for target in engines:
+            event.remove(target, "before_cursor_execute", counter._on_execute)
+
+# -------------------------------------------------------- Query Budget.
+@contextmanager
+def query_budget(max_queries: int, engine=None, label: Optional[str] = None):
+    """Fail With 'QueryBudgetExceeded' When The Block Runs More Than 'max_queries' Statements."""
+
+    with count_queries(engine) as counter:
+        yield counter
+
+    if counter.count > max_queries:
+        listing = "\n".join(f"  {i + 1}. {' '.join(statement.split())[:200]}" for i, statement in enumerate(counter.statements))
+        raise QueryBudgetExceeded(
+            f"{label or 'Block'} ran {counter.count} queries (budget {max_queries}):\n{listing}"
+        )
+
+# -------------------------------------------------------- Get Route Budget.
+def get_route_budget(method: str, route: str) -> Optional[int]:
+    """Get The Budget For A Method + Route Template (None If Unbudgeted Or Not Enforced)."""
+    return ROUTE_QUERY_BUDGETS.get(f"{method} {route}")
+
+# -------------------------------------------------------- Check Route Budget.
+def check_route_budget(method: str, route: str, queries: int):
+    """Check A Finished Request Against Its Route Budget (Logs, Or Raises In Strict Mode)."""
+
+    budget = get_route_budget(method, route)
+    if budget is None or queries <= budget:
+        return
+
+    message = f"{method} {route} ran {queries} queries (budget {budget})"
+    if QUERY_BUDGET_STRICT:
+        raise QueryBudgetExceeded(message)
+    print(f"⚠️ {message}")
+
+# -------------------------------------------------------- Find Unbudgeted Routes.
+def find_unbudgeted_routes(app) -> List[str]:
+    """List App Routes (Method + Template) Missing From 'ROUTE_QUERY_BUDGETS' (Docs Routes Excluded)."""
+
+    docs = {app.openapi_url, app.docs_url, app.redoc_url, app.swagger_ui_oauth2_redirect_url}
+    missing = []
+    for route in app.routes:
+        if route.path in docs:
+            continue
+        for method in sorted(getattr(route, "methods", None) or []):
+            if method == "HEAD":
+                continue
+            key = f"{method} {route.path}"
+            if key not in ROUTE_QUERY_BUDGETS:
+                missing.append(key)
+    return missing
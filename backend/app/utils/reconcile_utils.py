@@ -0,0 +1,206 @@
+# Reconcile Utils.
+#
+# Note : Finds The Same Purchase Imported Twice From Different Sources - Once From Plaid, Once From A CSV Statement
+#        Or Manual Entry - Where Fingerprints Don't Match Because The Posting Date Or Descriptor Differs.
+#        Candidates Are Blocked By (Account, Amount In Cents), Then Each Block's Plaid And Non-Plaid Rows Are Walked
+#        In Date Order With A Sliding ±N-Day Window (A Sort-Merge Join), So Work Grows With The Number Of Rows Plus
+#        Real Candidates Rather Than Rows Squared. Candidates Are Scored On Vendor Similarity And Date Gap, And Each
+#        Row Is Matched At Most Once, Best Score First.
+#        Merging Keeps The Plaid Row (Richer Data), Moves Tags And Notes Over, Records The Duplicate's Fingerprint In
+#        'merged_fingerprints' (So Re-Uploading The Statement Doesn't Bring It Back), And Deletes The Duplicate -
+#        All In Chunked Set-Based Statements.
+#
+# Functions :
+#   - 'vendor_similarity' - Similarity Of Two Vendor Strings (0 - 1).
+#   - 'find_duplicate_pairs' - Match Plaid Rows To CSV/Manual Duplicates For A User.
+#   - 'merge_duplicate_pairs' - Merge Matched Duplicates Into Their Plaid Rows.
+
+# Imports.
+from datetime import datetime, timedelta
+from difflib import SequenceMatcher
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy.orm import Session
+
+# Local Imports.
+from app.database import Transaction, TransactionTag, MergedFingerprint
+from app.utils.fingerprint_utils import LOOKUP_CHUNK_SIZE, vendor_key
+from app.utils.analytics_cache import bump_data_version
+from app.utils.budget_utils import record_transactions_spend, record_tag_links_spend
+
+# Defaults.
+DEFAULT_WINDOW_DAYS = 3
+DEFAULT_MIN_SCORE = 0.6
+
+# Score Weights (Vendor Similarity Dominates; A Closer Date Breaks Ties).
+VENDOR_WEIGHT = 0.8
+DATE_WEIGHT = 0.2
+
+# Row Tuple Positions.
+ID, ACCOUNT, DATE, AMOUNT, VENDOR, DESCRIPTION, SOURCE = range(7)
+
+# -------------------------------------------------------- Vendor Similarity.
+def vendor_similarity(a: Optional[str], b: Optional[str]) -> float:
+    """Similarity Of Two Vendor Strings (0 - 1), After Vendor Normalization."""
+
+    key_a, key_b = vendor_key(a or ""), vendor_key(b or "")
+    if not key_a or not key_b:
+        return 0.0
+    if key_a == key_b:
+        return 1.0
+    return SequenceMatcher(None, key_a, key_b).ratio()
+
+# -------------------------------------------------------- Score Pair.
+def _score_pair(plaid_row: tuple, other_row: tuple, window_days: int) -> float:
+    """Score A Candidate Pair On Vendor Similarity And Date Gap."""
+
+    # Plaid Rows Carry Both The Merchant Name And The Raw Descriptor; Either Can Match The Statement.
+    similarity = max(
+        vendor_similarity(plaid_row[VENDOR], other_row[VENDOR]),
+        vendor_similarity(plaid_row[DESCRIPTION], other_row[DESCRIPTION])
+    )
+    gap = abs((plaid_row[DATE] - other_row[DATE]).days)
+    return VENDOR_WEIGHT * similarity + DATE_WEIGHT * (1 - gap / (window_days + 1))
+
+# -------------------------------------------------------- Find Duplicate Pairs.
+def find_duplicate_pairs(
+    db: Session,
+    user_id: int,
+    window_days: int = DEFAULT_WINDOW_DAYS,
+    min_score: float = DEFAULT_MIN_SCORE
+) -> Tuple[List[Dict], int]:
+    """Match Plaid Rows To CSV/Manual Duplicates For A User. Returns (Pairs, Rows Scanned)."""
+
+    # Cash Rows Have No Plaid Counterpart, So Only Account Rows Are Loaded.
+    rows = db.query(
+        Transaction.id, Transaction.account_id, Transaction.date, Transaction.amount,
+        Transaction.vendor, Transaction.description, Transaction.source
+    ).filter(
+        Transaction.user_id == user_id,
+        Transaction.account_id.isnot(None),
+        Transaction.date.isnot(None)
+    ).all()
+
+    # Block By (Account, Cents) : [Plaid Rows, Other Rows].
+    blocks: Dict[tuple, Tuple[list, list]] = {}
+    for row in rows:
+        block = blocks.setdefault((row[ACCOUNT], int(round((row[AMOUNT] or 0) * 100))), ([], []))
+        block[0 if row[SOURCE] == "plaid" else 1].append(tuple(row))
+
+    # Sort-Merge Each Block Within The Date Window.
+    window = timedelta(days=window_days)
+    candidates = []
+    for plaid_rows, other_rows in blocks.values():
+        if not plaid_rows or not other_rows:
+            continue
+        plaid_rows.sort(key=lambda row: row[DATE])
+        other_rows.sort(key=lambda row: row[DATE])
+
+        start = 0
+        for other in other_rows:
+            while start < len(plaid_rows) and plaid_rows[start][DATE] < other[DATE] - window:
+                start += 1
+            j = start
+            while j < len(plaid_rows) and plaid_rows[j][DATE] <= other[DATE] + window:
+                score = _score_pair(plaid_rows[j], other, window_days)
+                if score >= min_score:
+                    candidates.append((score, plaid_rows[j], other))
+                j += 1
+
+    # Best Matches First; Each Row Used Once.
+    candidates.sort(key=lambda candidate: (-candidate[0], abs((candidate[1][DATE] - candidate[2][DATE]).days)))
+    used = set()
+    pairs = []
+    for score, plaid_row, other in candidates:
+        if plaid_row[ID] in used or other[ID] in used:
+            continue
+        used.update((plaid_row[ID], other[ID]))
+        pairs.append({
+            "keep_id": plaid_row[ID],
+            "duplicate_id": other[ID],
+            "duplicate_source": other[SOURCE],
+            "account_id": plaid_row[ACCOUNT],
+            "amount": plaid_row[AMOUNT],
+            "keep_date": plaid_row[DATE].isoformat(),
+            "duplicate_date": other[DATE].isoformat(),
+            "keep_vendor": plaid_row[VENDOR],
+            "duplicate_vendor": other[VENDOR],
+            "score": round(score, 3)
+        })
+
+    return pairs, len(rows)
+
+# -------------------------------------------------------- Merge Duplicate Pairs.
+def merge_duplicate_pairs(db: Session, user_id: int, pairs: List[Dict]) -> int:
+    """Merge Matched Duplicates Into Their Plaid Rows (Tags, Notes, Fingerprint). Returns Rows Removed. Caller Commits."""
+
+    keep_for = {pair["duplicate_id"]: pair["keep_id"] for pair in pairs}
+    duplicate_ids = list(keep_for)
+    involved_ids = duplicate_ids + list(keep_for.values())
+    now = datetime.now()
+
+    # Load Notes, Fingerprints And Tag Links For Every Involved Row (One Query Per Chunk Each).
+    details = {}
+    tag_links = []
+    for start in range(0, len(involved_ids), LOOKUP_CHUNK_SIZE):
+        chunk = involved_ids[start:start + LOOKUP_CHUNK_SIZE]
+        details.update({row[0]: row for row in db.query(
+            Transaction.id, Transaction.notes, Transaction.fingerprint
+        ).filter(Transaction.id.in_(chunk), Transaction.user_id == user_id)})
+        tag_links.extend(db.query(
+            TransactionTag.id, TransactionTag.transaction_id, TransactionTag.tag_id
+        ).filter(TransactionTag.transaction_id.in_(chunk)).all())
+
+    # Budgets : The Duplicates Leave Their Counters (Before Their Links Move).
+    for start in range(0, len(duplicate_ids), LOOKUP_CHUNK_SIZE):
+        record_transactions_spend(db, user_id, [Transaction.id.in_(duplicate_ids[start:start + LOOKUP_CHUNK_SIZE])], -1)
+
+    # Tags : Move The Duplicate's Links Over Unless The Kept Row Already Has That Tag.
+    kept_tags = {(transaction_id, tag_id) for _, transaction_id, tag_id in tag_links if transaction_id not in keep_for}
+    moved, moved_links, dropped = [], [], []
+    for link_id, transaction_id, tag_id in tag_links:
+        if transaction_id not in keep_for:
+            continue
+        target = (keep_for[transaction_id], tag_id)
+        if target in kept_tags:
+            dropped.append(link_id)
+        else:
+            kept_tags.add(target)
+            moved.append({"id": link_id, "transaction_id": target[0]})
+            moved_links.append(target)
+    if moved:
+        record_tag_links_spend(db, user_id, moved_links, 1)
+        db.bulk_update_mappings(TransactionTag, moved)
+    for start in range(0, len(dropped), LOOKUP_CHUNK_SIZE):
+        db.query(TransactionTag).filter(
+            TransactionTag.id.in_(dropped[start:start + LOOKUP_CHUNK_SIZE])
+        ).delete(synchronize_session=False)
+
+    # Notes : Keep The Duplicate's Notes When The Kept Row Has None.
+    note_updates = []
+    for duplicate_id, keep_id in keep_for.items():
+        duplicate, kept = details.get(duplicate_id), details.get(keep_id)
+        if duplicate and kept and duplicate[1] and not kept[1]:
+            note_updates.append({"id": keep_id, "notes": duplicate[1]})
+    if note_updates:
+        db.bulk_update_mappings(Transaction, note_updates)
+
+    # Remember Duplicate Fingerprints, So Re-Importing The Statement Skips Them.
+    tombstones = [
+        {"user_id": user_id, "fingerprint": details[duplicate_id][2], "transaction_id": keep_id, "created_at": now}
+        for duplicate_id, keep_id in keep_for.items()
+        if duplicate_id in details and details[duplicate_id][2]
+    ]
+    if tombstones:
+        db.bulk_insert_mappings(MergedFingerprint, tombstones)
+
+    # Delete The Duplicates.
+    removed = 0
+    for start in range(0, len(duplicate_ids), LOOKUP_CHUNK_SIZE):
+        removed += db.query(Transaction).filter(
+            Transaction.id.in_(duplicate_ids[start:start + LOOKUP_CHUNK_SIZE]),
+            Transaction.user_id == user_id
+        ).delete(synchronize_session=False)
+    if removed:
+        bump_data_version(db, user_id)
+
+    return removed
@@ -12,7 +12,7 @@ from threading import Thread
 from datetime import datetime, date
 
 # Local Imports.
-from ..database import SessionLocal, User, WeeklyCentiScore
+from ..database import get_session, User, WeeklyCentiScore
 from .centi_score_utils import create_weekly_score, get_monday_of_week
 
 # -------------------------------------------------------- Centi Score Scheduler.
@@ -74,8 +74,11 @@ class CentiScoreScheduler:
             # Print Message.
             print(f"Starting weekly Centi Score calculation at {datetime.now()}.")
             
-            # Get Database Session.
-            db = SessionLocal()
+            # Get Database Session ('SessionLocal' Is Only Built Once The Engine Exists, So Go Through 'get_session').
+            db = get_session()
+            if db is None:
+                print("Skipping weekly Centi Score calculation - no database connection")
+                return
             try:
                 # Get All Active Users.
                 users = db.query(User).filter(User.is_active == True).all()
@@ -0,0 +1,305 @@
+# Score Analytics Utils.
+#
+# Note : Computes Centi Score History Stats In The Database Instead Of Loading Every Weekly Row Into Python.
+#        Best/Worst/Average Come From Plain Aggregates, Week-Over-Week Deltas From LAG(), And Growth/Decline
+#        Streaks From A Gaps-And-Islands Pass, All In A Single Statement So Cost Stays Flat As History Grows.
+#
+# Functions :
+#   - 'get_score_analytics' - Get Aggregate Stats, Deltas And Streaks For A User's Weekly Scores In One Query.
+#   - 'get_recent_weekly_scores' - Get The Last N Weekly Score Rows For A User.
+#   - 'build_score_status' - Build The '/centi-score/status' Payload From Analytics.
+#   - 'build_growth_analysis' - Build The '/centi-score/growth' Payload From Analytics.
+#   - 'build_score_summary' - Build The '/centi-score/summary' Payload From Analytics.
+
+# Imports.
+from sqlalchemy import func, case, select, and_
+from sqlalchemy.orm import Session
+from datetime import date
+from typing import Dict, List, Optional
+
+# Local Imports.
+from ..database import WeeklyCentiScore
+
+# -------------------------------------------------------- Month Bounds.
+def _month_bounds(today: date):
+    """Get The Start Of The Previous, Current, And Next Month."""
+
+    current_start = today.replace(day=1)
+    if current_start.month == 1:
+        previous_start = date(current_start.year - 1, 12, 1)
+    else:
+        previous_start = date(current_start.year, current_start.month - 1, 1)
+    if current_start.month == 12:
+        next_start = date(current_start.year + 1, 1, 1)
+    else:
+        next_start = date(current_start.year, current_start.month + 1, 1)
+    return previous_start, current_start, next_start
+
+# -------------------------------------------------------- Get Score Analytics.
+def get_score_analytics(db: Session, user_id: int, today: Optional[date] = None) -> Optional[Dict]:
+    """Get Aggregate Stats, Deltas And Streaks For A User's Weekly Scores In One Query."""
+
+    today = today or date.today()
+    previous_start, current_start, next_start = _month_bounds(today)
+
+    # Per-Week Rows With The Prior Week's Score And Recency Rank.
+    scored = select(
+        WeeklyCentiScore.score_date,
+        WeeklyCentiScore.total_score,
+        WeeklyCentiScore.created_at,
+        func.lag(WeeklyCentiScore.total_score).over(order_by=WeeklyCentiScore.score_date).label("previous_score"),
+        func.row_number().over(order_by=WeeklyCentiScore.score_date.desc()).label("recency")
+    ).where(WeeklyCentiScore.user_id == user_id).cte("scored")
+
+    # Direction Of Each Week-Over-Week Move (1 Up, -1 Down, 0 Flat / First Week).
+    directed = select(
+        scored.c.score_date,
+        scored.c.recency,
+        case(
+            (scored.c.total_score > scored.c.previous_score, 1),
+            (scored.c.total_score < scored.c.previous_score, -1),
+            else_=0
+        ).label("direction")
+    ).cte("directed")
+
+    # Gaps-And-Islands : Consecutive Weeks Moving The Same Way Share An Island Id.
+    islands = select(
+        directed.c.direction,
+        directed.c.recency,
+        (
+            func.row_number().over(order_by=directed.c.score_date)
+            - func.row_number().over(partition_by=directed.c.direction, order_by=directed.c.score_date)
+        ).label("island")
+    ).cte("islands")
+
+    # Length Of Each Streak And Whether It Includes The Latest Week.
+    streaks = select(
+        islands.c.direction,
+        func.count().label("length"),
+        func.min(islands.c.recency).label("latest_recency")
+    ).group_by(islands.c.direction, islands.c.island).cte("streaks")
+
+    def streak_length(direction: int, current_only: bool = False):
+        condition = streaks.c.direction == direction
+        if current_only:
+            condition = and_(condition, streaks.c.latest_recency == 1)
+        return select(func.coalesce(func.max(streaks.c.length), 0)).where(condition).scalar_subquery()
+
+    def extreme_date(best: bool):
+        order = scored.c.total_score.desc() if best else scored.c.total_score.asc()
+        return select(scored.c.score_date).order_by(order, scored.c.score_date.desc()).limit(1).scalar_subquery()
+
+    def month_average(start: date, end: date):
+        return func.avg(case(
+            (and_(scored.c.score_date >= start, scored.c.score_date < end), scored.c.total_score),
+            else_=None
+        ))
+
+    def latest(column):
+        return func.max(case((scored.c.recency == 1, column), else_=None))
+
+    statement = select(
+        func.count(scored.c.score_date).label("total_scores"),
+        func.min(scored.c.total_score).label("worst_score"),
+        func.max(scored.c.total_score).label("best_score"),
+        func.avg(scored.c.total_score).label("average_score"),
+        func.min(scored.c.score_date).label("first_score_date"),
+        func.max(scored.c.score_date).label("last_score_date"),
+        latest(scored.c.total_score).label("latest_score"),
+        latest(scored.c.previous_score).label("previous_score"),
+        latest(scored.c.created_at).label("last_updated"),
+        month_average(current_start, next_start).label("current_month_avg"),
+        month_average(previous_start, current_start).label("previous_month_avg"),
+        extreme_date(True).label("best_score_date"),
+        extreme_date(False).label("worst_score_date"),
+        streak_length(1).label("longest_growth_streak"),
+        streak_length(-1).label("longest_decline_streak"),
+        streak_length(1, current_only=True).label("current_growth_streak"),
+        streak_length(-1, current_only=True).label("current_decline_streak")
+    )
+
+    row = db.execute(statement).first()
+    if row is None or not row.total_scores:
+        return None
+
+    return dict(row._mapping)
+
+# -------------------------------------------------------- Get Recent Weekly Scores.
+def get_recent_weekly_scores(db: Session, user_id: int, limit: int = 12) -> List[WeeklyCentiScore]:
+    """Get The Last N Weekly Score Rows For A User."""
+
+    return db.query(WeeklyCentiScore).filter(
+        WeeklyCentiScore.user_id == user_id
+    ).order_by(WeeklyCentiScore.score_date.desc()).limit(limit).all()
+
+# -------------------------------------------------------- Score Point Helper.
+def _score_points(scores: List[WeeklyCentiScore]) -> List[Dict]:
+    """Format Weekly Score Rows For Charting."""
+
+    return [
+        {
+            "date": score.score_date,
+            "score": score.total_score,
+            "net_worth": score.net_worth,
+            "assets": score.total_assets,
+            "liabilities": score.total_liabilities,
+            "cash_flow": score.monthly_cash_flow
+        }
+        for score in scores
+    ]
+
+# -------------------------------------------------------- Build Score Status.
+def build_score_status(analytics: Optional[Dict], recent: List[WeeklyCentiScore]) -> Dict:
+    """Build The '/centi-score/status' Payload From Analytics."""
+
+    if not analytics:
+        return {
+            "has_centi_scores": False,
+            "total_scores": 0,
+            "message": "No Centi Score data found. Add financial data and calculate your first score!",
+            "can_calculate": True
+        }
+
+    total_scores = analytics["total_scores"]
+    latest_score = analytics["latest_score"]
+    previous_score = analytics["previous_score"]
+
+    # Determine Score Trend.
+    if previous_score is not None:
+        change = latest_score - previous_score
+        trend = "improving" if change > 0 else "declining" if change < 0 else "stable"
+    else:
+        trend = "new"
+        change = 0
+
+    # Calculate Weeks Tracked.
+    weeks_tracked = (analytics["last_score_date"] - analytics["first_score_date"]).days // 7 + 1
+
+    return {
+        "has_centi_scores": True,
+        "total_scores": total_scores,
+        "weeks_tracked": weeks_tracked,
+        "latest_score": latest_score,
+        "latest_score_date": analytics["last_score_date"],
+        "best_score": analytics["best_score"],
+        "worst_score": analytics["worst_score"],
+        "average_score": round(float(analytics["average_score"]), 1),
+        "trend": trend,
+        "change": change,
+        "last_updated": analytics["last_updated"],
+        "message": f"You have {total_scores} Centi Score{'s' if total_scores > 1 else ''} tracked over {weeks_tracked} week{'s' if weeks_tracked > 1 else ''}",
+        "can_calculate": True,
+        "score_history": _score_points(recent[:12])
+    }
+
+# -------------------------------------------------------- Build Growth Analysis.
+def build_growth_analysis(analytics: Optional[Dict], recent: List[WeeklyCentiScore]) -> Dict:
+    """Build The '/centi-score/growth' Payload From Analytics."""
+
+    if not analytics or analytics["total_scores"] < 2:
+        return {
+            "has_growth_data": False,
+            "message": "Need at least 2 weeks of data to show growth analysis"
+        }
+
+    latest_score = analytics["latest_score"]
+    previous_score = analytics["previous_score"] or 0
+    change = latest_score - previous_score
+
+    # Monthly Comparison (Only When Both Months Have Scores).
+    monthly_comparison = None
+    current_month_avg = analytics["current_month_avg"]
+    previous_month_avg = analytics["previous_month_avg"]
+    if current_month_avg is not None and previous_month_avg is not None:
+        current_month_avg = float(current_month_avg)
+        previous_month_avg = float(previous_month_avg)
+        monthly_change = current_month_avg - previous_month_avg
+        monthly_comparison = {
+            "current_month_avg": round(current_month_avg, 1),
+            "previous_month_avg": round(previous_month_avg, 1),
+            "change": round(monthly_change, 1),
+            "change_percentage": round((monthly_change / previous_month_avg * 100) if previous_month_avg > 0 else 0, 1)
+        }
+
+    return {
+        "has_growth_data": True,
+        "current_score": latest_score,
+        "previous_score": previous_score,
+        "trend": {
+            "trend": "improving" if change > 0 else "declining" if change < 0 else "stable",
+            "change": change,
+            "change_percentage": ((change / previous_score) * 100) if previous_score > 0 else 0,
+            "weeks_tracked": analytics["total_scores"]
+        },
+        "monthly_comparison": monthly_comparison,
+        "streaks": {
+            "current_growth_streak": analytics["current_growth_streak"],
+            "current_decline_streak": analytics["current_decline_streak"],
+            "longest_growth_streak": analytics["longest_growth_streak"],
+            "longest_decline_streak": analytics["longest_decline_streak"]
+        },
+        "stats": {
+            "total_scores": analytics["total_scores"],
+            "best_score": analytics["best_score"],
+            "best_score_date": analytics["best_score_date"],
+            "worst_score": analytics["worst_score"],
+            "worst_score_date": analytics["worst_score_date"],
+            "average_score": round(float(analytics["average_score"]), 1),
+            "score_range": analytics["best_score"] - analytics["worst_score"]
+        },
+        "recent_scores": _score_points(recent[:8])  # Last 8 Weeks.
+    }
+
+# -------------------------------------------------------- Build Score Summary.
+def build_score_summary(analytics: Optional[Dict]) -> Dict:
+    """Build The '/centi-score/summary' Payload From Analytics."""
+
+    if not analytics:
+        return {
+            "has_data": False,
+            "message": "No Centi Score data available"
+        }
+
+    latest_score = analytics["latest_score"]
+    previous_score = analytics["previous_score"]
+
+    if previous_score is None:
+        return {
+            "has_data": True,
+            "current_score": latest_score,
+            "is_first_score": True,
+            "message": "This is your first Centi Score! Keep adding financial data to see your growth."
+        }
+
+    # Calculate Change And Change Percentage.
+    change = latest_score - previous_score
+    change_percentage = ((change / previous_score) * 100) if previous_score > 0 else 0
+
+    # Determine Growth Message.
+    if change > 0:
+        if change >= 5:
+            growth_message = f"Great progress! Your score increased by {change} points."
+        elif change >= 2:
+            growth_message = f"Nice improvement! Your score went up by {change} points."
+        else:
+            growth_message = f"Small gain of {change} points."
+    elif change < 0:
+        if change <= -5:
+            growth_message = f"Score dropped by {abs(change)} points - Time to review your finances."
+        elif change <= -2:
+            growth_message = f"Score decreased by {abs(change)} points"
+        else:
+            growth_message = f"Small decrease of {abs(change)} points"
+    else:
+        growth_message = "Your score stayed the same"
+
+    return {
+        "has_data": True,
+        "current_score": latest_score,
+        "previous_score": previous_score,
+        "change": change,
+        "change_percentage": round(change_percentage, 1),
+        "growth_message": growth_message,
+        "last_updated": analytics["last_updated"],
+        "score_date": analytics["last_score_date"]
+    }
@@ -0,0 +1,215 @@
+# Score Backfill Utils.
+#
+# Note : Plaid Imports ~90 Days Of History, But Weekly Scores Only Start Accruing From The Week A User Signs Up.
+#        This Rebuilds Each Past Monday's Balances By Walking Transactions Backwards From Today's Balances,
+#        All In One Vectorized Pass, Then Scores And Upserts The Missing Weeks. An Import Of Older History Also
+#        Recomputes The Reconstructed Weeks From Its Earliest New Transaction On; Live Scores Are Never Overwritten.
+#        Weeks Are Unique Per User ('uq_weekly_centi_scores_user_date'), So Overlapping Backfills Can't Double Up.
+#
+# Functions :
+#   - 'get_backfill_mondays' - Get The Past Mondays That Need A Weekly Score (Missing, Or Reconstructed And Stale).
+#   - 'backfill_weekly_scores' - Reconstruct And Store Weekly Centi Scores For Past Weeks From Transaction History.
+#   - 'backfill_weekly_scores_job' - Run The Backfill In Its Own Session (For Background Tasks).
+
+# Imports.
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from datetime import date, datetime, timedelta
+from typing import List, Optional
+
+# Local Imports.
+from ..database import get_session, WeeklyCentiScore, Transaction, Account
+from .centi_score_utils import calculate_centi_scores_batch, get_monday_of_week
+
+# Account Types That Count As Liabilities (Matches 'calculate_account_financial_impact').
+LIABILITY_TYPES = {"credit", "loan"}
+
+# Default Number Of Weeks To Reconstruct.
+DEFAULT_MAX_WEEKS = 52
+
+# -------------------------------------------------------- Get Backfill Mondays.
+def get_backfill_mondays(
+    db: Session,
+    user_id: int,
+    first_transaction_date: date,
+    max_weeks: int = DEFAULT_MAX_WEEKS,
+    recompute_from: Optional[date] = None
+) -> List[date]:
+    """Get The Past Mondays That Need A Weekly Score - Missing Ones, Plus Reconstructed Ones From 'recompute_from' On."""
+
+    # Current Week Is Handled By 'create_weekly_score', So Stop At Last Week.
+    last_monday = get_monday_of_week(date.today()) - timedelta(days=7)
+    first_monday = max(
+        get_monday_of_week(first_transaction_date),
+        last_monday - timedelta(weeks=max_weeks - 1)
+    )
+
+    if first_monday > last_monday:
+        return []
+
+    # Skip Weeks That Already Have A Score, Unless It Was Reconstructed And Newly Imported History Changes It.
+    existing = dict(db.query(WeeklyCentiScore.score_date, WeeklyCentiScore.is_reconstructed).filter(
+        WeeklyCentiScore.user_id == user_id,
+        WeeklyCentiScore.score_date >= first_monday,
+        WeeklyCentiScore.score_date <= last_monday
+    ).all())
+    stale_from = get_monday_of_week(recompute_from) if recompute_from else None
+
+    weeks = (last_monday - first_monday).days // 7 + 1
+    mondays = [first_monday + timedelta(weeks=i) for i in range(weeks)]
+    return [
+        monday for monday in mondays
+        if monday not in existing or (stale_from and monday >= stale_from and existing[monday])
+    ]
+
+# -------------------------------------------------------- Upsert Reconstructed Weeks.
+def _upsert_reconstructed_weeks(db: Session):
+    """INSERT For Reconstructed Weeks That Refreshes Earlier Reconstructions And Leaves Live Scores Alone."""
+
+    # A Week Written Meanwhile (Another Backfill, Or A Live Score) Hits 'uq_weekly_centi_scores_user_date'.
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    elif dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        return insert(WeeklyCentiScore)
+
+    statement = dialect_insert(WeeklyCentiScore)
+    refreshed = [column.name for column in WeeklyCentiScore.__table__.columns if column.name not in ("id", "user_id", "score_date")]
+    return statement.on_conflict_do_update(
+        index_elements=["user_id", "score_date"],
+        set_={name: statement.excluded[name] for name in refreshed},
+        where=WeeklyCentiScore.is_reconstructed == True
+    )
+
+# -------------------------------------------------------- Backfill Weekly Scores.
+def backfill_weekly_scores(
+    db: Session,
+    user_id: int,
+    max_weeks: int = DEFAULT_MAX_WEEKS,
+    recompute_from: Optional[date] = None
+) -> int:
+    """Reconstruct And Store Weekly Centi Scores For Past Weeks From Transaction History. Returns Weeks Written."""
+
+    # Imported Here So App Startup Doesn't Pay For numpy.
+    import numpy as np
+
+    # Load Every Transaction As Plain Tuples (No ORM Objects).
+    rows = db.query(Transaction.account_id, Transaction.date, Transaction.amount).filter(
+        Transaction.user_id == user_id,
+        Transaction.date.isnot(None)
+    ).all()
+
+    if not rows:
+        return 0
+
+    # Work Out Which Mondays Need Scores.
+    first_date = min(row[1] for row in rows)
+    mondays = get_backfill_mondays(db, user_id, first_date, max_weeks, recompute_from)
+    if not mondays:
+        return 0
+
+    # Load Active Accounts (Same Set The Live Score Uses).
+    accounts = db.query(Account.account_id, Account.type, Account.current_balance).filter(
+        Account.user_id == user_id,
+        Account.is_active == True
+    ).all()
+    account_index = {account_id: i for i, (account_id, _, _) in enumerate(accounts)}
+    cash_index = len(accounts)      # Cash (account_id = None) Gets Its Own Row.
+    ignored_index = cash_index + 1  # Transactions On Inactive/Unknown Accounts Don't Move Balances.
+
+    # Build Transaction Arrays, Sorted By Day.
+    days = np.fromiter((row[1].toordinal() for row in rows), dtype=np.int64, count=len(rows))
+    amounts = np.fromiter((row[2] or 0.0 for row in rows), dtype=np.float64, count=len(rows))
+    owners = np.fromiter(
+        (cash_index if row[0] is None else account_index.get(row[0], ignored_index) for row in rows),
+        dtype=np.int64,
+        count=len(rows)
+    )
+    order = np.argsort(days, kind="stable")
+    days, amounts, owners = days[order], amounts[order], owners[order]
+
+    # Each Score Is "As Of" The End Of Its Monday.
+    as_of = np.array([monday.toordinal() for monday in mondays], dtype=np.int64)
+    month_starts = np.array([monday.replace(day=1).toordinal() for monday in mondays], dtype=np.int64)
+    weeks = len(mondays)
+
+    # Bucket Each Transaction By How Many Score Dates Come Before It, Then Sum Per (Owner, Bucket).
+    # A Transaction In Bucket k Happened After Score Dates 0..k-1.
+    buckets = np.searchsorted(as_of, days, side="left")
+    per_bucket = np.zeros((ignored_index + 1, weeks + 1), dtype=np.float64)
+    np.add.at(per_bucket, (owners, buckets), amounts)
+
+    # Amount Posted After Each Score Date = Sum Of All Later Buckets.
+    after = np.cumsum(per_bucket[:, ::-1], axis=1)[:, ::-1][:, 1:]
+
+    # Walk Each Account's Balance Back From Today.
+    total_assets = np.zeros(weeks, dtype=np.float64)
+    total_liabilities = np.zeros(weeks, dtype=np.float64)
+    for i, (_, account_type, current_balance) in enumerate(accounts):
+        balance = current_balance or 0.0
+        if account_type in LIABILITY_TYPES:
+            # Purchases Are Negative, So Owed-Then = Owed-Now + Later Postings.
+            total_liabilities += np.maximum(0.0, abs(balance) + after[i])
+        else:
+            total_assets += balance - after[i]
+
+    # Cash Has No Stored Balance, It's Just The Running Sum Of Cash Transactions.
+    cash_total = per_bucket[cash_index].sum()
+    total_assets += cash_total - after[cash_index]
+    net_worth = total_assets - total_liabilities
+
+    # Month-To-Date Cash Flow & Transaction Count Via Prefix Sums Over All Transactions.
+    prefix = np.concatenate(([0.0], np.cumsum(amounts)))
+    upto_as_of = np.searchsorted(days, as_of, side="right")
+    before_month = np.searchsorted(days, month_starts, side="left")
+    monthly_cash_flow = prefix[upto_as_of] - prefix[before_month]
+    transaction_count = upto_as_of
+
+    # Score Every Week At Once.
+    scores = calculate_centi_scores_batch(net_worth, total_assets, total_liabilities, monthly_cash_flow)
+
+    # Upsert The Reconstructed Weeks In One Statement.
+    now = datetime.now()
+    db.execute(_upsert_reconstructed_weeks(db), [
+        {
+            "user_id": user_id,
+            "score_date": monday,
+            "total_score": int(scores["total_score"][i]),
+            "net_worth_score": int(scores["net_worth_score"][i]),
+            "assets_score": int(scores["assets_score"][i]),
+            "liabilities_score": int(scores["liabilities_score"][i]),
+            "cash_flow_score": int(scores["cash_flow_score"][i]),
+            "net_worth": float(net_worth[i]),
+            "total_assets": float(total_assets[i]),
+            "total_liabilities": float(total_liabilities[i]),
+            "monthly_cash_flow": float(monthly_cash_flow[i]),
+            "transaction_count": int(transaction_count[i]),
+            "created_at": now,
+            "is_reconstructed": True
+        }
+        for i, monday in enumerate(mondays)
+    ])
+    db.commit()
+
+    return weeks
+
+# -------------------------------------------------------- Backfill Weekly Scores Job.
+def backfill_weekly_scores_job(user_id: int, recompute_from: Optional[date] = None, max_weeks: int = DEFAULT_MAX_WEEKS):
+    """Run The Backfill In Its Own Session (For Background Tasks)."""
+
+    # Request Sessions Are Closed By The Time Background Tasks Run, So Open A Fresh One.
+    db = get_session()
+    if db is None:
+        print("Skipping Centi Score backfill - no database connection")
+        return
+
+    try:
+        written = backfill_weekly_scores(db, user_id, max_weeks, recompute_from)
+        print(f"Backfilled {written} weekly Centi Scores for user {user_id}.")
+    except Exception as e:
+        db.rollback()
+        print(f"Error backfilling Centi Scores for user {user_id}: {str(e)}")
+    finally:
+        db.close()
@@ -0,0 +1,289 @@
+# Search Utils.
+#
+# Note : Server-Side Text Search Over Vendor, Merchant Name, Description And Notes.
+#        SQLite (Dev) Uses An FTS5 External-Content Table Kept In Sync By Triggers, Plus An 'fts5vocab' Table
+#        So Misspelled Words Can Be Swapped For Close Terms From The User's Own Transactions (The Shared
+#        Vocabulary Only Shortlists Them). PostgreSQL (Prod) Uses A GIN 'tsvector' Expression Index For
+#        Word/Prefix Matches And 'pg_trgm' GIN Indexes For Typo-Tolerant Similarity.
+#        Expression Indexes Update Themselves, So Postgres Needs No Triggers.
+#
+# Functions :
+#   - 'setup_search_index' - Create The Search Index (And Sync Triggers) For The Current Database.
+#   - 'tokenize_query' - Split A Search String Into Lowercase Word Tokens.
+#   - 'search_transactions' - Get Ranked, Paginated Transaction Matches For A User.
+
+# Imports.
+import re
+import difflib
+from sqlalchemy import text, or_, func
+from sqlalchemy.orm import Session
+from typing import Dict, List, Tuple
+
+# Local Imports.
+from ..database import Transaction
+
+# Columns Covered By Search, With BM25 Weights (Vendor Matches Rank Highest).
+SEARCH_COLUMNS = ["vendor", "merchant_name", "description", "notes"]
+SEARCH_WEIGHTS = [4.0, 3.0, 1.0, 1.0]
+
+# Fuzzy Matching Settings.
+FUZZY_MIN_TOKEN_LENGTH = 4      # Shorter Words Are Too Ambiguous To Correct.
+FUZZY_MAX_CANDIDATES = 3        # Close Terms Added Per Misspelled Word.
+FUZZY_SHORTLIST_SIZE = 10       # Close Terms From The Shared Vocabulary Checked Against The User's Transactions.
+FUZZY_CUTOFF = 0.75             # 'difflib' Similarity Needed To Count As A Typo.
+TRIGRAM_THRESHOLD = 0.3         # 'pg_trgm' Similarity Needed To Count As A Match.
+
+# SQLite FTS5 Schema.
+SQLITE_SEARCH_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS transactions_fts USING fts5(
+        vendor, merchant_name, description, notes,
+        content='transactions', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )
+    """,
+    "CREATE VIRTUAL TABLE IF NOT EXISTS transactions_fts_vocab USING fts5vocab(transactions_fts, 'row')",
+    """
+    CREATE TRIGGER IF NOT EXISTS transactions_fts_insert AFTER INSERT ON transactions BEGIN
+        INSERT INTO transactions_fts(rowid, vendor, merchant_name, description, notes)
+        VALUES (new.id, new.vendor, new.merchant_name, new.description, new.notes);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS transactions_fts_delete AFTER DELETE ON transactions BEGIN
+        INSERT INTO transactions_fts(transactions_fts, rowid, vendor, merchant_name, description, notes)
+        VALUES ('delete', old.id, old.vendor, old.merchant_name, old.description, old.notes);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS transactions_fts_update
+    AFTER UPDATE OF vendor, merchant_name, description, notes ON transactions BEGIN
+        INSERT INTO transactions_fts(transactions_fts, rowid, vendor, merchant_name, description, notes)
+        VALUES ('delete', old.id, old.vendor, old.merchant_name, old.description, old.notes);
+        INSERT INTO transactions_fts(rowid, vendor, merchant_name, description, notes)
+        VALUES (new.id, new.vendor, new.merchant_name, new.description, new.notes);
+    END
+    """
+]
+
+# PostgreSQL Search Document (Must Match The Expression Index Exactly To Be Used).
+POSTGRES_DOCUMENT = (
+    "to_tsvector('simple', coalesce(vendor, '') || ' ' || coalesce(merchant_name, '') || ' ' || "
+    "coalesce(description, '') || ' ' || coalesce(notes, ''))"
+)
+
+# PostgreSQL Search Schema.
+POSTGRES_SEARCH_DDL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    f"CREATE INDEX IF NOT EXISTS ix_transactions_search_document ON transactions USING GIN ({POSTGRES_DOCUMENT})",
+    "CREATE INDEX IF NOT EXISTS ix_transactions_vendor_trgm ON transactions USING GIN (vendor gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_transactions_merchant_trgm ON transactions USING GIN (merchant_name gin_trgm_ops)"
+]
+
+# -------------------------------------------------------- Setup Search Index.
+def setup_search_index(engine) -> bool:
+    """Create The Search Index (And Sync Triggers) For The Current Database."""
+
+    dialect = engine.dialect.name
+
+    try:
+        with engine.begin() as conn:
+            if dialect == "sqlite":
+                # Only Backfill The Index The First Time It's Created.
+                exists = conn.execute(text(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'transactions_fts'"
+                )).first()
+
+                for statement in SQLITE_SEARCH_DDL:
+                    conn.execute(text(statement))
+
+                if not exists:
+                    conn.execute(text("INSERT INTO transactions_fts(transactions_fts) VALUES ('rebuild')"))
+
+            elif dialect == "postgresql":
+                for statement in POSTGRES_SEARCH_DDL:
+                    conn.execute(text(statement))
+
+            else:
+                # Other Databases Fall Back To LIKE Scans.
+                return False
+
+        print(f"Transaction search index ready ({dialect})")
+        return True
+
+    except Exception as e:
+        # Search Still Works Through The LIKE Fallback, So Don't Block Startup.
+        print(f"Failed to set up transaction search index: {e}")
+        return False
+
+# -------------------------------------------------------- Tokenize Query.
+def tokenize_query(query: str) -> List[str]:
+    """Split A Search String Into Lowercase Word Tokens."""
+
+    return re.findall(r"\w+", (query or "").lower())
+
+# -------------------------------------------------------- SQLite Matches.
+def _sqlite_matches_sql(param: str, rank: str = "") -> str:
+    """FROM Clause Joining The FTS Matches For ':param' (As 'matches') Out To Their Transactions (As 't')."""
+
+    # The MATCH Runs Once, Leading The Join ('CROSS JOIN' Stops SQLite Reordering It). Joined Plainly, SQLite
+    # Drives From The User's Index Instead And Re-Runs The MATCH For Every Row They Own.
+    return (
+        f"(SELECT rowid{rank} FROM transactions_fts WHERE transactions_fts MATCH :{param}) AS matches "
+        f"CROSS JOIN transactions t ON t.id = matches.rowid"
+    )
+
+# -------------------------------------------------------- SQLite User Has Match.
+def _sqlite_user_match_sql(param: str) -> str:
+    """SQL That Is True When The User Has A Transaction Matching The FTS Expression In ':param'."""
+
+    return f"EXISTS (SELECT 1 FROM {_sqlite_matches_sql(param)} WHERE t.user_id = :user_id)"
+
+# -------------------------------------------------------- SQLite Fuzzy Terms.
+def _sqlite_fuzzy_terms(db: Session, user_id: int, token: str) -> List[str]:
+    """Get The User's Indexed Terms That Look Like A Misspelling Of The Token."""
+
+    # Skip Tokens That Already Prefix-Match One Of The User's Transactions (Other Users' Terms Don't Count).
+    if db.execute(
+        text(f"SELECT {_sqlite_user_match_sql('match')}"),
+        {"match": f'"{token}"*', "user_id": user_id}
+    ).scalar():
+        return []
+
+    # The Vocabulary Is Shared By Every User, So It Only Shortlists Terms Of A Similar Length.
+    candidates = [row[0] for row in db.execute(
+        text("SELECT term FROM transactions_fts_vocab WHERE length(term) BETWEEN :low AND :high"),
+        {"low": len(token) - 2, "high": len(token) + 2}
+    )]
+    shortlist = difflib.get_close_matches(token, candidates, n=FUZZY_SHORTLIST_SIZE, cutoff=FUZZY_CUTOFF)
+    if not shortlist:
+        return []
+
+    # Keep The Closest Ones The User Actually Has (One Query).
+    params = {"user_id": user_id}
+    selects = []
+    for index, term in enumerate(shortlist):
+        params[f"match_{index}"] = f'"{term}"'
+        selects.append(f"SELECT {index} WHERE {_sqlite_user_match_sql(f'match_{index}')}")
+    owned = sorted(row[0] for row in db.execute(text(" UNION ALL ".join(selects)), params))
+
+    return [shortlist[index] for index in owned[:FUZZY_MAX_CANDIDATES]]
+
+# -------------------------------------------------------- SQLite Search.
+def _search_sqlite(db: Session, user_id: int, tokens: List[str], limit: int, offset: int, fuzzy: bool) -> Tuple[List[int], int]:
+    """Get Ranked Transaction IDs Using The FTS5 Index."""
+
+    # Every Token Must Match, Either As A Prefix Or As A Close Spelling.
+    clauses = []
+    for token in tokens:
+        alternatives = [f'"{token}"*']
+        if fuzzy and len(token) >= FUZZY_MIN_TOKEN_LENGTH:
+            alternatives += [f'"{term}"' for term in _sqlite_fuzzy_terms(db, user_id, token)]
+        clauses.append("(" + " OR ".join(alternatives) + ")")
+    match = " AND ".join(clauses)
+
+    params = {"match": match, "user_id": user_id, "limit": limit, "offset": offset}
+    weights = ", ".join(str(weight) for weight in SEARCH_WEIGHTS)
+
+    # Matches Are Ranked In The FTS Table, Then Joined Out To The User's Rows.
+    total = db.execute(text(
+        f"SELECT count(*) FROM {_sqlite_matches_sql('match')} WHERE t.user_id = :user_id"
+    ), params).scalar()
+
+    ids = [row[0] for row in db.execute(text(
+        f"SELECT t.id FROM {_sqlite_matches_sql('match', f', bm25(transactions_fts, {weights}) AS rank')} "
+        f"WHERE t.user_id = :user_id "
+        f"ORDER BY matches.rank, t.date DESC "
+        f"LIMIT :limit OFFSET :offset"
+    ), params)]
+
+    return ids, total
+
+# -------------------------------------------------------- PostgreSQL Search.
+def _search_postgres(db: Session, user_id: int, tokens: List[str], limit: int, offset: int, fuzzy: bool) -> Tuple[List[int], int]:
+    """Get Ranked Transaction IDs Using The tsvector And Trigram Indexes."""
+
+    # Every Token Must Match As A Word Prefix, Or (If Fuzzy) The Whole Phrase Is Similar To The Vendor/Merchant.
+    params = {
+        "tsquery": " & ".join(f"{token}:*" for token in tokens),
+        "phrase": " ".join(tokens),
+        "user_id": user_id,
+        "limit": limit,
+        "offset": offset
+    }
+    condition = f"{POSTGRES_DOCUMENT} @@ to_tsquery('simple', :tsquery)"
+    if fuzzy:
+        # '%' Is The Operator The Trigram Indexes Serve ('similarity()' Calls Can't Use Them); Its Cutoff Is A
+        # Setting, Scoped To This Transaction. 'similarity()' Itself Only Ranks The Rows That Matched.
+        db.execute(text("SELECT set_config('pg_trgm.similarity_threshold', :threshold, true)"),
+                   {"threshold": str(TRIGRAM_THRESHOLD)})
+        condition = f"({condition} OR vendor % :phrase OR merchant_name % :phrase)"
+    rank = (
+        f"ts_rank({POSTGRES_DOCUMENT}, to_tsquery('simple', :tsquery)) + "
+        f"greatest(similarity(coalesce(vendor, ''), :phrase), similarity(coalesce(merchant_name, ''), :phrase))"
+    )
+
+    total = db.execute(text(
+        f"SELECT count(*) FROM transactions WHERE user_id = :user_id AND {condition}"
+    ), params).scalar()
+
+    ids = [row[0] for row in db.execute(text(
+        f"SELECT id FROM transactions WHERE user_id = :user_id AND {condition} "
+        f"ORDER BY {rank} DESC, date DESC LIMIT :limit OFFSET :offset"
+    ), params)]
+
+    return ids, total
+
+# -------------------------------------------------------- Fallback Search.
+def _search_like(db: Session, user_id: int, tokens: List[str], limit: int, offset: int) -> Tuple[List[int], int]:
+    """Get Matching Transaction IDs With LIKE Scans (No Index Available)."""
+
+    query = db.query(Transaction.id).filter(Transaction.user_id == user_id)
+    for token in tokens:
+        pattern = f"%{token}%"
+        query = query.filter(or_(*[func.lower(getattr(Transaction, column)).like(pattern) for column in SEARCH_COLUMNS]))
+
+    total = query.count()
+    ids = [row[0] for row in query.order_by(Transaction.date.desc()).limit(limit).offset(offset).all()]
+    return ids, total
+
+# -------------------------------------------------------- Search Transactions.
+def search_transactions(
+    db: Session,
+    user_id: int,
+    query: str,
+    limit: int = 50,
+    offset: int = 0,
+    fuzzy: bool = True
+) -> Dict:
+    """Get Ranked, Paginated Transaction Matches For A User."""
+
+    tokens = tokenize_query(query)
+    if not tokens:
+        return {"transactions": [], "total": 0}
+
+    dialect = db.bind.dialect.name
+    try:
+        if dialect == "sqlite":
+            ids, total = _search_sqlite(db, user_id, tokens, limit, offset, fuzzy)
+        elif dialect == "postgresql":
+            ids, total = _search_postgres(db, user_id, tokens, limit, offset, fuzzy)
+        else:
+            ids, total = _search_like(db, user_id, tokens, limit, offset)
+    except Exception as e:
+        # Index Missing (e.g. Setup Failed) - Fall Back To A Plain Scan.
+        print(f"Search index unavailable, falling back to LIKE scan: {e}")
+        db.rollback()
+        ids, total = _search_like(db, user_id, tokens, limit, offset)
+
+    if not ids:
+        return {"transactions": [], "total": total}
+
+    # Load The Page In One Query, Then Restore Rank Order.
+    rows = db.query(Transaction).filter(Transaction.id.in_(ids)).all()
+    by_id = {row.id: row for row in rows}
+
+    return {
+        "transactions": [by_id[transaction_id] for transaction_id in ids if transaction_id in by_id],
+        "total": total
+    }
@@ -0,0 +1,207 @@
+# Slow Query Utils.
+#
+# Note : Opt-In Slow-Query Recorder. Set 'SLOW_QUERY_MS' (e.g. 50) To Turn It On. Any Statement Slower Than That Is
+#        Recorded With Its Normalized SQL (Literals And IN-Lists Collapsed, So Repeats Group Together), The Shape Of
+#        Its Bound Parameters (Types Only - Values Are Never Stored), Duration, And The Route That Issued It.
+#        A Query Plan Is Then Captured On A Separate Pooled Connection By One Background Worker, So The Request's
+#        Own Transaction Is Never Touched And Requests Never Wait On It :
+#          - SQLite : 'EXPLAIN QUERY PLAN'.
+#          - PostgreSQL : 'EXPLAIN (ANALYZE, BUFFERS)' For SELECTs (ANALYZE Re-Runs The Query, So Writes Only Get
+#            A Plain 'EXPLAIN').
+#        Entries Live In A Ring Buffer ('SLOW_QUERY_BUFFER', Default 200) And Can Be Dumped As JSON Lines To
+#        'SLOW_QUERY_LOG' (Default 'slow_queries.jsonl').
+#
+# Functions :
+#   - 'register_slow_query_log' - Attach The Slow-Query Listeners To An Engine (No-Op Unless Enabled).
+#   - 'normalize_sql' - Collapse Literals, IN-Lists And Whitespace So Equivalent Statements Match.
+#   - 'describe_parameters' - Describe Bound Parameters By Type, Without Their Values.
+#   - 'get_slow_queries' - Get Recorded Slow Queries (Newest First) And A Per-Statement Summary.
+#   - 'clear_slow_queries' - Empty The Ring Buffer.
+#   - 'dump_slow_queries' - Append The Ring Buffer To The Slow-Query Log File.
+
+# Imports.
+import os
+import re
+import json
+import time
+import threading
+from collections import deque
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+# Local Imports.
+from .metrics_utils import get_request_route
+
+# Settings (Threshold Of 0 Keeps The Recorder Off).
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "0"))
+SLOW_QUERY_BUFFER = int(os.getenv("SLOW_QUERY_BUFFER", "200"))
+SLOW_QUERY_EXPLAIN = os.getenv("SLOW_QUERY_EXPLAIN", "true").lower() != "false"
+SLOW_QUERY_LOG = os.getenv("SLOW_QUERY_LOG", "slow_queries.jsonl")
+
+# Ring Buffer Of Recorded Statements.
+_entries = deque(maxlen=SLOW_QUERY_BUFFER)
+_lock = threading.Lock()
+
+# One Worker Is Enough - Plans Are Best-Effort And Shouldn't Compete With Requests For Connections.
+_explain_executor = None
+
+# Literal Patterns.
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w.$])-?\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\((?:\s*(?:\?|%s|%\(\w+\)s|\$\d+|:\w+)\s*,)+\s*(?:\?|%s|%\(\w+\)s|\$\d+|:\w+)\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+# -------------------------------------------------------- Normalize SQL.
+def normalize_sql(statement: str) -> str:
+    """Collapse Literals, IN-Lists And Whitespace So Equivalent Statements Match."""
+
+    normalized = _STRING_LITERAL.sub("?", statement)
+    normalized = _NUMBER_LITERAL.sub("?", normalized)
+    normalized = _PLACEHOLDER_LIST.sub("(?, ...)", normalized)
+    return _WHITESPACE.sub(" ", normalized).strip()
+
+# -------------------------------------------------------- Describe Parameters.
+def describe_parameters(parameters, executemany: bool = False) -> str:
+    """Describe Bound Parameters By Type, Without Their Values."""
+
+    if executemany:
+        rows = list(parameters or [])
+        return f"{len(rows)} x {describe_parameters(rows[0]) if rows else '()'}"
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(f"{key}: {type(value).__name__}" for key, value in parameters.items()) + "}"
+    if isinstance(parameters, (list, tuple)):
+        return "(" + ", ".join(type(value).__name__ for value in parameters) + ")"
+    return type(parameters).__name__
+
+# -------------------------------------------------------- Explain Statement.
+def _explain(engine, dialect: str, statement: str, parameters, entry: dict):
+    """Capture A Query Plan On A Separate Connection And Attach It To The Entry."""
+
+    is_select = statement.lstrip().lower().startswith(("select", "with"))
+    if dialect == "sqlite":
+        prefix = "EXPLAIN QUERY PLAN "
+    elif dialect == "postgresql":
+        prefix = "EXPLAIN (ANALYZE, BUFFERS) " if is_select else "EXPLAIN "
+    else:
+        return
+
+    try:
+        with engine.connect() as conn:
+            rows = conn.exec_driver_sql(prefix + statement, parameters).fetchall()
+        if dialect == "sqlite":
+            # Rows : (id, parent, notused, detail).
+            plan = "\n".join(str(row[-1]) for row in rows)
+        else:
+            plan = "\n".join(str(row[0]) for row in rows)
+    except Exception as e:
+        plan = f"EXPLAIN failed: {e}"
+
+    with _lock:
+        entry["plan"] = plan
+
+# -------------------------------------------------------- Record Slow Query.
+def _record(conn, statement: str, parameters, executemany: bool, seconds: float):
+    """Add A Slow Statement To The Ring Buffer And Queue Its Plan."""
+
+    global _explain_executor
+
+    entry = {
+        "recorded_at": datetime.now().isoformat(timespec="seconds"),
+        "duration_ms": round(seconds * 1000, 2),
+        "sql": normalize_sql(statement),
+        "parameters": describe_parameters(parameters, executemany),
+        "route": get_request_route() or "background",
+        "dialect": conn.dialect.name,
+        "plan": None
+    }
+    with _lock:
+        _entries.append(entry)
+
+    # Plans For Batched Writes Aren't Meaningful, And Async Engines Are Explained Through The Sync Engine.
+    if SLOW_QUERY_EXPLAIN and not executemany:
+        from app.database import get_engine
+        explain_engine = get_engine()
+        if explain_engine is not None:
+            if _explain_executor is None:
+                _explain_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="slow-query-explain")
+            _explain_executor.submit(_explain, explain_engine, conn.dialect.name, statement, parameters, entry)
+
+# -------------------------------------------------------- Register Slow Query Log.
+def register_slow_query_log(engine):
+    """Attach The Slow-Query Listeners To An Engine (No-Op Unless 'SLOW_QUERY_MS' Is Set)."""
+
+    if SLOW_QUERY_MS <= 0:
+        return
+
+    from sqlalchemy import event
+    threshold = SLOW_QUERY_MS / 1000
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._slow_query_started = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "_slow_query_started", None)
+        if started is None:
+            return
+        seconds = time.perf_counter() - started
+        # Skip Our Own EXPLAINs.
+        if seconds >= threshold and not statement.lstrip().upper().startswith("EXPLAIN"):
+            _record(conn, statement, parameters, executemany, seconds)
+
+    print(f"Slow query log enabled (>{SLOW_QUERY_MS:g}ms, last {SLOW_QUERY_BUFFER} kept)")
+
+# -------------------------------------------------------- Get Slow Queries.
+def get_slow_queries(limit: int = 50) -> Dict:
+    """Get Recorded Slow Queries (Newest First) And A Per-Statement Summary."""
+
+    with _lock:
+        entries = [dict(entry) for entry in _entries]
+
+    # Group By Normalized SQL, Slowest Total First.
+    summary = {}
+    for entry in entries:
+        group = summary.setdefault(entry["sql"], {"sql": entry["sql"], "count": 0, "total_ms": 0.0, "max_ms": 0.0, "routes": set()})
+        group["count"] += 1
+        group["total_ms"] += entry["duration_ms"]
+        group["max_ms"] = max(group["max_ms"], entry["duration_ms"])
+        group["routes"].add(entry["route"])
+    groups = sorted(summary.values(), key=lambda group: group["total_ms"], reverse=True)
+    for group in groups:
+        group["total_ms"] = round(group["total_ms"], 2)
+        group["routes"] = sorted(group["routes"])
+
+    return {
+        "enabled": SLOW_QUERY_MS > 0,
+        "threshold_ms": SLOW_QUERY_MS,
+        "buffer_size": SLOW_QUERY_BUFFER,
+        "recorded": len(entries),
+        "summary": groups,
+        "entries": entries[::-1][:limit]
+    }
+
+# -------------------------------------------------------- Clear Slow Queries.
+def clear_slow_queries() -> int:
+    """Empty The Ring Buffer. Returns How Many Entries Were Dropped."""
+
+    with _lock:
+        count = len(_entries)
+        _entries.clear()
+    return count
+
+# -------------------------------------------------------- Dump Slow Queries.
+def dump_slow_queries(path: Optional[str] = None) -> Dict:
+    """Append The Ring Buffer To The Slow-Query Log File As JSON Lines."""
+
+    path = path or SLOW_QUERY_LOG
+    with _lock:
+        entries: List[dict] = [dict(entry) for entry in _entries]
+
+    with open(path, "a", encoding="utf-8") as f:
+        for entry in entries:
+            f.write(json.dumps(entry) + "\n")
+
+    return {"path": os.path.abspath(path), "written": len(entries)}
@@ -2,6 +2,7 @@
 #
 # Functions :
 #   - 'create_monthly_snapshot' - Create A Monthly Snapshot For A User.
+#   - 'monthly_snapshot_job' - Create Or Update A Monthly Snapshot In Its Own Session (For Background Tasks).
 #   - 'get_monthly_snapshot' - Get A Specific Monthly Snapshot For A User.
 #   - 'get_previous_month_snapshot' - Get The Previous Month's Snapshot For Comparison.
 #   - 'get_snapshots_for_user' - Get The Last N Monthly Snapshots For A User.
@@ -13,7 +14,7 @@ from datetime import datetime, date
 from typing import Optional, Dict, Any
 
 # Local Imports.
-from ..database import MonthlySnapshot
+from ..database import get_session, MonthlySnapshot
 
 # -------------------------------------------------------- Create Monthly Snapshot.
 def create_monthly_snapshot(
@@ -71,6 +72,24 @@ def create_monthly_snapshot(
         # Return New Snapshot.
         return snapshot
 
+# -------------------------------------------------------- Monthly Snapshot Job.
+def monthly_snapshot_job(user_id: int, snapshot_date: date, values: Dict[str, Any]):
+    """Create Or Update A Monthly Snapshot In Its Own Session (For Background Tasks, So GET Routes Stay Read-Only)."""
+
+    # Request Sessions Are Closed (And May Be Replica Sessions) By Now, So Open A Fresh One On The Primary.
+    db = get_session()
+    if db is None:
+        print("Skipping monthly snapshot - no database connection")
+        return
+
+    try:
+        create_monthly_snapshot(db=db, user_id=user_id, snapshot_date=snapshot_date, **values)
+    except Exception as e:
+        db.rollback()
+        print(f"Error saving monthly snapshot for user {user_id}: {str(e)}")
+    finally:
+        db.close()
+
 # -------------------------------------------------------- Get Monthly Snapshot.
 def get_monthly_snapshot(db: Session, user_id: int, snapshot_date: date) -> Optional[MonthlySnapshot]:
     """Get A Specific Monthly Snapshot For A User."""
@@ -0,0 +1,262 @@
+# Tag Rule Utils.
+#
+# Note : Auto-Tagging. Each User Has Rules ('tag_rules') With Optional Conditions On Vendor Keywords, Merchant Keywords,
+#        Primary Category, Absolute Amount Range And Account - All Set Conditions Must Hold For The Rule's Tag To Apply.
+#        A User's Active Rules Are Loaded Once And Compiled Into A 'TagRuleset' :
+#          - Rules Are Bucketed By Category, So A Row Only Checks Rules For Its Own Category Plus Category-Free Ones.
+#          - Every Keyword Is Folded Into One Regex, So Rows That Mention No Keyword At All (Most Of Them) Skip
+#            Keyword Rules With A Single Scan.
+#        Imports (CSV, Plaid, Manual) Run The Ruleset Once Over The Whole Batch And Insert All Links In One Statement.
+#        'apply_rules_to_history' Re-Applies Rules Over A User's Full History In Id-Ordered Chunks.
+#
+# Functions :
+#   - 'TagRuleset' - A User's Active Rules, Compiled Into One Matcher.
+#   - 'parse_keywords' - Split A Comma-Separated Keyword String Into Lowercased Keywords.
+#   - 'load_ruleset' - Load And Compile A User's Active Rules (One Query).
+#   - 'apply_rules_to_rows' - Tag Freshly Imported Rows (Dicts With 'fingerprint' Set).
+#   - 'apply_rules_to_transaction' - Tag One Just-Created Transaction.
+#   - 'apply_rules_to_history' - Re-Apply Rules Across A User's History In Chunks.
+#   - 'apply_rules_job' - Run The History Backfill In Its Own Session (For Background Tasks).
+#   - 'create_default_tag_rules' - Create Rules That Apply The Default Tags.
+
+# Imports.
+import re
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+from sqlalchemy.orm import Session
+
+# Local Imports.
+from app.database import get_session, Tag, TagRule, Transaction, TransactionTag
+from app.utils.tag_utils import create_default_tags, insert_tag_links
+from app.utils.fingerprint_utils import LOOKUP_CHUNK_SIZE
+
+# Rows Per Chunk When Re-Applying Rules Across History.
+HISTORY_CHUNK_SIZE = 5000
+
+# Default Rules : Default Tag Name -> Conditions.
+DEFAULT_TAG_RULES = [
+    ("Groceries", {"vendor_contains": "publix, kroger, safeway, whole foods, trader joe, aldi, wegmans, h-e-b, food lion"}),
+    ("Dining", {"category_primary": "Food and Drink"}),
+    ("Subscriptions", {"vendor_contains": "netflix, spotify, hulu, disney+, hbo max, youtube premium, apple.com/bill, audible"}),
+    ("Transportation", {"vendor_contains": "uber, lyft, shell, chevron, exxon, marathon petro, sunoco, parking"}),
+    ("Utilities", {"vendor_contains": "electric, energy, xfinity, comcast, verizon, at&t, t-mobile, spectrum"}),
+    ("Travel", {"category_primary": "Travel"}),
+    ("Healthcare", {"category_primary": "Healthcare"}),
+    ("Entertainment", {"vendor_contains": "amc theatres, regal, ticketmaster, steam games, playstation"}),
+    ("Shopping", {"vendor_contains": "amazon, target, best buy, etsy, ebay"})
+]
+
+# -------------------------------------------------------- Parse Keywords.
+def parse_keywords(value: Optional[str]) -> tuple:
+    """Split A Comma-Separated Keyword String Into Lowercased Keywords."""
+    return tuple(keyword.strip().lower() for keyword in (value or "").split(",") if keyword.strip())
+
+# -------------------------------------------------------- Tag Ruleset.
+class TagRuleset:
+    """A User's Active Rules, Compiled Into One Matcher."""
+
+    def __init__(self, rules: Iterable[TagRule]):
+        # Category (Lowercased, None = Any) -> [(Tag ID, Vendor Keywords, Merchant Keywords, Account, Min, Max)].
+        self._by_category: Dict[Optional[str], list] = {}
+        keywords = set()
+        self.rule_count = 0
+
+        for rule in rules:
+            vendor_keywords = parse_keywords(rule.vendor_contains)
+            merchant_keywords = parse_keywords(rule.merchant_contains)
+            keywords.update(vendor_keywords + merchant_keywords)
+            category = rule.category_primary.strip().lower() if rule.category_primary else None
+            self._by_category.setdefault(category, []).append((
+                rule.tag_id, vendor_keywords, merchant_keywords, rule.account_id, rule.min_amount, rule.max_amount
+            ))
+            self.rule_count += 1
+
+        # One Alternation Over Every Keyword (Longest First), Used To Skip Keyword Rules For Rows Mentioning None.
+        self._keyword_pattern = re.compile(
+            "|".join(re.escape(keyword) for keyword in sorted(keywords, key=len, reverse=True))
+        ) if keywords else None
+        self._no_category = self._by_category.get(None, [])
+
+    def __bool__(self) -> bool:
+        return self.rule_count > 0
+
+    def match(self, vendor: Optional[str], merchant_name: Optional[str], category_primary: Optional[str],
+              amount: Optional[float], account_id: Optional[str]) -> List[int]:
+        """Tag IDs Whose Rules Match This Transaction."""
+
+        candidates = self._no_category
+        if category_primary:
+            categorized = self._by_category.get(category_primary.lower())
+            if categorized:
+                candidates = candidates + categorized
+        if not candidates:
+            return []
+
+        vendor = (vendor or "").lower()
+        merchant_name = (merchant_name or "").lower()
+        has_keyword = self._keyword_pattern is not None and (
+            self._keyword_pattern.search(vendor) is not None or self._keyword_pattern.search(merchant_name) is not None
+        )
+        magnitude = abs(amount or 0)
+
+        tag_ids = []
+        for tag_id, vendor_keywords, merchant_keywords, rule_account, min_amount, max_amount in candidates:
+            if (vendor_keywords or merchant_keywords) and not has_keyword:
+                continue
+            if vendor_keywords and not any(keyword in vendor for keyword in vendor_keywords):
+                continue
+            if merchant_keywords and not any(keyword in merchant_name for keyword in merchant_keywords):
+                continue
+            if rule_account and rule_account != account_id:
+                continue
+            if min_amount is not None and magnitude < min_amount:
+                continue
+            if max_amount is not None and magnitude > max_amount:
+                continue
+            if tag_id not in tag_ids:
+                tag_ids.append(tag_id)
+        return tag_ids
+
+# -------------------------------------------------------- Load Ruleset.
+def load_ruleset(db: Session, user_id: int) -> TagRuleset:
+    """Load And Compile A User's Active Rules (One Query)."""
+    return TagRuleset(db.query(TagRule).filter(TagRule.user_id == user_id, TagRule.is_active == True).all())
+
+# -------------------------------------------------------- Apply Rules To Rows.
+def apply_rules_to_rows(db: Session, user_id: int, rows: List[dict], ruleset: Optional[TagRuleset] = None) -> int:
+    """Tag Freshly Imported Rows (Dicts With 'fingerprint' Set). Returns Links Added. Caller Commits."""
+
+    ruleset = ruleset if ruleset is not None else load_ruleset(db, user_id)
+    if not ruleset or not rows:
+        return 0
+
+    # One Pass Over The Batch.
+    matched = {}
+    for row in rows:
+        tag_ids = ruleset.match(row.get("vendor"), row.get("merchant_name"), row.get("category_primary"),
+                                row.get("amount"), row.get("account_id"))
+        if tag_ids:
+            matched[row["fingerprint"]] = tag_ids
+    if not matched:
+        return 0
+
+    # Bulk Inserts Don't Return IDs, So Look Them Up By Fingerprint (One Query Per Chunk).
+    fingerprints = list(matched)
+    now = datetime.now()
+    links = []
+    for start in range(0, len(fingerprints), LOOKUP_CHUNK_SIZE):
+        for transaction_id, fingerprint in db.query(Transaction.id, Transaction.fingerprint).filter(
+            Transaction.user_id == user_id,
+            Transaction.fingerprint.in_(fingerprints[start:start + LOOKUP_CHUNK_SIZE])
+        ):
+            links.extend({"transaction_id": transaction_id, "tag_id": tag_id, "user_id": user_id, "created_at": now}
+                         for tag_id in matched[fingerprint])
+
+    insert_tag_links(db, links)
+    return len(links)
+
+# -------------------------------------------------------- Apply Rules To Transaction.
+def apply_rules_to_transaction(db: Session, transaction: Transaction) -> int:
+    """Tag One Just-Created Transaction. Returns Links Added. Caller Commits."""
+
+    ruleset = load_ruleset(db, transaction.user_id)
+    if not ruleset:
+        return 0
+
+    tag_ids = ruleset.match(transaction.vendor, transaction.merchant_name, transaction.category_primary,
+                            transaction.amount, transaction.account_id)
+    now = datetime.now()
+    insert_tag_links(db, [
+        {"transaction_id": transaction.id, "tag_id": tag_id, "user_id": transaction.user_id, "created_at": now}
+        for tag_id in tag_ids
+    ])
+    return len(tag_ids)
+
+# -------------------------------------------------------- Apply Rules To History.
+def apply_rules_to_history(db: Session, user_id: int, chunk_size: int = HISTORY_CHUNK_SIZE) -> Dict:
+    """Re-Apply Rules Across A User's History In Id-Ordered Chunks (Commits Per Chunk)."""
+
+    ruleset = load_ruleset(db, user_id)
+    scanned, added = 0, 0
+    if not ruleset:
+        return {"rules": 0, "scanned": 0, "tags_added": 0}
+
+    last_id = 0
+    while True:
+        rows = db.query(
+            Transaction.id, Transaction.vendor, Transaction.merchant_name, Transaction.category_primary,
+            Transaction.amount, Transaction.account_id
+        ).filter(
+            Transaction.user_id == user_id,
+            Transaction.id > last_id
+        ).order_by(Transaction.id).limit(chunk_size).all()
+        if not rows:
+            break
+        last_id = rows[-1][0]
+        scanned += len(rows)
+
+        matched = {row[0]: ruleset.match(*row[1:]) for row in rows}
+        matched = {transaction_id: tag_ids for transaction_id, tag_ids in matched.items() if tag_ids}
+        if matched:
+            # Skip Links The User Already Has, So Counts Are Exact.
+            existing = set()
+            transaction_ids = list(matched)
+            for start in range(0, len(transaction_ids), LOOKUP_CHUNK_SIZE):
+                existing.update(db.query(TransactionTag.transaction_id, TransactionTag.tag_id).filter(
+                    TransactionTag.transaction_id.in_(transaction_ids[start:start + LOOKUP_CHUNK_SIZE])
+                ))
+            now = datetime.now()
+            links = [
+                {"transaction_id": transaction_id, "tag_id": tag_id, "user_id": user_id, "created_at": now}
+                for transaction_id, tag_ids in matched.items()
+                for tag_id in tag_ids
+                if (transaction_id, tag_id) not in existing
+            ]
+            insert_tag_links(db, links)
+            added += len(links)
+        db.commit()
+
+    return {"rules": ruleset.rule_count, "scanned": scanned, "tags_added": added}
+
+# -------------------------------------------------------- Apply Rules Job.
+def apply_rules_job(user_id: int):
+    """Run The History Backfill In Its Own Session (For Background Tasks)."""
+
+    # Request Sessions Are Closed By The Time Background Tasks Run, So Open A Fresh One.
+    db = get_session()
+    if db is None:
+        print("Skipping tag rule backfill - no database connection")
+        return
+
+    try:
+        result = apply_rules_to_history(db, user_id)
+        print(f"Applied {result['rules']} tag rules to {result['scanned']} transactions for user {user_id} "
+              f"({result['tags_added']} tags added).")
+    except Exception as e:
+        db.rollback()
+        print(f"Error applying tag rules for user {user_id}: {str(e)}")
+    finally:
+        db.close()
+
+# -------------------------------------------------------- Create Default Tag Rules.
+def create_default_tag_rules(db: Session, user_id: int) -> List[dict]:
+    """Create Rules That Apply The Default Tags (Creating Missing Default Tags First)."""
+
+    create_default_tags(db, user_id)
+    tag_ids = {name: tag_id for tag_id, name in db.query(Tag.id, Tag.name).filter(Tag.user_id == user_id)}
+    existing = {name for (name,) in db.query(TagRule.name).filter(TagRule.user_id == user_id)}
+
+    now = datetime.now()
+    no_conditions = dict.fromkeys(("vendor_contains", "merchant_contains", "category_primary", "min_amount", "max_amount", "account_id"))
+    created_rules = [
+        {"user_id": user_id, "tag_id": tag_ids[tag_name], "name": f"Default: {tag_name}", "is_active": True,
+         "created_at": now, "updated_at": now, **no_conditions, **conditions}
+        for tag_name, conditions in DEFAULT_TAG_RULES
+        if tag_name in tag_ids and f"Default: {tag_name}" not in existing
+    ]
+
+    # One Batched INSERT (Every Row Lists Every Condition, So They All Share One Statement Shape).
+    if created_rules:
+        db.bulk_insert_mappings(TagRule, created_rules, render_nulls=True)
+    db.commit()
+    return created_rules
@@ -4,10 +4,19 @@
 #   - 'create_default_tags' - Create Default Tags For A New User.
 #   - 'get_user_tags' - Get All Tags For A User.
 #   - 'get_tag_by_name' - Get A Specific Tag By Name For A User.
+#   - 'find_missing_ids' - Which Of These IDs Don't Belong To The User (One IN Query).
+#   - 'insert_tag_links' - Insert Transaction-Tag Links In One Batched Statement, Skipping Conflicts.
+#   - 'add_tags_to_transactions' - Link Every Tag To Every Transaction, Skipping Existing Links.
+#   - 'remove_tags_from_transactions' - Unlink Tags From Transactions In One Statement.
+#   - 'backfill_tag_link_user_ids' - Copy Each Tag Link's Owner From Its Transaction Where Missing.
 
 # Imports.
+from datetime import datetime
+from typing import List, Set
+from sqlalchemy import insert, text
 from sqlalchemy.orm import Session
-from app.database import Tag
+from app.database import Tag, TransactionTag
+from app.utils.budget_utils import record_tag_links_spend
 
 # -------------------------------------------------------- Create Default Tags.
 def create_default_tags(db: Session, user_id: int):
@@ -31,16 +40,14 @@ def create_default_tags(db: Session, user_id: int):
         {"name": "Utilities", "emoji": "⚡", "color": "#f59e0b"}
     ]
     
+    # Get The User's Existing Tag Names In One Query.
+    existing_names = {name for (name,) in db.query(Tag.name).filter(Tag.user_id == user_id)}
+    
     # Create Default Tags.
     created_tags = []
     for tag_data in default_tags:
         # Check If Tag Already Exists For This User.
-        existing_tag = db.query(Tag).filter(
-            Tag.user_id == user_id,
-            Tag.name == tag_data["name"]
-        ).first()
-        
-        if not existing_tag:
+        if tag_data["name"] not in existing_names:
             new_tag = Tag(
                 user_id=user_id,
                 name=tag_data["name"],
@@ -48,9 +55,11 @@ def create_default_tags(db: Session, user_id: int):
                 color=tag_data["color"],
                 is_default=True
             )
-            db.add(new_tag)
             created_tags.append(new_tag)
     
+    # One Batched INSERT Instead Of One Per Tag.
+    if created_tags:
+        db.bulk_save_objects(created_tags)
     db.commit()
     return created_tags
 
@@ -65,4 +74,96 @@ def get_tag_by_name(db: Session, user_id: int, tag_name: str):
     return db.query(Tag).filter(
         Tag.user_id == user_id,
         Tag.name == tag_name
-    ).first() 
\ No newline at end of file
+    ).first()
+
+# -------------------------------------------------------- Find Missing IDs.
+def find_missing_ids(db: Session, model, user_id: int, ids: List[int]) -> Set[int]:
+    """Which Of These IDs (Transaction Or Tag) Don't Exist Or Don't Belong To The User (One IN Query)."""
+
+    ids = set(ids)
+    owned = {row[0] for row in db.query(model.id).filter(model.id.in_(ids), model.user_id == user_id)}
+    return ids - owned
+
+# -------------------------------------------------------- Insert Tag Links.
+def insert_tag_links(db: Session, links: List[dict]):
+    """Insert Transaction-Tag Links In One Batched Statement, Skipping Rows That Hit 'uq_transaction_tags_transaction_tag'."""
+
+    if not links:
+        return
+
+    # Tag Budgets Count The New Links Before They Land (Already-Linked Pairs Are Skipped).
+    for user_id in {link["user_id"] for link in links}:
+        record_tag_links_spend(db, user_id, [
+            (link["transaction_id"], link["tag_id"]) for link in links if link["user_id"] == user_id
+        ], 1)
+
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+        statement = sqlite_insert(TransactionTag).on_conflict_do_nothing(index_elements=["transaction_id", "tag_id"])
+    elif dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+        # No Conflict Target : Partitioned Tables Lead The Unique Index With 'user_id' (See 'partition_utils').
+        statement = postgresql_insert(TransactionTag).on_conflict_do_nothing()
+    else:
+        statement = insert(TransactionTag)
+    db.execute(statement, links)
+
+# -------------------------------------------------------- Add Tags To Transactions.
+def add_tags_to_transactions(db: Session, user_id: int, transaction_ids: List[int], tag_ids: List[int]) -> int:
+    """Link Every Tag To Every Transaction, Skipping Existing Links. Returns Links Added. Caller Commits."""
+
+    transaction_ids, tag_ids = list(set(transaction_ids)), list(set(tag_ids))
+    if not transaction_ids or not tag_ids:
+        return 0
+
+    # Existing Links In One Query, Then One Batched INSERT For The Rest.
+    existing = set(db.query(TransactionTag.transaction_id, TransactionTag.tag_id).filter(
+        TransactionTag.transaction_id.in_(transaction_ids),
+        TransactionTag.tag_id.in_(tag_ids)
+    ))
+    now = datetime.now()
+    links = [
+        {"transaction_id": transaction_id, "tag_id": tag_id, "user_id": user_id, "created_at": now}
+        for transaction_id in transaction_ids
+        for tag_id in tag_ids
+        if (transaction_id, tag_id) not in existing
+    ]
+    insert_tag_links(db, links)
+    return len(links)
+
+# -------------------------------------------------------- Remove Tags From Transactions.
+def remove_tags_from_transactions(db: Session, user_id: int, transaction_ids: List[int], tag_ids: List[int]) -> int:
+    """Unlink Tags From Transactions In One Statement. Returns Links Removed. Caller Commits."""
+
+    if not transaction_ids or not tag_ids:
+        return 0
+    record_tag_links_spend(db, user_id, [
+        (transaction_id, tag_id) for transaction_id in set(transaction_ids) for tag_id in set(tag_ids)
+    ], -1)
+    return db.query(TransactionTag).filter(
+        TransactionTag.transaction_id.in_(set(transaction_ids)),
+        TransactionTag.tag_id.in_(set(tag_ids))
+    ).delete(synchronize_session=False)
+
+# -------------------------------------------------------- Backfill Tag Link User IDs.
+def backfill_tag_link_user_ids(engine) -> int:
+    """Copy Each Tag Link's Owner From Its Transaction Where Missing (One Statement). Returns Rows Filled."""
+
+    statement = text("""
+        UPDATE transaction_tags
+        SET user_id = (SELECT t.user_id FROM transactions t WHERE t.id = transaction_tags.transaction_id)
+        WHERE user_id IS NULL
+          AND EXISTS (SELECT 1 FROM transactions t WHERE t.id = transaction_tags.transaction_id)
+    """)
+
+    try:
+        with engine.begin() as conn:
+            filled = conn.execute(statement).rowcount or 0
+    except Exception as e:
+        print(f"Tag link owner backfill failed: {e}")
+        return 0
+
+    if filled:
+        print(f"Filled in the owner of {filled} existing tag links")
+    return filled
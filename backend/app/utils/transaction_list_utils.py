@@ -0,0 +1,181 @@
+# Transaction List Utils.
+#
+# Note : Builds The '/transactions' And '/transactions/detailed' Payloads From Plain Tuples.
+#        One Joined Query For Transactions + Accounts, One For Institutions, One For Tags - Instead Of ORM Objects
+#        Plus A Per-Row Institution And Tag Lookup. Output Is Trusted DB Data, So Routes Encode It Directly With
+#        orjson Rather Than Re-Validating Every Row Against 'TransactionOut'.
+#
+# Functions :
+#   - 'get_tags_by_transaction' - Get Every Tagged Transaction's Tags For A User In One Query.
+#   - 'build_transaction_list' - Build The Full '/transactions' Payload For A User (Or One Upload).
+#   - 'build_detailed_transaction_list' - Build The '/transactions/detailed' Payload For A User.
+
+# Imports.
+from collections import defaultdict
+from sqlalchemy.orm import Session
+from typing import Dict, List, Optional
+
+# Local Imports.
+from ..database import Transaction, Account, Institution, Tag, TransactionTag
+
+# Transaction Columns Returned As-Is (Order Matches 'TransactionOut').
+TRANSACTION_FIELDS = [
+    "id", "transaction_id", "account_id", "date", "amount", "vendor", "merchant_name", "description",
+    "category_primary", "category_detailed", "transaction_type", "source", "file", "iso_currency_code",
+    "location_address", "location_city", "location_state", "location_country", "payment_reference",
+    "payment_method", "created_at", "updated_at", "notes"
+]
+
+# Account Columns Nested Under 'account_details'.
+ACCOUNT_FIELDS = [
+    "id", "account_id", "name", "official_name", "type", "subtype", "mask", "current_balance",
+    "available_balance", "limit", "currency", "is_active", "item_id"
+]
+
+# Cash Transactions Have No Account Row, So They Get A Fixed Stand-In.
+CASH_ACCOUNT_DETAILS = {
+    "id": None,
+    "account_id": None,
+    "name": "Cash",
+    "official_name": "Cash Transaction",
+    "type": "cash",
+    "subtype": "cash",
+    "mask": None,
+    "current_balance": None,
+    "available_balance": None,
+    "limit": None,
+    "currency": "USD",
+    "is_active": True
+}
+
+# -------------------------------------------------------- Get Tags By Transaction.
+def get_tags_by_transaction(db: Session, user_id: int, file_upload_id: Optional[int] = None) -> Dict[int, List[Dict]]:
+    """Get Every Tagged Transaction's Tags For A User (Or Just One Upload's Transactions) In One Query."""
+
+    query = db.query(
+        TransactionTag.transaction_id, Tag.id, Tag.name, Tag.emoji, Tag.color
+    ).join(
+        Tag, TransactionTag.tag_id == Tag.id
+    ).filter(
+        Tag.user_id == user_id
+    )
+    if file_upload_id is not None:
+        query = query.filter(TransactionTag.transaction_id.in_(
+            db.query(Transaction.id).filter(Transaction.file_upload_id == file_upload_id, Transaction.user_id == user_id)
+        ))
+    rows = query.order_by(TransactionTag.id).all()
+
+    tags = defaultdict(list)
+    for transaction_id, tag_id, name, emoji, color in rows:
+        tags[transaction_id].append({"id": tag_id, "name": name, "emoji": emoji, "color": color})
+    return tags
+
+# -------------------------------------------------------- Get Institutions By Item.
+def _get_institutions_by_item(db: Session, user_id: int) -> Dict[str, Dict]:
+    """Get The User's Institutions Keyed By Plaid Item ID."""
+
+    institutions = {}
+    for row in db.query(
+        Institution.id, Institution.institution_id, Institution.name, Institution.item_id,
+        Institution.is_connected, Institution.last_sync
+    ).filter(Institution.user_id == user_id).order_by(Institution.id):
+        # First Match Wins (Same As The Old '.first()' Lookup).
+        institutions.setdefault(row.item_id, {
+            "id": row.id,
+            "institution_id": row.institution_id,
+            "name": row.name,
+            "item_id": row.item_id,
+            "is_connected": row.is_connected,
+            "last_sync": row.last_sync
+        })
+    return institutions
+
+# -------------------------------------------------------- Build Transaction List.
+def build_transaction_list(db: Session, user_id: int, file_upload_id: Optional[int] = None) -> List[Dict]:
+    """Build The Full '/transactions' Payload For A User (Or Just One Upload's Transactions)."""
+
+    columns = [getattr(Transaction, field) for field in TRANSACTION_FIELDS]
+    columns += [getattr(Account, field).label(f"account_{field}") for field in ACCOUNT_FIELDS]
+    query = db.query(*columns).outerjoin(
+        Account, Transaction.account_id == Account.account_id
+    ).filter(
+        Transaction.user_id == user_id
+    )
+    if file_upload_id is not None:
+        query = query.filter(Transaction.file_upload_id == file_upload_id)
+    rows = query.order_by(Transaction.id).all()
+
+    institutions = _get_institutions_by_item(db, user_id)
+    tags = get_tags_by_transaction(db, user_id, file_upload_id)
+
+    transaction_count = len(TRANSACTION_FIELDS)
+    result = []
+    for row in rows:
+        tx = dict(zip(TRANSACTION_FIELDS, row[:transaction_count]))
+        account = row[transaction_count:]
+
+        # Account Row Found (Join Hit), Cash, Or Dangling Account ID.
+        if account[0] is not None:
+            account_details = dict(zip(ACCOUNT_FIELDS, account))
+            item_id = account_details.pop("item_id")
+            institution_details = institutions.get(item_id) if item_id else None
+        else:
+            account_details = CASH_ACCOUNT_DETAILS if tx["account_id"] is None else None
+            institution_details = None
+
+        tx["is_duplicate"] = False
+        tx["duplicate_count"] = 0
+        tx["last_updated"] = None
+        tx["account_details"] = account_details
+        tx["institution_details"] = institution_details
+        tx["tags"] = tags.get(tx["id"], [])
+        result.append(tx)
+
+    return result
+
+# -------------------------------------------------------- Build Detailed Transaction List.
+def build_detailed_transaction_list(db: Session, user_id: int) -> List[Dict]:
+    """Build The '/transactions/detailed' Payload For A User."""
+
+    rows = db.query(
+        Transaction.id, Transaction.transaction_id, Transaction.date, Transaction.amount, Transaction.vendor,
+        Transaction.merchant_name, Transaction.description, Transaction.category_primary,
+        Transaction.category_detailed, Transaction.transaction_type, Transaction.source, Transaction.file,
+        Transaction.location_city, Transaction.location_state, Transaction.created_at, Transaction.account_id,
+        Account.id, Account.name, Account.type, Account.subtype, Account.mask
+    ).outerjoin(
+        Account, Transaction.account_id == Account.account_id
+    ).filter(
+        Transaction.user_id == user_id
+    ).order_by(Transaction.id).all()
+
+    result = []
+    for row in rows:
+        # Account Row Found, Cash, Or Dangling Account ID.
+        if row[16] is not None:
+            account_info = {"name": row[17], "type": row[18], "subtype": row[19], "mask": row[20]}
+        elif row[15] is None:
+            account_info = {"name": "Cash", "type": "cash", "subtype": "cash", "mask": None}
+        else:
+            account_info = None
+
+        result.append({
+            "id": row[0],
+            "transaction_id": row[1],
+            "date": row[2],
+            "amount": row[3],
+            "vendor": row[4],
+            "merchant_name": row[5],
+            "description": row[6],
+            "category_primary": row[7],
+            "category_detailed": row[8],
+            "transaction_type": row[9],
+            "source": row[10],
+            "file": row[11],
+            "location_city": row[12],
+            "location_state": row[13],
+            "created_at": row[14],
+            "account": account_info
+        })
+
+    return result
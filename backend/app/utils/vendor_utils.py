@@ -92,15 +92,25 @@ PREFIXES = {
     "DKC*", "DNH*", "ETT*", "NIC*-", "NIC*", "PY", "SQ *", "SQ*", "TST*", "WL"
 }
 
+# Compiled Once. Most Descriptions Match No Rule, So One Combined Search Rules Them Out Before The Ordered Scan.
+COMPILED_RULES = [(re.compile(pattern), vendor) for pattern, vendor in VENDOR_RULES]
+ANY_RULE = re.compile("|".join(f"(?:{pattern})" for pattern, _ in VENDOR_RULES))
+TRAILING_CODE = re.compile(r"\*[A-Z0-9]{4,}$")
+HASH_SPLIT = re.compile(r"[#]")
+MULTI_SPACE = re.compile(r"\s{2,}")
+TRAILING_DIGITS = re.compile(r"\d+$")
+DISALLOWED_CHARS = re.compile(r"[^\w\s&\-\'\.]")
+
 
 def normalize_vendor(description: str) -> str:
     # 1. Decode HTML (e..g. &amp;).
     desc = html.unescape(description).upper().strip()
 
-    # 2. Match known vendor rules.
-    for pattern, vendor in VENDOR_RULES:
-        if re.search(pattern, desc):
-            return vendor
+    # 2. Match known vendor rules (First Rule In Order Wins).
+    if ANY_RULE.search(desc):
+        for pattern, vendor in COMPILED_RULES:
+            if pattern.search(desc):
+                return vendor
     
     # 3. Strip known prefixes.
     for prefix in PREFIXES:
@@ -109,16 +119,16 @@ def normalize_vendor(description: str) -> str:
             break
 
     # 4. Remove trailing '*XYZ123' suffixes
-    desc = re.sub(r"\*[A-Z0-9]{4,}$", "", desc).strip()
+    desc = TRAILING_CODE.sub("", desc).strip()
 
     # 5. Remove everything after double space or #.
-    desc = re.split(r"[#]", desc)[0]
-    desc = re.sub(r"\s{2,}", " ", desc).strip()
+    desc = HASH_SPLIT.split(desc)[0]
+    desc = MULTI_SPACE.sub(" ", desc).strip()
 
     # 6. Remove trailing digits.
-    desc = re.sub(r"\d+$", "", desc).strip()
+    desc = TRAILING_DIGITS.sub("", desc).strip()
 
-    desc = re.sub(r"[^\w\s&\-\'\.]", "", desc)
+    desc = DISALLOWED_CHARS.sub("", desc)
 
     # 7. Word cleanup and smart casing.
     words = desc.split()
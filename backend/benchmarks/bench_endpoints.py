@@ -0,0 +1,255 @@
+# Endpoint Benchmark.
+#
+# Note : Drives The FastAPI App In-Process (TestClient, Real Startup/Shutdown) Against A Database Filled By
+#        'generate_data', Signed In As One Generated User. For Each Case Reports p50/p95 Latency, SQL Statements
+#        Per Call (Counted With A 'before_cursor_execute' Listener On The Sync And Async Engines) And Peak Python
+#        Memory (tracemalloc, Measured In A Separate Pass So It Doesn't Skew Latency). Results Can Be Saved As A
+#        JSON Baseline And Compared Against Later Runs; '--fail-over' Makes Regressions Exit Non-Zero.
+#        App 'print()' Output Is Silenced While Timing (Use '--verbose' To Keep It).
+#        The Upload Case Adds Rows And Runs Its Backfill Task Inline (TestClient Runs Background Tasks Before
+#        Returning), So It Runs Last.
+#
+# Usage :
+#   cd backend
+#   python -m benchmarks.generate_data --database-url sqlite:///./bench.db --users 3 --transactions 20000 --reset
+#   python -m benchmarks.bench_endpoints --database-url sqlite:///./bench.db --save benchmarks/baseline.json
+#   python -m benchmarks.bench_endpoints --database-url sqlite:///./bench.db --compare benchmarks/baseline.json
+#   python -m benchmarks.bench_endpoints --cases transactions stats --iterations 50
+
+# Imports.
+import io
+import os
+import sys
+import json
+import time
+import argparse
+import tracemalloc
+import contextlib
+from datetime import date, datetime, timedelta
+
+# Local Imports.
+from benchmarks.generate_data import BENCH_EMAIL
+
+# Rows Per Generated Upload File.
+UPLOAD_ROWS = 200
+
+# -------------------------------------------------------- Parse Args.
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark API endpoints in-process.")
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL", "sqlite:///./bench.db"),
+                        help="Database filled by generate_data (defaults to $DATABASE_URL, then sqlite:///./bench.db).")
+    parser.add_argument("--user-index", type=int, default=1, help="Generated user to sign in as.")
+    parser.add_argument("--iterations", type=int, default=20, help="Timed calls per case.")
+    parser.add_argument("--warmup", type=int, default=2, help="Untimed calls per case first.")
+    parser.add_argument("--cases", nargs="+", help="Only run these cases (default: all).")
+    parser.add_argument("--save", help="Write results to this JSON baseline.")
+    parser.add_argument("--compare", help="Compare against this JSON baseline.")
+    parser.add_argument("--fail-over", type=float, help="Exit non-zero if any p50 regresses by more than this percent.")
+    parser.add_argument("--verbose", action="store_true", help="Keep the app's print() output.")
+    return parser.parse_args()
+
+# -------------------------------------------------------- Query Counter.
+class QueryCounter:
+    """Counts SQL Statements Sent By The App's Engines."""
+
+    def __init__(self):
+        self.count = 0
+
+    def attach(self, engine):
+        from sqlalchemy import event
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, *args):
+        self.count += 1
+
+# -------------------------------------------------------- Percentile.
+def percentile(values: list, pct: float) -> float:
+    """Nearest-Rank Percentile."""
+
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[rank]
+
+# -------------------------------------------------------- Build Upload.
+def build_upload(iteration: int) -> dict:
+    """Build A Unique CSV Upload (Unique Content, So The Duplicate-File Check Doesn't Short-Circuit It)."""
+
+    today = date.today()
+    lines = ["Date,Description,Amount,Category"]
+    for i in range(UPLOAD_ROWS):
+        day = today - timedelta(days=(i * 3) % 365)
+        lines.append(f"{day.isoformat()},SQ *BENCH CAFE {iteration}-{i},-{(i % 50) + iteration / 100 + 1:.2f},Food and Drink")
+    content = ("\n".join(lines) + "\n").encode("utf-8")
+    return {
+        "files": {"file": (f"bench_upload_{iteration}_{time.time_ns()}.csv", content, "text/csv")},
+        "data": {"account_data": json.dumps({"type": "cash"})}
+    }
+
+# -------------------------------------------------------- Build Cases.
+def build_cases(client) -> list:
+    """Benchmark Cases : (Name, Callable Taking The Iteration Number)."""
+
+    from app.database import get_session, WeeklyCentiScore
+    from app.utils.scheduler import centi_score_scheduler
+    from app.utils.centi_score_utils import get_monday_of_week
+
+    def get(path):
+        def call(_):
+            response = client.get(path)
+            assert response.status_code == 200, f"GET {path} -> {response.status_code}: {response.text[:200]}"
+        return call
+
+    def upload(iteration):
+        response = client.post("/upload", **build_upload(iteration))
+        assert response.status_code == 200, f"POST /upload -> {response.status_code}: {response.text[:200]}"
+
+    def weekly_scheduler(_):
+        # Drop This Week's Scores First, Otherwise The Job Skips Every User.
+        db = get_session()
+        try:
+            db.query(WeeklyCentiScore).filter(
+                WeeklyCentiScore.score_date == get_monday_of_week(date.today())
+            ).delete(synchronize_session=False)
+            db.commit()
+        finally:
+            db.close()
+        centi_score_scheduler._calculate_all_users_scores()
+
+    return [
+        ("transactions", get("/transactions")),
+        ("transactions_detailed", get("/transactions/detailed")),
+        ("transactions_search", get("/transactions/search?q=coffee")),
+        ("stats", get("/stats")),
+        ("accounts", get("/accounts")),
+        ("accounts_enhanced", get("/accounts/enhanced")),
+        ("centi_score_overview", get("/centi-score/overview")),
+        ("weekly_scheduler", weekly_scheduler),
+        ("upload", upload)
+    ]
+
+# -------------------------------------------------------- Run Case.
+def run_case(call, counter: QueryCounter, iterations: int, warmup: int, quiet: bool) -> dict:
+    """Time One Case, Then Measure Its Peak Memory In A Separate Call."""
+
+    output = contextlib.redirect_stdout(io.StringIO()) if quiet else contextlib.nullcontext()
+    iteration = 0
+    with output:
+        for _ in range(warmup):
+            call(iteration)
+            iteration += 1
+
+        timings, queries = [], []
+        for _ in range(iterations):
+            counter.count = 0
+            started = time.perf_counter()
+            call(iteration)
+            timings.append((time.perf_counter() - started) * 1000)
+            queries.append(counter.count)
+            iteration += 1
+
+        tracemalloc.start()
+        call(iteration)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    return {
+        "p50_ms": round(percentile(timings, 50), 2),
+        "p95_ms": round(percentile(timings, 95), 2),
+        "mean_ms": round(sum(timings) / len(timings), 2),
+        "queries": max(queries),
+        "peak_mb": round(peak / 1e6, 2)
+    }
+
+# -------------------------------------------------------- Change.
+def change(current: float, previous: float) -> str:
+    """Format A Percent Change Against The Baseline."""
+
+    if not previous:
+        return "n/a"
+    return f"{(current - previous) / previous * 100:+.0f}%"
+
+# -------------------------------------------------------- Main.
+def main():
+    args = parse_args()
+
+    # Point The App At The Benchmark Database Before Anything Builds An Engine.
+    os.environ["DATABASE_URL"] = args.database_url
+    from fastapi.testclient import TestClient
+    from app.main import app
+    from app.database import get_session, get_engine, get_async_engine, User, Transaction
+    from app.routes.accounts import create_access_token
+
+    # Find The Benchmark User.
+    db = get_session()
+    try:
+        user = db.query(User).filter(User.email == BENCH_EMAIL.format(index=args.user_index)).first()
+        if user is None:
+            sys.exit(f"No {BENCH_EMAIL.format(index=args.user_index)} in {args.database_url} - run benchmarks.generate_data first")
+        user_id = user.id
+        transaction_count = db.query(Transaction).filter(Transaction.user_id == user_id).count()
+    finally:
+        db.close()
+
+    counter = QueryCounter()
+    counter.attach(get_engine())
+    async_engine = get_async_engine()
+    if async_engine is not None:
+        counter.attach(async_engine.sync_engine)
+
+    client = TestClient(app)
+    client.__enter__()
+    client.cookies.set("access_token", create_access_token({"sub": str(user_id)}))
+
+    results = {}
+    try:
+        cases = build_cases(client)
+        if args.cases:
+            unknown = set(args.cases) - {name for name, _ in cases}
+            if unknown:
+                sys.exit(f"Unknown cases: {', '.join(sorted(unknown))}")
+            cases = [case for case in cases if case[0] in args.cases]
+
+        print(f"{BENCH_EMAIL.format(index=args.user_index)} ({transaction_count:,} transactions), "
+              f"{args.iterations} iterations, {args.warmup} warmup\n")
+        print(f"{'case':<24}{'p50 ms':>10}{'p95 ms':>10}{'mean ms':>10}{'queries':>9}{'peak MB':>9}")
+        for name, call in cases:
+            results[name] = run_case(call, counter, args.iterations, args.warmup, not args.verbose)
+            r = results[name]
+            print(f"{name:<24}{r['p50_ms']:>10.1f}{r['p95_ms']:>10.1f}{r['mean_ms']:>10.1f}{r['queries']:>9}{r['peak_mb']:>9.1f}")
+    finally:
+        client.__exit__(None, None, None)
+
+    # Compare Against A Saved Baseline.
+    regressions = []
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+        print(f"\nvs {args.compare}")
+        print(f"{'case':<24}{'p50':>10}{'p95':>10}{'queries':>10}{'peak':>10}")
+        for name, r in results.items():
+            previous = baseline.get(name)
+            if previous is None:
+                print(f"{name:<24}{'(new)':>10}")
+                continue
+            print(f"{name:<24}{change(r['p50_ms'], previous['p50_ms']):>10}{change(r['p95_ms'], previous['p95_ms']):>10}"
+                  f"{r['queries'] - previous['queries']:>+10}{change(r['peak_mb'], previous['peak_mb']):>10}")
+            if args.fail_over is not None and previous["p50_ms"] and \
+                    (r["p50_ms"] - previous["p50_ms"]) / previous["p50_ms"] * 100 > args.fail_over:
+                regressions.append(name)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({
+                "created_at": datetime.now().isoformat(timespec="seconds"),
+                "database": args.database_url.split("://")[0],
+                "transactions": transaction_count,
+                "iterations": args.iterations,
+                "results": results
+            }, f, indent=2)
+        print(f"\nSaved baseline to {args.save}")
+
+    if regressions:
+        sys.exit(f"p50 regressed more than {args.fail_over:.0f}%: {', '.join(regressions)}")
+
+if __name__ == "__main__":
+    main()
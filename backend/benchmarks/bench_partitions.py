@@ -0,0 +1,146 @@
+# Partition Benchmark.
+#
+# Note : Shows Whether Per-User Query Latency Stays Flat As The Shared Tables Grow. Creates One Measured User, Then
+#        Repeatedly Adds Filler Users (Growing 'transactions', 'transaction_tags' And 'account_balance_history' For
+#        Everyone Else) And Re-Times The Measured User's Hot Queries After Each Step. With Hash Partitioning On
+#        ('--partitions', See 'partition_utils') The Planner Prunes To One Partition, So p50 Should Barely Move;
+#        Run Again With '--partitions 0' Against A Fresh Database To See The Unpartitioned Curve.
+#        PostgreSQL Only, And It Partitions The Target Database - Point It At A Scratch Database.
+#        '--max-growth' Makes It Exit Non-Zero When Any Query's p50 Grows By More Than That Percent.
+#
+# Usage :
+#   cd backend
+#   python -m benchmarks.bench_partitions --database-url postgresql://localhost/centi_bench --partitions 16
+#   python -m benchmarks.bench_partitions --database-url postgresql://localhost/centi_bench_plain --partitions 0
+#   python -m benchmarks.bench_partitions --steps 5 --users-per-step 50 --transactions 20000 --max-growth 25
+
+# Imports.
+import io
+import os
+import sys
+import time
+import random
+import argparse
+import contextlib
+from datetime import date, timedelta
+
+# Local Imports.
+from benchmarks.generate_data import BENCH_EMAIL, BENCH_PASSWORD, reset_bench_users, generate_user
+from benchmarks.bench_endpoints import percentile
+
+# -------------------------------------------------------- Parse Args.
+def parse_args():
+    parser = argparse.ArgumentParser(description="Time per-user queries as the shared tables grow.")
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL"),
+                        help="Scratch PostgreSQL database (defaults to $DATABASE_URL).")
+    parser.add_argument("--partitions", type=int, default=16, help="Hash partitions (0 = plain tables).")
+    parser.add_argument("--steps", type=int, default=4, help="Growth steps after the first measurement.")
+    parser.add_argument("--users-per-step", type=int, default=20, help="Filler users added per step.")
+    parser.add_argument("--transactions", type=int, default=20000, help="Transactions per filler user.")
+    parser.add_argument("--user-transactions", type=int, default=5000, help="Transactions for the measured user.")
+    parser.add_argument("--iterations", type=int, default=30, help="Timed runs per query per step.")
+    parser.add_argument("--max-growth", type=float, help="Exit non-zero if any p50 grows by more than this percent.")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed.")
+    return parser.parse_args()
+
+# -------------------------------------------------------- Build Queries.
+def build_queries(user_id: int) -> list:
+    """The Measured User's Hot Queries : (Name, Callable Taking A Session)."""
+
+    from sqlalchemy import func
+    from app.database import Transaction, TransactionTag, AccountBalanceHistory
+
+    since = date.today() - timedelta(days=30)
+    return [
+        ("list_page", lambda db: db.query(Transaction.id, Transaction.date, Transaction.amount, Transaction.vendor).filter(
+            Transaction.user_id == user_id
+        ).order_by(Transaction.date.desc(), Transaction.id.desc()).limit(50).all()),
+        ("month_totals", lambda db: db.query(Transaction.category_primary, func.sum(Transaction.amount)).filter(
+            Transaction.user_id == user_id, Transaction.date >= since
+        ).group_by(Transaction.category_primary).all()),
+        ("tag_counts", lambda db: db.query(TransactionTag.tag_id, func.count(TransactionTag.id)).filter(
+            TransactionTag.user_id == user_id
+        ).group_by(TransactionTag.tag_id).all()),
+        ("balance_history", lambda db: db.query(AccountBalanceHistory.snapshot_date, func.sum(AccountBalanceHistory.current_balance)).filter(
+            AccountBalanceHistory.user_id == user_id
+        ).group_by(AccountBalanceHistory.snapshot_date).all())
+    ]
+
+# -------------------------------------------------------- Time Queries.
+def time_queries(db, queries: list, iterations: int) -> dict:
+    """p50 Latency (ms) Of Each Query, After One Warmup Run."""
+
+    results = {}
+    for name, run in queries:
+        run(db)
+        timings = []
+        for _ in range(iterations):
+            started = time.perf_counter()
+            run(db)
+            timings.append((time.perf_counter() - started) * 1000)
+        results[name] = round(percentile(timings, 50), 2)
+    return results
+
+# -------------------------------------------------------- Main.
+def main():
+    args = parse_args()
+    if not args.database_url or not args.database_url.startswith(("postgresql", "postgres")):
+        sys.exit("bench_partitions needs a scratch PostgreSQL database (--database-url postgresql://...)")
+
+    # Point The App At The Target Database (And Partition Count) Before Anything Builds An Engine.
+    os.environ["DATABASE_URL"] = args.database_url
+    os.environ["DB_HASH_PARTITIONS"] = str(args.partitions)
+    from sqlalchemy import text
+    from app.database import create_tables, get_session, Transaction
+    from app.routes.accounts import get_password_hash
+
+    create_tables()
+    db = get_session()
+    if db is None:
+        sys.exit("Could not connect to the database")
+
+    rng = random.Random(args.seed)
+    password_hash = get_password_hash(BENCH_PASSWORD)
+    generated = argparse.Namespace(accounts=4, days=730, tag_ratio=0.2, batch_size=5000, transactions=args.user_transactions)
+    quiet = contextlib.redirect_stdout(io.StringIO())
+
+    try:
+        reset_bench_users(db)
+        user_id = generate_user(db, rng, 1, password_hash, generated)["user_id"]
+        queries = build_queries(user_id)
+        generated.transactions = args.transactions
+
+        print(f"{BENCH_EMAIL.format(index=1)} ({args.user_transactions:,} transactions), "
+              f"{args.partitions or 'no'} partitions, {args.iterations} iterations\n")
+        print(f"{'total rows':>12}" + "".join(f"{name:>18}" for name, _ in queries))
+
+        rows = []
+        next_index = 2
+        for step in range(args.steps + 1):
+            if step:
+                with quiet:
+                    for _ in range(args.users_per_step):
+                        generate_user(db, rng, next_index, password_hash, generated)
+                        next_index += 1
+            db.execute(text("ANALYZE"))
+            db.commit()
+
+            total = db.query(Transaction.id).count()
+            result = time_queries(db, queries, args.iterations)
+            rows.append(result)
+            print(f"{total:>12,}" + "".join(f"{result[name]:>18.2f}" for name, _ in queries))
+    finally:
+        db.close()
+
+    # Growth From The Smallest To The Largest Table.
+    first, last = rows[0], rows[-1]
+    growth = {name: (last[name] - first[name]) / first[name] * 100 if first[name] else 0.0 for name in first}
+    print(f"\n{'p50 growth':>12}" + "".join(f"{growth[name]:>+17.0f}%" for name in first))
+
+    if args.max_growth is not None:
+        over = [name for name, value in growth.items() if value > args.max_growth]
+        if over:
+            sys.exit(f"\np50 grew by more than {args.max_growth:.0f}%: {', '.join(over)}")
+
+if __name__ == "__main__":
+    main()
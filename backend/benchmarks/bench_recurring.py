@@ -0,0 +1,95 @@
+# Recurring Detection Benchmark.
+#
+# Note : Times 'detect_series' On A Synthetic History - Known Weekly, Monthly And Annual Series Buried In Random
+#        Everyday Spending Across Many Vendors - And Checks Every Planted Series Is Found. Detection Runs On Arrays,
+#        So No Database Is Needed; Loading Rows Is Timed Separately By 'bench_endpoints'.
+#        '--max-ms' Makes It Exit Non-Zero When The Median Run Is Slower (The Target Is 1,000 ms At 100k Rows).
+#
+# Usage :
+#   cd backend
+#   python -m benchmarks.bench_recurring                       # 10k And 100k Rows.
+#   python -m benchmarks.bench_recurring --rows 250000 --max-ms 1000
+
+# Imports.
+import sys
+import time
+import random
+import argparse
+import statistics
+from datetime import date
+
+# Local Imports.
+from app.utils.recurring_utils import detect_series
+
+# Planted Series : (Vendor Code Offset, Interval Days, Amount In Cents).
+PLANTED = [
+    (0, 7, -1500),          # Weekly Class.
+    (1, 30, -1599),         # Streaming.
+    (2, 30, -12000),        # Utility (Amount Varies, See 'make_history').
+    (3, 14, 210000),        # Biweekly Payroll.
+    (4, 365, -9900)         # Annual Membership.
+]
+
+# -------------------------------------------------------- Parse Args.
+def parse_args():
+    parser = argparse.ArgumentParser(description="Time vectorized recurring-transaction detection.")
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000, 100000], help="History sizes to time.")
+    parser.add_argument("--vendors", type=int, default=2000, help="Distinct everyday vendors.")
+    parser.add_argument("--days", type=int, default=1825, help="Days of history.")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per size.")
+    parser.add_argument("--max-ms", type=float, help="Exit non-zero if a median run is slower than this.")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed.")
+    return parser.parse_args()
+
+# -------------------------------------------------------- Make History.
+def make_history(rows: int, vendors: int, days: int, seed: int):
+    """Random Spending Plus The Planted Series. Returns (Days, Cents, Codes, Planted Codes)."""
+
+    rng = random.Random(seed)
+    today = date.today().toordinal()
+    history_days, history_cents, history_codes = [], [], []
+
+    # Planted Series Use Codes After The Everyday Vendors.
+    for offset, interval, cents in PLANTED:
+        for day in range(today - days, today, interval):
+            jitter = rng.randint(-2, 2) if interval >= 28 else 0
+            amount = int(cents * rng.uniform(0.8, 1.2)) if offset == 2 else cents
+            history_days.append(day + jitter)
+            history_cents.append(amount)
+            history_codes.append(vendors + offset)
+
+    # Everyday Spending Fills The Rest.
+    for _ in range(max(0, rows - len(history_days))):
+        history_days.append(today - rng.randint(0, days))
+        history_cents.append(-rng.randint(100, 25000))
+        history_codes.append(rng.randrange(vendors))
+
+    planted = {vendors + offset for offset, _, _ in PLANTED}
+    return history_days, history_cents, history_codes, planted
+
+# -------------------------------------------------------- Main.
+def main():
+    args = parse_args()
+    slow = []
+    print(f"{'rows':>10}{'median ms':>12}{'series':>9}{'planted found':>15}")
+    for rows in args.rows:
+        days, cents, codes, planted = make_history(rows, args.vendors, args.days, args.seed)
+        timings = []
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            series = detect_series(days, cents, codes)
+            timings.append((time.perf_counter() - started) * 1000)
+
+        median = statistics.median(timings)
+        found = planted & {found["code"] for found in series}
+        print(f"{rows:>10,}{median:>12.1f}{len(series):>9}{f'{len(found)}/{len(planted)}':>15}")
+        if args.max_ms is not None and median > args.max_ms:
+            slow.append(rows)
+        if found != planted:
+            sys.exit(f"Missed planted series: {sorted(planted - found)}")
+
+    if slow:
+        sys.exit(f"Slower than {args.max_ms:.0f} ms at: {', '.join(f'{rows:,}' for rows in slow)} rows")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+# Serialization Benchmark.
+#
+# Note : Compares The Old '/transactions' Response Path (Validate Every Row Against 'list[TransactionOut]', Dump To
+#        Python, Then Stdlib 'json.dumps' - What FastAPI Does With 'response_model') Against Encoding The Trusted
+#        Rows Directly With orjson ('ORJSONResponse'), Plus Pydantic's Own 'TypeAdapter.dump_json' For Reference.
+#        Uses Synthetic Rows Shaped Like 'build_transaction_list' Output, So No Database Is Needed.
+#
+# Usage :
+#   cd backend
+#   python -m benchmarks.bench_serialization                    # 10k And 100k Rows.
+#   python -m benchmarks.bench_serialization --rows 50000 --repeat 5
+
+# Imports.
+import json
+import time
+import random
+import argparse
+import statistics
+from datetime import date, datetime, timedelta
+
+import orjson
+from pydantic import TypeAdapter
+
+# Local Imports.
+from app.models import TransactionOut
+
+# Reused Adapter (Building One Per Call Would Skew The Pydantic Numbers).
+TRANSACTION_LIST_ADAPTER = TypeAdapter(list[TransactionOut])
+
+# -------------------------------------------------------- Make Rows.
+def make_rows(count: int, seed: int = 0) -> list:
+    """Build Synthetic Transaction Payload Rows."""
+
+    rng = random.Random(seed)
+    vendors = ["Publix", "Netflix", "Amazon", "Chipotle", "Shell", "Payroll", "Target", "Starbucks"]
+    categories = ["Food and Drink", "Shops", "Travel", "Transfer", "Payment", "Recreation"]
+    tags = [{"id": i, "name": f"Tag {i}", "emoji": "🏷️", "color": "#6366f1"} for i in range(1, 6)]
+    account = {
+        "id": 1, "account_id": "acc_1", "name": "Checking", "official_name": "Total Checking", "type": "depository",
+        "subtype": "checking", "mask": "0000", "current_balance": 2500.0, "available_balance": 2400.0,
+        "limit": None, "currency": "USD", "is_active": True
+    }
+    institution = {
+        "id": 1, "institution_id": "ins_1", "name": "Chase", "item_id": "item_1", "is_connected": True,
+        "last_sync": datetime(2026, 1, 1, 12, 0)
+    }
+    start = date(2020, 1, 1)
+    now = datetime(2026, 1, 1, 12, 0)
+
+    rows = []
+    for i in range(count):
+        vendor = rng.choice(vendors)
+        rows.append({
+            "id": i + 1,
+            "transaction_id": f"tx_{i}",
+            "account_id": "acc_1",
+            "date": start + timedelta(days=rng.randint(0, 2000)),
+            "amount": round(rng.uniform(-250, 250), 2),
+            "vendor": vendor,
+            "merchant_name": vendor,
+            "description": f"{vendor.upper()} #{rng.randint(100, 999)}",
+            "category_primary": rng.choice(categories),
+            "category_detailed": None,
+            "transaction_type": "place",
+            "source": "plaid",
+            "file": "plaid",
+            "iso_currency_code": "USD",
+            "location_address": None,
+            "location_city": "Orlando",
+            "location_state": "FL",
+            "location_country": "US",
+            "payment_reference": None,
+            "payment_method": None,
+            "created_at": now,
+            "updated_at": now,
+            "notes": None,
+            "is_duplicate": False,
+            "duplicate_count": 0,
+            "last_updated": None,
+            "account_details": account,
+            "institution_details": institution,
+            "tags": rng.sample(tags, rng.randint(0, 2))
+        })
+    return rows
+
+# -------------------------------------------------------- Encoders.
+def encode_response_model(rows: list) -> bytes:
+    """Old Path : Validate Against 'list[TransactionOut]', Dump To JSON-Safe Python, Then Stdlib json."""
+
+    validated = TRANSACTION_LIST_ADAPTER.validate_python(rows)
+    content = TRANSACTION_LIST_ADAPTER.dump_python(validated, mode="json")
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+def encode_type_adapter(rows: list) -> bytes:
+    """Precompiled TypeAdapter : Validate Then Dump Straight To JSON Bytes In pydantic-core."""
+
+    return TRANSACTION_LIST_ADAPTER.dump_json(TRANSACTION_LIST_ADAPTER.validate_python(rows))
+
+def encode_orjson(rows: list) -> bytes:
+    """New Path : Trusted Rows Encoded Directly With orjson (What 'ORJSONResponse' Does)."""
+
+    return orjson.dumps(rows)
+
+ENCODERS = [
+    ("response_model + json", encode_response_model),
+    ("TypeAdapter.dump_json", encode_type_adapter),
+    ("orjson (ORJSONResponse)", encode_orjson)
+]
+
+# -------------------------------------------------------- Time Encoder.
+def time_encoder(encoder, rows: list, repeat: int) -> tuple:
+    """Get The Median Seconds And Output Size For An Encoder."""
+
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        body = encoder(rows)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings), len(body)
+
+# -------------------------------------------------------- Main.
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark '/transactions' response serialization.")
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000, 100000], help="Row counts to benchmark.")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per encoder (median is reported).")
+    args = parser.parse_args()
+
+    for count in args.rows:
+        rows = make_rows(count)
+
+        # Sanity Check : Every Path Must Produce The Same Document.
+        reference = orjson.loads(encode_orjson(rows))
+        for name, encoder in ENCODERS:
+            assert orjson.loads(encoder(rows)) == reference, f"{name} output differs"
+
+        print(f"\n{count:,} rows")
+        baseline = None
+        for name, encoder in ENCODERS:
+            seconds, size = time_encoder(encoder, rows, args.repeat)
+            baseline = baseline or seconds
+            print(f"  {name:<26} {seconds * 1000:>9.1f} ms  {size / 1e6:>6.1f} MB  {baseline / seconds:>5.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+# Startup Benchmark.
+#
+# Note : Measures Cold-Start Cost The Way A Scale-To-Zero Host Pays It - A Fresh Interpreter Importing 'app.main'.
+#        Runs 'python -X importtime' In A Subprocess, Reports The Slowest Imports, Checks That Heavy Optional
+#        Modules (Plaid SDK, numpy, pandas, pyarrow, requests) Stay Out Of Startup, And Times The First '/health'
+#        Response. Exits Non-Zero When The Import Budget Is Blown Or A Deferred Module Sneaks Back In, So It Can
+#        Gate CI.
+#
+# Usage :
+#   cd backend
+#   python -m benchmarks.bench_startup                          # Default Budget.
+#   python -m benchmarks.bench_startup --budget-ms 1500 --repeat 5 --top 20
+
+# Imports.
+import os
+import sys
+import argparse
+import tempfile
+import statistics
+import subprocess
+
+# Import Time Budget For 'app.main' (Median, Milliseconds).
+DEFAULT_BUDGET_MS = 2500
+
+# Modules That Must Only Be Imported By The Routes That Use Them.
+DEFERRED_MODULES = ["plaid", "numpy", "pandas", "pyarrow", "requests"]
+
+# Runs In The Child Interpreter : Import The App, Then Report Which Deferred Modules Got Loaded.
+IMPORT_SCRIPT = (
+    "import sys, app.main; "
+    "print('LOADED=' + ','.join(m for m in sys.argv[1:] if m in sys.modules))"
+)
+
+# Runs In The Child Interpreter : Import The App, Run Startup, Then Time The First '/health' Response.
+HEALTH_SCRIPT = """
+import time
+started = time.perf_counter()
+from fastapi.testclient import TestClient
+from app.main import app
+client = TestClient(app)
+client.__enter__()
+response = client.get("/health")
+elapsed = time.perf_counter() - started
+client.__exit__(None, None, None)
+assert response.status_code == 200, response.text
+print(f"FIRST_HEALTH_MS={elapsed * 1000:.1f}")
+"""
+
+# -------------------------------------------------------- Child Environment.
+def _child_env() -> dict:
+    """Environment For The Child Interpreter (No Plaid/Google Credentials, Throwaway SQLite)."""
+
+    env = dict(os.environ)
+    for name in ("PLAID_CLIENT_ID", "PLAID_SECRET", "GOOGLE_CLIENT_ID", "GOOGLE_CLIENT_SECRET"):
+        env.pop(name, None)
+    env["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.gettempdir(), 'bench_startup.db')}"
+    env.setdefault("SECRET_KEY", "bench-startup")
+    return env
+
+# -------------------------------------------------------- Run Import Time.
+def run_importtime() -> tuple:
+    """Import 'app.main' In A Fresh Interpreter. Returns (Per-Module Cumulative us, Loaded Deferred Modules)."""
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", IMPORT_SCRIPT, *DEFERRED_MODULES],
+        capture_output=True, text=True, env=_child_env()
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing app.main failed:\n{result.stderr}")
+
+    # Lines Look Like : "import time:  self [us] | cumulative | package".
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, total, name = line[len("import time:"):].split("|")
+        cumulative[name.rstrip()] = int(total)    # Keep Leading Spaces (Nesting Depth) For Display.
+
+    loaded = []
+    for line in result.stdout.splitlines():
+        if line.startswith("LOADED="):
+            loaded = [name for name in line[len("LOADED="):].split(",") if name]
+    return cumulative, loaded
+
+# -------------------------------------------------------- Run First Health.
+def run_first_health() -> float:
+    """Time From A Fresh Interpreter To The First '/health' Response, In Milliseconds."""
+
+    result = subprocess.run([sys.executable, "-c", HEALTH_SCRIPT], capture_output=True, text=True, env=_child_env())
+    for line in result.stdout.splitlines():
+        if line.startswith("FIRST_HEALTH_MS="):
+            return float(line[len("FIRST_HEALTH_MS="):])
+    raise RuntimeError(f"First /health request failed:\n{result.stderr}")
+
+# -------------------------------------------------------- Main.
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark cold-start import time of app.main.")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS, help="Median import time budget.")
+    parser.add_argument("--repeat", type=int, default=3, help="Fresh interpreters to time (median is reported).")
+    parser.add_argument("--top", type=int, default=15, help="Slowest top-level imports to list.")
+    parser.add_argument("--skip-health", action="store_true", help="Skip timing the first /health response.")
+    args = parser.parse_args()
+
+    runs = [run_importtime() for _ in range(args.repeat)]
+    totals_ms = [cumulative.get(" app.main", 0) / 1000 for cumulative, _ in runs]
+    median_ms = statistics.median(totals_ms)
+
+    # Slowest Imports From The Median Run.
+    cumulative, loaded = sorted(runs, key=lambda run: run[0].get(" app.main", 0))[len(runs) // 2]
+    print("\nSlowest imports (cumulative)")
+    for name, micros in sorted(cumulative.items(), key=lambda item: item[1], reverse=True)[:args.top]:
+        print(f"  {micros / 1000:>9.1f} ms  {name}")
+
+    print(f"\nimport app.main  median {median_ms:.1f} ms  (runs: {', '.join(f'{ms:.0f}' for ms in totals_ms)})")
+    if not args.skip_health:
+        print(f"first /health    {run_first_health():.1f} ms")
+
+    # Enforce The Budget.
+    failures = []
+    if median_ms > args.budget_ms:
+        failures.append(f"import time {median_ms:.1f} ms is over the {args.budget_ms:.0f} ms budget")
+    if loaded:
+        failures.append(f"deferred modules imported at startup: {', '.join(loaded)}")
+
+    if failures:
+        for failure in failures:
+            print(f"FAIL: {failure}")
+        sys.exit(1)
+    print("OK: within budget, no deferred modules imported")
+
+if __name__ == "__main__":
+    main()
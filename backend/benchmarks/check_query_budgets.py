@@ -0,0 +1,225 @@
+# Query Budget Check.
+#
+# Note : CI Gate For 'ROUTE_QUERY_BUDGETS'. Builds A Throwaway SQLite Database With Two Generated Users - A Small
+#        One And One With Many Times The Data - And Drives Every Exercised Route As Both Through The In-Process
+#        App With 'QUERY_BUDGET_STRICT=true', So Any Request Over Its Budget Fails. It Then Checks That :
+#          - Each Route Runs The Same Number Of Statements For Both Users (Counts That Grow With Data Are N+1s).
+#          - Every Route The App Registers Has An Entry In 'ROUTE_QUERY_BUDGETS'.
+#        '--report' Prints Each Route's Measured Count Next To Its Budget (Handy When Setting New Budgets).
+#
+# Usage :
+#   cd backend
+#   python -m benchmarks.check_query_budgets
+#   python -m benchmarks.check_query_budgets --large 20000 --report
+
+# Imports.
+import io
+import os
+import sys
+import random
+import argparse
+import tempfile
+import contextlib
+from types import SimpleNamespace
+
+# Local Imports.
+from benchmarks.generate_data import BENCH_EMAIL, BENCH_PASSWORD
+
+# -------------------------------------------------------- Parse Args.
+def parse_args():
+    parser = argparse.ArgumentParser(description="Check per-route SQL statement budgets.")
+    parser.add_argument("--small", type=int, default=300, help="Transactions for the small user.")
+    parser.add_argument("--large", type=int, default=3000, help="Transactions for the large user.")
+    parser.add_argument("--report", action="store_true", help="Print measured counts next to budgets.")
+    parser.add_argument("--verbose", action="store_true", help="Keep the app's print() output.")
+    return parser.parse_args()
+
+# -------------------------------------------------------- Build Database.
+def build_database(args) -> list:
+    """Create The Small And Large Users. Returns Their User IDs."""
+
+    from app.database import create_tables, get_session
+    from app.routes.accounts import get_password_hash
+    from benchmarks.generate_data import generate_user
+
+    create_tables()
+    db = get_session()
+    try:
+        password_hash = get_password_hash(BENCH_PASSWORD)
+        user_ids = []
+        for index, transactions in enumerate((args.small, args.large), start=1):
+            options = SimpleNamespace(accounts=4, transactions=transactions, days=365, tag_ratio=0.2, batch_size=5000)
+            user_ids.append(generate_user(db, random.Random(index), index, password_hash, options)["user_id"])
+        return user_ids
+    finally:
+        db.close()
+
+# -------------------------------------------------------- Build Requests.
+def build_requests(user_id: int, index: int) -> list:
+    """Requests To Run For One User : (Method, Route Template, Path, Request Kwargs)."""
+
+    from app.database import get_session, Account, Transaction, Tag, TransactionTag, FileUpload, Budget
+
+    db = get_session()
+    try:
+        account_id = db.query(Account.account_id).filter(Account.user_id == user_id).order_by(Account.id).first()[0]
+        first = db.query(Transaction.id).filter(Transaction.user_id == user_id).order_by(Transaction.id).first()[0]
+        batch = [row[0] for row in db.query(Transaction.id).filter(Transaction.user_id == user_id).order_by(Transaction.id).limit(50)]
+        # Delete An Untagged Transaction (Tag Links Aren't Cascaded).
+        untagged = db.query(Transaction.id).filter(
+            Transaction.user_id == user_id,
+            ~Transaction.id.in_(db.query(TransactionTag.transaction_id))
+        ).order_by(Transaction.id.desc()).first()[0]
+        tag_id = db.query(Tag.id).filter(Tag.user_id == user_id).order_by(Tag.id).first()[0]
+        file_id = db.query(FileUpload.id).filter(FileUpload.user_id == user_id).order_by(FileUpload.id).first()[0]
+
+        # Category And Tag Budgets, So Every Write Below Also Moves Budget Counters.
+        budgets = [Budget(user_id=user_id, category_primary="Shops", monthly_limit=1_000_000, is_active=True),
+                   Budget(user_id=user_id, tag_id=tag_id, monthly_limit=1_000_000, is_active=True)]
+        db.add_all(budgets)
+        db.commit()
+        budget_id = budgets[0].id
+    finally:
+        db.close()
+
+    new_transaction = {
+        "date": "2024-01-15", "amount": -12.5, "vendor": "Budget Check", "description": "Budget Check",
+        "category_primary": "Food and Drink", "account_data": {"account_id": account_id}
+    }
+    return [
+        ("GET", "/", "/", {}),
+        ("GET", "/health", "/health", {}),
+        ("GET", "/auth/me", "/auth/me", {}),
+        ("POST", "/auth/login", "/auth/login", {"json": {"email": BENCH_EMAIL.format(index=index), "password": BENCH_PASSWORD}}),
+        ("GET", "/files", "/files", {}),
+        ("GET", "/files/", "/files/", {}),
+        ("GET", "/files/{file_id}/transactions", f"/files/{file_id}/transactions", {}),
+        ("PATCH", "/files/{file_id}", f"/files/{file_id}", {"json": {"new_name": f"statement_{index}.csv"}}),
+        ("GET", "/transactions", "/transactions", {}),
+        ("GET", "/transactions/search", "/transactions/search?q=coffee", {}),
+        ("GET", "/transactions/export", "/transactions/export", {}),
+        ("GET", "/transactions/detailed", "/transactions/detailed", {}),
+        ("GET", "/accounts", "/accounts", {}),
+        ("GET", "/accounts/enhanced", "/accounts/enhanced", {}),
+        ("GET", "/accounts/analysis", "/accounts/analysis", {}),
+        ("POST", "/accounts/snapshot", "/accounts/snapshot", {}),
+        ("GET", "/stats", "/stats", {}),
+        ("GET", "/analytics/compare", "/analytics/compare?range=2024-Q3&range=2024-Q2&group_by=category", {}),
+        ("POST", "/analytics/recurring/detect", "/analytics/recurring/detect", {}),
+        ("GET", "/analytics/recurring", "/analytics/recurring", {}),
+        ("GET", "/analytics/forecast", "/analytics/forecast?horizon_days=90", {}),
+        ("POST", "/budgets", "/budgets", {"json": {"category_primary": "Food and Drink", "monthly_limit": 1_000_000}}),
+        ("GET", "/budgets", "/budgets", {}),
+        ("PUT", "/budgets/{budget_id}", f"/budgets/{budget_id}", {"json": {"category_primary": "Shops", "monthly_limit": 2_000_000}}),
+        ("GET", "/budgets/{budget_id}/history", f"/budgets/{budget_id}/history", {}),
+        ("GET", "/debug/account/{account_id}", f"/debug/account/{account_id}", {}),
+        ("GET", "/debug/cash-flow", "/debug/cash-flow", {}),
+        ("POST", "/transactions/update-details", "/transactions/update-details", {}),
+        ("POST", "/transactions/bulk-update", "/transactions/bulk-update", {"json": {"transaction_ids": batch, "category_primary": "Shops"}}),
+        ("POST", "/transactions/", "/transactions/", {"json": new_transaction}),
+        ("DELETE", "/transactions/{transaction_id}", f"/transactions/{untagged}", {}),
+        ("POST", "/accounts/{account_id}/fix-balance", f"/accounts/{account_id}/fix-balance", {}),
+        ("GET", "/tags", "/tags", {}),
+        ("POST", "/tags", "/tags", {"json": {"name": f"Budget Check {index}"}}),
+        ("POST", "/tags/initialize", "/tags/initialize", {}),
+        ("GET", "/tags/{tag_id}/transaction-count", f"/tags/{tag_id}/transaction-count", {}),
+        ("POST", "/transactions/{transaction_id}/tags/{tag_id}", f"/transactions/{first}/tags/{tag_id}", {}),
+        ("GET", "/transactions/{transaction_id}/tags", f"/transactions/{first}/tags", {}),
+        ("DELETE", "/transactions/{transaction_id}/tags/{tag_id}", f"/transactions/{first}/tags/{tag_id}", {}),
+        ("POST", "/transactions/bulk-tag", "/transactions/bulk-tag", {"json": {"transaction_ids": batch, "add_tag_ids": [tag_id]}}),
+        ("PUT", "/tags/{tag_id}", f"/tags/{tag_id}", {"json": {"name": f"Renamed Check {index}", "color": "#123456"}}),
+        ("GET", "/centi-score/overview", "/centi-score/overview", {}),
+        ("GET", "/centi-score/status", "/centi-score/status", {}),
+        ("GET", "/centi-score/current", "/centi-score/current", {}),
+        ("GET", "/centi-score/history", "/centi-score/history", {}),
+        ("GET", "/centi-score/growth", "/centi-score/growth", {}),
+        ("GET", "/centi-score/summary", "/centi-score/summary", {}),
+        ("GET", "/centi-score/trend", "/centi-score/trend", {}),
+        ("POST", "/centi-score/calculate", "/centi-score/calculate", {}),
+        ("POST", "/tag-rules/initialize", "/tag-rules/initialize", {}),
+        ("GET", "/tag-rules", "/tag-rules", {}),
+        ("POST", "/tag-rules", "/tag-rules", {"json": {"tag_id": tag_id, "vendor_contains": "coffee", "max_amount": 20}}),
+        ("DELETE", "/tags/{tag_id}", f"/tags/{tag_id}", {}),
+        ("DELETE", "/files/{file_id}", f"/files/{file_id}", {}),
+        ("GET", "/budgets/alerts", "/budgets/alerts", {}),
+        ("POST", "/budgets/alerts/read", "/budgets/alerts/read", {}),
+        ("DELETE", "/budgets/{budget_id}", f"/budgets/{budget_id}", {}),
+        ("POST", "/auth/logout", "/auth/logout", {})
+    ]
+
+# -------------------------------------------------------- Run Requests.
+def run_requests(client, user_id: int, index: int, quiet: bool, failures: list) -> dict:
+    """Run Every Request As One User. Returns Route -> Statement Count, Adding Blown Budgets To 'failures'."""
+
+    from app.routes.accounts import create_access_token
+    from app.utils.query_budget_utils import count_queries, QueryBudgetExceeded
+
+    client.cookies.set("access_token", create_access_token({"sub": str(user_id)}))
+    output = contextlib.redirect_stdout(io.StringIO()) if quiet else contextlib.nullcontext()
+
+    counts = {}
+    for method, route, path, kwargs in build_requests(user_id, index):
+        # Strict Mode Raises Out Of The Middleware, After The Response Has Been Sent.
+        with output, count_queries() as counter:
+            try:
+                response = client.request(method, path, **kwargs)
+            except QueryBudgetExceeded as e:
+                failures.append(f"user {index}: {e}")
+                response = None
+        if response is not None and response.status_code >= 400:
+            raise RuntimeError(f"{method} {path} -> {response.status_code}: {response.text[:200]}")
+        counts[f"{method} {route}"] = counter.count
+    return counts
+
+# -------------------------------------------------------- Main.
+def main():
+    args = parse_args()
+
+    # Throwaway Database, Strict Budgets, Before Anything Imports The App.
+    db_path = os.path.join(tempfile.mkdtemp(prefix="query_budgets_"), "budgets.db")
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+    os.environ["QUERY_BUDGET_STRICT"] = "true"
+    os.environ.setdefault("SECRET_KEY", "query-budget-check")
+
+    from fastapi.testclient import TestClient
+    from app.main import app
+    from app.utils.query_budget_utils import ROUTE_QUERY_BUDGETS, find_unbudgeted_routes
+
+    failures = [f"no budget for {route}" for route in find_unbudgeted_routes(app)]
+
+    user_ids = build_database(args)
+    client = TestClient(app)
+    client.__enter__()
+    try:
+        measured = [
+            run_requests(client, user_id, index, not args.verbose, failures)
+            for index, user_id in enumerate(user_ids, start=1)
+        ]
+    finally:
+        client.__exit__(None, None, None)
+
+    # Counts Must Not Depend On How Much Data The User Has.
+    small, large = measured
+    for route in sorted(set(small) & set(large)):
+        if small[route] != large[route]:
+            failures.append(f"{route} ran {small[route]} queries for {args.small} transactions but "
+                            f"{large[route]} for {args.large} - statement count grows with data")
+
+    if args.report:
+        print(f"{'route':<56}{'small':>7}{'large':>7}{'budget':>8}")
+        for route in sorted(ROUTE_QUERY_BUDGETS):
+            budget = ROUTE_QUERY_BUDGETS[route]
+            print(f"{route:<56}{small.get(route, '-'):>7}{large.get(route, '-'):>7}{'-' if budget is None else budget:>8}")
+        print()
+
+    if failures:
+        for failure in failures:
+            print(f"FAIL: {failure}")
+        sys.exit(1)
+
+    enforced = sum(1 for budget in ROUTE_QUERY_BUDGETS.values() if budget is not None)
+    print(f"OK: {len(small)} routes within budget for both users, "
+          f"{enforced}/{len(ROUTE_QUERY_BUDGETS)} routes have enforced budgets")
+
+if __name__ == "__main__":
+    main()
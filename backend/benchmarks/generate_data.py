@@ -0,0 +1,330 @@
+# Synthetic Data Generator.
+#
+# Note : Fills A SQLite Or PostgreSQL Database With Realistic-Looking Users For Benchmarks. Each User Gets Plaid-Style
+#        Institutions And Accounts, Transactions With Plaid Categories And Raw Bank Descriptors That Exercise
+#        'normalize_vendor' (Prefixes, Store Numbers, Trailing Reference Codes), Recurring Payroll, Rent And
+#        Subscriptions, A Statement Upload Holding The CSV Rows, Default Tags On A Share Of Transactions, Monthly Balance History And Backfilled Weekly
+#        Centi Scores. Rows Are Written With Bulk Core Inserts, So Millions Of Transactions Load In Minutes.
+#        Output Is Deterministic For A Given '--seed'. Every Generated User Signs In With 'BENCH_PASSWORD'.
+#
+# Usage :
+#   cd backend
+#   python -m benchmarks.generate_data --database-url sqlite:///./bench.db --users 10 --transactions 5000 --reset
+#   python -m benchmarks.generate_data --database-url postgresql://... --users 100 --accounts 6 --transactions 20000
+
+# Imports.
+import os
+import sys
+import time
+import random
+import argparse
+from datetime import date, datetime, timedelta
+
+# Shared With 'bench_endpoints'.
+BENCH_EMAIL = "bench_user_{index}@example.com"
+BENCH_PASSWORD = "BenchPassword123!"
+
+# Account Shapes : (Type, Subtype, Name, Balance Range).
+ACCOUNT_SHAPES = [
+    ("depository", "checking", "Total Checking", (500, 15000)),
+    ("credit", "credit card", "Sapphire Preferred", (100, 6000)),
+    ("depository", "savings", "High Yield Savings", (1000, 60000)),
+    ("loan", "student", "Student Loan", (5000, 40000)),
+    ("investment", "brokerage", "Individual Brokerage", (2000, 150000)),
+    ("credit", "credit card", "Freedom Unlimited", (0, 3000)),
+    ("loan", "mortgage", "Home Mortgage", (150000, 400000)),
+    ("depository", "checking", "Joint Checking", (200, 8000))
+]
+
+INSTITUTIONS = [("ins_3", "Chase"), ("ins_4", "Wells Fargo"), ("ins_5", "Bank of America"), ("ins_13", "Capital One")]
+
+# Everyday Spending : (Raw Descriptor, Merchant Name, Plaid Category, Detailed Category, Amount Range).
+# Descriptors Mimic What Banks Send ('SQ *', 'TST*', Store Numbers, '*AB12CD' References) So Vendor Cleanup Is Exercised.
+SPENDING = [
+    ("PUBLIX #{n}", "Publix", "Food and Drink", "Groceries", (15, 180)),
+    ("TRADER JOE'S #{n}", "Trader Joe's", "Food and Drink", "Groceries", (20, 140)),
+    ("SQ *BLUE BOTTLE COFFEE", "Blue Bottle Coffee", "Food and Drink", "Coffee Shop", (4, 14)),
+    ("TST* CHIPOTLE {n}", "Chipotle", "Food and Drink", "Restaurants", (9, 30)),
+    ("STARBUCKS STORE {n}", "Starbucks", "Food and Drink", "Coffee Shop", (4, 12)),
+    ("UBER *EATS {ref}", "Uber Eats", "Food and Drink", "Restaurants", (15, 60)),
+    ("AMAZON MKTPL*{ref}", "Amazon", "Shops", "Online Marketplaces", (8, 250)),
+    ("TARGET        000{n}", "Target", "Shops", "Department Stores", (10, 200)),
+    ("BEST BUY      {n}", "Best Buy", "Shops", "Electronics", (20, 900)),
+    ("SHELL OIL {n}", "Shell", "Travel", "Gas Stations", (25, 70)),
+    ("UBER *TRIP {ref}", "Uber", "Travel", "Taxi", (8, 45)),
+    ("DELTA AIR {n}", "Delta", "Travel", "Airlines and Aviation Services", (120, 650)),
+    ("CVS/PHARMACY #{n}", "CVS", "Healthcare", "Pharmacies", (5, 80)),
+    ("PLANET FITNESS", "Planet Fitness", "Recreation", "Gyms and Fitness Centers", (10, 25)),
+    ("AMC {n} ONLINE", "AMC Theatres", "Recreation", "Movie Theatres", (12, 40)),
+    ("VENMO PAYMENT {ref}", None, "Transfer", "Third Party", (10, 200))
+]
+
+# Recurring Charges : (Raw Descriptor, Merchant Name, Category, Detailed Category, Amount, Day Of Month).
+SUBSCRIPTIONS = [
+    ("NETFLIX.COM", "Netflix", "Service", "Subscription", 15.49, 3),
+    ("SPOTIFY USA", "Spotify", "Service", "Subscription", 10.99, 9),
+    ("APPLE.COM/BILL", "Apple", "Service", "Subscription", 2.99, 14),
+    ("DUKE ENERGY PAYMENT", "Duke Energy", "Service", "Utilities", 120.0, 18),
+    ("ATT*BILL PAYMENT", "AT&T", "Service", "Telecommunication Services", 75.0, 22)
+]
+
+# -------------------------------------------------------- Parse Args.
+def parse_args():
+    parser = argparse.ArgumentParser(description="Fill a database with synthetic Centi users for benchmarking.")
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL", "sqlite:///./bench.db"),
+                        help="Target database (defaults to $DATABASE_URL, then sqlite:///./bench.db).")
+    parser.add_argument("--users", type=int, default=5, help="Users to create.")
+    parser.add_argument("--accounts", type=int, default=4, help="Accounts per user (max %d)." % len(ACCOUNT_SHAPES))
+    parser.add_argument("--transactions", type=int, default=2000, help="Transactions per user.")
+    parser.add_argument("--days", type=int, default=730, help="History length in days.")
+    parser.add_argument("--tag-ratio", type=float, default=0.2, help="Share of transactions that get a tag.")
+    parser.add_argument("--batch-size", type=int, default=5000, help="Rows per bulk insert.")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed (same seed, same data).")
+    parser.add_argument("--skip-scores", action="store_true", help="Don't backfill weekly Centi Scores.")
+    parser.add_argument("--reset", action="store_true", help="Delete existing bench users first.")
+    return parser.parse_args()
+
+# -------------------------------------------------------- Insert Rows.
+def insert_rows(db, model, rows: list, batch_size: int):
+    """Bulk Insert Dict Rows With Core 'executemany' In Batches."""
+
+    for start in range(0, len(rows), batch_size):
+        db.execute(model.__table__.insert(), rows[start:start + batch_size])
+
+# -------------------------------------------------------- Reset Bench Users.
+def reset_bench_users(db):
+    """Delete Previously Generated Users And Everything They Own."""
+
+    from app.database import (
+        User, Account, Transaction, Institution, Tag, TransactionTag, WeeklyCentiScore,
+        MonthlySnapshot, AccountBalanceHistory, FileUpload
+    )
+
+    user_ids = [row[0] for row in db.query(User.id).filter(User.email.like(BENCH_EMAIL.format(index="%")))]
+    if not user_ids:
+        return 0
+
+    transaction_ids = db.query(Transaction.id).filter(Transaction.user_id.in_(user_ids))
+    db.query(TransactionTag).filter(TransactionTag.transaction_id.in_(transaction_ids)).delete(synchronize_session=False)
+    for model in (Transaction, Tag, WeeklyCentiScore, MonthlySnapshot, AccountBalanceHistory, FileUpload, Account, Institution):
+        db.query(model).filter(model.user_id.in_(user_ids)).delete(synchronize_session=False)
+    db.query(User).filter(User.id.in_(user_ids)).delete(synchronize_session=False)
+    db.commit()
+    return len(user_ids)
+
+# -------------------------------------------------------- Build Description.
+def build_description(rng: random.Random, template: str) -> str:
+    """Fill Store Numbers And Reference Codes Into A Raw Descriptor."""
+
+    reference = "".join(rng.choice("ABCDEFGHJKLMNPQRSTUVWXYZ0123456789") for _ in range(6))
+    return template.format(n=rng.randint(100, 9999), ref=reference)
+
+# -------------------------------------------------------- Build Transactions.
+def build_transactions(rng: random.Random, user_id: int, accounts: list, count: int, days: int, today: date) -> list:
+    """Build A User's Transaction Rows : Recurring Income/Bills First, Then Everyday Spending."""
+
+    from app.utils.vendor_utils import normalize_vendor
+
+    start = today - timedelta(days=days)
+    spend_accounts = [a for a in accounts if a["type"] in ("depository", "credit")] or accounts
+    checking = next((a for a in accounts if a["subtype"] == "checking"), spend_accounts[0])
+    now = datetime.now()
+    vendors = {}
+    rows = []
+
+    def add(day, amount, raw, merchant, category, detailed, account_id, source="plaid", kind="place"):
+        # Cache Vendor Cleanup Per Descriptor (Same Raw String Always Normalizes The Same Way).
+        if raw not in vendors:
+            vendors[raw] = normalize_vendor(raw)
+        index = len(rows)
+        rows.append({
+            "user_id": user_id,
+            "transaction_id": f"bench_{user_id}_{index}",
+            "account_id": account_id,
+            "date": day,
+            "amount": round(amount, 2),
+            "vendor": vendors[raw],
+            "merchant_name": merchant,
+            "description": raw,
+            "category_primary": category,
+            "category_detailed": detailed,
+            "transaction_type": kind,
+            "source": source,
+            "file": "plaid" if source == "plaid" else f"bench_{user_id}.csv",
+            "iso_currency_code": "USD",
+            "location_city": rng.choice(["Orlando", "Tampa", "Miami", None]),
+            "location_state": "FL",
+            "location_country": "US",
+            "payment_method": rng.choice(["card", "ach", None]),
+            "created_at": now,
+            "updated_at": now,
+            "transaction_hash": f"bench_{user_id}_{index}"
+        })
+
+    # Bi-Weekly Payroll.
+    salary = rng.randint(1800, 4500)
+    day = start + timedelta(days=rng.randint(0, 13))
+    while day <= today and len(rows) < count:
+        add(day, salary + rng.uniform(-50, 50), "PAYROLL ACME CORP DIR DEP", "Acme Corp", "Transfer", "Payroll",
+            checking["account_id"], kind="special")
+        day += timedelta(days=14)
+
+    # Monthly Rent And Subscriptions.
+    rent = rng.randint(900, 2600)
+    month = date(start.year, start.month, 1)
+    while month <= today and len(rows) < count:
+        add(month, -rent, "ZELLE TO PROPERTY MGMT", None, "Payment", "Rent", checking["account_id"], kind="special")
+        for raw, merchant, category, detailed, amount, day_of_month in SUBSCRIPTIONS:
+            charge_day = month.replace(day=day_of_month)
+            if start <= charge_day <= today:
+                add(charge_day, -amount, raw, merchant, category, detailed, rng.choice(spend_accounts)["account_id"],
+                    kind="digital")
+        month = (month + timedelta(days=32)).replace(day=1)
+
+    # Everyday Spending Fills The Rest (Some Cash And CSV Imports Mixed In).
+    while len(rows) < count:
+        raw, merchant, category, detailed, (low, high) = rng.choice(SPENDING)
+        roll = rng.random()
+        if roll < 0.05:
+            account_id, source = None, "manual"
+        elif roll < 0.15:
+            account_id, source = checking["account_id"], "csv"
+        else:
+            account_id, source = rng.choice(spend_accounts)["account_id"], "plaid"
+        add(start + timedelta(days=rng.randint(0, days)), -rng.uniform(low, high), build_description(rng, raw),
+            merchant, category, detailed, account_id, source=source)
+
+    return rows[:count]
+
+# -------------------------------------------------------- Generate User.
+def generate_user(db, rng: random.Random, index: int, password_hash: str, args) -> dict:
+    """Create One User With Institutions, Accounts, Transactions, Tags And Balance History."""
+
+    from app.database import User, Account, Institution, Transaction, Tag, TransactionTag, AccountBalanceHistory, FileUpload
+    from app.utils.tag_utils import create_default_tags
+    from app.utils.fingerprint_utils import fingerprint_rows
+
+    now = datetime.now()
+    today = date.today()
+
+    user = User(
+        first_name="Bench", last_name=f"User {index}", email=BENCH_EMAIL.format(index=index),
+        hashed_password=password_hash, is_active=True, is_verified=True, created_at=now, updated_at=now
+    )
+    db.add(user)
+    db.flush()
+
+    # Institutions (One Plaid Item Per Institution, Accounts Spread Across Them).
+    institutions = []
+    for i, (institution_id, name) in enumerate(rng.sample(INSTITUTIONS, min(2, len(INSTITUTIONS)))):
+        institutions.append({
+            "user_id": user.id, "institution_id": f"{institution_id}_{user.id}", "name": name,
+            "item_id": f"bench_item_{user.id}_{i}", "is_connected": True, "last_sync": now,
+            "access_token": f"access-sandbox-bench-{user.id}-{i}", "created_at": now, "updated_at": now
+        })
+    insert_rows(db, Institution, institutions, args.batch_size)
+
+    accounts = []
+    for j, (kind, subtype, name, (low, high)) in enumerate(ACCOUNT_SHAPES[:args.accounts]):
+        balance = round(rng.uniform(low, high), 2)
+        accounts.append({
+            "user_id": user.id, "account_id": f"bench_acc_{user.id}_{j}", "item_id": institutions[j % len(institutions)]["item_id"],
+            "name": name, "official_name": f"{name} Account", "type": kind, "subtype": subtype,
+            "mask": f"{rng.randint(0, 9999):04d}", "current_balance": balance,
+            "available_balance": balance if kind == "depository" else None,
+            "limit": round(balance * 3, -2) if kind == "credit" else None,
+            "currency": "USD", "is_active": True, "created_at": now, "updated_at": now
+        })
+    insert_rows(db, Account, accounts, args.batch_size)
+
+    # Monthly Balance History, Drifting Back From Today's Balance.
+    history = []
+    for account in accounts:
+        balance = account["current_balance"]
+        month = date(today.year, today.month, 1)
+        for _ in range(max(1, args.days // 30)):
+            history.append({
+                "user_id": user.id, "account_id": account["account_id"], "snapshot_date": month,
+                "current_balance": round(balance, 2), "available_balance": account["available_balance"] or 0.0,
+                "limit": account["limit"] or 0.0, "account_name": account["name"], "account_type": account["type"],
+                "account_subtype": account["subtype"], "currency": "USD", "created_at": now
+            })
+            balance = max(0.0, balance * rng.uniform(0.9, 1.05))
+            month = (month - timedelta(days=1)).replace(day=1)
+    insert_rows(db, AccountBalanceHistory, history, args.batch_size)
+
+    transactions = build_transactions(rng, user.id, accounts, args.transactions, args.days, today)
+
+    # CSV Rows Belong To One Statement Upload.
+    csv_count = sum(1 for row in transactions if row["source"] == "csv")
+    upload = FileUpload(
+        user_id=user.id, filename=f"bench_{user.id}.csv", original_filename=f"bench_{user.id}.csv", file_type="csv",
+        upload_date=now, transaction_count=csv_count, status="processed", total_rows_processed=csv_count,
+        processing_completed_at=now
+    )
+    db.add(upload)
+    db.flush()
+
+    for row, fingerprint in zip(transactions, fingerprint_rows(user.id, transactions)):
+        row["fingerprint"] = fingerprint
+        row["file_upload_id"] = upload.id if row["source"] == "csv" else None
+    insert_rows(db, Transaction, transactions, args.batch_size)
+
+    # Default Tags, Applied To A Share Of Transactions.
+    create_default_tags(db, user.id)
+    tag_ids = [row[0] for row in db.query(Tag.id).filter(Tag.user_id == user.id)]
+    transaction_ids = [row[0] for row in db.query(Transaction.id).filter(Transaction.user_id == user.id)]
+    tagged = rng.sample(transaction_ids, int(len(transaction_ids) * args.tag_ratio)) if tag_ids else []
+    insert_rows(db, TransactionTag, [
+        {"transaction_id": transaction_id, "tag_id": rng.choice(tag_ids), "user_id": user.id, "created_at": now}
+        for transaction_id in tagged
+    ], args.batch_size)
+
+    db.commit()
+    return {"user_id": user.id, "transactions": len(transactions), "tags": len(tagged), "history": len(history)}
+
+# -------------------------------------------------------- Main.
+def main():
+    args = parse_args()
+    if args.accounts < 1 or args.accounts > len(ACCOUNT_SHAPES):
+        sys.exit(f"--accounts must be between 1 and {len(ACCOUNT_SHAPES)}")
+
+    # Point The App At The Target Database Before Anything Builds An Engine.
+    os.environ["DATABASE_URL"] = args.database_url
+    from app.database import create_tables, get_session
+    from app.routes.accounts import get_password_hash
+    from app.utils.score_backfill_utils import backfill_weekly_scores
+
+    create_tables()
+    db = get_session()
+    if db is None:
+        sys.exit("Could not connect to the database")
+
+    rng = random.Random(args.seed)
+    started = time.perf_counter()
+
+    try:
+        if args.reset:
+            print(f"Removed {reset_bench_users(db)} existing bench users")
+
+        # Hashing Is Deliberately Slow, So Every Bench User Shares One Hash.
+        password_hash = get_password_hash(BENCH_PASSWORD)
+
+        totals = {"transactions": 0, "tags": 0, "history": 0, "scores": 0}
+        for index in range(1, args.users + 1):
+            result = generate_user(db, rng, index, password_hash, args)
+            if not args.skip_scores:
+                result["scores"] = backfill_weekly_scores(db, result["user_id"])
+            for key in totals:
+                totals[key] += result.get(key, 0)
+            print(f"  {BENCH_EMAIL.format(index=index)}: {result['transactions']:,} transactions, "
+                  f"{result.get('scores', 0)} weekly scores")
+    finally:
+        db.close()
+
+    print(f"\nGenerated {args.users} users, {args.users * args.accounts} accounts, {totals['transactions']:,} transactions, "
+          f"{totals['tags']:,} tags, {totals['history']:,} balance snapshots, {totals['scores']:,} weekly scores "
+          f"in {time.perf_counter() - started:.1f}s")
+
+if __name__ == "__main__":
+    main()
@@ -122,6 +122,17 @@ export const fetchTransactions = () => API.get('/transactions');
 // ----------------------------------------------------------------- Fetches Detailed Transactions With Account Info.
 export const fetchDetailedTransactions = () => API.get('/transactions/detailed');
 
+// ----------------------------------------------------------------- Search Transactions (Ranked, Paginated).
+export const searchTransactions = (query, { limit = 50, offset = 0, fuzzy = true } = {}) => API.get('/transactions/search', {
+    params: { q: query, limit, offset, fuzzy }
+});
+
+// ----------------------------------------------------------------- Export Transactions (format: 'csv' | 'ndjson' | 'parquet'; filters: start_date, end_date, account_id, category, source).
+export const exportTransactions = (format = 'csv', filters = {}) => API.get('/transactions/export', {
+    params: { format, ...filters },
+    responseType: 'blob'
+});
+
 // ----------------------------------------------------------------- Manually Create Transaction.
 export const createTransaction = (data) => API.post('/transactions/', data);
 
@@ -227,6 +238,9 @@ export const calculateWeeklyScore = () => API.post('/centi-score/calculate');
 // ----------------------------------------------------------------- Get Centi Score Trend
 export const getCentiScoreTrend = () => API.get('/centi-score/trend');
 
+// ----------------------------------------------------------------- Get Centi Score Overview (Current, Status, Growth, Summary, Trend & History In One Call)
+export const getCentiScoreOverview = (historyLimit = 12) => API.get(`/centi-score/overview?history_limit=${historyLimit}`);
+
 // ================================================================= DATABASE OPERATIONS
 // ----------------------------------------------------------------- Empties Entire Database.
 export const emptyDatabase = () => API.delete('/clear');